@@ -28,21 +28,27 @@
 # Author: Robert Balas (balasr@iis.ee.ethz.ch)
 
 import argparse
+import asyncio
 import re
-from subprocess import (Popen, TimeoutExpired,
-                        CalledProcessError, PIPE)
-from threading import Lock
+from subprocess import CalledProcessError, PIPE, Popen
 import shlex
 import sys
 import signal
 import os
-import multiprocessing
-import errno
+import resource
+import threading
 import pprint
 import time
-import random
 from collections import OrderedDict
 import json
+import hashlib
+import fnmatch
+
+# parse_vsim lives with the exploration scripts and has no dependencies
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'target', 'verif', 'exploration',
+                                'scripts'))
+from parse_vsim import SUMMARY_MARKER, ParseError, parse_summary  # noqa: E402
 
 runtest = argparse.ArgumentParser(
     prog='bwruntests',
@@ -60,6 +66,20 @@ parallel_bare_tests: # name of the test set
     command: make clean all run # command to run in the test's folder
 [...]
 
+Tests can share a build step by naming an entry of the reserved 'compile'
+set. Each compile job runs once, before the tests that depend on it, and
+those tests are failed without running if it fails:
+
+compile:
+  hci:
+    path: .
+    command: make opt-verif HARDWARE_JSON=hci.json
+hci_tests:
+  hci_fair:
+    path: .
+    compile: hci
+    command: make run-only-verif HARDWARE_JSON=hci.json TESTBENCH_JSON=fair.json
+
 or
 
 Test_file needs to be a list of commands to be executed. Each line corresponds
@@ -85,12 +105,12 @@ shows the full set of commands being run.""")
 
 runtest.version = '0.2'
 
-runtest.add_argument('test_file', type=str,
+runtest.add_argument('test_file', type=str, nargs='?',
                      help='file defining tests to be run')
 runtest.add_argument('--version', action='version',
                      version='%(prog)s ' + runtest.version)
 runtest.add_argument('-p', '--max_procs', type=int,
-                     default=multiprocessing.cpu_count(),
+                     default=os.cpu_count(),
                      help="""Number of parallel
                      processes used to run test.
                      Default is number of cpu cores.""")
@@ -115,16 +135,241 @@ runtest.add_argument('-o,', '--output', type=str,
                      help="""Write junit.xml to file instead of stdout""")
 runtest.add_argument('-P,', '--perf', type=str, default=None,
                      help="""Write performance results to JSON file""")
-stdout_lock = Lock()
-
+runtest.add_argument('--history', type=str, default=None,
+                     help="""Read and update per-test wall time history in
+                     this JSON file. Tests are scheduled longest-first based
+                     on it. Tests without history are estimated from the
+                     --perf JSON (if any) or from --default_estimate""")
+runtest.add_argument('--log_dir', type=str, default='bwruntests_logs',
+                     help="""Directory where the full stdout and stderr of
+                     each test are streamed to. Default is
+                     bwruntests_logs""")
+runtest.add_argument('--tail_bytes', type=int, default=64 * 1024,
+                     help="""Bytes of each test's stdout and stderr kept in
+                     memory for the junit report and failure output.
+                     Default is 64 KiB""")
+runtest.add_argument('--baseline', type=str, default=None,
+                     help="""Compare the simulation summary metrics of each
+                     test against this JSON baseline and fail tests that
+                     regress by more than the allowed threshold""")
+runtest.add_argument('--update_baseline', action='store_true',
+                     help="""Write the metrics of passing tests to --baseline
+                     instead of comparing against it""")
+runtest.add_argument('--threshold', type=str, action='append', default=[],
+                     metavar='METRIC=REL',
+                     help="""Allowed relative regression for metrics matching
+                     the glob METRIC, e.g. 'req_gnt_latency/*=0.2'. Can be
+                     given multiple times; the first match wins""")
+runtest.add_argument('--default_threshold', type=float, default=0.05,
+                     help="""Allowed relative regression for metrics without
+                     a --threshold. Default is 0.05""")
+runtest.add_argument('--shard', type=str, default=None, metavar='I/N',
+                     help="""Only run shard I (1-based) of N. Tests are
+                     assigned deterministically, balanced by their estimated
+                     duration, so every host given the same test file and
+                     history gets a disjoint share. The history is then
+                     written to <history>.shardIofN. Run every shard in its
+                     own checkout or worktree: compile jobs regenerate the
+                     config and stimuli of the tree they run in""")
+runtest.add_argument('--merge_junit', type=str, nargs='+', default=None,
+                     metavar='XML',
+                     help="""Merge per-shard junit reports into --output and
+                     exit""")
+runtest.add_argument('--merge_perf', type=str, nargs='+', default=None,
+                     metavar='JSON',
+                     help="""Merge per-shard --perf files into --perf and
+                     exit""")
+runtest.add_argument('--merge_history', type=str, nargs='+', default=None,
+                     metavar='JSON',
+                     help="""Merge per-shard history files into --history
+                     and exit""")
+runtest.add_argument('--default_estimate', type=float, default=60.0,
+                     help="""Estimated duration in seconds for tests without
+                     history. Default is 60 seconds.""")
+# progress counters, only touched from the event loop
 shared_total = 0
 len_total = 0
+remaining_work = 0.0
+estimates = {}
+# processes currently running and the error that aborted the run, if any
+running = set()
+aborted = []
+
+# weight of a new measurement in the history moving average
+HISTORY_ALPHA = 0.5
+
+# units of the resource usage entries of a FinishedProcess
+RUSAGE_UNITS = OrderedDict([('cpu_user', 's'), ('cpu_sys', 's'),
+                            ('max_rss', 'KiB')])
+
+class MetricScanner(object):
+    """Extract metrics from a test's stdout one line at a time
+
+    Lines from the last simulation summary marker on are kept (up to
+    max_summary_lines) and handed to parse_vsim.parse_summary at the end.
+    """
+    hwpe_cycles = re.compile(r"# hwpe cycles =\s+(\d+)")
+    max_summary_lines = 10000
+
+    def __init__(self):
+        self.hwpe_cycles_value = 0
+        self.summary_lines = None
+
+    def feed(self, line):
+        if not self.hwpe_cycles_value:
+            match = self.hwpe_cycles.search(line)
+            if match:
+                self.hwpe_cycles_value = int(match.group(1))
+        if SUMMARY_MARKER in line:
+            self.summary_lines = [line]
+        elif (self.summary_lines is not None
+              and len(self.summary_lines) < self.max_summary_lines):
+            self.summary_lines.append(line)
+
+    def summary(self):
+        """Parsed simulation summary or None if there is none"""
+        if self.summary_lines is None:
+            return None
+        try:
+            return parse_summary('\n'.join(self.summary_lines))
+        except ParseError:
+            return None
+
+    @property
+    def exec_time(self):
+        """Legacy hwpe cycle count, else the total simulation cycles"""
+        if self.hwpe_cycles_value:
+            return self.hwpe_cycles_value
+        summary = self.summary()
+        if summary is None:
+            return 0
+        return int(summary['simulation_time'].get('total_cycles', 0))
+
+def summary_metrics(summary):
+    """Flatten a parse_vsim summary into {metric: (value, unit, higher_is_better)}
+    """
+    metrics = OrderedDict()
+    if summary is None:
+        return metrics
+    sim_time = summary.get('simulation_time', {})
+    bw = summary.get('bandwidth', {})
+    averages = summary.get('request_to_grant_latency', {}).get('averages', {})
+    if 'total_cycles' in sim_time:
+        metrics['total_cycles'] = (sim_time['total_cycles'], 'cycles', False)
+    if 'completion_phase_duration_cycles' in bw:
+        metrics['completion_cycles'] = (
+            bw['completion_phase_duration_cycles'], 'cycles', False)
+    if 'actual_completion_bit_per_cycle' in bw:
+        metrics['actual_bw'] = (
+            bw['actual_completion_bit_per_cycle'], 'bit/cycle', True)
+    if 'actual_completion_utilization_pct' in bw:
+        metrics['utilization'] = (
+            bw['actual_completion_utilization_pct'], '%', True)
+    for group, avg in sorted(averages.items()):
+        if 'weighted_cycles' in avg:
+            metrics['req_gnt_latency/' + group] = (
+                avg['weighted_cycles'], 'cycles', False)
+    for row in summary.get('request_to_grant_latency', {}).get('per_master', []):
+        value = row.get('avg_req_to_gnt_stall_latency_cycles')
+        if value is not None:
+            metrics['req_gnt_latency/' + row['master_name']] = (
+                value, 'cycles', False)
+    return metrics
+
+def parse_thresholds(specs):
+    """Parse 'glob=rel' threshold specs into a list of (glob, rel)"""
+    thresholds = []
+    for spec in specs:
+        pattern, sep, rel = spec.rpartition('=')
+        if not sep or not pattern:
+            raise ValueError('bad --threshold {!r}, expected METRIC=REL'.format(spec))
+        thresholds.append((pattern, float(rel)))
+    return thresholds
+
+def find_regressions(metrics, baseline, thresholds, default_threshold):
+    """Return messages for metrics that regressed against baseline"""
+    regressions = []
+    for metric, (value, unit, higher_is_better) in metrics.items():
+        base = baseline.get(metric)
+        if base is None or base == 0:
+            continue
+        rel = next((t for pattern, t in thresholds
+                    if fnmatch.fnmatchcase(metric, pattern)),
+                   default_threshold)
+        change = (value - base) / abs(base)
+        if (-change if higher_is_better else change) > rel:
+            regressions.append(
+                '{}: {:g} {} vs baseline {:g} ({:+.1f}%, allowed {:.1f}%)'
+                .format(metric, value, unit, base, 100 * change, 100 * rel))
+    return regressions
+
+class StreamLog(object):
+    """Stream output to a log file, keeping only a bounded tail in memory.
+
+    Complete lines are passed on to scanner (if any) as they arrive, so
+    metrics never require the full output to be held in memory.
+    """
+    def __init__(self, path, tail_bytes, scanner=None):
+        self.path = path
+        self.tail_bytes = tail_bytes
+        self.scanner = scanner
+        self.tail = bytearray()
+        self.truncated = False
+        self.partial = b''
+        self.f = open(path, 'wb')
+
+    def write(self, data):
+        self.f.write(data)
+        self.tail += data
+        if len(self.tail) > self.tail_bytes:
+            del self.tail[:len(self.tail) - self.tail_bytes]
+            self.truncated = True
+        if self.scanner is not None:
+            lines = (self.partial + data).split(b'\n')
+            # a runaway line without newline must not grow unbounded either
+            self.partial = lines.pop()[-self.tail_bytes:]
+            for line in lines:
+                self.scanner.feed(line.decode('utf-8', errors='replace'))
+
+    def close(self):
+        if self.scanner is not None and self.partial:
+            self.scanner.feed(self.partial.decode('utf-8', errors='replace'))
+        self.partial = b''
+        self.f.close()
+
+    def text(self):
+        text = self.tail.decode('utf-8', errors='replace')
+        if self.truncated:
+            text = '[... truncated, full output in {}]\n'.format(self.path) + text
+        return text
+
+def max_rss_kib(ru):
+    """ru_maxrss of a resource.struct_rusage in KiB"""
+    return ru.ru_maxrss // (1024 if sys.platform == 'darwin' else 1)
+
+def rusage_entries(ru):
+    """RUSAGE_UNITS entries of a resource.struct_rusage"""
+    return OrderedDict([('cpu_user', ru.ru_utime), ('cpu_sys', ru.ru_stime),
+                        ('max_rss', max_rss_kib(ru))])
+
+def format_rss(kib):
+    """Format a KiB amount as MiB"""
+    return '{:.0f}MiB'.format(kib / 1024)
+
+def log_path(name, suffix):
+    """Path of the log file of test name"""
+    stem = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_')
+    if len(stem) > 100:
+        stem = stem[:100] + '_' + hashlib.md5(name.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(args.log_dir, stem + suffix)
 
 class FinishedProcess(object):
     """A process that has finished running.
     """
     def __init__(self, name, cwd, runargs, returncode,
-                 stdout=None, stderr=None, time=None):
+                 stdout=None, stderr=None, time=None,
+                 exec_time=0, stdout_log=None, stderr_log=None,
+                 metrics=None, rusage=None, timed_out=False):
         self.name = name
         self.cwd = cwd
         self.runargs = runargs
@@ -132,15 +377,16 @@ class FinishedProcess(object):
         self.stdout = stdout
         self.stderr = stderr
         self.time = time
-        exec_time = 0
-        throughput = 0
-        workload = 0
-        if returncode == 0:
-            matches = re.findall("# hwpe cycles =\s+(\d+)", stdout)
-            if matches:
-                exec_time = int(matches[0])
-        self.exec_time = exec_time
-
+        self.stdout_log = stdout_log
+        self.stderr_log = stderr_log
+        self.exec_time = exec_time if returncode == 0 else 0
+        self.metrics = metrics if returncode == 0 and metrics else OrderedDict()
+        # cpu_user/cpu_sys seconds and max_rss KiB, empty if the test never
+        # ran
+        self.rusage = rusage or OrderedDict()
+        self.regressions = []
+        # killed at --timeout, so time is only a lower bound
+        self.timed_out = timed_out
 
     def __repr__(self):
         runargs = ['name={!r}'.format(self.name)]
@@ -153,99 +399,428 @@ class FinishedProcess(object):
             runargs.append('stderr={!r}'.format(self.stderr))
         if self.time is not None:
             runargs.append('time={!r}'.format(self.time))
+        if self.stdout_log is not None:
+            runargs.append('stdout_log={!r}'.format(self.stdout_log))
         return "{}({})".format(type(self).__name__, ', '.join(runargs))
 
-def fork(name, cwd, *popenargs, check=False, shell=True,
-         **kwargs):
+async def drain(stream, sink):
+    """Write everything read from stream to sink until EOF"""
+    while True:
+        data = await stream.read(65536)
+        if not data:
+            break
+        sink.write(data)
+
+def reap(pid):
+    """Future of the (wait status, rusage) of child pid.
+
+    asyncio reaps the processes it starts with waitpid, which drops their
+    resource usage, so the tests are started with Popen and each one is
+    waited for with os.wait4 in a thread of its own.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def wait():
+        try:
+            _, status, ru = os.wait4(pid, 0)
+        except OSError as e:
+            # e.g. ChildProcessError when something else reaped the pid
+            loop.call_soon_threadsafe(future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(future.set_result, (status, ru))
+    threading.Thread(target=wait, daemon=True).start()
+    return future
+
+async def pipe_reader(pipe):
+    """StreamReader over a pipe of a Popen, which is closed at EOF"""
+    reader = asyncio.StreamReader()
+    await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    return reader
+
+def kill_group(process):
+    """Kill the whole process group of process.
+
+    process.kill() will only kill the immediate child but not its forks.
+    This won't work since our commands will create a few forks
+    (make -> vsim -> etc). The child is started in its own session, so its
+    pid is also the pgid of everything it spawns.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+async def fork(name, cwd, popenargs, semaphore, check=False):
     """Run subprocess and return process args, error code, stdout and stderr
     """
+    global shared_total
+    global remaining_work
 
     def proc_out(cwd, stdout, stderr):
         print('cwd={}'.format(cwd))
         print('stdout=')
-        print(stdout.decode('utf-8'))
+        print(stdout)
         print('stderr=')
-        print(stderr.decode('utf-8'))
-
-    kwargs['stdout'] = PIPE
-    kwargs['stderr'] = PIPE
+        print(stderr)
 
-    with Popen(*popenargs, preexec_fn=os.setpgrp, cwd=cwd,
-               **kwargs) as process:
+    async with semaphore:
+        if aborted:
+            return None
+        scanner = MetricScanner()
+        out_log = StreamLog(log_path(name, '.stdout.log'), args.tail_bytes,
+                            scanner)
+        err_log = StreamLog(log_path(name, '.stderr.log'), args.tail_bytes)
+        # measure runtime
+        start = time.time()
+        timeoutmsg = None
+        rusage = None
         try:
-            # Child and parent are racing for setting/using the pgid so we have
-            # to set it in both processes. See glib manual.
+            process = Popen(popenargs, cwd=cwd, stdout=PIPE, stderr=PIPE,
+                            start_new_session=True)
+        except OSError as e:
+            err_log.write('bwruntests: {}\n'.format(e).encode('utf-8'))
+            err_log.close()
+            out_log.close()
+            returncode = 127
+        else:
+            running.add(process)
+            reaped = reap(process.pid)
             try:
-                os.setpgid(process.pid, process.pid)
+                stdout_pipe = await pipe_reader(process.stdout)
+                stderr_pipe = await pipe_reader(process.stderr)
+                try:
+                    await asyncio.wait_for(
+                        asyncio.gather(drain(stdout_pipe, out_log),
+                                       drain(stderr_pipe, err_log),
+                                       asyncio.shield(reaped)),
+                        timeout=args.timeout)
+                except asyncio.TimeoutError:
+                    kill_group(process)
+                    # collect whatever is left in the pipes
+                    await asyncio.gather(drain(stdout_pipe, out_log),
+                                         drain(stderr_pipe, err_log),
+                                         reaped)
+                    timeoutmsg = 'TIMEOUT after {:f}s'.format(args.timeout)
             except OSError as e:
-                if e.errno != errno.EACCES:
-                    raise
-            # measure runtime
-            start = time.time()
-            stdout, stderr = process.communicate(input, timeout=args.timeout)
-        except TimeoutExpired:
-            pgid = os.getpgid(process.pid)
-            os.killpg(pgid, signal.SIGKILL)
-            # process.kill() will only kill the immediate child but not its
-            # forks. This won't work since our commands will create a few forks
-            # (make -> vsim -> etc). We need to make a process group and kill
-            # that
-            stdout, stderr = process.communicate()
-            timeoutmsg = 'TIMEOUT after {:f}s'.format(args.timeout)
-
-            if args.proc_verbose:
-                stdout_lock.acquire()
-                print(name)
-                print(timeoutmsg)
-                proc_out(cwd, stdout, stderr)
-                stdout_lock.release()
-
-            return FinishedProcess(name, cwd, process.args, 1,
-                                   stdout.decode('utf-8'),
-                                   timeoutmsg + '\n'
-                                   + stderr.decode('utf-8'),
-                                   time.time() - start)
-        # Including KeyboardInterrupt, communicate handled that.
-        except:  # noqa: E722
-            pgid = os.getpgid(process.pid)
-            os.killpg(pgid, signal.SIGKILL)
-            # We don't call process.wait() as .__exit__ does that for us.
-            raise
-        retcode = process.poll()
-        if check and retcode:
-            raise CalledProcessError(retcode, process.args,
-                                     output=stdout, stderr=stderr)
-        if args.proc_verbose:
-            stdout_lock.acquire()
-            print(name)
-            proc_out(cwd, stdout, stderr)
-            stdout_lock.release()
-
-    with lock:
-        shared_total.value += 1
-        print("[%s][%d/%d] %s" % ("\033[1;32m OK \033[0m" if retcode == 0 else "\033[1;31mFAIL\033[0m", shared_total.value, len_total.value, name))
-
-    return FinishedProcess(name, cwd, process.args, retcode,
-                           stdout.decode('utf-8'),
-                           stderr.decode('utf-8'),
-                           time.time() - start)
-
-def poolInit(s, t, l):
+                # The test fails, the others keep running
+                kill_group(process)
+                await asyncio.gather(reaped, return_exceptions=True)
+                err_log.write('bwruntests: {}\n'.format(e).encode('utf-8'))
+            # Including KeyboardInterrupt, which cancels all running tests
+            except BaseException:
+                kill_group(process)
+                await asyncio.gather(reaped, return_exceptions=True)
+                raise
+            finally:
+                running.discard(process)
+                out_log.close()
+                err_log.close()
+            if reaped.exception() is not None:
+                # exit status and resource usage are lost
+                process.returncode = returncode = 1
+            else:
+                status, ru = reaped.result()
+                # also keeps Popen from polling the reaped pid
+                process.returncode = returncode = os.waitstatus_to_exitcode(status)
+                # the rusage of killed tests is kept, they are the slow ones
+                rusage = rusage_entries(ru)
+        elapsed = time.time() - start
+
+    stdout = out_log.text()
+    stderr = (timeoutmsg + '\n' if timeoutmsg else '') + err_log.text()
+    retcode = 1 if timeoutmsg else returncode
+    if check and retcode:
+        raise CalledProcessError(retcode, popenargs,
+                                 output=stdout, stderr=stderr)
+    if args.proc_verbose:
+        print(name)
+        proc_out(cwd, stdout, stderr)
+
+    shared_total += 1
+    remaining_work = max(0.0, remaining_work - estimates.get(name, 0.0))
+    print("[%s][%d/%d] %s (ETA %s)" % ("\033[1;32m OK \033[0m" if retcode == 0 else "\033[1;31mFAIL\033[0m", shared_total, len_total, name,
+                                      format_duration(remaining_work / args.max_procs)))
+
+    return FinishedProcess(name, cwd, popenargs, retcode, stdout, stderr,
+                           elapsed, exec_time=scanner.exec_time,
+                           stdout_log=out_log.path, stderr_log=err_log.path,
+                           metrics=summary_metrics(scanner.summary()),
+                           rusage=rusage, timed_out=timeoutmsg is not None)
+
+def compile_failed(name, cwd, cmd, compile_proc):
+    """Result of a test not run because its compile job failed"""
     global shared_total
-    global len_total
-    global lock
-    shared_total = s
-    len_total = t
-    lock = l
+    global remaining_work
+    shared_total += 1
+    remaining_work = max(0.0, remaining_work - estimates.get(name, 0.0))
+    print("[%s][%d/%d] %s (%s failed)" % ("\033[1;31mFAIL\033[0m", shared_total, len_total, name, compile_proc.name))
+    return FinishedProcess(name, cwd, cmd, 1, '',
+                           '{} failed, see {}\n'.format(
+                               compile_proc.name, compile_proc.stderr_log),
+                           0.0)
+
+async def run_tests(tests, compiles=None, deps=None):
+    """Run all tests with at most --max_procs of them at once
+
+    Tests listed in deps first wait for their compile job from compiles. The
+    compile jobs of this flow regenerate the shared config and stimuli
+    directories, so a compile job and its tests run to completion before the
+    next compile job starts; tests without a compile job run alongside.
+    """
+    compiles = compiles or {}
+    deps = deps or {}
+    # asyncio.Semaphore wakes waiters in FIFO order, so tests start in the
+    # order they are listed
+    semaphore = asyncio.Semaphore(args.max_procs)
+
+    async def guarded(name, cwd, cmd):
+        # On an error, kill the running tests and skip the pending ones
+        # instead of cancelling them, so that no subprocess is left behind
+        try:
+            return await fork(name, cwd, cmd, semaphore)
+        except Exception as e:
+            if not aborted:
+                aborted.append(e)
+                for process in list(running):
+                    kill_group(process)
+            raise
+
+    async def compiled_groups():
+        results = []
+        for compile_name, (cwd, cmd) in compiles.items():
+            members = [t for t in tests if deps.get(t[0]) == compile_name]
+            compile_proc = await guarded(compile_name, cwd, cmd)
+            if compile_proc is None:
+                break
+            results.append(compile_proc)
+            if compile_proc.returncode != 0:
+                results.extend(compile_failed(*t, compile_proc)
+                               for t in members)
+                continue
+            results.extend(await asyncio.gather(*(guarded(*t)
+                                                  for t in members)))
+        return results
+
+    procresults = await asyncio.gather(compiled_groups(),
+                                       *(guarded(name, cwd, cmd)
+                                         for name, cwd, cmd in tests
+                                         if name not in deps),
+                                       return_exceptions=True)
+    if aborted:
+        raise aborted[0]
+    for r in procresults:
+        if isinstance(r, BaseException):
+            raise r
+    return procresults[0] + procresults[1:]
+
+def format_duration(seconds):
+    """Format seconds as e.g. 1h02m03s"""
+    seconds = int(round(seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    if h:
+        return '{:d}h{:02d}m{:02d}s'.format(h, m, s)
+    if m:
+        return '{:d}m{:02d}s'.format(m, s)
+    return '{:d}s'.format(s)
+
+def load_json(path):
+    """Load a JSON dict (e.g. history or baseline), empty if missing"""
+    if path is None or not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def load_perf_cycles(path):
+    """Return the most recent cycle count per test from a --perf JSON file"""
+    if path is None or not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return {e['name']: e['value'] for e in json.load(f)
+                if e.get('unit') == 'cycles' and e.get('value')
+                and 'metric' not in e}
+
+def estimate_durations(testnames, history, perf_cycles, default):
+    """Estimate wall time in seconds for each test.
+
+    Tests with history use it directly. Tests that only appear in the perf
+    JSON are converted from cycles using the mean seconds/cycle of tests that
+    have both; if there are none, their cycle counts are scaled around the
+    default estimate. All other tests get the default estimate.
+    """
+    ratios = [history[n]['time'] / perf_cycles[n] for n in history
+              if n in perf_cycles and history[n].get('time')]
+    if ratios:
+        sec_per_cycle = sum(ratios) / len(ratios)
+    elif perf_cycles:
+        sec_per_cycle = default / (sum(perf_cycles.values())
+                                   / len(perf_cycles))
+    else:
+        sec_per_cycle = 0.0
+    est = {}
+    for n in testnames:
+        if n in history and history[n].get('time'):
+            est[n] = history[n]['time']
+        elif n in perf_cycles and sec_per_cycle > 0:
+            est[n] = perf_cycles[n] * sec_per_cycle
+        else:
+            est[n] = default
+    return est
+
+def lpt_makespan(durations, procs):
+    """Wall time of scheduling durations longest-first on procs workers"""
+    workers = [0.0] * max(1, procs)
+    for d in sorted(durations, reverse=True):
+        i = workers.index(min(workers))
+        workers[i] += d
+    return max(workers)
+
+def parse_shard(spec):
+    """Parse 'I/N' into a 0-based (index, count)"""
+    try:
+        index, count = (int(x) for x in spec.split('/'))
+    except ValueError:
+        raise ValueError('bad --shard {!r}, expected I/N'.format(spec))
+    if not 1 <= index <= count:
+        raise ValueError('bad --shard {!r}, need 1 <= I <= N'.format(spec))
+    return index - 1, count
+
+def shard_tests(tests, estimates, index, count, deps=None):
+    """Tests of shard index out of count.
+
+    Tests are dealt longest-first to the least loaded shard (lowest shard on
+    ties), which only depends on the test names and estimates. Tests sharing
+    a compile job in deps are dealt together, so it only runs on one shard.
+    """
+    deps = deps or {}
+    units = OrderedDict()
+    for t in tests:
+        units.setdefault(deps.get(t[0], t[0]), []).append(t)
+    work = {u: sum(estimates[t[0]] for t in members)
+            + (estimates.get(u, 0.0) if u in deps.values() else 0.0)
+            for u, members in units.items()}
+    load = [0.0] * count
+    mine = []
+    for u in sorted(units, key=lambda u: (-work[u], u)):
+        k = load.index(min(load))
+        load[k] += work[u]
+        if k == index:
+            mine.extend(units[u])
+    return mine
+
+def merge_junit(inputs, output, prettyprint):
+    """Merge the testcases of several junit reports into one testsuite
+
+    The suite properties (the per-test resource usage) are merged as well;
+    a property repeated in a later report replaces the earlier one.
+    """
+    import xml.etree.ElementTree as ET
+    merged = ET.Element('testsuite', name='bwruntests')
+    properties = OrderedDict()
+    for path in inputs:
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == 'testsuite' else root.iter('testsuite')
+        for suite in suites:
+            for prop in suite.findall('properties/property'):
+                properties[prop.get('name')] = prop
+            merged.extend(suite.findall('testcase'))
+    if properties:
+        props = ET.Element('properties')
+        props.extend(properties.values())
+        merged.insert(0, props)
+    cases = merged.findall('testcase')
+    merged.set('tests', str(len(cases)))
+    for tag, attr in (('failure', 'failures'), ('error', 'errors'),
+                      ('skipped', 'skipped')):
+        merged.set(attr, str(sum(1 for c in cases if c.find(tag) is not None)))
+    merged.set('time', str(sum(float(c.get('time', 0)) for c in cases)))
+    root = ET.Element('testsuites')
+    for attr in ('tests', 'failures', 'errors', 'time'):
+        root.set(attr, merged.get(attr))
+    root.append(merged)
+    if prettyprint:
+        ET.indent(root)
+    tree = ET.ElementTree(root)
+    if output:
+        tree.write(output, encoding='utf-8', xml_declaration=True)
+    else:
+        print(ET.tostring(root, encoding='unicode'))
+    return int(merged.get('failures')) + int(merged.get('errors'))
+
+def merge_perf(inputs, output):
+    """Append the entries of several --perf files to output"""
+    d = []
+    if os.path.isfile(output):
+        with open(output) as f:
+            d = json.load(f)
+    for path in inputs:
+        with open(path) as f:
+            d.extend(json.load(f))
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(d, f, ensure_ascii=False, indent=4)
+
+def merge_history(inputs, output):
+    """Fold per-shard history files into output.
+
+    Every shard starts from the same history, so for each test the entry
+    with the most runs is the most recent one.
+    """
+    history = load_json(output)
+    for path in inputs:
+        for name, entry in load_json(path).items():
+            if entry.get('runs', 0) > history.get(name, {}).get('runs', 0):
+                history[name] = entry
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=4, sort_keys=True)
+
+def update_history(path, history, procresults):
+    """Fold measured wall times into the history file
+
+    A timed-out test ran for at least its wall time, so it is not averaged
+    in: the entry keeps the larger of both and is marked timed_out.
+    """
+    for p in procresults:
+        # tests skipped because their compile job failed were not timed
+        if not p.time:
+            continue
+        prev = history.get(p.name) or {}
+        runs = prev.get('runs', 0) + 1
+        if p.timed_out:
+            history[p.name] = {'time': max(p.time, prev.get('time') or 0.0),
+                               'runs': runs, 'timed_out': True}
+        elif prev.get('time'):
+            t = (1 - HISTORY_ALPHA) * prev['time'] + HISTORY_ALPHA * p.time
+            history[p.name] = {'time': t, 'runs': runs}
+        else:
+            history[p.name] = {'time': p.time, 'runs': runs}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=4, sort_keys=True)
 
 if __name__ == '__main__':
-    # Python 3.14 changed the default multiprocessing start method on Linux
-    # from 'fork' to 'forkserver'. Workers below rely on inheriting `args` and
-    # other module-level state via fork's copy-on-write memory, so force it.
-    multiprocessing.set_start_method('fork')
     args = runtest.parse_args()
     pp = pprint.PrettyPrinter(indent=4)
 
+    # merge per-shard results and exit
+    if args.merge_junit or args.merge_perf or args.merge_history:
+        failed = 0
+        if args.merge_junit:
+            failed = merge_junit(args.merge_junit, args.output,
+                                 not(args.disable_junit_pp))
+        if args.merge_perf:
+            if args.perf is None:
+                runtest.error('--merge_perf requires --perf')
+            merge_perf(args.merge_perf, args.perf)
+        if args.merge_history:
+            if args.history is None:
+                runtest.error('--merge_history requires --history')
+            merge_history(args.merge_history, args.history)
+        exit(1 if failed else 0)
+
+    if args.test_file is None:
+        runtest.error('the following arguments are required: test_file')
+
     # lazy importing so that we can work without junit_xml
     if args.report_junit:
         try:
@@ -265,6 +840,8 @@ the junit_xml library which is not installed.""",
 library which is not installed""")
 
     tests = []  # list of tuple (testname, working dir, command)
+    compiles = OrderedDict()  # compile job name -> (working dir, command)
+    deps = {}  # testname -> compile job name
 
     # load tests (yaml or command list)
     if args.yaml:
@@ -281,9 +858,19 @@ the pyyaml library which is not installed.""",
                 for testname, insn in testv.items():
                     cmd = shlex.split(insn['command'])
                     cwd = insn['path']
+                    if testsetname == 'compile':
+                        compiles['compile:' + testname] = (cwd, cmd)
+                        continue
                     tests.append((testsetname + ':' + testname, cwd, cmd))
+                    if 'compile' in insn:
+                        deps[tests[-1][0]] = 'compile:' + insn['compile']
+            for testname, compile_name in deps.items():
+                if compile_name not in compiles:
+                    runtest.error('{}: unknown compile job {!r}'.format(
+                        testname, compile_name.split(':', 1)[1]))
             if args.verbose:
                 pp.pprint(tests)
+                pp.pprint(compiles)
     else:  # (command list)
         with open(args.test_file) as f:
             testnames = list(map(str.rstrip, f))
@@ -295,28 +882,88 @@ the pyyaml library which is not installed.""",
                 pp.pprint(tests)
                 pp.pprint(shellcmds)
 
-    # Spawning process pool
-    # Disable signals to prevent race. Child processes inherit SIGINT handler
-    original_sigint_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
-    lock = multiprocessing.Lock()
-    shared_total = multiprocessing.Value('i', 0)
-    len_total = multiprocessing.Value('i', len(tests))
-    pool = multiprocessing.Pool(processes=args.max_procs, initializer=poolInit, initargs=(shared_total, len_total, lock ))
-    # Restore SIGINT handler
-    signal.signal(signal.SIGINT, original_sigint_handler)
-    # Shuffle tests
-    random.shuffle(tests)
+    # Order tests longest-first (LPT) so that a long test does not end up
+    # last and dominate the wall time
+    history = load_json(args.history)
+    estimates = estimate_durations([t[0] for t in tests] + list(compiles),
+                                   history, load_perf_cycles(args.perf),
+                                   args.default_estimate)
+    if args.shard is not None:
+        try:
+            shard_index, shard_count = parse_shard(args.shard)
+        except ValueError as e:
+            runtest.error(str(e))
+        ntotal = len(tests)
+        tests = shard_tests(tests, estimates, shard_index, shard_count, deps)
+        print('Shard {}: {:d} of {:d} tests'.format(args.shard, len(tests),
+                                                   ntotal))
+        # every shard compiles what its own tests need
+        compiles = OrderedDict((c, compiles[c]) for c in compiles
+                               if any(deps.get(t[0]) == c for t in tests))
+        estimates = {n: estimates[n] for n in [t[0] for t in tests]
+                     + list(compiles)}
+    tests.sort(key=lambda t: (-estimates[t[0]], t[0]))
+    # compile jobs go longest group first, like the tests
+    group_work = {c: estimates[c] + sum(estimates[n] for n in deps
+                                        if deps[n] == c and n in estimates)
+                  for c in compiles}
+    compiles = OrderedDict(sorted(compiles.items(),
+                                  key=lambda c: (-group_work[c[0]], c[0])))
+    print('Running {:d} tests{} on {:d} workers, estimated wall time {}'.format(
+        len(tests), ' and {:d} compile jobs'.format(len(compiles))
+        if compiles else '', args.max_procs,
+        format_duration(lpt_makespan(estimates.values(), args.max_procs))))
+
+    os.makedirs(args.log_dir, exist_ok=True)
+    len_total = len(tests) + len(compiles)
+    remaining_work = sum(estimates.values())
     try:
-        procresults = pool.starmap(fork, tests)
+        procresults = asyncio.run(run_tests(tests, compiles, deps))
     except KeyboardInterrupt:
         print("\nTerminating bwruntest.py")
-        pool.terminate()
-        pool.join()
         exit(1)
 
-    # pp.pprint(procresults)
-    pool.close()
-    pool.join()
+    # CPU load and memory of the run, to size --max_procs for this host
+    measured = [p for p in procresults if p.rusage]
+    if measured:
+        cpu = sum(p.rusage['cpu_user'] + p.rusage['cpu_sys'] for p in measured)
+        wall = sum(p.time for p in measured)
+        # The kernel counts the peak RSS of the process that execs a test
+        # into the test's, so no test shows less than the runner's own
+        print('CPU time {} over {} of test wall time ({:.2f} cores per test), '
+              'largest peak RSS {} (floor {}: the runner\'s own RSS)'.format(
+                  format_duration(cpu), format_duration(wall),
+                  cpu / wall if wall else 0.0,
+                  format_rss(max(p.rusage['max_rss'] for p in measured)),
+                  format_rss(max_rss_kib(
+                      resource.getrusage(resource.RUSAGE_SELF)))))
+
+    if args.history is not None:
+        history_out = args.history
+        if args.shard is not None:
+            # shards must not race on the shared history; see --merge_history
+            history_out += '.shard{}of{}'.format(shard_index + 1, shard_count)
+        update_history(history_out, history, procresults)
+
+    # Performance regressions against the stored baseline
+    if args.baseline is not None:
+        baseline = load_json(args.baseline)
+        if args.update_baseline:
+            for p in procresults:
+                if p.returncode == 0 and p.metrics:
+                    baseline[p.name] = OrderedDict(
+                        (m, v[0]) for m, v in p.metrics.items())
+            with open(args.baseline, 'w', encoding='utf-8') as f:
+                json.dump(baseline, f, ensure_ascii=False, indent=4,
+                          sort_keys=True)
+        else:
+            thresholds = parse_thresholds(args.threshold)
+            for p in procresults:
+                p.regressions = find_regressions(
+                    p.metrics, baseline.get(p.name, {}), thresholds,
+                    args.default_threshold)
+                for r in p.regressions:
+                    print('PERF REGRESSION {}: {}'.format(p.name, r))
 
     # Generate junit.xml file. Junit.xml differentiates between failure and
     # errors but we treat everything as errors.
@@ -332,9 +979,17 @@ the pyyaml library which is not installed.""",
                                 elapsed_sec=p.time)
             if p.returncode != 0:
                 testcase.add_failure_info(p.stderr)
+            elif p.regressions:
+                testcase.add_failure_info('performance regression',
+                                          '\n'.join(p.regressions))
             testcases.append(testcase)
 
-        testsuite = TestSuite('bwruntests', testcases)
+        # junit_xml has no per-testcase properties, so resource usage goes
+        # into the suite properties as '<test> <resource>'
+        properties = OrderedDict(
+            ('{} {}'.format(p.name, k), '{:g}'.format(v))
+            for p in procresults for k, v in p.rusage.items())
+        testsuite = TestSuite('bwruntests', testcases, properties=properties)
         if args.output:
             with open(args.output, 'w') as f:
                 TestSuite.to_file(f, [testsuite],
@@ -372,26 +1027,45 @@ the pyyaml library which is not installed.""",
         for p in procresults:
             if p.returncode == 0:
                 d.append({ 'name': p.name, 'value': p.exec_time, 'unit': 'cycles'})
+                for m, (value, unit, _) in p.metrics.items():
+                    d.append({'name': '{} {}'.format(p.name, m),
+                              'value': value, 'unit': unit, 'metric': m})
+                for k, value in p.rusage.items():
+                    d.append({'name': '{} {}'.format(p.name, k),
+                              'value': value, 'unit': RUSAGE_UNITS[k],
+                              'metric': k})
         with open(args.perf, 'w', encoding='utf-8') as f:
             json.dump(d, f, ensure_ascii=False, indent=4)
 
     # print summary of test results
     if not(args.disable_results_pp):
-        testcount = sum(1 for x in tests)
-        testfailcount = sum(1 for p in procresults if p.returncode != 0)
+        testcount = len(procresults)
+        testfailcount = sum(1 for p in procresults
+                            if p.returncode != 0 or p.regressions)
         testpassedcount = testcount - testfailcount
-        resulttable = PrettyTable(['test', 'cycles', 'time', 'passed/total'])
+        resulttable = PrettyTable(['test', 'cycles', 'time', 'cpu',
+                                   'peak rss', 'perf', 'passed/total'])
         resulttable.align['test'] = "l"
         for p in procresults:
-            testpassed = 1 if p.returncode == 0 else 0
+            testpassed = 1 if p.returncode == 0 and not p.regressions else 0
             testname = p.name
             resulttable.add_row([testname,
                                  p.exec_time,
                                  '{0:.2f}s'.format(p.time),
+                                 '{0:.2f}s'.format(p.rusage['cpu_user']
+                                                   + p.rusage['cpu_sys'])
+                                 if p.rusage else '',
+                                 format_rss(p.rusage['max_rss'])
+                                 if p.rusage else '',
+                                 '{:d} regr.'.format(len(p.regressions))
+                                 if p.regressions else '',
                                  '{0:d}/{1:d}'.format(testpassed, 1)])
-        resulttable.add_row(['total', '', '', '{0:d}/{1:d}'.
+        resulttable.add_row(['total', '', '', '', '', '', '{0:d}/{1:d}'.
                              format(testpassedcount, testcount)])
         print(resulttable)
         if testpassedcount != testcount:
             import sys; sys.exit(1)
 
+    if any(p.regressions for p in procresults):
+        sys.exit(1)
+
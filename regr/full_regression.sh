@@ -20,6 +20,22 @@
 export N_PROC=1
 export P_STALL=0.04
 TIMEOUT=400
+HISTORY=regr/hci_tests_history.json
+
+# Set SHARD=I/N to run only shard I of N, e.g. on one of N hosts. Every shard
+# needs its own checkout (or git worktree): the compile jobs regenerate the
+# config and stimuli directories of the tree they run in, which the tests of
+# another shard would otherwise read mid-run. Collect the per-shard results in
+# one checkout and merge them with
+#   regr/bwruntests.py --merge_junit regr/hci_tests.shard*.xml -o regr/hci_tests.xml \
+#       --merge_history ${HISTORY}.shard* --history ${HISTORY}
+if [ -n "${SHARD}" ]; then
+    SHARD_ARGS="--shard ${SHARD}"
+    JUNIT_XML=regr/hci_tests.shard${SHARD%/*}of${SHARD#*/}.xml
+else
+    SHARD_ARGS=""
+    JUNIT_XML=regr/hci_tests.xml
+fi
 
 # Declare a string array with type
 declare -a test_list=(
@@ -28,7 +44,7 @@ declare -a test_list=(
 
 # Read the list values with space
 for val in "${test_list[@]}"; do
-    nice -n10 regr/bwruntests.py --report_junit -t ${TIMEOUT} --yaml -o regr/hci_tests.xml -p${N_PROC} $val
+    nice -n10 regr/bwruntests.py --report_junit -t ${TIMEOUT} --yaml -o ${JUNIT_XML} --history ${HISTORY} --log_dir regr/logs ${SHARD_ARGS} -p${N_PROC} $val
     if test $? -ne 0; then
         echo "Error in test $val"
         exit 1
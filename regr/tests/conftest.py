@@ -0,0 +1,6 @@
+"""bwruntests is a script, imported here as a top-level module."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,216 @@
+"""Shard merging, duration history and baseline gating of bwruntests."""
+
+import asyncio
+import json
+import os
+import subprocess
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from bwruntests import (HISTORY_ALPHA, FinishedProcess, MetricScanner, StreamLog, find_regressions, merge_history,
+                        merge_junit, parse_thresholds, reap, summary_metrics, update_history)
+
+
+def write_shard(path, cases, properties):
+    suite = ET.Element('testsuite', name='shard')
+    props = ET.SubElement(suite, 'properties')
+    for name, value in properties:
+        ET.SubElement(props, 'property', name=name, value=value)
+    for name, time, outcome in cases:
+        case = ET.SubElement(suite, 'testcase', name=name, time=str(time))
+        if outcome:
+            ET.SubElement(case, outcome, message=outcome)
+    root = ET.Element('testsuites')
+    root.append(suite)
+    ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+    return path
+
+
+def test_merge_junit_keeps_cases_and_properties(tmp_path):
+    a = write_shard(tmp_path / 'a.xml', [('t0', 1.5, None), ('t1', 2.0, 'failure')],
+                    [('t0.max_rss', '100'), ('t1.max_rss', '200')])
+    b = write_shard(tmp_path / 'b.xml', [('t2', 0.5, 'error'), ('t3', 1.0, 'skipped')],
+                    [('t2.max_rss', '300'), ('t1.max_rss', '250')])
+    out = tmp_path / 'merged.xml'
+    assert merge_junit([a, b], out, prettyprint=True) == 2
+
+    root = ET.parse(out).getroot()
+    suite, = root.findall('testsuite')
+    assert [c.get('name') for c in suite.findall('testcase')] == ['t0', 't1', 't2', 't3']
+    assert {k: suite.get(k) for k in ('tests', 'failures', 'errors', 'skipped')} == \
+        {'tests': '4', 'failures': '1', 'errors': '1', 'skipped': '1'}
+    assert float(suite.get('time')) == 5.0 and root.get('tests') == '4'
+    # the properties come first, a later shard wins
+    assert suite[0].tag == 'properties'
+    assert [(p.get('name'), p.get('value')) for p in suite.findall('properties/property')] == \
+        [('t0.max_rss', '100'), ('t1.max_rss', '250'), ('t2.max_rss', '300')]
+
+
+def finished(name, time, returncode=0, timed_out=False):
+    return FinishedProcess(name, '.', [], returncode, time=time, timed_out=timed_out)
+
+
+def test_update_history_round_trip(tmp_path):
+    path = tmp_path / 'history.json'
+    update_history(path, {}, [finished('a', 10.0), finished('b', 4.0), finished('skipped', None)])
+    history = json.loads(path.read_text())
+    assert history == {'a': {'time': 10.0, 'runs': 1}, 'b': {'time': 4.0, 'runs': 1}}
+
+    update_history(path, history, [finished('a', 20.0, returncode=1)])
+    history = json.loads(path.read_text())
+    assert history['a'] == {'time': (1 - HISTORY_ALPHA) * 10.0 + HISTORY_ALPHA * 20.0, 'runs': 2}
+
+
+def test_timed_out_runs_are_not_averaged_in(tmp_path):
+    path = tmp_path / 'history.json'
+    history = {'slow': {'time': 5.0, 'runs': 3}, 'fast': {'time': 0.5, 'runs': 1}}
+    update_history(path, history, [finished('slow', 1.0, returncode=-9, timed_out=True),
+                                   finished('fast', 1.0, returncode=-9, timed_out=True),
+                                   finished('new', 2.0, returncode=-9, timed_out=True)])
+    history = json.loads(path.read_text())
+    assert history['slow'] == {'time': 5.0, 'runs': 4, 'timed_out': True}
+    assert history['fast'] == {'time': 1.0, 'runs': 2, 'timed_out': True}
+    assert history['new'] == {'time': 2.0, 'runs': 1, 'timed_out': True}
+
+    # a later run that finishes is averaged again and clears the mark
+    update_history(path, history, [finished('slow', 7.0)])
+    assert json.loads(path.read_text())['slow'] == {'time': 6.0, 'runs': 5}
+
+
+def test_merge_history_keeps_the_entry_with_most_runs(tmp_path):
+    out = tmp_path / 'history.json'
+    out.write_text(json.dumps({'a': {'time': 1.0, 'runs': 1}, 'b': {'time': 2.0, 'runs': 1}}))
+    shard0 = tmp_path / 'h0.json'
+    shard1 = tmp_path / 'h1.json'
+    shard0.write_text(json.dumps({'a': {'time': 3.0, 'runs': 2}, 'b': {'time': 2.0, 'runs': 1}}))
+    shard1.write_text(json.dumps({'a': {'time': 1.0, 'runs': 1}, 'b': {'time': 4.0, 'runs': 2},
+                                  'c': {'time': 5.0, 'runs': 1}}))
+    merge_history([shard0, shard1], out)
+    assert json.loads(out.read_text()) == {
+        'a': {'time': 3.0, 'runs': 2},
+        'b': {'time': 4.0, 'runs': 2},
+        'c': {'time': 5.0, 'runs': 1},
+    }
+
+
+def test_reap_reports_a_pid_reaped_elsewhere():
+    process = subprocess.Popen(['true'])
+    os.waitpid(process.pid, 0)
+
+    async def main():
+        with pytest.raises(ChildProcessError):
+            await asyncio.wait_for(reap(process.pid), timeout=10)
+
+    asyncio.run(main())
+    process.returncode = 0
+
+
+def test_reap_returns_status_and_rusage():
+    process = subprocess.Popen(['sh', '-c', 'exit 3'])
+
+    async def main():
+        return await asyncio.wait_for(reap(process.pid), timeout=10)
+
+    status, ru = asyncio.run(main())
+    process.returncode = os.waitstatus_to_exitcode(status)
+    assert process.returncode == 3
+    assert ru.ru_maxrss > 0
+
+
+TRANSCRIPT = """\
+# ** Note: loading the design
+# Actual BW (completion): 1.00 bit/cycle  [utilization: 1.0%]
+# hwpe cycles =   0
+# ------ Simulation Summary ------
+# \\HW CONFIG\\
+# Masters: CORE=2 DMA=0 EXT=0 HWPE=1 (total=3)
+#
+# \\BANDWIDTH\\
+# Actual BW (completion):  96.50 bit/cycle  [utilization: 75.4%]
+# Completion phase duration: 1200.00 cycles
+#
+# \\SIMULATION TIME\\
+# Total simulation time: 1234.00 cycles
+# master_log_0: avg req->gnt stall latency 1.50 cycles over 100 grants
+# master_hwpe_0: avg req->gnt stall latency 3.25 cycles over 40 grants
+# LOG avg req->gnt stall latency (weighted by grant count): 1.50 cycles
+# HWPE avg req->gnt stall latency (weighted by grant count): 3.25 cycles
+"""
+
+METRICS = {
+    'total_cycles': (1234.0, 'cycles', False),
+    'completion_cycles': (1200.0, 'cycles', False),
+    'actual_bw': (96.5, 'bit/cycle', True),
+    'utilization': (75.4, '%', True),
+    'req_gnt_latency/log': (1.5, 'cycles', False),
+    'req_gnt_latency/hwpe': (3.25, 'cycles', False),
+    'req_gnt_latency/master_log_0': (1.5, 'cycles', False),
+    'req_gnt_latency/master_hwpe_0': (3.25, 'cycles', False),
+}
+
+
+def test_scanner_reads_the_summary_from_split_writes(tmp_path):
+    scanner = MetricScanner()
+    log = StreamLog(tmp_path / 'out.log', 64, scanner)
+    data = TRANSCRIPT.encode()
+    # chunks that cut lines (and the summary marker) in two
+    for i in range(0, len(data), 37):
+        log.write(data[i:i + 37])
+    log.close()
+
+    assert scanner.exec_time == 1234
+    # the bandwidth line before the marker is not part of the summary
+    assert dict(summary_metrics(scanner.summary())) == METRICS
+    assert (tmp_path / 'out.log').read_bytes() == data
+
+
+def test_no_summary_no_metrics():
+    scanner = MetricScanner()
+    for line in TRANSCRIPT.splitlines()[:3]:
+        scanner.feed(line)
+    assert scanner.summary() is None
+    assert scanner.exec_time == 0
+    assert not summary_metrics(scanner.summary())
+
+
+def regressions(metrics, baseline, thresholds=(), default_threshold=0.05):
+    return [r.split(':')[0] for r in find_regressions(metrics, baseline, parse_thresholds(thresholds),
+                                                       default_threshold)]
+
+
+def test_first_matching_threshold_wins():
+    metrics = {'req_gnt_latency/log': (1.5, 'cycles', False), 'req_gnt_latency/hwpe': (1.5, 'cycles', False)}
+    baseline = {'req_gnt_latency/log': 1.0, 'req_gnt_latency/hwpe': 1.0}
+    # +50% on both: only the metric whose first matching threshold is below that fails
+    assert regressions(metrics, baseline, ['req_gnt_latency/log=0.6', 'req_gnt_latency/*=0.4']) == \
+        ['req_gnt_latency/hwpe']
+    assert regressions(metrics, baseline, ['req_gnt_latency/*=0.6', 'req_gnt_latency/log=0.4']) == []
+
+
+def test_default_threshold_and_direction():
+    metrics = {
+        'total_cycles': (1100.0, 'cycles', False),
+        'completion_cycles': (1040.0, 'cycles', False),
+        'actual_bw': (90.0, 'bit/cycle', True),
+        'utilization': (80.0, '%', True),
+    }
+    baseline = {'total_cycles': 1000.0, 'completion_cycles': 1000.0, 'actual_bw': 100.0, 'utilization': 70.0}
+    # more cycles and less bandwidth are worse; within 5% or better is fine
+    assert regressions(metrics, baseline) == ['total_cycles', 'actual_bw']
+    assert regressions(metrics, baseline, default_threshold=0.2) == []
+    message, = find_regressions(metrics, baseline, [], 0.05)[:1]
+    assert message == 'total_cycles: 1100 cycles vs baseline 1000 (+10.0%, allowed 5.0%)'
+
+
+def test_metrics_missing_from_the_baseline_are_not_gated():
+    metrics = {'total_cycles': (5000.0, 'cycles', False), 'req_gnt_latency/new': (9.0, 'cycles', False),
+               'utilization': (10.0, '%', True)}
+    assert regressions(metrics, {'utilization': 0.0}) == []
+    assert regressions(metrics, {'total_cycles': 1000.0, 'utilization': None}) == ['total_cycles']
+
+
+def test_threshold_specs_need_a_pattern_and_a_value():
+    assert parse_thresholds(['total_*=0.1', 'actual_bw=0.02']) == [('total_*', 0.1), ('actual_bw', 0.02)]
+    with pytest.raises(ValueError):
+        parse_thresholds(['total_cycles'])
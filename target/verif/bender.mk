@@ -21,10 +21,7 @@ VERIF_DEFS += \
 	-D CLK_PERIOD=$(CLK_PERIOD) \
 	-D RST_CLK_CYCLES=$(RST_CLK_CYCLES) \
 	-D RANDOM_GNT=$(RANDOM_GNT) \
-	-D INTERCO_TYPE=$(INTERCO_TYPE) \
-	-D INVERT_PRIO=$(INVERT_PRIO) \
-	-D PRIORITY_CNT_NUMERATOR=$(PRIORITY_CNT_NUMERATOR) \
-	-D PRIORITY_CNT_DENOMINATOR=$(PRIORITY_CNT_DENOMINATOR)
+	-D INTERCO_TYPE=$(INTERCO_TYPE)
 
 # Common targets for bender
 VERIF_TARGS ?=
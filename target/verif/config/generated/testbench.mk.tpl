@@ -11,3 +11,4 @@ RANDOM_GNT?=${RANDOM_GNT}
 INVERT_PRIO?=${INVERT_PRIO}
 PRIORITY_CNT_NUMERATOR?=${PRIORITY_CNT_NUMERATOR}
 PRIORITY_CNT_DENOMINATOR?=${PRIORITY_CNT_DENOMINATOR}
+STIM_PREFETCH?=${STIM_PREFETCH}
@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
-"""Parse the final 'Simulation Summary' section from one transcript file."""
+"""Parse the final 'Simulation Summary' section from Questa transcript files.
+
+Only the tail of the transcript starting at the last summary marker is read:
+plain files are scanned backwards from the end in fixed-size blocks, gzip
+transcripts are streamed once while keeping just the text after the most
+recent marker. In batch mode all transcripts below a directory are parsed in
+parallel worker processes.
+"""
 
 import argparse
+import gzip
 import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 
 SUMMARY_MARKER = "------ Simulation Summary ------"
+_MARKER_BYTES = SUMMARY_MARKER.encode("ascii")
+_GZIP_MAGIC = b"\x1f\x8b"
+TAIL_BLOCK_SIZE = 1 << 20
+BATCH_GLOB = "**/transcript*"
 
 
 class ParseError(RuntimeError):
@@ -38,6 +52,66 @@ def _summary_lines(transcript_text: str) -> List[str]:
     return [_clean_line(line) for line in transcript_text[idx:].splitlines()]
 
 
+def _is_gzip(path: Path) -> bool:
+    with path.open("rb") as fh:
+        return fh.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+
+
+def _seek_tail(path: Path, block_size: int) -> bytes:
+    """Read backwards from EOF block by block until the last marker is found."""
+    with path.open("rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            fh.seek(pos)
+            tail = fh.read(step) + tail
+            # Only the new block plus a marker-sized overlap can hold a new match
+            idx = tail.rfind(_MARKER_BYTES, 0, step + len(_MARKER_BYTES) - 1)
+            if idx >= 0:
+                return tail[idx:]
+    raise ParseError(f"Summary marker '{SUMMARY_MARKER}' not found.")
+
+
+def _stream_tail(path: Path, block_size: int) -> bytes:
+    """Stream a gzip transcript, keeping only the text after the last marker."""
+    overlap = len(_MARKER_BYTES) - 1
+    tail = b""
+    found = False
+    with gzip.open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(block_size)
+            if not chunk:
+                break
+            start = max(0, len(tail) - overlap)
+            tail += chunk
+            idx = tail.rfind(_MARKER_BYTES, start)
+            if idx >= 0:
+                tail = tail[idx:]
+                found = True
+            elif not found:
+                tail = tail[-overlap:]
+    if not found:
+        raise ParseError(f"Summary marker '{SUMMARY_MARKER}' not found.")
+    return tail
+
+
+def read_summary_tail(path: Path, block_size: int = TAIL_BLOCK_SIZE) -> str:
+    """Return the transcript text starting at the last summary marker."""
+    if block_size <= 0:
+        raise ValueError(f"block_size must be positive, got {block_size}")
+    path = Path(path)
+    if not path.exists():
+        raise ParseError(f"Transcript not found: {path}")
+    if _is_gzip(path):
+        tail = _stream_tail(path, block_size)
+    else:
+        tail = _seek_tail(path, block_size)
+    return tail.decode("utf-8", errors="replace")
+
+
 def _ensure_master(masters: Dict[str, Dict[str, object]], master_name: str) -> Dict[str, object]:
     entry = masters.get(master_name)
     if entry is None:
@@ -325,29 +399,101 @@ def parse_summary(transcript_text: str) -> Dict[str, object]:
     return result
 
 
+def parse_transcript(path: Path, block_size: int = TAIL_BLOCK_SIZE) -> Dict[str, object]:
+    """Parse the summary of a plain or gzip-compressed transcript file."""
+    return parse_summary(read_summary_tail(Path(path), block_size))
+
+
+def _write_json(parsed: Dict[str, object], out_path: Path) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(parsed, indent=2, sort_keys=False) + "\n", encoding="ascii")
+
+
+def _batch_out_name(transcript_path: Path, root: Path) -> str:
+    rel = transcript_path.relative_to(root)
+    if rel.suffix == ".gz":
+        rel = rel.with_suffix("")
+    return "_".join(rel.parts) + ".json"
+
+
+def _batch_worker(job: Tuple[str, str, int]) -> Tuple[str, Optional[str]]:
+    transcript, out, block_size = job
+    try:
+        _write_json(parse_transcript(Path(transcript), block_size), Path(out))
+    except (ParseError, OSError, EOFError) as exc:
+        return transcript, str(exc)
+    return transcript, None
+
+
+def run_batch(
+    root: Path,
+    out_dir: Path,
+    pattern: str = BATCH_GLOB,
+    jobs: Optional[int] = None,
+    block_size: int = TAIL_BLOCK_SIZE,
+) -> int:
+    """Parse every transcript matching `pattern` below `root` into `out_dir`.
+
+    Returns the number of transcripts that failed to parse.
+    """
+    transcripts = sorted(p for p in root.glob(pattern) if p.is_file())
+    if not transcripts:
+        raise ParseError(f"No transcripts matching '{pattern}' found in {root}")
+
+    work = [(str(p), str(out_dir / _batch_out_name(p, root)), block_size) for p in transcripts]
+    n_failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for transcript, error in pool.map(_batch_worker, work):
+            if error is None:
+                print(f"[ OK ] {transcript}")
+            else:
+                n_failed += 1
+                print(f"[FAIL] {transcript}: {error}", file=sys.stderr)
+    return n_failed
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def _cli_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Parse final Simulation Summary lines from one transcript.")
-    parser.add_argument("--transcript", required=True, help="Path to transcript file")
-    parser.add_argument("--out", default="", help="Optional output JSON file path")
+    parser = argparse.ArgumentParser(description="Parse final Simulation Summary lines from transcripts.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--transcript", help="Path to transcript file (plain or gzip)")
+    source.add_argument("--batch-dir", help="Parse all transcripts below this directory in parallel")
+    parser.add_argument(
+        "--out",
+        default="",
+        help="Output JSON file path (single mode) or output directory (batch mode, default: --batch-dir)",
+    )
+    parser.add_argument("--glob", default=BATCH_GLOB, help=f"Transcript glob in batch mode (default: {BATCH_GLOB})")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Worker processes in batch mode")
+    parser.add_argument(
+        "--block-size",
+        type=_positive_int,
+        default=TAIL_BLOCK_SIZE,
+        help=f"Block size in bytes for the backwards tail search (default: {TAIL_BLOCK_SIZE})",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = _cli_args()
-    transcript_path = Path(args.transcript)
-    if not transcript_path.exists():
-        raise ParseError(f"Transcript not found: {transcript_path}")
-
-    text = transcript_path.read_text(encoding="utf-8", errors="replace")
-    parsed = parse_summary(text)
-
-    output = json.dumps(parsed, indent=2, sort_keys=False)
+    if args.batch_dir:
+        root = Path(args.batch_dir)
+        if not root.is_dir():
+            raise ParseError(f"Batch directory not found: {root}")
+        out_dir = Path(args.out) if args.out else root
+        return 2 if run_batch(root, out_dir, args.glob, args.jobs, args.block_size) else 0
+
+    parsed = parse_summary(read_summary_tail(Path(args.transcript), args.block_size))
     if args.out:
-        out_path = Path(args.out)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(output + "\n", encoding="ascii")
+        _write_json(parsed, Path(args.out))
     else:
-        print(output)
+        print(json.dumps(parsed, indent=2, sort_keys=False))
     return 0
 
 
@@ -1,23 +1,28 @@
 #!/usr/bin/env python3
-"""Plot sweep metrics from parsed transcript JSON files."""
+"""Plot sweep metrics from parsed transcript JSON files.
+
+The JSON files are ingested into the SQLite results store (results_db.py)
+before plotting. Figures are rendered in a pool of worker processes; each
+figure is only re-rendered when the runs it is built from, or its plot
+inputs, changed since the last invocation. matplotlib (Agg backend) and numpy
+are imported lazily by the processes that actually render.
+"""
 
 import argparse
 import json
 import math
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Tuple
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import numpy as np
-from matplotlib.colors import ListedColormap
-from matplotlib.lines import Line2D
-from matplotlib.patches import Patch
+import results_db
+from results_db import (
+    INTERCO_ORDER,
+    _parse_hw_cfg_from_filename,
+    _to_float,
+)
 
-INTERCO_ORDER = {"LOG": 0, "HCI": 1, "MUX": 2}
 INTERCO_COLORS = {"LOG": "#1f77b4", "MUX": "#9467bd", "HCI": "#ff7f0e"}
 IDEAL_COLOR = "#7f7f7f"
 IDEAL_RED = "#C0392B"   # rich crimson for ideal-workload lines and annotations
@@ -25,19 +30,33 @@ IDEAL_RED = "#C0392B"   # rich crimson for ideal-workload lines and annotations
 # Colors for invert_prio=0 (blue) and invert_prio=1 (orange)
 TB_INVERT_COLORS = {0: "#2196F3", 1: "#FF9800", None: "#78909C"}
 
+# Plot families selectable with --only (also the output filename prefixes)
+PLOT_FAMILIES = ("total_simulation_time", "avg_req_to_gnt_per_master", "bandwidth")
 
-def _to_int(value: object, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return default
+# Populated by _import_plotting() in the rendering process
+plt = None
+np = None
+ListedColormap = None
+Line2D = None
+Patch = None
 
 
-def _to_float(value: object, default: float = float("nan")) -> float:
-    try:
-        return float(value)
-    except Exception:
-        return default
+def _import_plotting() -> None:
+    """Import matplotlib with the Agg backend and numpy into module globals."""
+    global plt, np, ListedColormap, Line2D, Patch
+    if plt is not None:
+        return
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as _plt
+    import numpy as _np
+    from matplotlib.colors import ListedColormap as _ListedColormap
+    from matplotlib.lines import Line2D as _Line2D
+    from matplotlib.patches import Patch as _Patch
+
+    plt, np = _plt, _np
+    ListedColormap, Line2D, Patch = _ListedColormap, _Line2D, _Patch
 
 
 def _master_sort_key(master: str) -> Tuple[int, int]:
@@ -48,34 +67,10 @@ def _master_sort_key(master: str) -> Tuple[int, int]:
     return (9, 0)
 
 
-def _parse_hw_cfg_from_filename(path: Path) -> Tuple[str, int, int]:
-    """Parse (interco_type, n_hwpe, hwpe_width_fact) from filename stem.
-
-    Handles both old-style 'hardware_X_Nhwpe_Mfact.json' and new combined
-    'hardware_X_Nhwpe_Mfact_testbench_*.json' names.
-    """
-    match = re.match(r"^hardware_([a-zA-Z]+)_([0-9]+)hwpe_([0-9]+)fact", path.stem)
-    if not match:
-        return ("UNK", 0, 0)
-    return (match.group(1).upper(), int(match.group(2)), int(match.group(3)))
-
-
 # Keep the old name as an alias so callers that still use it don't break.
 _parse_cfg_from_filename = _parse_hw_cfg_from_filename
 
 
-def _parse_tb_cfg_from_stem(stem: str) -> Tuple[Optional[int], Optional[int], Optional[int], str]:
-    """Parse TB config embedded in a combined result filename stem.
-
-    Returns (invert_prio, stall_num, stall_den, tb_name).
-    All values are None / '' when no testbench segment is found.
-    """
-    match = re.search(r"(testbench_invert_([01])_stall_([0-9]+)_([0-9]+))", stem)
-    if not match:
-        return (None, None, None, "")
-    return (int(match.group(2)), int(match.group(3)), int(match.group(4)), match.group(1))
-
-
 def _tb_sort_key(entry: Dict) -> Tuple:
     stall_num = entry.get("stall_num") or 0
     stall_den = entry.get("stall_den") or 1
@@ -83,119 +78,10 @@ def _tb_sort_key(entry: Dict) -> Tuple:
     return (invert, stall_num / stall_den)
 
 
-def _derive_interco_side(hw_cfg: Dict[str, object]) -> Dict[str, int]:
-    masters = hw_cfg.get("masters", {}) if isinstance(hw_cfg, dict) else {}
-    memory = hw_cfg.get("memory", {}) if isinstance(hw_cfg, dict) else {}
-    interco_side = hw_cfg.get("interconnect_side", {}) if isinstance(hw_cfg, dict) else {}
-
-    if isinstance(interco_side, dict) and "narrow_total_ports" in interco_side:
-        return {
-            "n_narrow_hci": _to_int(interco_side.get("n_narrow_hci")),
-            "n_wide_hci": _to_int(interco_side.get("n_wide_hci")),
-            "n_dma": _to_int(interco_side.get("n_dma")),
-            "n_ext": _to_int(interco_side.get("n_ext")),
-            "narrow_total_ports": _to_int(interco_side.get("narrow_total_ports")),
-            "total_initiator_ports": _to_int(interco_side.get("total_initiator_ports")),
-        }
-
-    interco_type = str(interco_side.get("type", "UNK")).upper()
-    if interco_type == "UNK":
-        interco_type = str(hw_cfg.get("interco_type", "UNK")).upper()
-
-    n_core = _to_int(masters.get("core"))
-    n_dma = _to_int(masters.get("dma"))
-    n_ext = _to_int(masters.get("ext"))
-    n_hwpe = _to_int(masters.get("hwpe"))
-    hwpe_width = _to_int(memory.get("hwpe_width_lanes"), 1)
-
-    if interco_type == "LOG":
-        n_narrow_hci = n_core + n_hwpe * hwpe_width
-        n_wide_hci = 0
-    elif interco_type == "MUX":
-        n_narrow_hci = n_core
-        n_wide_hci = 1 if n_hwpe > 0 else 0
-    else:
-        n_narrow_hci = n_core
-        n_wide_hci = n_hwpe
-
-    narrow_total = n_narrow_hci + n_dma + n_ext
-    return {
-        "n_narrow_hci": n_narrow_hci,
-        "n_wide_hci": n_wide_hci,
-        "n_dma": n_dma,
-        "n_ext": n_ext,
-        "narrow_total_ports": narrow_total,
-        "total_initiator_ports": narrow_total + n_wide_hci,
-    }
-
-
-def _load_results(results_dir: Path) -> List[Dict[str, object]]:
-    entries: List[Dict[str, object]] = []
-    for path in sorted(results_dir.glob("hardware_*.json")):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-
-        hw_cfg = data.get("hw_config", {})
-        masters = hw_cfg.get("masters", {}) if isinstance(hw_cfg, dict) else {}
-        memory = hw_cfg.get("memory", {}) if isinstance(hw_cfg, dict) else {}
-        bw = data.get("bandwidth", {})
-
-        interco_from_name, n_hwpe_name, wf_name = _parse_hw_cfg_from_filename(path)
-        interco_type = str(hw_cfg.get("interconnect_side", {}).get("type", interco_from_name)).upper()
-        if interco_type not in INTERCO_ORDER:
-            interco_type = interco_from_name
-
-        n_hwpe = _to_int(masters.get("hwpe"), n_hwpe_name)
-        n_core = _to_int(masters.get("core"))
-        hwpe_wf = _to_int(memory.get("hwpe_width_lanes"), wf_name)
-        cfg_label = f"{interco_type}_{n_hwpe}x{hwpe_wf}"
-
-        interco_side = _derive_interco_side(hw_cfg if isinstance(hw_cfg, dict) else {})
-        banks = _to_int(memory.get("banks"))
-        data_width = _to_int(memory.get("data_width_bits"))
-        ideal_mem = float(banks * data_width)
-        ideal_interco = float(
-            interco_side["narrow_total_ports"] * data_width
-            + interco_side["n_wide_hci"] * hwpe_wf * data_width
-        )
-        ideal_bottleneck = min(ideal_mem, ideal_interco)
-
-        actual_bw = _to_float(bw.get("actual_completion_bit_per_cycle"))
-        util_pct = (actual_bw / ideal_bottleneck * 100.0) if ideal_bottleneck > 0 and not math.isnan(actual_bw) else float("nan")
-
-        invert_prio, stall_num, stall_den, tb_name = _parse_tb_cfg_from_stem(path.stem)
-        # Full hardware config name: strip the testbench suffix from the stem
-        hw_name = path.stem[: path.stem.index(f"_{tb_name}")] if tb_name else path.stem
-
-        entries.append(
-            {
-                "path": path,
-                "label": cfg_label,
-                "hw_name": hw_name,
-                "interco_type": interco_type,
-                "n_hwpe": n_hwpe,
-                "hwpe_width_fact": hwpe_wf,
-                "json": data,
-                "total_sim_cycles": _to_float(data.get("simulation_time", {}).get("total_cycles")),
-                "avg_req_to_gnt_per_master": data.get("request_to_grant_latency", {}).get("per_master", []),
-                "ideal_mem_bw": ideal_mem,
-                "ideal_interco_bw": ideal_interco,
-                "ideal_bottleneck_bw": ideal_bottleneck,
-                "actual_bw": actual_bw,
-                "utilization_pct": util_pct,
-                "n_core": n_core,
-                # TB config fields
-                "tb_name": tb_name,
-                "invert_prio": invert_prio,
-                "stall_num": stall_num,
-                "stall_den": stall_den,
-            }
-        )
-
-    entries.sort(key=lambda e: (e["n_hwpe"], e["hwpe_width_fact"], INTERCO_ORDER.get(e["interco_type"], 9)))
-    return entries
+def _load_results(conn, results_dir: Path) -> List[Dict[str, object]]:
+    """Sync `results_dir` into the results store and return its plot entries."""
+    results_db.sync_dir(conn, results_dir)
+    return results_db.load_entries(conn, results_dir)
 
 
 def _parse_ideal_runtime(ideal_json_path: Path) -> float:
@@ -630,6 +516,29 @@ def _plot_per_master_avg_req_to_gnt_vs_tb(
 # Main
 # -----------------------------------------------------------------------
 
+def _plot_task(family: str, fn: Callable, out_path: Path, entries: List[Dict[str, object]], *args, **kwargs) -> Dict[str, object]:
+    return {
+        "family": family,
+        # module-level functions pickle by name for the worker processes
+        "fn": fn,
+        "out_path": out_path,
+        "entries": entries,
+        "args": args,
+        "kwargs": kwargs,
+    }
+
+
+def _render_figure(task: Dict[str, object]) -> Path:
+    """Worker entry point: render one figure."""
+    _import_plotting()
+    task["fn"](task["entries"], *task["args"], task["out_path"], **task["kwargs"])
+    return task["out_path"]
+
+
+def _task_digest(task: Dict[str, object]) -> str:
+    return results_db.group_digest(task["entries"], task["fn"].__name__, task["args"], sorted(task["kwargs"].items()))
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Plot sweep results from parsed transcript JSON files.")
     parser.add_argument(
@@ -647,14 +556,40 @@ def main() -> int:
         default=None,
         help="Path to the ideal run JSON file for comparison.",
     )
+    parser.add_argument(
+        "--db",
+        default=None,
+        help=f"SQLite results store (default: <results-dir>/{results_db.DEFAULT_DB_NAME}).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render all plots even if their input runs did not change.",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=PLOT_FAMILIES,
+        default=list(PLOT_FAMILIES),
+        help="Plot families to render (default: all).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes used to render figures (default: CPU count).",
+    )
     args = parser.parse_args()
 
     results_dir = Path(args.results_dir)
     out_dir = Path(args.out_dir) if args.out_dir else results_dir / "plots"
     out_dir.mkdir(parents=True, exist_ok=True)
     ideal_json_path = Path(args.ideal_run) if args.ideal_run else None
+    db_path = Path(args.db) if args.db else results_dir / results_db.DEFAULT_DB_NAME
 
-    entries = _load_results(results_dir)
+    conn = results_db.connect(db_path)
+    entries = _load_results(conn, results_dir)
     if not entries:
         raise SystemExit(f"No sweep JSON files found in: {results_dir}")
     ideal_runtime = _parse_ideal_runtime(ideal_json_path)
@@ -686,6 +621,8 @@ def main() -> int:
     if not tb_groups:
         tb_groups[""] = list(log_entries)
 
+    tasks: List[Dict[str, object]] = []
+
     # Per-TB plots: one set of 3 plots per full testbench config, using
     # the tb_name as the filename suffix.
     for tb_name, tb_entries in tb_groups.items():
@@ -698,9 +635,9 @@ def main() -> int:
         tb_subtitle = f"workload: {workload_label} | sweep: hw config"
         if tb_name:
             tb_subtitle += f" | tb: {tb_name}"
-        _plot_total_sim_time(tb_entries, ideal_runtime, out_dir / f"total_simulation_time{suffix}.png", subtitle=tb_subtitle)
-        _plot_per_master_avg_req_to_gnt(tb_entries, out_dir / f"avg_req_to_gnt_per_master{suffix}.png", subtitle=tb_subtitle)
-        _plot_bandwidth(tb_entries, ideal_runtime, out_dir / f"bandwidth_ideal_vs_actual{suffix}.png", subtitle=tb_subtitle)
+        tasks.append(_plot_task("total_simulation_time", _plot_total_sim_time, out_dir / f"total_simulation_time{suffix}.png", tb_entries, ideal_runtime, subtitle=tb_subtitle))
+        tasks.append(_plot_task("avg_req_to_gnt_per_master", _plot_per_master_avg_req_to_gnt, out_dir / f"avg_req_to_gnt_per_master{suffix}.png", tb_entries, subtitle=tb_subtitle))
+        tasks.append(_plot_task("bandwidth", _plot_bandwidth, out_dir / f"bandwidth_ideal_vs_actual{suffix}.png", tb_entries, ideal_runtime, subtitle=tb_subtitle))
 
     # -----------------------------------------------------------------
     # Group entries by full HW config name
@@ -717,11 +654,38 @@ def main() -> int:
             continue
         hw_label = hw_entries[0]["label"]  # short label for plot titles
         hw_subtitle = f"workload: {workload_label} | hw: {hw_label} | sweep: tb config"
-        _plot_total_sim_time_vs_tb(hw_entries, ideal_runtime, hw_label, out_dir / f"total_simulation_time_vs_tb_{hw_name}.png", subtitle=hw_subtitle)
-        _plot_bandwidth_vs_tb(hw_entries, ideal_runtime, hw_label, out_dir / f"bandwidth_vs_tb_{hw_name}.png", subtitle=hw_subtitle)
-        _plot_per_master_avg_req_to_gnt_vs_tb(hw_entries, hw_label, out_dir / f"avg_req_to_gnt_per_master_vs_tb_{hw_name}.png", subtitle=hw_subtitle)
+        tasks.append(_plot_task("total_simulation_time", _plot_total_sim_time_vs_tb, out_dir / f"total_simulation_time_vs_tb_{hw_name}.png", hw_entries, ideal_runtime, hw_label, subtitle=hw_subtitle))
+        tasks.append(_plot_task("bandwidth", _plot_bandwidth_vs_tb, out_dir / f"bandwidth_vs_tb_{hw_name}.png", hw_entries, ideal_runtime, hw_label, subtitle=hw_subtitle))
+        tasks.append(_plot_task("avg_req_to_gnt_per_master", _plot_per_master_avg_req_to_gnt_vs_tb, out_dir / f"avg_req_to_gnt_per_master_vs_tb_{hw_name}.png", hw_entries, hw_label, subtitle=hw_subtitle))
+
+    # -----------------------------------------------------------------
+    # Skip figures whose inputs did not change, render the rest in parallel
+    # -----------------------------------------------------------------
+    pending: Dict[Path, Tuple[Dict[str, object], str]] = {}
+    n_skipped = 0
+    for task in tasks:
+        if task["family"] not in args.only:
+            continue
+        out_path = task["out_path"]
+        digest = _task_digest(task)
+        if (
+            not args.force
+            and out_path.is_file()
+            and results_db.get_group_digest(conn, results_dir, task["family"], out_path.name) == digest
+        ):
+            n_skipped += 1
+            continue
+        pending[out_path] = (task, digest)
+
+    render = [task for task, _ in pending.values()]
+    jobs = max(1, min(args.jobs or 1, len(render)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for out_path in pool.map(_render_figure, render):
+            task, digest = pending[out_path]
+            results_db.set_group_digest(conn, results_dir, task["family"], out_path.name, digest)
 
-    print(f"Plots written to: {out_dir}")
+    conn.close()
+    print(f"Plots written to: {out_dir} ({len(pending)} rendered, {n_skipped} unchanged)")
     return 0
 
 
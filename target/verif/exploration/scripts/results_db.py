@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""SQLite store for parsed sweep results.
+
+Transcript summaries produced by parse_vsim.py are ingested into a local
+database with indexed tables for runs, per-master metrics and hardware
+configurations. Ingestion is incremental: a result file is only re-read when
+its size or mtime changed since the last sync, and rows of files that were
+removed from the results directory are dropped.
+
+The configuration of a run is taken from the parsed `hw_config` section. The
+result filename (hardware_<TYPE>_<N>hwpe_<M>fact[_testbench_*].json) is only
+used to name the run and as a fallback for fields missing from the summary.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+INTERCO_ORDER = {"LOG": 0, "HCI": 1, "MUX": 2}
+RESULTS_GLOB = "hardware_*.json"
+DEFAULT_DB_NAME = "sweep_results.sqlite"
+# Bumped on schema changes; the store is rebuilt from the result files then
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    results_dir           TEXT NOT NULL,
+    hw_name               TEXT NOT NULL,
+    interco_type          TEXT NOT NULL,
+    n_core                INTEGER,
+    n_dma                 INTEGER,
+    n_ext                 INTEGER,
+    n_hwpe                INTEGER,
+    hwpe_width_fact       INTEGER,
+    banks                 INTEGER,
+    data_width            INTEGER,
+    n_narrow_hci          INTEGER,
+    n_wide_hci            INTEGER,
+    narrow_total_ports    INTEGER,
+    ideal_mem_bw          REAL,
+    ideal_interco_bw      REAL,
+    ideal_bottleneck_bw   REAL,
+    PRIMARY KEY (results_dir, hw_name)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id                INTEGER PRIMARY KEY,
+    results_dir           TEXT NOT NULL,
+    run_name              TEXT NOT NULL,
+    path                  TEXT NOT NULL,
+    size                  INTEGER NOT NULL,
+    mtime_ns              INTEGER NOT NULL,
+    digest                TEXT NOT NULL,
+    hw_name               TEXT NOT NULL,
+    tb_name               TEXT NOT NULL,
+    invert_prio           INTEGER,
+    stall_num             INTEGER,
+    stall_den             INTEGER,
+    total_sim_cycles      REAL,
+    actual_bw             REAL,
+    utilization_pct       REAL,
+    summary_json          TEXT NOT NULL,
+    UNIQUE (results_dir, run_name),
+    FOREIGN KEY (results_dir, hw_name) REFERENCES configs (results_dir, hw_name)
+);
+CREATE INDEX IF NOT EXISTS runs_by_hw ON runs (results_dir, hw_name);
+CREATE INDEX IF NOT EXISTS runs_by_tb ON runs (results_dir, tb_name);
+CREATE TABLE IF NOT EXISTS master_metrics (
+    run_id                INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    master_name           TEXT NOT NULL,
+    role_name             TEXT,
+    sim_time_cycles       REAL,
+    avg_req_to_gnt        REAL,
+    req_to_gnt_grants     INTEGER,
+    granted_reads         INTEGER,
+    granted_writes        INTEGER,
+    read_complete         INTEGER,
+    PRIMARY KEY (run_id, master_name)
+);
+CREATE INDEX IF NOT EXISTS master_metrics_by_name ON master_metrics (master_name);
+CREATE TABLE IF NOT EXISTS plot_groups (
+    results_dir           TEXT NOT NULL,
+    kind                  TEXT NOT NULL,
+    group_key             TEXT NOT NULL,
+    digest                TEXT NOT NULL,
+    PRIMARY KEY (results_dir, kind, group_key)
+);
+"""
+
+
+def _to_int(value: object, default: int = 0) -> int:
+    try:
+        return int(value)
+    except Exception:
+        return default
+
+
+def _to_float(value: object, default: float = float("nan")) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if value is None or math.isnan(value) else value
+
+
+def _none_to_nan(value: Optional[float]) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def _parse_hw_cfg_from_filename(path: Path) -> Tuple[str, int, int]:
+    """Parse (interco_type, n_hwpe, hwpe_width_fact) from filename stem.
+
+    Handles both old-style 'hardware_X_Nhwpe_Mfact.json' and new combined
+    'hardware_X_Nhwpe_Mfact_testbench_*.json' names.
+    """
+    match = re.match(r"^hardware_([a-zA-Z]+)_([0-9]+)hwpe_([0-9]+)fact", path.stem)
+    if not match:
+        return ("UNK", 0, 0)
+    return (match.group(1).upper(), int(match.group(2)), int(match.group(3)))
+
+
+def _parse_tb_cfg_from_stem(stem: str) -> Tuple[Optional[int], Optional[int], Optional[int], str]:
+    """Parse TB config embedded in a combined result filename stem.
+
+    Returns (invert_prio, stall_num, stall_den, tb_name).
+    All values are None / '' when no testbench segment is found.
+    """
+    match = re.search(r"(testbench_invert_([01])_stall_([0-9]+)_([0-9]+))", stem)
+    if not match:
+        return (None, None, None, "")
+    return (int(match.group(2)), int(match.group(3)), int(match.group(4)), match.group(1))
+
+
+def _derive_interco_side(hw_cfg: Dict[str, object]) -> Dict[str, int]:
+    masters = hw_cfg.get("masters", {}) if isinstance(hw_cfg, dict) else {}
+    memory = hw_cfg.get("memory", {}) if isinstance(hw_cfg, dict) else {}
+    interco_side = hw_cfg.get("interconnect_side", {}) if isinstance(hw_cfg, dict) else {}
+
+    if isinstance(interco_side, dict) and "narrow_total_ports" in interco_side:
+        return {
+            "n_narrow_hci": _to_int(interco_side.get("n_narrow_hci")),
+            "n_wide_hci": _to_int(interco_side.get("n_wide_hci")),
+            "n_dma": _to_int(interco_side.get("n_dma")),
+            "n_ext": _to_int(interco_side.get("n_ext")),
+            "narrow_total_ports": _to_int(interco_side.get("narrow_total_ports")),
+            "total_initiator_ports": _to_int(interco_side.get("total_initiator_ports")),
+        }
+
+    interco_type = str(interco_side.get("type", "UNK")).upper()
+    if interco_type == "UNK":
+        interco_type = str(hw_cfg.get("interco_type", "UNK")).upper()
+
+    n_core = _to_int(masters.get("core"))
+    n_dma = _to_int(masters.get("dma"))
+    n_ext = _to_int(masters.get("ext"))
+    n_hwpe = _to_int(masters.get("hwpe"))
+    hwpe_width = _to_int(memory.get("hwpe_width_lanes"), 1)
+
+    if interco_type == "LOG":
+        n_narrow_hci = n_core + n_hwpe * hwpe_width
+        n_wide_hci = 0
+    elif interco_type == "MUX":
+        n_narrow_hci = n_core
+        n_wide_hci = 1 if n_hwpe > 0 else 0
+    else:
+        n_narrow_hci = n_core
+        n_wide_hci = n_hwpe
+
+    narrow_total = n_narrow_hci + n_dma + n_ext
+    return {
+        "n_narrow_hci": n_narrow_hci,
+        "n_wide_hci": n_wide_hci,
+        "n_dma": n_dma,
+        "n_ext": n_ext,
+        "narrow_total_ports": narrow_total,
+        "total_initiator_ports": narrow_total + n_wide_hci,
+    }
+
+
+# -----------------------------------------------------------------------
+# Connection / ingestion
+# -----------------------------------------------------------------------
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # Older layout: drop it, the next sync re-ingests every result file
+        with conn:
+            for table in ("master_metrics", "runs", "configs", "plot_groups"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _dir_key(results_dir: Path) -> str:
+    return str(results_dir.resolve())
+
+
+def _derive_run(path: Path, data: Dict[str, object]) -> Tuple[Dict[str, object], Dict[str, object]]:
+    """Return (config_row, run_row) for one parsed result file."""
+    hw_cfg = data.get("hw_config", {})
+    if not isinstance(hw_cfg, dict):
+        hw_cfg = {}
+    masters = hw_cfg.get("masters", {})
+    memory = hw_cfg.get("memory", {})
+    bw = data.get("bandwidth", {})
+
+    interco_from_name, n_hwpe_name, wf_name = _parse_hw_cfg_from_filename(path)
+    interco_type = str(hw_cfg.get("interconnect_side", {}).get("type", interco_from_name)).upper()
+    if interco_type not in INTERCO_ORDER:
+        interco_type = interco_from_name
+
+    n_hwpe = _to_int(masters.get("hwpe"), n_hwpe_name)
+    hwpe_wf = _to_int(memory.get("hwpe_width_lanes"), wf_name)
+    interco_side = _derive_interco_side(hw_cfg)
+    banks = _to_int(memory.get("banks"))
+    data_width = _to_int(memory.get("data_width_bits"))
+    ideal_mem = float(banks * data_width)
+    ideal_interco = float(
+        interco_side["narrow_total_ports"] * data_width
+        + interco_side["n_wide_hci"] * hwpe_wf * data_width
+    )
+    ideal_bottleneck = min(ideal_mem, ideal_interco)
+
+    actual_bw = _to_float(bw.get("actual_completion_bit_per_cycle"))
+    util_pct = (actual_bw / ideal_bottleneck * 100.0) if ideal_bottleneck > 0 and not math.isnan(actual_bw) else float("nan")
+
+    invert_prio, stall_num, stall_den, tb_name = _parse_tb_cfg_from_stem(path.stem)
+    # Full hardware config name: strip the testbench suffix from the stem
+    hw_name = path.stem[: path.stem.index(f"_{tb_name}")] if tb_name else path.stem
+
+    config = {
+        "hw_name": hw_name,
+        "interco_type": interco_type,
+        "n_core": _to_int(masters.get("core")),
+        "n_dma": interco_side["n_dma"],
+        "n_ext": interco_side["n_ext"],
+        "n_hwpe": n_hwpe,
+        "hwpe_width_fact": hwpe_wf,
+        "banks": banks,
+        "data_width": data_width,
+        "n_narrow_hci": interco_side["n_narrow_hci"],
+        "n_wide_hci": interco_side["n_wide_hci"],
+        "narrow_total_ports": interco_side["narrow_total_ports"],
+        "ideal_mem_bw": ideal_mem,
+        "ideal_interco_bw": ideal_interco,
+        "ideal_bottleneck_bw": ideal_bottleneck,
+    }
+    run = {
+        "run_name": path.stem,
+        "hw_name": hw_name,
+        "tb_name": tb_name,
+        "invert_prio": invert_prio,
+        "stall_num": stall_num,
+        "stall_den": stall_den,
+        "total_sim_cycles": _nan_to_none(_to_float(data.get("simulation_time", {}).get("total_cycles"))),
+        "actual_bw": _nan_to_none(actual_bw),
+        "utilization_pct": _nan_to_none(util_pct),
+    }
+    return config, run
+
+
+def _insert_row(conn: sqlite3.Connection, table: str, row: Dict[str, object], upsert_key: Tuple[str, ...] = ()) -> int:
+    cols = ", ".join(row.keys())
+    marks = ", ".join("?" for _ in row)
+    sql = f"INSERT INTO {table} ({cols}) VALUES ({marks})"
+    if upsert_key:
+        updates = ", ".join(f"{col} = excluded.{col}" for col in row if col not in upsert_key)
+        sql += f" ON CONFLICT ({', '.join(upsert_key)}) DO UPDATE SET {updates}"
+    cur = conn.execute(sql, tuple(row.values()))
+    return cur.lastrowid
+
+
+def ingest_file(conn: sqlite3.Connection, results_dir: Path, path: Path) -> bool:
+    """Ingest one parsed result JSON. Returns False if the file is unreadable."""
+    raw = path.read_bytes()
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return False
+    stat = path.stat()
+    config, run = _derive_run(path, data)
+    dir_key = _dir_key(results_dir)
+
+    conn.execute("DELETE FROM runs WHERE results_dir = ? AND run_name = ?", (dir_key, run["run_name"]))
+    config["results_dir"] = dir_key
+    _insert_row(conn, "configs", config, upsert_key=("results_dir", "hw_name"))
+    run.update(
+        results_dir=dir_key,
+        path=str(path),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        digest=hashlib.sha1(raw).hexdigest(),
+        summary_json=raw.decode("utf-8"),
+    )
+    run_id = _insert_row(conn, "runs", run)
+
+    master_rows: Dict[str, Dict[str, object]] = {}
+    for row in data.get("masters", []):
+        if not isinstance(row, dict) or not row.get("master_name"):
+            continue
+        master_rows[row["master_name"]] = {
+            "run_id": run_id,
+            "master_name": row["master_name"],
+            "role_name": row.get("role_name"),
+            "sim_time_cycles": row.get("sim_time_cycles"),
+            "avg_req_to_gnt": row.get("avg_req_to_gnt_stall_latency_cycles"),
+            "req_to_gnt_grants": row.get("req_to_gnt_grants"),
+            "granted_reads": row.get("granted_reads"),
+            "granted_writes": row.get("granted_writes"),
+            "read_complete": row.get("read_complete"),
+        }
+    for row in master_rows.values():
+        _insert_row(conn, "master_metrics", row)
+    return True
+
+
+def sync_dir(conn: sqlite3.Connection, results_dir: Path, pattern: str = RESULTS_GLOB) -> Set[str]:
+    """Bring the database in line with the result files in `results_dir`.
+
+    Returns the names of the runs that were added, updated or removed.
+    """
+    dir_key = _dir_key(results_dir)
+    known = {
+        row["run_name"]: (row["size"], row["mtime_ns"])
+        for row in conn.execute("SELECT run_name, size, mtime_ns FROM runs WHERE results_dir = ?", (dir_key,))
+    }
+    changed: Set[str] = set()
+    seen: Set[str] = set()
+    with conn:
+        for path in sorted(results_dir.glob(pattern)):
+            seen.add(path.stem)
+            stat = path.stat()
+            if known.get(path.stem) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            if ingest_file(conn, results_dir, path):
+                changed.add(path.stem)
+        for run_name in set(known) - seen:
+            conn.execute("DELETE FROM runs WHERE results_dir = ? AND run_name = ?", (dir_key, run_name))
+            changed.add(run_name)
+    return changed
+
+
+# -----------------------------------------------------------------------
+# Queries
+# -----------------------------------------------------------------------
+
+def load_entries(conn: sqlite3.Connection, results_dir: Path) -> List[Dict[str, object]]:
+    """Return one plot entry per run of `results_dir`, sorted by hw config."""
+    dir_key = _dir_key(results_dir)
+    per_master: Dict[int, List[Dict[str, object]]] = {}
+    for row in conn.execute(
+        "SELECT m.run_id, m.master_name, m.avg_req_to_gnt, m.req_to_gnt_grants "
+        "FROM master_metrics m JOIN runs r ON r.run_id = m.run_id "
+        "WHERE r.results_dir = ? ORDER BY m.master_name",
+        (dir_key,),
+    ):
+        per_master.setdefault(row["run_id"], []).append(
+            {
+                "master_name": row["master_name"],
+                "avg_req_to_gnt_stall_latency_cycles": row["avg_req_to_gnt"],
+                "req_to_gnt_grants": row["req_to_gnt_grants"],
+            }
+        )
+
+    entries: List[Dict[str, object]] = []
+    for row in conn.execute(
+        "SELECT r.*, c.* FROM runs r JOIN configs c ON c.results_dir = r.results_dir AND c.hw_name = r.hw_name "
+        "WHERE r.results_dir = ?",
+        (dir_key,),
+    ):
+        entries.append(
+            {
+                "path": Path(row["path"]),
+                "run_name": row["run_name"],
+                "digest": row["digest"],
+                "label": f"{row['interco_type']}_{row['n_hwpe']}x{row['hwpe_width_fact']}",
+                "hw_name": row["hw_name"],
+                "interco_type": row["interco_type"],
+                "n_hwpe": row["n_hwpe"],
+                "hwpe_width_fact": row["hwpe_width_fact"],
+                "total_sim_cycles": _none_to_nan(row["total_sim_cycles"]),
+                "avg_req_to_gnt_per_master": per_master.get(row["run_id"], []),
+                "ideal_mem_bw": row["ideal_mem_bw"],
+                "ideal_interco_bw": row["ideal_interco_bw"],
+                "ideal_bottleneck_bw": row["ideal_bottleneck_bw"],
+                "actual_bw": _none_to_nan(row["actual_bw"]),
+                "utilization_pct": _none_to_nan(row["utilization_pct"]),
+                "n_core": row["n_core"],
+                # TB config fields
+                "tb_name": row["tb_name"],
+                "invert_prio": row["invert_prio"],
+                "stall_num": row["stall_num"],
+                "stall_den": row["stall_den"],
+            }
+        )
+
+    entries.sort(key=lambda e: (e["n_hwpe"], e["hwpe_width_fact"], INTERCO_ORDER.get(e["interco_type"], 9)))
+    return entries
+
+
+def group_digest(entries: Iterable[Dict[str, object]], *extra: object) -> str:
+    """Digest of the runs in a plot group plus any extra plot inputs."""
+    h = hashlib.sha1()
+    for run_name, digest in sorted((e["run_name"], e["digest"]) for e in entries):
+        h.update(f"{run_name}:{digest}\n".encode("utf-8"))
+    for item in extra:
+        h.update(f"{item!r}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def get_group_digest(conn: sqlite3.Connection, results_dir: Path, kind: str, group_key: str) -> Optional[str]:
+    row = conn.execute(
+        "SELECT digest FROM plot_groups WHERE results_dir = ? AND kind = ? AND group_key = ?",
+        (_dir_key(results_dir), kind, group_key),
+    ).fetchone()
+    return row["digest"] if row else None
+
+
+def set_group_digest(conn: sqlite3.Connection, results_dir: Path, kind: str, group_key: str, digest: str) -> None:
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO plot_groups (results_dir, kind, group_key, digest) VALUES (?, ?, ?, ?)",
+            (_dir_key(results_dir), kind, group_key, digest),
+        )
+
+
+# -----------------------------------------------------------------------
+# Main
+# -----------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest parsed sweep JSON files into the SQLite results store.")
+    parser.add_argument("--results-dir", required=True, help="Directory containing parsed sweep JSON files (hardware_*.json).")
+    parser.add_argument("--db", default=None, help=f"SQLite database path (default: <results-dir>/{DEFAULT_DB_NAME}).")
+    args = parser.parse_args()
+
+    results_dir = Path(args.results_dir)
+    if not results_dir.is_dir():
+        print(f"ERROR: Results directory not found: {results_dir}", file=sys.stderr)
+        return 2
+    db_path = Path(args.db) if args.db else results_dir / DEFAULT_DB_NAME
+    conn = connect(db_path)
+    changed = sync_dir(conn, results_dir)
+    n_runs = conn.execute("SELECT COUNT(*) FROM runs WHERE results_dir = ?", (_dir_key(results_dir),)).fetchone()[0]
+    conn.close()
+    print(f"{db_path}: {n_runs} runs, {len(changed)} changed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
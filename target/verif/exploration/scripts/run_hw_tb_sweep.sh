@@ -101,6 +101,7 @@ for workload_json in "${workload_list[@]}"; do
       make run-verif
       python3 $VERIF_EXPL_DIR/scripts/parse_vsim.py --transcript $VERIF_DIR/vsim/transcript --out "$workload_results_dir/${hw_name}.json"
       cp $VERIF_DIR/simvectors/generated/dataflow.html "$workload_results_dir/${hw_name}.html"
+      cp $VERIF_DIR/simvectors/generated/dataflow.data.js "$workload_results_dir/${hw_name}.data.js"
       continue
     fi
 
@@ -119,6 +120,7 @@ for workload_json in "${workload_list[@]}"; do
       # Remove used transcript so there is no danger to accidentally pick it up in next runs
       rm -f $VERIF_DIR/vsim/transcript
       cp $VERIF_DIR/simvectors/generated/dataflow.html "$workload_results_dir/${run_name}.html"
+      cp $VERIF_DIR/simvectors/generated/dataflow.data.js "$workload_results_dir/${run_name}.data.js"
     done
   done
 
@@ -137,6 +139,7 @@ for workload_json in "${workload_list[@]}"; do
     # Remove used transcript
     rm -f $VERIF_DIR/vsim/transcript
     cp $VERIF_DIR/simvectors/generated/dataflow.html "$workload_results_dir/ideal.html"
+    cp $VERIF_DIR/simvectors/generated/dataflow.data.js "$workload_results_dir/ideal.data.js"
     # Generate plots with ideal comparison
     python3 $VERIF_EXPL_DIR/scripts/plot_sweep_results.py --results-dir "$workload_results_dir" --ideal-run "$workload_results_dir/ideal.json"
   else
@@ -0,0 +1,151 @@
+"""Per-bank load over time, from the generated stimuli and the pattern schedule.
+
+The patterns of a driver issue their n_transactions requests one after the
+other, so the k-th request of a stimuli file belongs to a known pattern; it
+is placed at its share of the scheduled window of that pattern, and every
+bank word it covers is counted in a bank x time-bucket matrix. Bank
+hotspots thus show up in the reports before any simulation. The request
+addresses are decoded with NumPy when it is available.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # plain lists and int(s, 2) give the same counts, only slower
+    np = None
+
+from hci_stimuli import AffineDescriptor, open_stimuli
+
+# Time buckets of the matrix (fewer when the schedule is shorter)
+N_TIME_BUCKETS = 64
+
+
+def _decode_binary(fields):
+    """Integers of equal-width binary strings."""
+    if not fields:
+        return []
+    width = len(fields[0])
+    if np is None or width > 62:
+        return [int(f, 2) for f in fields]
+    bits = np.frombuffer(''.join(fields).encode('ascii'), dtype=np.uint8).reshape(-1, width) - ord('0')
+    weights = np.left_shift(np.int64(1), np.arange(width - 1, -1, -1, dtype=np.int64))
+    return bits.astype(np.int64) @ weights
+
+
+def _concat(parts):
+    parts = [p for p in parts if len(p)]
+    if np is None:
+        return [a for p in parts for a in p]
+    if not parts:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate([np.asarray(p, dtype=np.int64) for p in parts])
+
+
+def request_addresses(path, access_bytes):
+    """Byte addresses of the requests of a stimuli file (any format), in issue order."""
+    parts = []
+    fields = []
+    with open_stimuli(path) as f:
+        for raw_line in f:
+            line = raw_line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('@'):
+                line = line.split(None, 1)[1] if ' ' in line else ''
+            if line.startswith('1'):
+                fields.append(line.rsplit(None, 1)[1])
+            elif line.startswith('DESC'):
+                parts.append(_decode_binary(fields))
+                fields = []
+                desc = AffineDescriptor.from_line(line)
+                parts.append([addr for addr, _, _ in desc.expand(access_bytes)])
+    parts.append(_decode_binary(fields))
+    return _concat(parts)
+
+
+def _count_requests(counts, addrs, start, dur, n, total_cycles, n_banks, n_buckets, word_bytes, n_words):
+    """Add requests k = 0.. of a pattern issued at start + k * dur / n."""
+    if np is not None:
+        k = np.arange(len(addrs), dtype=np.int64)
+        buckets = np.minimum((start * n + k * dur) * n_buckets // (n * total_cycles), n_buckets - 1)
+        words = np.asarray(addrs, dtype=np.int64) // word_bytes
+        for w in range(n_words):
+            counts += np.bincount(((words + w) % n_banks) * n_buckets + buckets, minlength=len(counts))
+        return
+    for k, addr in enumerate(addrs):
+        bucket = min((start * n + k * dur) * n_buckets // (n * total_cycles), n_buckets - 1)
+        word = addr // word_bytes
+        for w in range(n_words):
+            counts[((word + w) % n_banks) * n_buckets + bucket] += 1
+
+
+def bank_load(pattern_nodes, addresses_of, total_cycles, n_banks, word_bytes, n_buckets=N_TIME_BUCKETS):
+    """Bank x time-bucket access counts and their summary, or None for an empty schedule.
+
+    addresses_of(driver_idx) returns the request addresses of the driver's
+    stimuli (see request_addresses), or None to leave the driver out; it is
+    called once per driver, so only one file is held in memory at a time.
+    A request of txn_bytes counts once in every bank word it covers.
+    """
+    total_cycles = int(total_cycles)
+    if total_cycles <= 0:
+        return None
+    n_banks = max(1, int(n_banks))
+    word_bytes = max(1, int(word_bytes))
+    n_buckets = max(1, min(int(n_buckets), total_cycles))
+    n_cells = n_banks * n_buckets
+    counts = np.zeros(n_cells, dtype=np.int64) if np is not None else [0] * n_cells
+
+    nodes_by_driver = {}
+    for node in pattern_nodes:
+        nodes_by_driver.setdefault(node['driver_idx'], []).append(node)
+    for drv_idx in sorted(nodes_by_driver):
+        addrs = addresses_of(drv_idx)
+        if addrs is None:
+            continue
+        pos = 0
+        for node in sorted(nodes_by_driver[drv_idx], key=lambda n: n['pattern_idx']):
+            n = int(node['n_transactions'])
+            seg = addrs[pos:pos + n]
+            pos += n
+            if n <= 0 or not len(seg):
+                continue
+            start = int(node['start_cycle'])
+            dur = max(0, int(node['end_cycle']) - start)
+            n_words = max(1, int(node['txn_bytes']) // word_bytes)
+            _count_requests(counts, seg, start, dur, n, total_cycles, n_banks, n_buckets, word_bytes, n_words)
+
+    counts = [int(c) for c in counts]
+    matrix = [counts[b * n_buckets:(b + 1) * n_buckets] for b in range(n_banks)]
+    per_bank = [sum(row) for row in matrix]
+    mean = sum(per_bank) / n_banks
+    hot_bank = max(range(n_banks), key=lambda b: per_bank[b])
+    peak = max(range(n_cells), key=lambda c: counts[c])
+    peak_bank, peak_bucket = divmod(peak, n_buckets)
+    # Imbalance inside each busy bucket: concurrent accesses to one bank conflict
+    bucket_ratios = []
+    for t in range(n_buckets):
+        col = [matrix[b][t] for b in range(n_banks)]
+        if any(col):
+            bucket_ratios.append(max(col) * n_banks / sum(col))
+    bucket_cycles = total_cycles / n_buckets
+    return {
+        'n_banks': n_banks,
+        'n_buckets': n_buckets,
+        'total_cycles': total_cycles,
+        'bucket_cycles': bucket_cycles,
+        'counts': matrix,
+        'per_bank': per_bank,
+        'accesses': sum(per_bank),
+        'max': per_bank[hot_bank],
+        'mean': mean,
+        'imbalance': per_bank[hot_bank] / mean if mean else 0.0,
+        'hot_bank': hot_bank,
+        'peak': {
+            'bank': peak_bank,
+            'bucket': peak_bucket,
+            'start': round(peak_bucket * bucket_cycles),
+            'end': round((peak_bucket + 1) * bucket_cycles),
+            'count': counts[peak],
+        },
+        'bucket_imbalance': sum(bucket_ratios) / len(bucket_ratios) if bucket_ratios else 0.0,
+    }
@@ -0,0 +1,202 @@
+"""Critical-path and slack analysis of the pattern schedule."""
+
+import heapq
+import json
+from pathlib import Path
+
+
+class ScheduleGraph:
+    """Pattern dependency graph with earliest/latest times and slack.
+
+    Built once from the nodes scheduled by build_schedule (which records the
+    effective predecessors of each node in 'sched_preds'). Durations are
+    taken from the schedule, so the earliest times reproduce it. Durations
+    can then be scaled for what-if analysis: only the earliest times of the
+    affected successors are propagated again, and latest times are
+    recomputed lazily.
+    """
+
+    def __init__(self, pattern_nodes):
+        self.nodes = pattern_nodes
+        n_nodes = len(pattern_nodes)
+        self.preds = [sorted(set(n['sched_preds'])) for n in pattern_nodes]
+        self.succs = [[] for _ in range(n_nodes)]
+        for i, preds in enumerate(self.preds):
+            for p in preds:
+                self.succs[p].append(i)
+        self.release = [max(0, int(n['start_delay'])) for n in pattern_nodes]
+        self.base_duration = [max(0, int(n['end_cycle']) - int(n['start_cycle'])) for n in pattern_nodes]
+        self.duration = list(self.base_duration)
+
+        indeg = [len(p) for p in self.preds]
+        ready = [i for i in range(n_nodes) if indeg[i] == 0]
+        heapq.heapify(ready)
+        self.topo = []
+        while ready:
+            cur = heapq.heappop(ready)
+            self.topo.append(cur)
+            for nxt in self.succs[cur]:
+                indeg[nxt] -= 1
+                if indeg[nxt] == 0:
+                    heapq.heappush(ready, nxt)
+        if len(self.topo) != n_nodes:
+            raise ValueError("dependency cycle in the pattern schedule")
+        self.rank = {n_idx: r for r, n_idx in enumerate(self.topo)}
+
+        self.earliest_start = [0] * n_nodes
+        self.earliest_finish = [0] * n_nodes
+        for i in self.topo:
+            self._forward(i)
+        self._latest_finish = None
+
+    def _forward(self, i):
+        start = max([self.release[i]] + [self.earliest_finish[p] for p in self.preds[i]])
+        finish = start + self.duration[i]
+        changed = finish != self.earliest_finish[i]
+        self.earliest_start[i] = start
+        self.earliest_finish[i] = finish
+        return changed
+
+    @property
+    def total_cycles(self):
+        return max(self.earliest_finish, default=0)
+
+    def set_duration(self, n_idx, duration):
+        """Change one node's duration and re-propagate its successors only."""
+        self.duration[n_idx] = max(0, int(duration))
+        self._latest_finish = None
+        heap = [(self.rank[n_idx], n_idx)]
+        queued = {n_idx}
+        while heap:
+            _, cur = heapq.heappop(heap)
+            queued.discard(cur)
+            if self._forward(cur):
+                for nxt in self.succs[cur]:
+                    if nxt not in queued:
+                        queued.add(nxt)
+                        heapq.heappush(heap, (self.rank[nxt], nxt))
+
+    def scale(self, n_idx, factor):
+        """Scale one node's scheduled duration by factor."""
+        self.set_duration(n_idx, round(self.base_duration[n_idx] * float(factor)))
+
+    def _latest(self):
+        if self._latest_finish is None:
+            total = self.total_cycles
+            latest = [total] * len(self.nodes)
+            for i in reversed(self.topo):
+                for s in self.succs[i]:
+                    latest[i] = min(latest[i], latest[s] - self.duration[s])
+            self._latest_finish = latest
+        return self._latest_finish
+
+    def slack(self, n_idx):
+        return self._latest()[n_idx] - self.earliest_finish[n_idx]
+
+    def critical_path(self):
+        """Node indices of one longest path, from its first node to the last finishing one."""
+        if not self.nodes:
+            return []
+        cur = max(range(len(self.nodes)), key=lambda i: (self.earliest_finish[i], -i))
+        path = [cur]
+        while True:
+            tight = [p for p in self.preds[cur]
+                     if self.earliest_finish[p] == self.earliest_start[cur]]
+            # stop where the start is bound by the start delay only
+            if not tight:
+                break
+            cur = max(tight, key=lambda p: (self.duration[p], -p))
+            path.append(cur)
+        path.reverse()
+        return path
+
+    def summary(self):
+        """Critical path, per-job/driver contributions and per-node slack as a dict."""
+        path = self.critical_path()
+        by_job = {}
+        by_driver = {}
+        for i in path:
+            node = self.nodes[i]
+            by_job[node['job']] = by_job.get(node['job'], 0) + self.duration[i]
+            by_driver[node['driver_name']] = by_driver.get(node['driver_name'], 0) + self.duration[i]
+        bottleneck = None
+        if path:
+            job = max(by_job, key=lambda j: (by_job[j], j))
+            driver = max(by_driver, key=lambda d: (by_driver[d], d))
+            bottleneck = {
+                'job': job,
+                'job_cycles': by_job[job],
+                'driver': driver,
+                'driver_cycles': by_driver[driver],
+            }
+        critical = set(path)
+        return {
+            'total_cycles': self.total_cycles,
+            'critical_path': [self._node_entry(i) for i in path],
+            'critical_cycles_by_job': dict(sorted(by_job.items(), key=lambda kv: -kv[1])),
+            'critical_cycles_by_driver': dict(sorted(by_driver.items(), key=lambda kv: -kv[1])),
+            'bottleneck': bottleneck,
+            'nodes': [dict(self._node_entry(i), slack=self.slack(i), critical=i in critical)
+                      for i in range(len(self.nodes))],
+        }
+
+    def _node_entry(self, i):
+        node = self.nodes[i]
+        return {
+            'node_idx': i,
+            'driver': node['driver_name'],
+            'pattern_idx': node['pattern_idx'],
+            'job': node['job'],
+            'start': self.earliest_start[i],
+            'end': self.earliest_finish[i],
+            'duration': self.duration[i],
+        }
+
+    def what_if(self, n_idx, factor):
+        """Total cycles and critical path if one node's duration were scaled.
+
+        The graph is restored afterwards.
+        """
+        before = self.total_cycles
+        saved = self.duration[n_idx]
+        self.scale(n_idx, factor)
+        result = {
+            'node': self._node_entry(n_idx),
+            'factor': float(factor),
+            'total_cycles': self.total_cycles,
+            'delta_cycles': self.total_cycles - before,
+            'critical_path': [self._node_entry(i) for i in self.critical_path()],
+        }
+        self.set_duration(n_idx, saved)
+        return result
+
+    def annotate(self):
+        """Add 'slack' and 'critical' to the pattern nodes for the reports."""
+        critical = set(self.critical_path())
+        for i, node in enumerate(self.nodes):
+            node['slack'] = self.slack(i)
+            node['critical'] = i in critical
+
+
+def find_node(pattern_nodes, driver_name, pattern_idx):
+    for node in pattern_nodes:
+        if node['driver_name'] == driver_name and node['pattern_idx'] == pattern_idx:
+            return node['node_idx']
+    raise KeyError(f"no pattern {pattern_idx} on driver {driver_name}")
+
+
+def parse_what_if(spec):
+    """Parse '<driver>:<pattern_idx>=<factor>', e.g. 'hwpe_0:1=1.5'."""
+    try:
+        target, factor = spec.split('=', 1)
+        driver_name, pattern_idx = target.rsplit(':', 1)
+        return driver_name.strip(), int(pattern_idx), float(factor)
+    except ValueError:
+        raise ValueError(f"bad what-if spec {spec!r}, expected <driver>:<pattern_idx>=<factor>")
+
+
+def write_critical_path_json(critical_path_path: Path, summary, what_if=()):
+    data = dict(summary)
+    data['what_if'] = list(what_if)
+    critical_path_path.write_text(json.dumps(data, indent=2) + "\n", encoding='utf-8')
+    return data
@@ -0,0 +1,637 @@
+/*
+ * Canvas viewer of dataflow.html, inlined by html_report.py.
+ *
+ * Draws the execution timeline, the memory address timeline, the bank load
+ * heatmap and the job dependency graph from DATAFLOW_DATA (see
+ * build_dataflow_data). Every frame
+ * only visits what falls into the viewport (binary search on the sorted
+ * columns), and patterns or accesses narrower than a pixel are merged into
+ * one mark, so the cost of a frame follows the screen, not the workload.
+ * Wheel zooms, drag pans, double-click resets; the timelines and the
+ * heatmap share the time window.
+ */
+(function () {
+  'use strict';
+
+  var D = window.DATAFLOW_DATA;
+  if (!D) {
+    document.body.insertAdjacentHTML('beforeend',
+      "<p style='color:#b00020;font-weight:600;'>Chart data not found: keep the .data.js file " +
+      "next to this page, with the same name.</p>");
+    return;
+  }
+
+  var S = D.strings, N = D.nodes, R = D.regions, A = D.addr, G = D.dag, ROWS = D.rows;
+  var WIDTH = 1280;
+  var FONT = 'Arial, sans-serif';
+  var KIND_COLORS = ['#2980b9', '#c0392b', '#8e44ad'];
+  var KIND_NAMES = ['R', 'W', 'R/W'];
+  var tip = document.getElementById('df-tip');
+
+  var driverName = {};
+  ROWS.driver.forEach(function (d, r) { driverName[d] = S[ROWS.name[r]]; });
+
+  function color(drv) { return D.palette[drv % D.palette.length]; }
+
+  function hex(v, width) {
+    var s = v.toString(16);
+    while (s.length < width) s = '0' + s;
+    return s;
+  }
+
+  // First index in [lo, hi) with arr[i] >= v (arr sorted ascending)
+  function lowerBound(arr, v, lo, hi) {
+    while (lo < hi) {
+      var mid = (lo + hi) >> 1;
+      if (arr[mid] < v) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  function tickStep(total) {
+    if (total <= 10) return 1;
+    var raw = Math.max(1, Math.floor(total / 10));
+    var mag = Math.pow(10, Math.floor(Math.log10(raw)));
+    return Math.ceil(raw / mag) * mag;
+  }
+
+  function setupCanvas(id, w, h) {
+    var cv = document.getElementById(id), dpr = window.devicePixelRatio || 1;
+    cv.width = Math.round(w * dpr);
+    cv.height = Math.round(h * dpr);
+    cv.style.width = w + 'px';
+    cv.style.height = h + 'px';
+    var ctx = cv.getContext('2d');
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    return {cv: cv, ctx: ctx};
+  }
+
+  function line(ctx, x1, y1, x2, y2) {
+    ctx.beginPath();
+    ctx.moveTo(x1, y1);
+    ctx.lineTo(x2, y2);
+    ctx.stroke();
+  }
+
+  function roundRect(ctx, x, y, w, h, r) {
+    r = Math.min(r, w / 2, h / 2);
+    ctx.beginPath();
+    ctx.moveTo(x + r, y);
+    ctx.arcTo(x + w, y, x + w, y + h, r);
+    ctx.arcTo(x + w, y + h, x, y + h, r);
+    ctx.arcTo(x, y + h, x, y, r);
+    ctx.arcTo(x, y, x + w, y, r);
+    ctx.closePath();
+  }
+
+  function text(ctx, s, x, y, font, fill, align) {
+    ctx.font = font;
+    ctx.fillStyle = fill;
+    ctx.textAlign = align || 'left';
+    ctx.fillText(s, x, y);
+  }
+
+  // Topmost hit [x0, y0, x1, y1, ...] under (x, y)
+  function hitAt(hits, x, y) {
+    for (var k = hits.length - 1; k >= 0; k--) {
+      var h = hits[k];
+      if (x >= h[0] && x <= h[2] && y >= h[1] && y <= h[3]) return h;
+    }
+    return null;
+  }
+
+  // ---- Interaction ----
+  function interact(cv, h) {
+    var drag = null;
+    cv.addEventListener('wheel', function (e) {
+      e.preventDefault();
+      var r = cv.getBoundingClientRect();
+      h.zoom(e.clientX - r.left, e.clientY - r.top, e.deltaY > 0 ? 1.25 : 0.8);
+    }, {passive: false});
+    cv.addEventListener('mousedown', function (e) {
+      drag = {x: e.clientX, y: e.clientY};
+      cv.style.cursor = 'grabbing';
+      tip.style.display = 'none';
+    });
+    window.addEventListener('mouseup', function () {
+      if (drag) {
+        drag = null;
+        cv.style.cursor = '';
+      }
+    });
+    window.addEventListener('mousemove', function (e) {
+      if (!drag) return;
+      h.pan(e.clientX - drag.x, e.clientY - drag.y);
+      drag.x = e.clientX;
+      drag.y = e.clientY;
+    });
+    cv.addEventListener('mousemove', function (e) {
+      if (drag) return;
+      var r = cv.getBoundingClientRect(), s = h.hover(e.clientX - r.left, e.clientY - r.top);
+      if (!s) {
+        tip.style.display = 'none';
+        return;
+      }
+      tip.textContent = s;
+      tip.style.left = (e.clientX + 12) + 'px';
+      tip.style.top = (e.clientY + 12) + 'px';
+      tip.style.display = 'block';
+    });
+    cv.addEventListener('mouseleave', function () { tip.style.display = 'none'; });
+    cv.addEventListener('dblclick', function () { h.reset(); });
+  }
+
+  // Time window shared by the two timelines
+  var time = {t0: 0, t1: D.total};
+  var charts = [];
+  var pending = false;
+
+  function redraw() {
+    if (pending) return;
+    pending = true;
+    window.requestAnimationFrame(function () {
+      pending = false;
+      charts.forEach(function (c) { c.draw(); });
+    });
+  }
+
+  function setTime(t0, t1) {
+    var span = Math.min(D.total, Math.max(t1 - t0, Math.min(D.total, 4)));
+    t0 = Math.max(0, Math.min(t0, D.total - span));
+    time.t0 = t0;
+    time.t1 = t0 + span;
+    redraw();
+  }
+
+  function timeInteraction(chart) {
+    interact(chart.cv, {
+      zoom: function (x, y, f) {
+        var u = Math.max(0, Math.min(1, (x - chart.x0) / chart.pw));
+        var at = time.t0 + u * (time.t1 - time.t0), span = (time.t1 - time.t0) * f;
+        setTime(at - u * span, at - u * span + span);
+      },
+      pan: function (dx) {
+        var dt = dx / chart.pw * (time.t1 - time.t0);
+        setTime(time.t0 - dt, time.t1 - dt);
+      },
+      reset: function () { setTime(0, D.total); },
+      hover: chart.hover,
+    });
+  }
+
+  function timeAxis(ctx, x0, pw, yTop, yBot, labelY, grid, font) {
+    var span = time.t1 - time.t0, step = tickStep(Math.max(1, Math.ceil(span)));
+    ctx.strokeStyle = grid;
+    ctx.lineWidth = 1;
+    for (var t = Math.ceil(time.t0 / step) * step; t <= time.t1; t += step) {
+      var x = x0 + (t - time.t0) / span * pw;
+      line(ctx, x, yTop, x, yBot);
+      text(ctx, String(t), x, labelY, font, '#555', 'center');
+    }
+  }
+
+  function axisCaption(ctx, x0, pw, h) {
+    text(ctx, 'Transaction number', x0 + pw / 2, h - 18, '12px ' + FONT, '#333', 'center');
+    text(ctx, 'Issued memory transactions (r/w) and computation cycles (i.e., req = 0) are both modeled here.',
+         x0 + pw / 2, h - 2, '11px ' + FONT, '#555', 'center');
+  }
+
+  function nodeTitle(i) {
+    var kib = (N.bytes[i] / 1024).toFixed(1);
+    var s = driverName[ROWS.driver[N.row[i]]] + ' p' + N.pattern[i] + ' job=' + S[N.job[i]] +
+      ' [' + N.start[i] + ', ' + N.end[i] + ') ' + S[N.type[i]] + ' n=' + N.n[i] +
+      ' base=0x' + hex(N.base[i], 8) + ' ' + kib + 'KiB ' + S[N.mix[i]] + ' ' + S[N.detail[i]];
+    if (N.slack[i] !== null) s += N.crit[i] ? ' | critical path' : ' | slack=' + N.slack[i];
+    return s;
+  }
+
+  // ---- Execution timeline: one row per driver, one box per pattern ----
+  function ExecChart() {
+    var X0 = 220, PW = WIDTH - 220 - 24, ROW_H = 80, YT = 36;
+    var nRows = ROWS.name.length, H = YT + ROW_H * nRows + 72;
+    var c = setupCanvas('df-exec', WIDTH, H), ctx = c.ctx, hits = [];
+    var self = {cv: c.cv, x0: X0, pw: PW};
+
+    function px(t) { return X0 + (t - time.t0) / (time.t1 - time.t0) * PW; }
+
+    function drawRow(r) {
+      var y = YT + r * ROW_H, lo = ROWS.first[r], hi = ROWS.first[r + 1], col = color(ROWS.driver[r]);
+      text(ctx, S[ROWS.name[r]], X0 - 10, y + 34, '12px ' + FONT, ROWS.hwpe[r] ? '#111111' : '#555555', 'right');
+      ctx.strokeStyle = '#f0f0f0';
+      ctx.lineWidth = 1;
+      line(ctx, X0, y + ROW_H - 1, X0 + PW, y + ROW_H - 1);
+      ctx.save();
+      ctx.beginPath();
+      ctx.rect(X0, y, PW, ROW_H);
+      ctx.clip();
+
+      function flush(run) {
+        if (!run) return;
+        var w = Math.max(1, run.x1 - run.x0);
+        ctx.globalAlpha = run.n > 1 ? 0.55 : 0.82;
+        ctx.fillStyle = col;
+        ctx.fillRect(run.x0, y + 4, w, 34);
+        ctx.globalAlpha = 1;
+        if (run.crit) {
+          ctx.strokeStyle = '#b00020';
+          ctx.lineWidth = 2.5;
+          ctx.strokeRect(run.x0, y + 4, w, 34);
+        }
+        hits.push([run.x0, y + 4, run.x0 + Math.max(w, 2), y + 38, run.i, run.n]);
+      }
+
+      function drawNode(i, x0, x1) {
+        var w = Math.max(1, x1 - x0);
+        roundRect(ctx, x0, y + 4, w, 34, 3);
+        ctx.globalAlpha = 0.82;
+        ctx.fillStyle = col;
+        ctx.fill();
+        ctx.globalAlpha = 1;
+        ctx.strokeStyle = N.crit[i] ? '#b00020' : '#222';
+        ctx.lineWidth = N.crit[i] ? 2.5 : 0.2;
+        ctx.stroke();
+        // Text may use the empty space up to the next box of the row
+        var clipW = Math.max(w, (i + 1 < hi ? px(N.start[i + 1]) : X0 + PW) - x0);
+        if (clipW > 12) {
+          ctx.save();
+          ctx.beginPath();
+          ctx.rect(x0, y, clipW, ROW_H);
+          ctx.clip();
+          text(ctx, S[N.job[i]], x0 + 4, y + 15, '9px ' + FONT, '#ffffff');
+          text(ctx, S[N.type[i]], x0 + 4, y + 25, '8px ' + FONT, '#ffffff');
+          text(ctx, S[N.mix[i]], x0 + 4, y + 34, '8px ' + FONT, '#ffffff');
+          S[N.detail[i]].split(' | ').forEach(function (ext, k) {
+            text(ctx, ext, x0 + 2, y + 49 + k * 9, '8px ' + FONT, '#333333');
+          });
+          ctx.restore();
+        }
+        hits.push([x0, y + 4, x0 + w, y + 38, i, 1]);
+      }
+
+      // The patterns of a driver run one after the other: ends are sorted too
+      var run = null;
+      for (var i = lowerBound(N.end, time.t0, lo, hi); i < hi && N.start[i] < time.t1; i++) {
+        var x0 = px(N.start[i]), x1 = px(N.end[i]);
+        if (x1 - x0 < 2) {
+          if (run && x0 <= run.x1 + 1) {
+            run.x1 = Math.max(run.x1, x1);
+            run.n++;
+            run.crit = run.crit || N.crit[i];
+          } else {
+            flush(run);
+            run = {x0: x0, x1: x1, n: 1, i: i, crit: N.crit[i]};
+          }
+          continue;
+        }
+        flush(run);
+        run = null;
+        drawNode(i, x0, x1);
+      }
+      flush(run);
+      ctx.restore();
+    }
+
+    self.draw = function () {
+      hits = [];
+      ctx.fillStyle = '#ffffff';
+      ctx.fillRect(0, 0, WIDTH, H);
+      text(ctx, 'Execution Timeline', X0, 20, 'bold 14px ' + FONT, '#111');
+      timeAxis(ctx, X0, PW, YT - 6, H - 52, H - 36, '#e0e0e0', '11px ' + FONT);
+      axisCaption(ctx, X0, PW, H);
+      for (var r = 0; r < nRows; r++) drawRow(r);
+    };
+
+    self.hover = function (x, y) {
+      var h = hitAt(hits, x, y);
+      if (!h) return null;
+      if (h[5] > 1) {
+        return h[5] + ' patterns of ' + driverName[ROWS.driver[N.row[h[4]]]] + ' merged (from p' +
+          N.pattern[h[4]] + ', job=' + S[N.job[h[4]]] + '), zoom in to separate them';
+      }
+      return nodeTitle(h[4]);
+    };
+
+    timeInteraction(self);
+    return self;
+  }
+
+  // ---- Memory address timeline: address (non-linear) x time ----
+  function AddrChart() {
+    var X0 = 110, PW = WIDTH - 110 - 24, H = 560, YT = 36, PH = 472, YB = YT + PH;
+    var c = setupCanvas('df-addr', WIDTH, H), ctx = c.ctx, hits = [];
+    var self = {cv: c.cv, x0: X0, pw: PW};
+    var nReg = R.node.length, regStart = new Float64Array(nReg);
+    for (var j = 0; j < nReg; j++) regStart[j] = N.start[R.node[j]];
+    var ticks = [0, A.max].concat(A.bands.map(function (b) { return b[0]; }));
+    ticks = ticks.filter(function (v, k) { return ticks.indexOf(v) === k; }).sort(function (a, b) { return a - b; });
+
+    function px(t) { return X0 + (t - time.t0) / (time.t1 - time.t0) * PW; }
+
+    function ay(addr) {
+      var ca = A.cum_addr, a = Math.max(0, Math.min(addr, A.max));
+      if (ca.length < 2) return YT;
+      var k = Math.min(ca.length - 2, Math.max(0, lowerBound(ca, a + 1, 0, ca.length) - 1));
+      var a0 = ca[k], a1 = ca[k + 1], y0 = A.cum_y[k], y1 = A.cum_y[k + 1];
+      return YT + (a1 === a0 ? y0 : y0 + (a - a0) / (a1 - a0) * (y1 - y0)) * PH;
+    }
+
+    function ah(base, size) { return Math.max(1.5, ay(base + size) - ay(base)); }
+
+    self.draw = function () {
+      hits = [];
+      ctx.fillStyle = '#ffffff';
+      ctx.fillRect(0, 0, WIDTH, H);
+      text(ctx, 'Memory Address Timeline', X0, 22, 'bold 14px ' + FONT, '#111');
+
+      // Background bands, one per region
+      A.bands.forEach(function (b, k) {
+        ctx.fillStyle = k % 2 === 0 ? '#f5f5f5' : '#ebebeb';
+        ctx.fillRect(X0, ay(b[0]), PW, ah(b[0], b[1]));
+      });
+      // Region start addresses (labels at least 8 px apart)
+      var prevY = -999;
+      ctx.strokeStyle = '#d0d0d0';
+      ctx.lineWidth = 0.5;
+      ticks.forEach(function (addr) {
+        var ty = ay(addr);
+        line(ctx, X0 - 3, ty, X0 + PW, ty);
+        if (Math.abs(ty - prevY) >= 8) {
+          text(ctx, '0x' + hex(addr, 5).toUpperCase(), X0 - 5, ty + 7, '7.5px monospace', '#777', 'right');
+          prevY = ty;
+        }
+      });
+      timeAxis(ctx, X0, PW, YT, YB, YB + 13, '#e8e8e8', '10px ' + FONT);
+      ctx.strokeStyle = '#999';
+      ctx.lineWidth = 1;
+      ctx.strokeRect(X0, YT, PW, PH);
+      axisCaption(ctx, X0, PW, H);
+
+      ctx.save();
+      ctx.beginPath();
+      ctx.rect(X0, YT, PW, PH);
+      ctx.clip();
+      // Accesses are sorted by start: the visible ones start after t0 - max_dur
+      var merged = new Map();
+      var hi = lowerBound(regStart, time.t1, 0, nReg);
+      for (var j = lowerBound(regStart, time.t0 - R.max_dur, 0, hi); j < hi; j++) {
+        var i = R.node[j];
+        if (N.end[i] <= time.t0) continue;
+        var x0 = px(N.start[i]), w = Math.max(1.5, px(N.end[i]) - x0);
+        var ry = ay(R.base[j]), y0 = Math.max(YT, ry), y1 = Math.min(YB, ry + ah(R.base[j], R.size[j]));
+        if (y1 <= y0) continue;
+        if (w < 2) {
+          // Sub-pixel access: one mark per pixel column, band and kind
+          var key = Math.round(x0) + ',' + Math.round(y0) + ',' + Math.round(y1) + ',' + R.kind[j];
+          var m = merged.get(key);
+          if (m) m.n++; else merged.set(key, {x: Math.round(x0), y0: y0, y1: y1, kind: R.kind[j], j: j, n: 1});
+          continue;
+        }
+        var col = KIND_COLORS[R.kind[j]];
+        roundRect(ctx, x0, y0, w, y1 - y0, 1.5);
+        ctx.globalAlpha = 0.45;
+        ctx.fillStyle = col;
+        ctx.fill();
+        ctx.globalAlpha = 1;
+        ctx.strokeStyle = col;
+        ctx.lineWidth = 0.7;
+        ctx.stroke();
+        if (w >= 8 && y1 - y0 >= 9) {
+          var job = S[N.job[i]], perLine = Math.max(1, Math.floor((w - 4) / 4));
+          ctx.save();
+          ctx.beginPath();
+          ctx.rect(x0, y0, w, y1 - y0);
+          ctx.clip();
+          for (var li = 0; li * perLine < job.length; li++) {
+            var ty = y0 + 8 + li * 9;
+            if (ty > y1) break;
+            text(ctx, job.substr(li * perLine, perLine), x0 + 2, ty, '7px ' + FONT, '#111');
+          }
+          ctx.restore();
+        }
+        hits.push([x0, y0, x0 + w, y1, j, 1]);
+      }
+      merged.forEach(function (m) {
+        ctx.globalAlpha = m.n > 1 ? 0.7 : 0.45;
+        ctx.fillStyle = KIND_COLORS[m.kind];
+        ctx.fillRect(m.x, m.y0, 1.5, m.y1 - m.y0);
+        hits.push([m.x - 1, m.y0, m.x + 2.5, m.y1, m.j, m.n]);
+      });
+      ctx.globalAlpha = 1;
+      ctx.restore();
+
+      [['Read from TCDM', 0], ['Write to TCDM', 1], ['Read + Write', 2]].forEach(function (l, k) {
+        var lx = X0 + k * 200, ly = YB + 26;
+        ctx.globalAlpha = 0.6;
+        ctx.fillStyle = KIND_COLORS[l[1]];
+        ctx.fillRect(lx, ly, 10, 10);
+        ctx.globalAlpha = 1;
+        ctx.strokeStyle = KIND_COLORS[l[1]];
+        ctx.strokeRect(lx, ly, 10, 10);
+        text(ctx, l[0], lx + 14, ly + 9, '10px ' + FONT, '#333');
+      });
+    };
+
+    self.hover = function (x, y) {
+      var h = hitAt(hits, x, y);
+      if (!h) return null;
+      var j = h[4], i = R.node[j];
+      if (h[5] > 1) return h[5] + ' accesses merged (e.g. ' + S[N.job[i]] + '), zoom in to separate them';
+      return S[N.job[i]] + ' [' + N.start[i] + ', ' + N.end[i] + ') 0x' + hex(R.base[j], 5).toUpperCase() +
+        '+' + R.size[j] + 'B ' + KIND_NAMES[R.kind[j]];
+    };
+
+    timeInteraction(self);
+    return self;
+  }
+
+  // ---- Bank load heatmap: bank x time bucket access counts ----
+  function BankChart() {
+    var B = D.banks, X0 = 110, PW = WIDTH - 110 - 24, YT = 36;
+    var CELL_H = Math.max(3, Math.min(14, Math.floor(320 / B.n))), PH = CELL_H * B.n;
+    var H = YT + PH + 62, span = D.total / B.buckets;
+    var c = setupCanvas('df-banks', WIDTH, H), ctx = c.ctx;
+    var self = {cv: c.cv, x0: X0, pw: PW};
+    var labelStep = Math.ceil(10 / CELL_H);
+
+    function px(t) { return X0 + (t - time.t0) / (time.t1 - time.t0) * PW; }
+
+    function heat(v) {
+      return v > 0 ? 'hsl(' + (60 - 60 * v) + ',90%,' + (92 - 52 * v) + '%)' : '#f7f7f7';
+    }
+
+    self.draw = function () {
+      ctx.fillStyle = '#ffffff';
+      ctx.fillRect(0, 0, WIDTH, H);
+      text(ctx, 'Bank Utilization', X0, 22, 'bold 14px ' + FONT, '#111');
+      var k0 = Math.max(0, Math.floor(time.t0 / span)), k1 = Math.min(B.buckets - 1, Math.floor(time.t1 / span));
+      for (var b = 0; b < B.n; b++) {
+        var y = YT + b * CELL_H;
+        for (var k = k0; k <= k1; k++) {
+          var x0 = Math.max(X0, px(k * span)), x1 = Math.min(X0 + PW, px((k + 1) * span));
+          ctx.fillStyle = heat(B.max ? B.counts[b * B.buckets + k] / B.max : 0);
+          ctx.fillRect(x0, y, Math.max(1, x1 - x0), CELL_H);
+        }
+        if (b % labelStep === 0) {
+          text(ctx, 'bank ' + b, X0 - 6, y + Math.min(CELL_H, 10) - 1, '9px ' + FONT, '#555', 'right');
+        }
+      }
+      timeAxis(ctx, X0, PW, YT + PH, YT + PH + 4, YT + PH + 15, '#999', '10px ' + FONT);
+      ctx.strokeStyle = '#999';
+      ctx.lineWidth = 1;
+      ctx.strokeRect(X0, YT, PW, PH);
+      text(ctx, 'Transaction number', X0 + PW / 2, YT + PH + 30, '12px ' + FONT, '#333', 'center');
+      // Color scale
+      var lx = X0, ly = H - 14;
+      for (var i = 0; i <= 100; i++) {
+        ctx.fillStyle = heat(i / 100);
+        ctx.fillRect(lx + 40 + i * 1.5, ly - 9, 1.5, 10);
+      }
+      text(ctx, '0', lx + 34, ly, '10px ' + FONT, '#333', 'right');
+      text(ctx, B.max + ' accesses per bank and bucket', lx + 198, ly, '10px ' + FONT, '#333');
+    };
+
+    self.hover = function (x, y) {
+      if (x < X0 || x > X0 + PW || y < YT || y >= YT + PH) return null;
+      var b = Math.floor((y - YT) / CELL_H), t = time.t0 + (x - X0) / PW * (time.t1 - time.t0);
+      var k = Math.min(B.buckets - 1, Math.max(0, Math.floor(t / span)));
+      return 'bank ' + b + ' [' + Math.round(k * span) + ', ' + Math.round((k + 1) * span) + '): ' +
+        B.counts[b * B.buckets + k] + ' accesses (bank total ' + B.per_bank[b] + ')';
+    };
+
+    timeInteraction(self);
+    return self;
+  }
+
+  // ---- Job dependency graph: columns by longest-path level ----
+  function DagChart() {
+    var NODE_H = 28, V_GAP = 12, H_GAP = 70, XL = 20, YT = 50, NW = G.node_w;
+    var COL_W = NW + H_GAP, ROW_STEP = NODE_H + V_GAP;
+    var nJobs = G.job.length, byLevel = [], maxRow = 0;
+    for (var j = 0; j < nJobs; j++) {
+      (byLevel[G.level[j]] = byLevel[G.level[j]] || [])[G.row[j]] = j;
+      maxRow = Math.max(maxRow, G.row[j]);
+    }
+    var fullW = XL + byLevel.length * COL_W + 20, fullH = YT + (maxRow + 1) * ROW_STEP + 30;
+    var H = Math.max(200, Math.min(640, fullH));
+    var c = setupCanvas('df-dag', WIDTH, H), ctx = c.ctx;
+    var minScale = Math.min(1, WIDTH / fullW, H / fullH) / 2;
+    var view = {x: 0, y: 0, s: 1};   // screen = (world - view) * s
+
+    function nx(j) { return XL + G.level[j] * COL_W; }
+    function ny(j) { return YT + G.row[j] * ROW_STEP; }
+    function sx(wx) { return (wx - view.x) * view.s; }
+    function sy(wy) { return (wy - view.y) * view.s; }
+
+    function draw() {
+      var s = view.s, detail = NODE_H * s >= 6;
+      var wx0 = view.x, wx1 = view.x + WIDTH / s, wy0 = view.y, wy1 = view.y + H / s;
+      ctx.fillStyle = '#ffffff';
+      ctx.fillRect(0, 0, WIDTH, H);
+
+      // Edges crossing the viewport (drawn before the nodes)
+      ctx.strokeStyle = '#aaa';
+      ctx.fillStyle = '#888';
+      ctx.lineWidth = detail ? 1.2 : 0.6;
+      for (var e = 0; e < G.edges.length; e += 2) {
+        var a = G.edges[e], b = G.edges[e + 1];
+        var x1 = nx(a) + NW, y1 = ny(a) + NODE_H / 2, x2 = nx(b), y2 = ny(b) + NODE_H / 2;
+        if (Math.max(x1, x2) < wx0 || Math.min(x1, x2) > wx1 || Math.max(y1, y2) < wy0 || Math.min(y1, y2) > wy1) continue;
+        ctx.beginPath();
+        ctx.moveTo(sx(x1), sy(y1));
+        if (detail) {
+          var mx = sx((x1 + x2) / 2);
+          ctx.bezierCurveTo(mx, sy(y1), mx, sy(y2), sx(x2), sy(y2));
+          ctx.stroke();
+          ctx.beginPath();
+          ctx.moveTo(sx(x2), sy(y2));
+          ctx.lineTo(sx(x2) - 8, sy(y2) - 3.5);
+          ctx.lineTo(sx(x2) - 8, sy(y2) + 3.5);
+          ctx.fill();
+        } else {
+          ctx.lineTo(sx(x2), sy(y2));
+          ctx.stroke();
+        }
+      }
+
+      // Nodes: only the visible levels and rows are visited
+      var l0 = Math.max(0, Math.floor((wx0 - XL - NW) / COL_W)), l1 = Math.min(byLevel.length - 1, Math.floor((wx1 - XL) / COL_W));
+      var r0 = Math.max(0, Math.floor((wy0 - YT - NODE_H) / ROW_STEP)), r1 = Math.floor((wy1 - YT) / ROW_STEP);
+      for (var l = l0; l <= l1; l++) {
+        var col = byLevel[l] || [];
+        for (var r = r0; r <= Math.min(r1, col.length - 1); r++) {
+          var jj = col[r];
+          if (jj === undefined) continue;
+          var x = sx(nx(jj)), y = sy(ny(jj)), w = NW * s, h = NODE_H * s;
+          ctx.fillStyle = color(G.driver[jj]);
+          if (!detail) {
+            ctx.fillRect(x, y, Math.max(1, w), Math.max(1, h));
+            if (G.crit[jj]) {
+              ctx.strokeStyle = '#b00020';
+              ctx.lineWidth = 1.5;
+              ctx.strokeRect(x, y, Math.max(1, w), Math.max(1, h));
+            }
+            continue;
+          }
+          roundRect(ctx, x, y, w, h, 4 * s);
+          ctx.globalAlpha = 0.88;
+          ctx.fill();
+          ctx.globalAlpha = 1;
+          ctx.strokeStyle = G.crit[jj] ? '#b00020' : '#333';
+          ctx.lineWidth = G.crit[jj] ? 2.5 : 0.8;
+          ctx.stroke();
+          if (9 * s >= 5) {
+            ctx.save();
+            ctx.beginPath();
+            ctx.rect(x, y, w, h);
+            ctx.clip();
+            text(ctx, S[G.job[jj]], x + 6 * s, y + 18 * s, (9 * s) + 'px ' + FONT, '#ffffff');
+            ctx.restore();
+          }
+        }
+      }
+      ctx.fillStyle = '#ffffff';
+      ctx.fillRect(0, 0, WIDTH, 30);
+      text(ctx, 'Job Dependency Graph', XL, 22, 'bold 14px ' + FONT, '#111');
+    }
+
+    function clampView() {
+      view.x = Math.max(-WIDTH / view.s / 2, Math.min(view.x, fullW - WIDTH / view.s / 2));
+      view.y = Math.max(-H / view.s / 2, Math.min(view.y, fullH - H / view.s / 2));
+      redraw();
+    }
+
+    interact(c.cv, {
+      zoom: function (x, y, f) {
+        var s = Math.max(minScale, Math.min(4, view.s / f));
+        var wx = view.x + x / view.s, wy = view.y + y / view.s;
+        view.s = s;
+        view.x = wx - x / s;
+        view.y = wy - y / s;
+        clampView();
+      },
+      pan: function (dx, dy) {
+        view.x -= dx / view.s;
+        view.y -= dy / view.s;
+        clampView();
+      },
+      reset: function () {
+        view = {x: 0, y: 0, s: 1};
+        redraw();
+      },
+      hover: function (x, y) {
+        var wx = view.x + x / view.s, wy = view.y + y / view.s;
+        var l = Math.floor((wx - XL) / COL_W), r = Math.floor((wy - YT) / ROW_STEP);
+        if (l < 0 || r < 0 || !byLevel[l] || wx - XL - l * COL_W > NW || wy - YT - r * ROW_STEP > NODE_H) return null;
+        var jj = byLevel[l][r];
+        if (jj === undefined) return null;
+        return S[G.job[jj]] + ' (' + (driverName[G.driver[jj]] || 'driver ' + G.driver[jj]) + ')' +
+          (G.crit[jj] ? ' | critical path' : '');
+      },
+    });
+    return {draw: draw};
+  }
+
+  charts.push(ExecChart(), AddrChart(), DagChart());
+  if (D.banks && document.getElementById('df-banks')) charts.push(BankChart());
+  redraw();
+})();
@@ -5,6 +5,11 @@ This package provides classes and functions for generating test stimuli
 for the HCI verification environment.
 """
 
-from .generator import StimuliGenerator
+from .compression import COMPRESSIONS, codec_available, compressed_path, open_stimuli, plain_path, stimuli_files
+from .descriptors import AffineDescriptor
+from .generator import DATA_MODES, StimuliGenerator, address_payload
+from .shaping import TrafficShaper
+from .timed import to_timed_lines, write_timed_stimuli
+from .totals import stimuli_totals, write_stimuli_header
 
-__all__ = ['StimuliGenerator']
+__all__ = ['COMPRESSIONS', 'codec_available', 'compressed_path', 'open_stimuli', 'plain_path', 'stimuli_files', 'AffineDescriptor', 'DATA_MODES', 'StimuliGenerator', 'address_payload', 'TrafficShaper', 'to_timed_lines', 'write_timed_stimuli', 'stimuli_totals', 'write_stimuli_header']
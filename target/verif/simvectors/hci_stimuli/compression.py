@@ -0,0 +1,65 @@
+"""Compressed stimuli files.
+
+A stimuli file may be stored as master_*.txt, master_*.txt.gz or
+master_*.txt.zst. open_stimuli() picks the codec from the suffix, so every
+reader and writer of stimuli goes through it and handles all three alike.
+gzip comes with Python; .zst needs the zstandard package.
+
+The simulator always reads the plain master_*.txt path: run-verif turns it
+into a named pipe fed by 'gzip -dc' / 'zstd -dc' (see verif.mk).
+"""
+
+import gzip
+import io
+
+try:
+    import zstandard
+except ImportError:  # only needed for .zst stimuli
+    zstandard = None
+
+# --compress choice -> file suffix appended to master_*.txt
+COMPRESSIONS = {'none': '', 'gz': '.gz', 'zst': '.zst'}
+
+STIMULI_GLOBS = tuple(f"master_*.txt{suffix}" for suffix in COMPRESSIONS.values())
+
+
+def plain_path(path):
+    """master_*.txt path of a (possibly compressed) stimuli file."""
+    for suffix in COMPRESSIONS.values():
+        if suffix and path.name.endswith(suffix):
+            return path.with_name(path.name[:-len(suffix)])
+    return path
+
+
+def compressed_path(path, compression):
+    """Path of a stimuli file once stored with the given compression."""
+    plain = plain_path(path)
+    return plain.with_name(plain.name + COMPRESSIONS[compression])
+
+
+def stimuli_files(stimuli_dir):
+    """Sorted stimuli files of a directory, whatever their compression."""
+    paths = set()
+    for pattern in STIMULI_GLOBS:
+        paths.update(stimuli_dir.glob(pattern))
+    return sorted(paths, key=lambda p: p.name)
+
+
+def codec_available(compression):
+    return compression != 'zst' or zstandard is not None
+
+
+def open_stimuli(path, mode='r'):
+    """Open a stimuli file in text mode ('r', 'w' or 'a'), compressed by suffix."""
+    name = str(path)
+    if name.endswith('.gz'):
+        # mtime=0 keeps the archives of identical stimuli identical
+        if mode == 'r':
+            return gzip.open(path, 'rt', encoding='ascii')
+        raw = gzip.GzipFile(path, mode + 'b', mtime=0)
+        return io.TextIOWrapper(raw, encoding='ascii')
+    if name.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"{path}: reading or writing .zst stimuli needs the zstandard package")
+        return zstandard.open(path, mode + 't', encoding='ascii')
+    return open(path, mode, encoding='ascii')
@@ -0,0 +1,143 @@
+"""Descriptor stimuli: affine address streams expanded by the application driver.
+
+A descriptor replaces the expanded request lines of a regular pattern with
+one line that application_driver.sv expands cycle by cycle:
+
+  DESC n id_start base stride0 len_d0 stride1 len_d1 stride2 wrap n_reads wen_seed
+       idle_num idle_den idle_credit row_gap tail_gap last_be data_mode data_state
+
+(one line; base, wen_seed and data_state are hex, everything else decimal).
+
+Request t (0 <= t < n) uses the loop indices i < len_d0, j < len_d1, k
+(len_d0/len_d1 = 0 means unbounded):
+
+  off  = i*stride0 + j*stride1 + k*stride2       (in words)
+  off  = off mod wrap                            (if wrap > 0)
+  add  = base + off * DATA_WIDTH/8
+  id   = id_start + t
+  wen  = t < n_reads, or bit 0 of the wen LFSR stepped once per request when
+         wen_seed != 0
+  be   = all ones, or the low last_be bytes for the last request if last_be > 0
+
+After each request the driver owes idle cycles: idle_num/idle_den per request
+by error diffusion (the credit starts at idle_credit), plus tail_gap after the
+last request or row_gap after a request that completes a len_d0 row.
+
+Write payloads follow data_mode (index into DATA_MODE_CODES); data_state is
+the LFSR state or the write count the pattern had reached before the
+descriptor. 'random' payloads are drawn by the simulator and are not
+reproduced by expand().
+"""
+
+from fractions import Fraction
+
+# Same order as the data_mode case in application_driver.sv
+DATA_MODE_CODES = ('random', 'address', 'counter', 'lfsr', 'zeros')
+
+LFSR_TAPS = 0x80200003
+
+
+def lfsr_step(state):
+    """One step of the 32-bit Galois LFSR x^32 + x^22 + x^2 + x + 1."""
+    return (state >> 1) ^ (LFSR_TAPS if state & 1 else 0)
+
+
+class AffineDescriptor:
+    """One DESC line: n requests over an affine (optionally wrapping) address stream."""
+
+    def __init__(self, n, id_start, base, stride0=1, len_d0=0, stride1=0, len_d1=0, stride2=0,
+                 wrap=0, n_reads=0, wen_seed=0, idle_ratio=Fraction(0), idle_credit=Fraction(0),
+                 row_gap=0, tail_gap=0, last_be=0, data_mode='random', data_state=0):
+        self.n = int(n)
+        self.id_start = int(id_start)
+        self.base = int(base)
+        self.stride0 = int(stride0)
+        self.len_d0 = int(len_d0)
+        self.stride1 = int(stride1)
+        self.len_d1 = int(len_d1)
+        self.stride2 = int(stride2)
+        self.wrap = int(wrap)
+        self.n_reads = int(n_reads)
+        self.wen_seed = int(wen_seed) & 0xFFFFFFFF
+        self.idle_ratio = Fraction(idle_ratio)
+        # the credit is a fraction of the same denominator as the ratio
+        self.idle_credit = Fraction(idle_credit)
+        self.row_gap = int(row_gap)
+        self.tail_gap = int(tail_gap)
+        self.last_be = int(last_be)
+        self.data_mode = data_mode
+        self.data_state = int(data_state) & 0xFFFFFFFF
+
+    @classmethod
+    def from_line(cls, line):
+        """Parse a DESC line written by to_line()."""
+        fields = line.split()
+        if len(fields) != 20 or fields[0] != 'DESC':
+            raise ValueError(f"malformed descriptor line: {line.strip()!r}")
+        v = fields[1:]
+        den = int(v[12])
+        return cls(
+            int(v[0]), int(v[1]), int(v[2], 16), stride0=int(v[3]), len_d0=int(v[4]),
+            stride1=int(v[5]), len_d1=int(v[6]), stride2=int(v[7]), wrap=int(v[8]),
+            n_reads=int(v[9]), wen_seed=int(v[10], 16), idle_ratio=Fraction(int(v[11]), den),
+            idle_credit=Fraction(int(v[13]), den), row_gap=int(v[14]), tail_gap=int(v[15]),
+            last_be=int(v[16]), data_mode=DATA_MODE_CODES[int(v[17])], data_state=int(v[18], 16),
+        )
+
+    def n_read_requests(self):
+        if not self.wen_seed:
+            return min(self.n_reads, self.n)
+        return sum(wen for _, wen, _ in self.expand(1))
+
+    def to_line(self):
+        den = self.idle_ratio.denominator
+        credit = self.idle_credit * den
+        if credit.denominator != 1:
+            raise ValueError("idle_credit must be a multiple of 1/idle_den")
+        return (
+            f"DESC {self.n} {self.id_start} {self.base:x} {self.stride0} {self.len_d0} "
+            f"{self.stride1} {self.len_d1} {self.stride2} {self.wrap} {self.n_reads} "
+            f"{self.wen_seed:x} {self.idle_ratio.numerator} {den} {int(credit)} "
+            f"{self.row_gap} {self.tail_gap} {self.last_be} "
+            f"{DATA_MODE_CODES.index(self.data_mode)} {self.data_state:x}"
+        )
+
+    def expand(self, access_bytes):
+        """Yield (addr, wen, idles_after) per request, as application_driver.sv does."""
+        num = self.idle_ratio.numerator
+        den = self.idle_ratio.denominator
+        credit = int(self.idle_credit * den)
+        wen_state = self.wen_seed
+        i = j = k = 0
+        for t in range(self.n):
+            off = i * self.stride0 + j * self.stride1 + k * self.stride2
+            if self.wrap > 0:
+                off %= self.wrap
+            if self.wen_seed:
+                wen_state = lfsr_step(wen_state)
+                wen = wen_state & 1
+            else:
+                wen = 1 if t < self.n_reads else 0
+            credit += num
+            idles = credit // den
+            credit -= idles * den
+            i += 1
+            row_done = False
+            if self.len_d0 and i == self.len_d0:
+                i = 0
+                j += 1
+                row_done = True
+                if self.len_d1 and j == self.len_d1:
+                    j = 0
+                    k += 1
+            if t == self.n - 1:
+                idles += self.tail_gap
+            elif row_done:
+                idles += self.row_gap
+            yield self.base + off * access_bytes, wen, idles
+
+    def final_credit(self):
+        """Shaping credit left after the last request (carried into the next descriptor)."""
+        den = self.idle_ratio.denominator
+        credit = self.idle_credit * den + self.n * self.idle_ratio.numerator
+        return Fraction(int(credit) % den, den)
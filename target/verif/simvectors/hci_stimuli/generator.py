@@ -12,13 +12,125 @@ be is all-ones for full-width transactions. For a trailing beat that covers only
   For reads (wen=1) be is still driven (all-ones for full, partial for trailing)
   for documentation/tracing purposes; the memory subsystem typically ignores be on
   reads.
+
+Write payloads follow the pattern's data mode (see DATA_MODES). Patterns pass
+data=None for writes and _write_req fills it in once the address is known.
+Random payloads are filled in by PayloadBatch, one payloads(n) call per batch
+of pending writes.
+
+With stim_format='descriptors' the regular patterns write one DESC line per
+address stream instead of the expanded requests (see descriptors.py).
 """
 
 import os
 import random
 
+try:
+    import numpy as np
+except ImportError:  # the byte LUT below encodes the same bits, only slower
+    np = None
+
+from .descriptors import lfsr_step
 from .patterns import PatternsMixin
 
+# Write payload per data mode:
+#   random  - uniformly random DATA_WIDTH bits
+#   address - every 32-bit lane holds its own byte address, so a read returns
+#             either the initial memory content or address_payload(addr)
+#   counter - running write count of the pattern, zero-extended
+#   lfsr    - 32-bit Galois LFSR (x^32 + x^22 + x^2 + x + 1), one step per
+#             write, replicated over the 32-bit lanes
+#   zeros   - all zeros
+DATA_MODES = ('random', 'address', 'counter', 'lfsr', 'zeros')
+
+# Stimulus formats: expanded request lines, or DESC lines for regular patterns
+STIM_FORMATS = ('lines', 'descriptors')
+
+# Most random-mode writes a pattern holds back before their payloads are drawn
+# in one payloads(n) call, and most other lines held back behind them
+PAYLOAD_BLOCK = 1024
+PAYLOAD_MAX_LINES = 16 * PAYLOAD_BLOCK
+
+_BYTE_BITS = [format(b, '08b') for b in range(256)]
+
+
+def encode_payloads(block, data_width):
+    """Encode raw payload bytes as data_width-bit binary strings, MSB first."""
+    n_bytes = data_width // 8
+    if np is not None:
+        bits = np.unpackbits(np.frombuffer(block, dtype=np.uint8))
+        text = (bits + ord('0')).tobytes().decode('ascii')
+    else:
+        text = ''.join([_BYTE_BITS[b] for b in block])
+    return [text[i:i + data_width] for i in range(0, len(block) // n_bytes * data_width, data_width)]
+
+
+def _lane_constants(data_width):
+    """(replicate, lane offsets): x * replicate + offsets puts x + 4*k in 32-bit lane k."""
+    n_lanes = max(1, data_width // 32)
+    replicate = sum(1 << (32 * lane) for lane in range(n_lanes))
+    offsets = sum((4 * lane) << (32 * lane) for lane in range(n_lanes))
+    return replicate, offsets
+
+
+def address_payload(addr, data_width):
+    """Payload written to byte address addr in 'address' data mode, as an int."""
+    replicate, offsets = _lane_constants(data_width)
+    return ((addr & 0xFFFFFFFF) * replicate + offsets) & ((1 << data_width) - 1)
+
+
+class PayloadBatch:
+    """Output file of a pattern that fills in its random write payloads in batches.
+
+    A random-mode write is held back, with every line written after it, until
+    PAYLOAD_BLOCK writes (or PAYLOAD_MAX_LINES other lines) are pending or the
+    pattern closes the file. The pending writes then get their payloads from
+    one payloads(n) call of exactly their number.
+    """
+
+    def __init__(self, file_ctx, generator):
+        self.file_ctx = file_ctx
+        self.generator = generator
+        self.file_obj = None
+        self.parts = []
+        self.slots = []
+        self.n_lines = 0
+
+    def __enter__(self):
+        self.file_obj = self.file_ctx.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.flush()
+        return self.file_ctx.__exit__(*exc_info)
+
+    def write(self, text):
+        if not self.slots:
+            self.file_obj.write(text)
+            return
+        self.parts.append(text)
+        self.n_lines += 1
+        if self.n_lines >= PAYLOAD_MAX_LINES:
+            self.flush()
+
+    def write_random(self, head, tail):
+        """Hold back the line head + <next random payload> + tail."""
+        self.slots.append(len(self.parts) + 1)
+        self.parts.extend((head, None, tail))
+        if len(self.slots) >= PAYLOAD_BLOCK:
+            self.flush()
+
+    def flush(self):
+        if not self.slots:
+            return
+        for slot, data in zip(self.slots, self.generator.payloads(len(self.slots))):
+            self.parts[slot] = data
+        self.file_obj.write(''.join(self.parts))
+        self.parts = []
+        self.slots = []
+        self.n_lines = 0
+
 
 class StimuliGenerator(PatternsMixin):
     def __init__(
@@ -32,6 +144,10 @@ class StimuliGenerator(PatternsMixin):
         filepath,
         N_TEST,
         MASTER_NUMBER_IDENTIFICATION,
+        data_mode='random',
+        seed=None,
+        stim_format='lines',
+        stream=None,
     ):
         self.WIDTH_OF_MEMORY = WIDTH_OF_MEMORY
         self.WIDTH_OF_MEMORY_BYTE = int(WIDTH_OF_MEMORY / 8)
@@ -40,10 +156,33 @@ class StimuliGenerator(PatternsMixin):
         self.DATA_WIDTH = DATA_WIDTH
         self.ADD_WIDTH = int(ADD_WIDTH)
         self.filepath = filepath
+        # Open file object (e.g. a named pipe) that the patterns write to
+        # instead of opening filepath; it is left open for the next pattern
+        self.stream = stream
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         self.N_TEST = N_TEST
         self.IW = IW
         self.MASTER_NUMBER_IDENTIFICATION = MASTER_NUMBER_IDENTIFICATION
+        if data_mode not in DATA_MODES:
+            raise ValueError(f"unknown data_mode {data_mode!r}, expected one of {', '.join(DATA_MODES)}")
+        self.data_mode = data_mode
+        if stim_format not in STIM_FORMATS:
+            raise ValueError(f"unknown stim_format {stim_format!r}, expected one of {', '.join(STIM_FORMATS)}")
+        self.stim_format = stim_format
+        self._data_fmt = f"0{self.DATA_WIDTH}b"
+        self._data_mask = (1 << self.DATA_WIDTH) - 1
+        self._zero_data = "0" * self.DATA_WIDTH
+        self._n_writes = 0
+        self._lfsr = (0xACE1ACE1 ^ MASTER_NUMBER_IDENTIFICATION) or 1
+        self._lane_replicate, self._lane_offsets = _lane_constants(self.DATA_WIDTH)
+        # Payload RNG: seeded for reproducible stimuli, OS entropy otherwise
+        self.rng = random.Random(seed)
+        # drawn bytes not used by the last payloads() call (less than 4)
+        self._payload_tail = b''
+
+    def _open(self, append):
+        f = super()._open(append)
+        return PayloadBatch(f, self) if self.data_mode == 'random' else f
 
     @property
     def _ab(self):
@@ -73,17 +212,60 @@ class StimuliGenerator(PatternsMixin):
     def _format_id(self, id_value):
         return bin(id_value % (1 << self.IW))[2:].zfill(self.IW)
 
+    def payloads(self, n):
+        """Next n random payloads of the pattern as DATA_WIDTH-bit binary strings.
+
+        Bytes are drawn in whole 32-bit Mersenne Twister outputs and the unused
+        rest is kept for the next call, so the same seed yields the same
+        payloads however they are batched.
+        """
+        n_bytes = max(0, int(n)) * (self.DATA_WIDTH // 8)
+        missing = n_bytes - len(self._payload_tail)
+        block = self._payload_tail
+        if missing > 0:
+            block += self.rng.randbytes((missing + 3) // 4 * 4)
+        self._payload_tail = block[n_bytes:]
+        return encode_payloads(block[:n_bytes], self.DATA_WIDTH)
+
     def random_data(self):
-        data_decimal = random.randint(0, (2 ** self.DATA_WIDTH) - 1)
-        return bin(data_decimal)[2:].zfill(self.DATA_WIDTH)
+        """One random payload; the patterns batch theirs through PayloadBatch."""
+        return self.payloads(1)[0]
+
+    def _lfsr_data(self):
+        state = lfsr_step(self._lfsr)
+        self._lfsr = state
+        return format((state * self._lane_replicate) & self._data_mask, self._data_fmt)
+
+    def write_data(self, add):
+        """Payload of the next write to add (binary address string) in this data mode."""
+        mode = self.data_mode
+        self._n_writes += 1
+        if mode == 'random':
+            return self.random_data()
+        if mode == 'zeros':
+            return self._zero_data
+        if mode == 'address':
+            addr = int(add, 2) & 0xFFFFFFFF
+            return format((addr * self._lane_replicate + self._lane_offsets) & self._data_mask,
+                          self._data_fmt)
+        if mode == 'counter':
+            return format((self._n_writes - 1) & self._data_mask, self._data_fmt)
+        return self._lfsr_data()
 
     def _write_req(self, file_obj, id_value, wen, data, add, be=None):
         """Write one active-request line (req=1).
 
         be: binary string of BE_WIDTH bits. Defaults to all-ones (full beat).
+        data: binary string, or None for a write payload chosen by the data mode.
         """
         if be is None:
             be = self._full_be()
+        if data is None and not wen and self.data_mode == 'random' and isinstance(file_obj, PayloadBatch):
+            self._n_writes += 1
+            file_obj.write_random("1 " + self._format_id(id_value) + " 0 " + be + " ", " " + add + "\n")
+            return
+        if data is None:
+            data = self._zero_data if wen else self.write_data(add)
         file_obj.write(
             "1 "
             + self._format_id(id_value)
@@ -119,7 +301,7 @@ class StimuliGenerator(PatternsMixin):
     def data_wen(self):
         wen = random.randint(0, 1)  # 1=read, 0=write
         if wen:
-            data = "0" * self.DATA_WIDTH
+            data = self._zero_data
         else:
-            data = self.random_data()
+            data = None  # filled in by _write_req from the data mode
         return data, wen
@@ -3,7 +3,8 @@
 Each method writes a cycle-accurate stimuli file directly (one line per cycle):
   req(1b) id(IWb) wen(1b) be(BEWb) data(Nb) add(Ab)
 
-req=0 lines are idle cycles. req=1 lines are active transactions.
+req=0 lines are idle cycles. req=1 lines are active transactions. traffic_pct
+idles are spread over the requests by the pattern's arrival model (see shaping.py).
 
 Fence semantics (one trailing PAUSE per pattern):
   Each pattern ends with a PAUSE. fence_idx[i] increments when resume_i fires while
@@ -18,9 +19,18 @@ Fence semantics (one trailing PAUSE per pattern):
   → fence_idx advances to N_patterns, signalling final completion to dependents.
 
 All generators accept append=True to open the file in append mode.
+
+linear, 2d, 3d and matmul_phased write DESC lines instead of the expanded
+requests when the generator uses stim_format='descriptors' and the driver can
+reproduce the pattern (see descriptors.py); otherwise they expand as usual.
 """
 
 import random
+from contextlib import nullcontext
+from fractions import Fraction
+
+from .descriptors import AffineDescriptor, lfsr_step
+from .shaping import TrafficShaper
 
 class PatternsMixin:
 
@@ -50,11 +60,6 @@ class PatternsMixin:
                 elif cb > 1: cb -= 1; cc = 1
         return ca, cb, cc
 
-    @staticmethod
-    def _idles_per_req(traffic_pct):
-        traffic_pct = max(1, min(100, int(traffic_pct)))
-        return 0 if traffic_pct >= 100 else int(round((100 - traffic_pct) / traffic_pct))
-
     def _is_allowed(self, add, wen, read_blocked_set, write_blocked_set):
         return add not in (read_blocked_set if wen else write_blocked_set)
 
@@ -105,8 +110,52 @@ class PatternsMixin:
         )
 
     def _open(self, append):
+        if self.stream is not None:
+            return nullcontext(self.stream)
         return open(self.filepath, "a" if append else "w", encoding="ascii")
 
+    def _wen_seed(self):
+        """Nonzero seed of the driver-side wen LFSR of a descriptor."""
+        return self.rng.getrandbits(32) | 1
+
+    def _emit_descriptors(self, pattern_name, descs, id_start, read_blocked, write_blocked,
+                          arrival=None, append=False):
+        """Write descs as DESC lines plus the trailing PAUSE, if the driver can expand them.
+
+        Returns the next id, or None when the pattern has to be expanded into
+        lines instead: a non-uniform arrival model, an out-of-range address, or
+        an access that the read/write blocked policy would skip.
+        """
+        if (arrival or {}).get('model', 'uniform') != 'uniform':
+            return None
+        read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
+        total = self._total_mem_bytes()
+        n_writes = self._n_writes
+        lfsr = self._lfsr
+        for desc in descs:
+            desc.data_mode = self.data_mode
+            desc.data_state = lfsr if self.data_mode == 'lfsr' else n_writes
+            for addr, wen, _ in desc.expand(self._ab):
+                if addr < 0 or addr + self._ab > total:
+                    return None
+                add = bin(addr)[2:].zfill(self.ADD_WIDTH)
+                if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
+                    return None
+                self._record_access(add, wen, read_blocked_set, write_blocked_set)
+                if not wen:
+                    n_writes += 1
+                    lfsr = lfsr_step(lfsr)
+        self._n_writes = n_writes
+        self._lfsr = lfsr
+        with self._open(append) as f:
+            for desc in descs:
+                f.write(desc.to_line() + "\n")
+            self._write_pause(f)
+        self._commit_blocked_sets(read_blocked, write_blocked, read_blocked_set, write_blocked_set)
+        id_value = id_start + sum(desc.n for desc in descs)
+        self._require_exact_emits(pattern_name, id_start, id_value)
+        return id_value
+
     def _total_mem_bytes(self):
         return int(self.TOT_MEM_SIZE * 1024)
 
@@ -190,7 +239,7 @@ class PatternsMixin:
     # ------------------------------------------------------------------ #
 
     def random_gen(self, id_start, read_blocked, write_blocked,
-                   region_base=0, region_size=None, traffic_pct=100,
+                   region_base=0, region_size=None, traffic_pct=100, arrival=None,
                    traffic_read_pct=None, trailing_bytes=0, append=False):
         total = int(self.TOT_MEM_SIZE * 1024)
         if region_size is None: region_size = total
@@ -203,7 +252,7 @@ class PatternsMixin:
                 f"random: region end 0x{region_base + region_size:X} exceeds total memory 0x{total:X}"
             )
         n_words = max(1, region_size // self._ab)
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         if traffic_read_pct is not None:
             rpct = max(0, min(100, int(traffic_read_pct)))
             n_reads = (self.N_TEST * rpct) // 100
@@ -218,7 +267,7 @@ class PatternsMixin:
             for i in range(self.N_TEST):
                 wen = wen_seq[i] if wen_seq is not None else None
                 if wen is None: data, wen = self.data_wen()
-                else: data = "0"*self.DATA_WIDTH if wen else self.random_data()
+                else: data = "0"*self.DATA_WIDTH if wen else None
                 placed = False
                 for _ in range(max_attempts):
                     ad = region_base + random.randint(0, int(n_words)-1)*self._ab
@@ -231,21 +280,32 @@ class PatternsMixin:
                     continue
                 be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                 self._write_req(f, id_value, wen, data, add, be=be); id_value += 1; tx_idx += 1
-                for _ in range(n_idles): self._write_idle(f)
+                for _ in range(shaper.idles()): self._write_idle(f)
             self._write_pause(f)
         self._commit_blocked_sets(read_blocked, write_blocked, read_blocked_set, write_blocked_set)
         self._require_exact_emits("random", id_start, id_value)
         return id_value
 
     def linear_gen(self, stride0, start_address, id_start, read_blocked, write_blocked,
-                   traffic_pct=100, traffic_read_pct=None, trailing_bytes=0, append=False):
-        n_idles = self._idles_per_req(traffic_pct)
+                   traffic_pct=100, arrival=None, traffic_read_pct=None, trailing_bytes=0, append=False):
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         if traffic_read_pct is not None:
             rpct = max(0, min(100, int(traffic_read_pct)))
             n_reads = (self.N_TEST * rpct) // 100
             wen_seq = [1]*n_reads + [0]*(self.N_TEST-n_reads)
         else:
             wen_seq = None
+        if self.stim_format == 'descriptors':
+            desc = AffineDescriptor(
+                self.N_TEST, id_start, self._parse_address(start_address), stride0=stride0,
+                n_reads=n_reads if wen_seq is not None else 0,
+                wen_seed=0 if wen_seq is not None else self._wen_seed(),
+                idle_ratio=shaper.ratio, last_be=trailing_bytes,
+            )
+            id_value = self._emit_descriptors("linear", [desc], id_start, read_blocked, write_blocked,
+                                              arrival, append)
+            if id_value is not None:
+                return id_value
         id_value = id_start
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         tx_idx = 0
@@ -260,7 +320,7 @@ class PatternsMixin:
             for i in range(self.N_TEST):
                 wen = wen_seq[i] if wen_seq is not None else None
                 if wen is None: data, wen = self.data_wen()
-                else: data = "0"*self.DATA_WIDTH if wen else self.random_data()
+                else: data = "0"*self.DATA_WIDTH if wen else None
                 if addr < 0 or addr + self._ab > total:
                     raise ValueError(
                         f"linear: address 0x{addr:X} (end 0x{addr + self._ab:X}) "
@@ -272,7 +332,7 @@ class PatternsMixin:
                 self._record_access(add, wen, read_blocked_set, write_blocked_set)
                 be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                 self._write_req(f, id_value, wen, data, add, be=be); id_value += 1; tx_idx += 1
-                for _ in range(n_idles): self._write_idle(f)
+                for _ in range(shaper.idles()): self._write_idle(f)
             self._write_pause(f)
         self._commit_blocked_sets(read_blocked, write_blocked, read_blocked_set, write_blocked_set)
         self._require_exact_emits("linear", id_start, id_value)
@@ -281,6 +341,18 @@ class PatternsMixin:
     def gen_2d(self, stride0, len_d0, stride1, start_address, id_start,
                read_blocked, write_blocked, idle_cycles_between_phases=0,
                trailing_bytes=0, append=False):
+        if self.stim_format == 'descriptors' and len_d0 > 0:
+            # the expanded form also pads after the last (possibly partial) row
+            desc = AffineDescriptor(
+                self.N_TEST, id_start, self._parse_address(start_address),
+                stride0=stride0, len_d0=len_d0, stride1=stride1, wen_seed=self._wen_seed(),
+                row_gap=idle_cycles_between_phases, tail_gap=idle_cycles_between_phases,
+                last_be=trailing_bytes,
+            )
+            id_value = self._emit_descriptors("2d", [desc], id_start, read_blocked, write_blocked,
+                                              append=append)
+            if id_value is not None:
+                return id_value
         id_value = id_start
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         tx_idx = 0
@@ -315,6 +387,17 @@ class PatternsMixin:
     def gen_3d(self, stride0, len_d0, stride1, len_d1, stride2, start_address, id_start,
                read_blocked, write_blocked, idle_cycles_between_phases=0,
                trailing_bytes=0, append=False):
+        if self.stim_format == 'descriptors' and len_d0 > 0 and len_d1 > 0:
+            desc = AffineDescriptor(
+                self.N_TEST, id_start, self._parse_address(start_address),
+                stride0=stride0, len_d0=len_d0, stride1=stride1, len_d1=len_d1, stride2=stride2,
+                wen_seed=self._wen_seed(), row_gap=idle_cycles_between_phases,
+                last_be=trailing_bytes,
+            )
+            id_value = self._emit_descriptors("3d", [desc], id_start, read_blocked, write_blocked,
+                                              append=append)
+            if id_value is not None:
+                return id_value
         id_value = id_start
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         tx_idx = 0
@@ -357,7 +440,7 @@ class PatternsMixin:
     def matmul_phased_gen(self, id_start, read_blocked, write_blocked,
                           region_base_address, region_size_bytes,
                           matmul_ratio_a=1, matmul_ratio_b=1, matmul_ratio_c=1,
-                          traffic_pct=100,
+                          traffic_pct=100, arrival=None,
                           idle_cycles_between_phases=0,
                           region_base_address_a=None, region_size_bytes_a=None,
                           region_base_address_b=None, region_size_bytes_b=None,
@@ -377,7 +460,7 @@ class PatternsMixin:
         id_value = id_start
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = max(1, self.DATA_WIDTH // 8); tm = int(self.TOT_MEM_SIZE * 1024)
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
 
         def _res(bo, so, fb, fs, label="region"):
             b = self._align_down(int(bo if bo is not None else fb), ab)
@@ -416,12 +499,35 @@ class PatternsMixin:
 
         ca, cb, cc = self._phase_counts(self.N_TEST, matmul_ratio_a, matmul_ratio_b, matmul_ratio_c)
 
+        if self.stim_format == 'descriptors':
+            descs = []
+            credit = Fraction(0)
+            phases = (
+                (ca, 1, a_base, a_size, trailing_bytes_a, ca > 0 and (cb > 0 or cc > 0)),
+                (cb, 1, b_base, b_size, trailing_bytes_b, cb > 0 and cc > 0),
+                (cc, 0, c_base, c_size, trailing_bytes_c, False),
+            )
+            for count, wen, pb, ps, trailing, gap in phases:
+                if count == 0:
+                    continue
+                desc = AffineDescriptor(
+                    count, id_start + sum(d.n for d in descs), pb, wrap=ps // ab,
+                    n_reads=count if wen else 0, idle_ratio=shaper.ratio, idle_credit=credit,
+                    tail_gap=idle_cycles_between_phases if gap else 0, last_be=trailing,
+                )
+                credit = desc.final_credit()
+                descs.append(desc)
+            desc_id = self._emit_descriptors("matmul_phased", descs, id_start, read_blocked,
+                                             write_blocked, arrival, append)
+            if desc_id is not None:
+                return desc_id
+
         def _emit(fobj, count, wen, pb, pe, trailing_bytes):
             nonlocal id_value
             addr = pb
             tx_idx = 0
             for _ in range(count):
-                data = "0"*self.DATA_WIDTH if wen else self.random_data()
+                data = "0"*self.DATA_WIDTH if wen else None
                 add = bin(addr)[2:].zfill(self.ADD_WIDTH)
                 if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                     addr += ab
@@ -433,7 +539,7 @@ class PatternsMixin:
                 self._record_access(add, wen, read_blocked_set, write_blocked_set)
                 id_value += 1; tx_idx += 1; addr += ab
                 if addr >= pe: addr = pb
-                for _ in range(n_idles): self._write_idle(fobj)
+                for _ in range(shaper.idles()): self._write_idle(fobj)
 
         with self._open(append) as f:
             _emit(f, ca, 1, a_base, a_base+a_size, trailing_bytes_a)
@@ -458,6 +564,7 @@ class PatternsMixin:
         schedule="round_robin",
         burst_len=1,
         traffic_pct=100,
+        arrival=None,
         trailing_bytes=0,
         append=False,
     ):
@@ -465,7 +572,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         burst = max(1, int(burst_len))
 
         norm_regions = []
@@ -519,13 +626,13 @@ class PatternsMixin:
                         data, wen = self.data_wen()
                     else:
                         wen = 1 if random.randint(1, 100) <= reg["read_pct"] else 0
-                        data = "0" * self.DATA_WIDTH if wen else self.random_data()
+                        data = "0" * self.DATA_WIDTH if wen else None
                     if self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                         self._record_access(add, wen, read_blocked_set, write_blocked_set)
                         be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                         self._write_req(f, id_value, wen, data, add, be=be)
                         id_value += 1; tx_idx += 1
-                        for _ in range(n_idles):
+                        for _ in range(shaper.idles()):
                             self._write_idle(f)
                     step = reg["stride_words"] * ab
                     reg["offset"] = (reg["offset"] + step) % reg["size"]
@@ -552,6 +659,7 @@ class PatternsMixin:
         bank_group_hop=0,
         wen=None,
         traffic_pct=100,
+        arrival=None,
         trailing_bytes=0,
         append=False,
     ):
@@ -565,7 +673,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         span = max(1, min(int(bank_group_span), int(self.N_BANKS)))
         start_bank = int(start_bank) % max(1, int(self.N_BANKS))
         stride = max(1, int(stride_beats))
@@ -586,14 +694,14 @@ class PatternsMixin:
                     data, wen_cur = self.data_wen()
                 else:
                     wen_cur = 1 if int(wen) else 0
-                    data = "0" * self.DATA_WIDTH if wen_cur else self.random_data()
+                    data = "0" * self.DATA_WIDTH if wen_cur else None
                 if not self._is_allowed(add, wen_cur, read_blocked_set, write_blocked_set):
                     continue
                 self._record_access(add, wen_cur, read_blocked_set, write_blocked_set)
                 be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                 self._write_req(f, id_value, wen_cur, data, add, be=be)
                 id_value += 1; tx_idx += 1
-                for _ in range(n_idles):
+                for _ in range(shaper.idles()):
                     self._write_idle(f)
             self._write_pause(f)
 
@@ -613,6 +721,7 @@ class PatternsMixin:
         reads_per_row,
         writes_per_row,
         traffic_pct=100,
+        arrival=None,
         idle_cycles_between_rows=0,
         trailing_bytes=0,
         append=False,
@@ -620,7 +729,7 @@ class PatternsMixin:
         id_value = id_start
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         base = self._align_down(int(row_base_address), ab)
         row_size = max(ab, self._align_down(int(row_size_bytes), ab))
         row_stride = max(ab, self._align_down(int(row_stride_bytes), ab))
@@ -650,7 +759,7 @@ class PatternsMixin:
                     be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                     self._write_req(f, id_value, wen, data, add, be=be)
                     id_value += 1; tx_idx += 1
-                    for _ in range(n_idles):
+                    for _ in range(shaper.idles()):
                         self._write_idle(f)
                 for i in range(writes_per_row):
                     if id_value - id_start >= self.N_TEST:
@@ -658,14 +767,14 @@ class PatternsMixin:
                     addr = self._normalize_addr(row_base + (i * ab) % row_size)
                     add = bin(addr)[2:].zfill(self.ADD_WIDTH)
                     wen = 0
-                    data = self.random_data()
+                    data = None
                     if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                         continue
                     self._record_access(add, wen, read_blocked_set, write_blocked_set)
                     be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                     self._write_req(f, id_value, wen, data, add, be=be)
                     id_value += 1; tx_idx += 1
-                    for _ in range(n_idles):
+                    for _ in range(shaper.idles()):
                         self._write_idle(f)
                 if r < n_rows - 1:
                     for _ in range(max(0, int(idle_cycles_between_rows))):
@@ -686,6 +795,7 @@ class PatternsMixin:
         chunk_bytes=0,
         schedule="4read_1write",
         traffic_pct=100,
+        arrival=None,
         trailing_bytes=0,
         append=False,
     ):
@@ -693,7 +803,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         chunk_val = ab if chunk_bytes is None else int(chunk_bytes)
         step = max(ab, self._align_down(chunk_val if chunk_val > 0 else ab, ab))
         tokens = self._parse_read_write_schedule(schedule)
@@ -761,7 +871,7 @@ class PatternsMixin:
                 else:
                     break
                 add = bin(addr)[2:].zfill(self.ADD_WIDTH)
-                data = "0" * self.DATA_WIDTH if wen else self.random_data()
+                data = "0" * self.DATA_WIDTH if wen else None
                 if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                     no_progress_iters += 1
                     if no_progress_iters >= max_no_progress:
@@ -772,7 +882,7 @@ class PatternsMixin:
                 be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                 self._write_req(f, id_value, wen, data, add, be=be)
                 id_value += 1; tx_idx += 1
-                for _ in range(n_idles):
+                for _ in range(shaper.idles()):
                     self._write_idle(f)
             self._write_pause(f)
 
@@ -797,6 +907,7 @@ class PatternsMixin:
         tiles=1,
         ab_c_schedule="A_B_C",
         traffic_pct=100,
+        arrival=None,
         idle_cycles_between_tiles=0,
         trailing_bytes=0,
         append=False,
@@ -805,7 +916,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
         tile_idle = max(0, int(idle_cycles_between_tiles))
         tokens = self._parse_abc_schedule(ab_c_schedule)
 
@@ -860,14 +971,14 @@ class PatternsMixin:
                         ptr[tok] = (ptr[tok] + ab) % size[tok]
                         wen = 0 if tok == "C" else 1
                         add = bin(addr)[2:].zfill(self.ADD_WIDTH)
-                        data = "0" * self.DATA_WIDTH if wen else self.random_data()
+                        data = "0" * self.DATA_WIDTH if wen else None
                         if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                             continue
                         self._record_access(add, wen, read_blocked_set, write_blocked_set)
                         be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                         self._write_req(f, id_value, wen, data, add, be=be)
                         id_value += 1; tx_idx += 1
-                        for _ in range(n_idles):
+                        for _ in range(shaper.idles()):
                             self._write_idle(f)
                 tile_idx += 1
                 if tile_idle > 0 and id_value - id_start < self.N_TEST:
@@ -894,6 +1005,7 @@ class PatternsMixin:
         write_blocked,
         hot_regions,
         traffic_pct=100,
+        arrival=None,
         traffic_read_pct=None,
         trailing_bytes=0,
         append=False,
@@ -902,7 +1014,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
 
         regions = []
         weights = []
@@ -949,14 +1061,14 @@ class PatternsMixin:
                 if wen is None:
                     data, wen = self.data_wen()
                 else:
-                    data = "0" * self.DATA_WIDTH if wen else self.random_data()
+                    data = "0" * self.DATA_WIDTH if wen else None
                 if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                     continue
                 self._record_access(add, wen, read_blocked_set, write_blocked_set)
                 be = self._be_for(tx_idx, self.N_TEST, trailing_bytes)
                 self._write_req(f, id_value, wen, data, add, be=be)
                 id_value += 1; tx_idx += 1
-                for _ in range(n_idles):
+                for _ in range(shaper.idles()):
                     self._write_idle(f)
             self._write_pause(f)
 
@@ -967,7 +1079,7 @@ class PatternsMixin:
     def copy_linear_gen(self, id_start, read_blocked, write_blocked,
                         src_base_address, src_size_bytes,
                         dst_base_address, dst_size_bytes,
-                        traffic_pct=100, append=False):
+                        traffic_pct=100, arrival=None, append=False):
         """Interleaved read-from-src / write-to-dst streaming copy pattern.
 
         Models a streaming copy/pack engine (e.g. DataMover doing im2col/pack):
@@ -978,7 +1090,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
 
         src_base = self._align_down(int(src_base_address), ab)
         src_size = self._align_down(int(src_size_bytes), ab)
@@ -1005,7 +1117,7 @@ class PatternsMixin:
                         self._record_access(add, 1, read_blocked_set, write_blocked_set)
                         self._write_req(f, id_value, 1, "0" * self.DATA_WIDTH, add)
                         id_value += 1
-                        for _ in range(n_idles):
+                        for _ in range(shaper.idles()):
                             self._write_idle(f)
                     src_addr += ab
                     if src_addr >= src_base + src_size:
@@ -1014,9 +1126,9 @@ class PatternsMixin:
                     add = bin(self._normalize_addr(dst_addr))[2:].zfill(self.ADD_WIDTH)
                     if self._is_allowed(add, 0, read_blocked_set, write_blocked_set):
                         self._record_access(add, 0, read_blocked_set, write_blocked_set)
-                        self._write_req(f, id_value, 0, self.random_data(), add)
+                        self._write_req(f, id_value, 0, None, add)
                         id_value += 1
-                        for _ in range(n_idles):
+                        for _ in range(shaper.idles()):
                             self._write_idle(f)
                     dst_addr += ab
                     if dst_addr >= dst_base + dst_size:
@@ -1054,6 +1166,7 @@ class PatternsMixin:
         include_weights=True,
         output_writes_per_point=1,
         traffic_pct=100,
+        arrival=None,
         idle_cycles_between_rows=0,
         idle_cycles_between_groups=0,
         trailing_bytes=0,
@@ -1077,7 +1190,7 @@ class PatternsMixin:
         read_blocked_set, write_blocked_set = self._init_blocked_sets(read_blocked, write_blocked)
         ab = self._ab
         tm = self._total_mem_bytes()
-        n_idles = self._idles_per_req(traffic_pct)
+        shaper = TrafficShaper.from_arrival(traffic_pct, arrival)
 
         in_base = self._align_down(int(input_base_address), ab)
         in_row = max(ab, self._align_down(int(input_row_stride_bytes), ab))
@@ -1105,7 +1218,7 @@ class PatternsMixin:
             nonlocal id_value
             addr = self._normalize_addr(addr)
             add = bin(addr)[2:].zfill(self.ADD_WIDTH)
-            data = "0" * self.DATA_WIDTH if wen else self.random_data()
+            data = "0" * self.DATA_WIDTH if wen else None
             if not self._is_allowed(add, wen, read_blocked_set, write_blocked_set):
                 return tx_idx, False
             self._record_access(add, wen, read_blocked_set, write_blocked_set)
@@ -1113,7 +1226,7 @@ class PatternsMixin:
             self._write_req(fobj, id_value, wen, data, add, be=be)
             id_value += 1
             tx_idx += 1
-            for _ in range(n_idles):
+            for _ in range(shaper.idles()):
                 self._write_idle(fobj)
             return tx_idx, True
 
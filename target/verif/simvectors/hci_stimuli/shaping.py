@@ -0,0 +1,202 @@
+"""Traffic shaping and arrival models shared by the pattern generators and the temporal model.
+
+Every generator asks its shaper for the number of req=0 idle cycles to emit
+after each request. The arrival model decides how those idles are spread;
+all models keep the long-run request rate at traffic_pct.
+"""
+
+import math
+import random
+from fractions import Fraction
+
+
+class TrafficShaper:
+    """Error-diffusion (token-bucket) shaper for traffic_pct.
+
+    Every emitted request earns (100 - pct) / pct idle cycles of credit; the
+    whole part of the credit is emitted as idles after the request and the
+    fraction is carried over. After n requests exactly
+    floor(n * (100 - pct) / pct) idles have been emitted, so the duty cycle
+    stays within one cycle of traffic_pct over the whole pattern instead of
+    snapping to 1/(1 + k).
+    """
+
+    model = 'uniform'
+
+    def __init__(self, traffic_pct=100, arrival=None):
+        self.traffic_pct = traffic_pct
+        self.ratio = self.idle_ratio(traffic_pct)
+        self.credit = Fraction(0)
+        self.arrival = dict(arrival or {})
+        self.rng = random.Random(self.arrival.get('seed', 0))
+
+    @staticmethod
+    def from_arrival(traffic_pct=100, arrival=None):
+        """Shaper for the 'arrival' object of a pattern (uniform when absent)."""
+        model = (arrival or {}).get('model', 'uniform')
+        if model not in ARRIVAL_MODELS:
+            raise ValueError(
+                f"unknown arrival model {model!r}, expected one of {', '.join(ARRIVAL_MODELS)}"
+            )
+        return ARRIVAL_MODELS[model](traffic_pct, arrival)
+
+    @staticmethod
+    def idle_ratio(traffic_pct):
+        """Idle cycles per request for traffic_pct (clamped to 1..100, may be fractional)."""
+        pct = min(Fraction(100), max(Fraction(1), Fraction(str(traffic_pct))))
+        return (100 - pct) / pct
+
+    def idles(self):
+        """Idle cycles to emit after the next request."""
+        self.credit += self.ratio
+        n_idles = int(self.credit)
+        self.credit -= n_idles
+        return n_idles
+
+    def take(self, n_requests):
+        """Idle cycles emitted after the next n_requests requests."""
+        return sum(self.idles() for _ in range(max(0, int(n_requests))))
+
+    @classmethod
+    def total_idles(cls, traffic_pct, n_requests, arrival=None):
+        """Idle cycles emitted after n_requests requests.
+
+        Seeded models are replayed, so the count matches the generated file.
+        """
+        if (arrival or {}).get('model', 'uniform') == 'uniform':
+            return int(cls.idle_ratio(traffic_pct) * max(0, int(n_requests)))
+        return cls.from_arrival(traffic_pct, arrival).take(n_requests)
+
+    @classmethod
+    def describe(cls, traffic_pct, arrival=None):
+        model = (arrival or {}).get('model', 'uniform')
+        if model != 'uniform':
+            return cls.from_arrival(traffic_pct, arrival).describe_model()
+        ratio = cls.idle_ratio(traffic_pct)
+        if ratio.denominator == 1:
+            return f"{ratio.numerator} idle(s) after each transaction"
+        return f"{ratio.numerator} idle(s) per {ratio.denominator} transactions"
+
+
+class BurstShaper(TrafficShaper):
+    """On/off bursts: burst_len back-to-back requests, then one idle gap.
+
+    The gap is burst_len times the uniform per-request idle credit, diffused
+    across bursts like the uniform shaper, so the rate is unchanged.
+    """
+
+    model = 'burst'
+
+    def __init__(self, traffic_pct=100, arrival=None):
+        super().__init__(traffic_pct, arrival)
+        self.burst_len = max(1, int(self.arrival.get('burst_len', 8)))
+        self.in_burst = 0
+
+    def idles(self):
+        self.in_burst += 1
+        if self.in_burst < self.burst_len:
+            return 0
+        self.in_burst = 0
+        self.credit += self.ratio * self.burst_len
+        n_idles = int(self.credit)
+        self.credit -= n_idles
+        return n_idles
+
+    def describe_model(self):
+        gap = self.ratio * self.burst_len
+        return f"bursts of {self.burst_len}, {float(gap):g} idle(s) between bursts"
+
+
+class GeometricShaper(TrafficShaper):
+    """Bernoulli arrivals: each cycle issues with probability traffic_pct / 100.
+
+    The gap after a request is geometric with mean (100 - pct) / pct.
+    """
+
+    model = 'geometric'
+
+    def __init__(self, traffic_pct=100, arrival=None):
+        super().__init__(traffic_pct, arrival)
+        self.p_issue = float(1 / (1 + self.ratio))
+
+    def idles(self):
+        if self.p_issue >= 1.0:
+            return 0
+        # inverse CDF of the number of failures before the first success
+        return int(math.log(1.0 - self.rng.random()) / math.log(1.0 - self.p_issue))
+
+    def describe_model(self):
+        return f"geometric gaps, mean {float(self.ratio):g} idle(s) per transaction"
+
+
+class MarkovShaper(TrafficShaper):
+    """Two-state Markov-modulated Bernoulli arrivals.
+
+    In the ON state a cycle issues with probability on_pct / 100, in the OFF
+    state with off_pct / 100. The state may change after every cycle; the
+    mean ON dwell is burst_len cycles and the OFF -> ON probability is chosen
+    so that the stationary request rate equals traffic_pct. When that would
+    need an OFF -> ON probability above 1 (short bursts at a high rate), the
+    OFF state lasts one cycle and the ON dwell is lengthened instead.
+    """
+
+    model = 'markov'
+
+    def __init__(self, traffic_pct=100, arrival=None):
+        super().__init__(traffic_pct, arrival)
+        pct = float(1 / (1 + self.ratio)) * 100
+        self.burst_len = max(1, int(self.arrival.get('burst_len', 16)))
+        self.on_rate = float(self.arrival.get('on_pct', 100)) / 100
+        self.off_rate = float(self.arrival.get('off_pct', 0)) / 100
+        if not self.off_rate * 100 <= pct <= self.on_rate * 100:
+            raise ValueError(
+                f"markov arrival needs off_pct <= traffic_pct <= on_pct "
+                f"(got {self.off_rate * 100:g} / {pct:g} / {self.on_rate * 100:g})"
+            )
+        self.p_on_off = 1.0 / self.burst_len
+        if self.on_rate == self.off_rate:
+            self.p_on = 1.0
+        else:
+            self.p_on = (pct / 100 - self.off_rate) / (self.on_rate - self.off_rate)
+        if self.p_on >= 1.0:
+            self.p_off_on = 1.0
+            self.p_on_off = 0.0
+        else:
+            # stationary P(ON) = p_off_on / (p_on_off + p_off_on)
+            self.p_off_on = self.p_on_off * self.p_on / (1.0 - self.p_on)
+            if self.p_off_on > 1.0:
+                self.p_off_on = 1.0
+                self.p_on_off = (1.0 - self.p_on) / self.p_on
+        self.on = True
+
+    def _step(self):
+        if self.on:
+            self.on = self.rng.random() >= self.p_on_off
+        else:
+            self.on = self.rng.random() < self.p_off_on
+
+    def idles(self):
+        self._step()
+        n_idles = 0
+        while self.rng.random() >= (self.on_rate if self.on else self.off_rate):
+            n_idles += 1
+            self._step()
+        return n_idles
+
+    def mean_on(self):
+        """Mean ON dwell in cycles (burst_len unless it had to be lengthened)."""
+        return round(1.0 / self.p_on_off, 1) if self.p_on_off > 0 else self.burst_len
+
+    def describe_model(self):
+        return (
+            f"markov on/off, {self.on_rate * 100:g}%/{self.off_rate * 100:g}% issue, "
+            f"mean ON {self.mean_on():g} cycle(s), P(ON)={self.p_on:.2f}"
+        )
+
+
+ARRIVAL_MODELS = {
+    'uniform': TrafficShaper,
+    'burst': BurstShaper,
+    'geometric': GeometricShaper,
+    'markov': MarkovShaper,
+}
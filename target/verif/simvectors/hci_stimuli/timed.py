@@ -0,0 +1,53 @@
+"""Cycle-stamped (timed) stimuli.
+
+A padded stimuli file encodes issue gaps as req=0 lines, which the
+application driver may consume while stalled on a grant. The timed form
+drops the idle lines and prefixes every request with its earliest-issue
+cycle instead:
+
+  @<cycle> req(1b) id(IWb) wen(1b) be(BEWb) data(Nb) add(Ab)
+  @<cycle> PAUSE
+
+<cycle> is decimal and counts from the start of the segment, i.e. from
+reset for the first segment and from the resume of the preceding PAUSE
+otherwise, so stamps stay valid however long a fence blocks. The driver
+issues each request at max(stamp, grant of the previous request) and
+consumes a PAUSE no earlier than its stamp, which keeps the offered load
+of the padded file exact under backpressure.
+"""
+
+from .compression import open_stimuli
+
+
+def to_timed_lines(lines):
+    """Convert padded stimuli lines to timed lines; return (lines, n_requests)."""
+    out = []
+    n_requests = 0
+    cycle = 0
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            out.append(line)
+            continue
+        if line == 'PAUSE':
+            out.append(f"@{cycle} PAUSE")
+            cycle = 0
+            continue
+        if line.startswith('@'):
+            raise ValueError("stimuli are already cycle-stamped")
+        if line.split(None, 1)[0] == '1':
+            out.append(f"@{cycle} {line}")
+            n_requests += 1
+        cycle += 1
+    return out, n_requests
+
+
+def write_timed_stimuli(path):
+    """Rewrite a padded stimuli file in place in timed form; return n_requests."""
+    with open_stimuli(path) as f:
+        lines, n_requests = to_timed_lines(f)
+    with open_stimuli(path, 'w') as f:
+        f.write("\n".join(lines) + ("\n" if lines else ""))
+    return n_requests
@@ -0,0 +1,71 @@
+"""Totals header of the stimuli files.
+
+The first line of every stimuli file summarizes it:
+
+  # totals requests=<n> reads=<n> writes=<n> fences=<n>
+
+so that the application driver can stream the file with a bounded prefetch
+and still know the request counts that the coverage checks compare against.
+Requests inside DESC lines are counted as the driver will expand them.
+"""
+
+import os
+
+from .compression import open_stimuli
+from .descriptors import AffineDescriptor
+
+HEADER_PREFIX = '# totals '
+
+
+def stimuli_totals(lines):
+    """Count requests, reads, writes and fences of stimuli lines (any format)."""
+    n_requests = n_reads = n_fences = 0
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('@'):
+            line = line.split(None, 1)[1] if ' ' in line else ''
+        if line == 'PAUSE':
+            n_fences += 1
+        elif line.startswith('DESC'):
+            desc = AffineDescriptor.from_line(line)
+            n_requests += desc.n
+            n_reads += desc.n_read_requests()
+        elif line.startswith('1'):
+            n_requests += 1
+            n_reads += line.split()[2] == '1'
+    return {
+        'requests': n_requests,
+        'reads': n_reads,
+        'writes': n_requests - n_reads,
+        'fences': n_fences,
+    }
+
+
+def header_line(totals):
+    return (f"{HEADER_PREFIX}requests={totals['requests']} reads={totals['reads']} "
+            f"writes={totals['writes']} fences={totals['fences']}")
+
+
+def write_stimuli_header(path, out_path=None):
+    """Prepend (or replace) the totals header of a stimuli file; return the totals.
+
+    With out_path the result goes there instead (compressed by its suffix, see
+    compression.py) and path is removed, so storing the file compressed costs
+    no extra pass.
+    """
+    out_path = path if out_path is None else out_path
+    with open_stimuli(path) as f:
+        totals = stimuli_totals(f)
+    # Keep the codec suffix last so that open_stimuli still recognizes it
+    tmp_path = out_path.with_name(f".tmp.{out_path.name}")
+    with open_stimuli(path) as src, open_stimuli(tmp_path, 'w') as dst:
+        dst.write(header_line(totals) + "\n")
+        for line in src:
+            if not line.startswith(HEADER_PREFIX):
+                dst.write(line)
+    os.replace(tmp_path, out_path)
+    if out_path != path:
+        os.remove(path)
+    return totals
@@ -3,15 +3,142 @@
 from collections import deque
 from pathlib import Path
 import html
+import json
 import math
 
+from region_index import IntervalIndex, region_access_kind
 
-def build_schedule(pattern_nodes, node_idx_by_driver_pattern, job_to_nodes, interco_type):
+
+def ideal_bandwidth(interco_type, n_narrow_hci, n_wide_hci, dw_narrow, dw_wide, n_banks, data_width):
+    """Ideal bandwidths in bit/cycle, as in the exploration flow's _derive_interco_side.
+
+    'narrow' and 'wide' are the interconnect-side master ports, 'memory' the
+    banks; 'bottleneck' is min(memory, narrow + wide), the utilization reference.
+    """
+    narrow = float(n_narrow_hci * dw_narrow)
+    wide = float(n_wide_hci * dw_wide)
+    memory = float(n_banks * data_width)
+    return {
+        'interco_type': str(interco_type).upper(),
+        'narrow': narrow,
+        'wide': wide,
+        'memory': memory,
+        'bottleneck': min(memory, narrow + wide),
+    }
+
+
+def _node_bits(node):
+    return max(0, int(node['n_transactions'])) * max(0, int(node['txn_bytes'])) * 8
+
+
+def _share_bandwidth(demands, uses, capacity):
+    """Max-min fair rates (progressive filling) of flows over shared resources.
+
+    demands: {flow: offered bit/cycle}; uses: {flow: resource names};
+    capacity: {resource: bit/cycle}. Resources without capacity are ignored.
+    """
+    rate = {f: 0.0 for f in demands}
+    left = {r: c for r, c in capacity.items() if c > 0}
+    growing = {f for f, d in demands.items() if d > 0}
+    while growing:
+        inc = min(demands[f] - rate[f] for f in growing)
+        for r, c in left.items():
+            users = sum(1 for f in growing if r in uses[f])
+            if users:
+                inc = min(inc, c / users)
+        for f in growing:
+            rate[f] += inc
+            for r in uses[f]:
+                if r in left:
+                    left[r] -= inc
+        growing = {
+            f for f in growing
+            if rate[f] < demands[f] * (1 - 1e-9)
+            and all(left[r] > 1e-9 for r in uses[f] if r in left)
+        }
+    return rate
+
+
+def _contention_times(pattern_nodes, sched_preds, bandwidth):
+    """Event-driven timing where concurrently active patterns share bandwidth.
+
+    Each pattern offers its own rate (bits over its uncontended cycles); the
+    active ones share the memory side and their interconnect-side master
+    ports (wide for HWPEs, except in LOG mode) max-min fairly, and stretch
+    by offered / granted rate. sched_preds (graph edges and driver order)
+    must be acyclic. Returns float (start, end) lists.
+    """
+    n_nodes = len(pattern_nodes)
+    wide_res = 'narrow' if bandwidth['interco_type'] == 'LOG' else 'wide'
+    capacity = {r: bandwidth[r] for r in ('narrow', 'wide', 'memory')}
+    work = [float(max(0, int(n['cycles']))) for n in pattern_nodes]
+    demand = [(_node_bits(n) / work[i]) if work[i] > 0 else 0.0 for i, n in enumerate(pattern_nodes)]
+    uses = [('memory', wide_res if n['is_hwpe'] else 'narrow') for n in pattern_nodes]
+    start = [None] * n_nodes
+    end = [None] * n_nodes
+    active = set()
+    now = 0.0
+    while True:
+        # start everything that is ready; zero-length patterns may unblock more
+        started = True
+        while started:
+            started = False
+            for i in range(n_nodes):
+                if start[i] is not None or pattern_nodes[i]['start_delay'] > now:
+                    continue
+                if all(end[b] is not None for b in sched_preds[i]):
+                    start[i] = now
+                    started = True
+                    if work[i] <= 0:
+                        end[i] = now
+                    else:
+                        active.add(i)
+        waiting = [pattern_nodes[i]['start_delay'] for i in range(n_nodes)
+                   if start[i] is None and all(end[b] is not None for b in sched_preds[i])]
+        if not active and not waiting:
+            break
+        rate = _share_bandwidth({i: demand[i] for i in active}, {i: uses[i] for i in active}, capacity)
+        speed = {i: (rate[i] / demand[i]) if demand[i] > 0 else 1.0 for i in active}
+        step = min([work[i] / speed[i] for i in active if speed[i] > 0]
+                   + [d - now for d in waiting])
+        now += step
+        for i in list(active):
+            work[i] -= speed[i] * step
+            if work[i] <= 1e-6:
+                end[i] = now
+                active.discard(i)
+    return start, end
+
+
+def _has_cycle(preds):
+    """Whether the graph given by per-node predecessor sets has a cycle."""
+    succs = [[] for _ in preds]
+    indeg = [len(p) for p in preds]
+    for dst, srcs in enumerate(preds):
+        for src in srcs:
+            succs[src].append(dst)
+    ready = [i for i, d in enumerate(indeg) if d == 0]
+    n_sorted = 0
+    while ready:
+        cur = ready.pop()
+        n_sorted += 1
+        for nxt in succs[cur]:
+            indeg[nxt] -= 1
+            if indeg[nxt] == 0:
+                ready.append(nxt)
+    return n_sorted != len(preds)
+
+
+def build_schedule(pattern_nodes, node_idx_by_driver_pattern, job_to_nodes, interco_type, bandwidth=None):
     """Build the temporal model: dependency graph, topo-sort, timing assignment.
 
     Mutates pattern_nodes in-place (adds 'start_cycle' and 'end_cycle' to each node).
+    With bandwidth (see ideal_bandwidth), concurrently active patterns share it
+    and stretch accordingly; the uncontended times are kept in
+    'ideal_start_cycle'/'ideal_end_cycle'.
     Returns (driver_windows, regions_timeline, total_cycles,
-             schedule_has_cycle, mux_serialization_applied, mux_phase_order).
+             schedule_has_cycle, mux_serialization_applied, mux_phase_order,
+             schedule_stats).
     """
     n_nodes = len(pattern_nodes)
     preds = [set() for _ in range(n_nodes)]
@@ -132,12 +259,47 @@ def build_schedule(pattern_nodes, node_idx_by_driver_pattern, job_to_nodes, inte
         if not changed:
             break
 
+    ideal_total_cycles = max(node_end, default=0)
+    prev_on_driver = [
+        node_idx_by_driver_pattern[(n['driver_idx'], n['pattern_idx'] - 1)]
+        if n['pattern_idx'] > 0 and not (mux_serialization_applied and n['is_hwpe']) else None
+        for n in pattern_nodes
+    ]
+    sched_preds = [preds[i] | ({prev_on_driver[i]} if prev_on_driver[i] is not None else set())
+                   for i in range(n_nodes)]
+    # The driver order is kept out of the graph, but it can still close a
+    # cycle with the job dependencies (e.g. X waits for W, which follows Z on
+    # its driver, while Z waits for Y, which follows X on its driver)
+    if not schedule_has_cycle:
+        schedule_has_cycle = _has_cycle(sched_preds)
+    contention_applied = bandwidth is not None and not schedule_has_cycle
+    if contention_applied:
+        c_start, c_end = _contention_times(pattern_nodes, sched_preds, bandwidth)
+        for n_idx, node in enumerate(pattern_nodes):
+            node['ideal_start_cycle'] = int(node_start[n_idx])
+            node['ideal_end_cycle'] = int(node_end[n_idx])
+        node_start = [int(round(t)) for t in c_start]
+        node_end = [max(st, int(math.ceil(t - 1e-6))) for st, t in zip(node_start, c_end)]
+
     for n_idx, node in enumerate(pattern_nodes):
         node['start_cycle'] = int(node_start[n_idx])
         node['end_cycle'] = int(node_end[n_idx])
+        # effective predecessors (graph edges and driver order), see critical_path.py
+        node['sched_preds'] = sorted(sched_preds[n_idx])
 
     total_cycles = max((n['end_cycle'] for n in pattern_nodes), default=0)
 
+    schedule_stats = {
+        'contention_applied': contention_applied,
+        'ideal_total_cycles': int(ideal_total_cycles),
+        'total_bits': sum(_node_bits(n) for n in pattern_nodes),
+        'bottleneck_bits_per_cycle': bandwidth['bottleneck'] if bandwidth is not None else None,
+        'predicted_utilization': None,
+    }
+    if bandwidth is not None and bandwidth['bottleneck'] > 0 and total_cycles > 0:
+        schedule_stats['predicted_utilization'] = (
+            schedule_stats['total_bits'] / (total_cycles * bandwidth['bottleneck']))
+
     driver_windows = {}
     for node in pattern_nodes:
         w = driver_windows.setdefault(node['driver_idx'], {
@@ -175,15 +337,292 @@ def build_schedule(pattern_nodes, node_idx_by_driver_pattern, job_to_nodes, inte
         reg['lifetime_end'] = max((a['end'] for a in reg['accesses']), default=0)
 
     return (driver_windows, regions_timeline, total_cycles,
-            schedule_has_cycle, mux_serialization_applied, mux_phase_order)
+            schedule_has_cycle, mux_serialization_applied, mux_phase_order,
+            schedule_stats)
+
+
+# Same order as the driver colors of the viewer legend
+_PALETTE = [
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#17becf",
+    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#9467bd",
+    "#1b9e77", "#d95f02", "#7570b3", "#e7298a", "#66a61e",
+    "#e6ab02", "#a6761d", "#666666",
+]
+
+# Region access kinds of the address timeline (index into the viewer's colors)
+_KIND_READ, _KIND_WRITE, _KIND_MIXED = 0, 1, 2
+_KIND_OF_ACCESS = {'R': _KIND_READ, 'W': _KIND_WRITE, 'RW': _KIND_MIXED}
+
+# Canvas viewer shared by every report, inlined into the HTML shell
+_VIEWER_JS = Path(__file__).resolve().parent / 'dataflow_view.js'
+
+
+def _color_for_driver(drv_idx):
+    return _PALETTE[drv_idx % len(_PALETTE)]
+
+
+def _rw_mix_text(node):
+    rpct = node.get('traffic_read_pct')
+    if rpct is None:
+        read_bytes = 0
+        write_bytes = 0
+        for reg in node.get('regions', []):
+            label_l = str(reg.get('label', '')).lower()
+            size_b = max(0, int(reg.get('size', 0)))
+            if 'read' in label_l and 'write' not in label_l:
+                read_bytes += size_b
+            elif 'write' in label_l and 'read' not in label_l:
+                write_bytes += size_b
+        if (read_bytes + write_bytes) > 0:
+            rpct = int(round(100.0 * read_bytes / (read_bytes + write_bytes)))
+        else:
+            rpct = 50
+    rpct = max(0, min(100, int(rpct)))
+    if rpct == 0:
+        return "100% writes"
+    if rpct == 100:
+        return "100% reads"
+    return f"{rpct}% reads / {100 - rpct}% writes"
+
+
+def _fmt_kib(bytes_v):
+    return f"{(max(0, int(bytes_v)) / 1024.0):.1f} KiB"
+
+
+def _outside_detail_lines(node, base_addr, size_kib):
+    regs = list(node.get('regions', []))
+    label_map = {str(r.get('label', '')): r for r in regs}
+
+    if node.get('mem_access_type') == 'copy_linear':
+        lines = []
+        for lbl in ('src(read)', 'dst(write)'):
+            if lbl in label_map:
+                r = label_map[lbl]
+                short = 'src' if lbl.startswith('src') else 'dst'
+                lines.append(f"{short}@0x{int(r['base']):08x} ({_fmt_kib(r['size'])})")
+        return lines or [f"@0x{base_addr:08x}", f"{size_kib:.1f} KiB"]
+
+    has_matmul_regs = any(k in label_map for k in ('A(read)', 'B(read)', 'C(write)'))
+    is_matmul = node.get('mem_access_type') in {'matmul', 'matmul_phased', 'matmul_tiled_interleave'} or has_matmul_regs
+
+    if is_matmul:
+        mat_lines = []
+        for lbl, short in [('A(read)', 'A'), ('B(read)', 'B'), ('C(write)', 'C')]:
+            if lbl in label_map:
+                r = label_map[lbl]
+                mat_lines.append(f"{short}@0x{int(r['base']):08x} ({_fmt_kib(r['size'])})")
+        if not mat_lines:
+            return [f"@0x{base_addr:08x}", f"{size_kib:.1f} KiB"]
+        return mat_lines
+
+    if regs:
+        r0 = regs[0]
+        return [f"@0x{int(r0['base']):08x}", f"{_fmt_kib(r0['size'])}"]
+    return [f"@0x{base_addr:08x}", f"{size_kib:.1f} KiB"]
+
+
+def _region_kind(node, reg):
+    """Viewer kind code of a region access, by the rule of the hazard report."""
+    return _KIND_OF_ACCESS[region_access_kind(node, reg)]
+
+
+class _StringTable:
+    """Deduplicated strings of the data file; columns hold their indices."""
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+
+    def __call__(self, s):
+        s = str(s)
+        idx = self._ids.get(s)
+        if idx is None:
+            idx = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return idx
+
+
+def _address_axis(region_rows, addr_max):
+    """Non-linear address axis of the address timeline.
+
+    Each region interval gets a guaranteed minimum height (tall enough for its
+    start-address label) plus a proportional share of the remaining space.
+    Returns the cumulative (address, y) breakpoints, y in units of the plot
+    height.
+    """
+    min_frac = 14.0 / 472.0
+    sregs = sorted(region_rows, key=lambda r: r['base'])
+    # Boundaries: region starts + 0 + addr_max (end+1 skipped to reduce tick clutter)
+    boundaries = sorted({0, addr_max} | {r['base'] for r in sregs} | {r['end'] + 1 for r in sregs})
+    region_index = IntervalIndex((r['base'], r['end'], r) for r in sregs)
+    is_region = [bool(region_index.covering(a0, a1 - 1)) for a0, a1 in zip(boundaries, boundaries[1:])]
+    remaining = max(0.0, 1.0 - sum(is_region) * min_frac)
+    span = max(1, addr_max)
+    cum_addr = [boundaries[0]]
+    cum_y = [0.0]
+    for (a0, a1), reg in zip(zip(boundaries, boundaries[1:]), is_region):
+        cum_addr.append(a1)
+        cum_y.append(cum_y[-1] + (min_frac if reg else 0.0) + (a1 - a0) / span * remaining)
+    return cum_addr, [round(y, 6) for y in cum_y]
+
+
+def _dag_layout(pattern_nodes):
+    """Jobs of the dependency graph with longest-path levels, sorted by driver within each level."""
+    # Collect unique jobs (first occurrence wins for metadata)
+    jobs = {}
+    for n in pattern_nodes:
+        if n['job'] not in jobs:
+            jobs[n['job']] = {
+                'driver_idx': n['driver_idx'],
+                'wait_for': list(n.get('wait_for_jobs_declared', [])),
+            }
+    for info in jobs.values():
+        info['wait_for'] = [d for d in info['wait_for'] if d in jobs]
 
+    children = {j: [] for j in jobs}
+    indeg = {j: 0 for j in jobs}
+    for jn, info in jobs.items():
+        for dep in info['wait_for']:
+            children[dep].append(jn)
+            indeg[jn] += 1
 
-def build_memory_lifetime_html(
+    # Longest-path level assignment via topological BFS
+    levels = {j: 0 for j in jobs}
+    queue = deque(j for j in jobs if indeg[j] == 0)
+    while queue:
+        jn = queue.popleft()
+        for ch in children[jn]:
+            levels[ch] = max(levels[ch], levels[jn] + 1)
+            indeg[ch] -= 1
+            if indeg[ch] == 0:
+                queue.append(ch)
+
+    level_groups = {}
+    for jn, lvl in levels.items():
+        level_groups.setdefault(lvl, []).append(jn)
+    rows = {}
+    for group in level_groups.values():
+        group.sort(key=lambda j: (jobs[j]['driver_idx'], j))
+        for i, jn in enumerate(group):
+            rows[jn] = i
+    return jobs, levels, rows
+
+
+def build_dataflow_data(
     *,
     pattern_nodes,
     driver_windows,
     regions_timeline,
     total_cycles,
+    tot_mem_size,
+    critical_path=None,
+    bank_load=None,
+    **_,
+):
+    """Compact, columnar data of the dataflow viewer (one list per field).
+
+    Strings are stored once in 'strings' and referenced by index. Nodes are
+    sorted by driver row, then start; regions by the start of their node, so
+    the viewer finds the visible ones by binary search.
+    """
+    st = _StringTable()
+    rows = [driver_windows[d] for d in sorted(driver_windows.keys())]
+    row_of_driver = {w['driver_idx']: r for r, w in enumerate(rows)}
+
+    nodes = sorted(
+        (n for n in pattern_nodes if n['end_cycle'] > n['start_cycle'] and n['driver_idx'] in row_of_driver),
+        key=lambda n: (row_of_driver[n['driver_idx']], n['start_cycle'], n['node_idx']),
+    )
+    node_cols = {k: [] for k in ('row', 'pattern', 'start', 'end', 'job', 'type', 'n', 'bytes',
+                                 'base', 'mix', 'detail', 'crit', 'slack')}
+    row_first = [0] * (len(rows) + 1)
+    region_items = []
+    for i, node in enumerate(nodes):
+        row = row_of_driver[node['driver_idx']]
+        row_first[row + 1] = i + 1
+        base_addr = min((int(r.get('base', 0)) for r in node.get('regions', [])), default=0)
+        n_bytes = int(node['n_transactions']) * int(node.get('txn_bytes', 1))
+        node_cols['row'].append(row)
+        node_cols['pattern'].append(node['pattern_idx'])
+        node_cols['start'].append(node['start_cycle'])
+        node_cols['end'].append(node['end_cycle'])
+        node_cols['job'].append(st(node['job']))
+        node_cols['type'].append(st(node['mem_access_type']))
+        node_cols['n'].append(int(node['n_transactions']))
+        node_cols['bytes'].append(n_bytes)
+        node_cols['base'].append(base_addr)
+        node_cols['mix'].append(st(_rw_mix_text(node)))
+        node_cols['detail'].append(st(" | ".join(_outside_detail_lines(node, base_addr, n_bytes / 1024.0))))
+        node_cols['crit'].append(1 if node.get('critical') else 0)
+        node_cols['slack'].append(node.get('slack'))
+        for reg in node.get('regions', []):
+            if int(reg.get('size', 0)) > 0:
+                region_items.append((node['start_cycle'], i, int(reg['base']), int(reg['size']), _region_kind(node, reg)))
+    # rows without nodes start where the previous one ended
+    for r in range(1, len(rows) + 1):
+        row_first[r] = max(row_first[r], row_first[r - 1])
+
+    region_items.sort(key=lambda it: (it[0], it[1], it[2]))
+    addr_max = int(tot_mem_size) * 1024
+    region_rows = [regions_timeline[k] for k in sorted(regions_timeline.keys(), key=lambda k: (k[0], k[1], k[2]))]
+    cum_addr, cum_y = _address_axis(region_rows, addr_max)
+
+    jobs, levels, dag_rows = _dag_layout(pattern_nodes)
+    job_names = list(jobs)
+    job_pos = {jn: i for i, jn in enumerate(job_names)}
+    critical_jobs = {e['job'] for e in critical_path['critical_path']} if critical_path else set()
+
+    return {
+        'version': 1,
+        'total': max(1, total_cycles),
+        'palette': _PALETTE,
+        'strings': st.strings,
+        'rows': {
+            'name': [st(w['name']) for w in rows],
+            'driver': [w['driver_idx'] for w in rows],
+            'hwpe': [1 if w['is_hwpe'] else 0 for w in rows],
+            'first': row_first,
+        },
+        'nodes': node_cols,
+        'regions': {
+            'node': [it[1] for it in region_items],
+            'base': [it[2] for it in region_items],
+            'size': [it[3] for it in region_items],
+            'kind': [it[4] for it in region_items],
+            # longest node window, bounds the backward search for visible regions
+            'max_dur': max((nodes[it[1]]['end_cycle'] - nodes[it[1]]['start_cycle'] for it in region_items), default=0),
+        },
+        'addr': {
+            'max': addr_max,
+            'cum_addr': cum_addr,
+            'cum_y': cum_y,
+            'bands': [[r['base'], r['size']] for r in sorted(region_rows, key=lambda r: r['base'])],
+        },
+        'dag': {
+            'job': [st(jn) for jn in job_names],
+            'driver': [jobs[jn]['driver_idx'] for jn in job_names],
+            'level': [levels[jn] for jn in job_names],
+            'row': [dag_rows[jn] for jn in job_names],
+            'crit': [1 if jn in critical_jobs else 0 for jn in job_names],
+            'edges': [x for jn in job_names for dep in jobs[jn]['wait_for'] for x in (job_pos[dep], job_pos[jn])],
+            # Node width: fit the longest job name (~5.8px per char at font-size 9 + padding)
+            'node_w': max(90, max((len(j) * 6 + 16) for j in job_names) if job_names else 90),
+        },
+        # bank x time-bucket access counts, bank-major (see bank_load.py)
+        'banks': None if bank_load is None else {
+            'n': bank_load['n_banks'],
+            'buckets': bank_load['n_buckets'],
+            'counts': [c for row in bank_load['counts'] for c in row],
+            'max': max((c for row in bank_load['counts'] for c in row), default=0),
+            'per_bank': bank_load['per_bank'],
+        },
+    }
+
+
+def build_memory_lifetime_html(
+    *,
+    driver_windows,
+    total_cycles,
     mux_serialization_applied,
     mux_phase_order,
     schedule_has_cycle,
@@ -198,540 +637,16 @@ def build_memory_lifetime_html(
     n_narrow_hci_cfg,
     n_wide_hci_cfg,
     n_banks,
-    tot_mem_size,
+    schedule_stats=None,
+    critical_path=None,
+    bank_load=None,
+    **_,
 ):
-    palette = [
-        "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#17becf",
-        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#9467bd",
-        "#1b9e77", "#d95f02", "#7570b3", "#e7298a", "#66a61e",
-        "#e6ab02", "#a6761d", "#666666",
-    ]
-
-    def _color_for_driver(drv_idx):
-        return palette[drv_idx % len(palette)]
-
-    def _tick_step(total):
-        if total <= 10:
-            return 1
-        raw = max(1, total // 10)
-        mag = 10 ** int(math.log10(raw))
-        return int(math.ceil(raw / mag) * mag)
-
-    total_for_plot = max(1, total_cycles)
-    chart_width = 1280
-    x_left = 220
-    x_right = 24
-    plot_w = chart_width - x_left - x_right
-    row_h = 80
-    y_top = 36
-    exec_rows = [driver_windows[d] for d in sorted(driver_windows.keys())]
-    exec_h = y_top + row_h * len(exec_rows) + 72
-    tick = _tick_step(total_for_plot)
-    ticks = list(range(0, total_for_plot + 1, tick))
-    if ticks[-1] != total_for_plot:
-        ticks.append(total_for_plot)
-
-    exec_svg = []
-    exec_svg.append(f'<svg width="{chart_width}" height="{exec_h}" viewBox="0 0 {chart_width} {exec_h}" xmlns="http://www.w3.org/2000/svg">')
-    exec_svg.append('<rect x="0" y="0" width="100%" height="100%" fill="#ffffff"/>')
-    exec_svg.append(f'<text x="{x_left}" y="20" font-family="Arial, sans-serif" font-size="14" font-weight="700">Execution Timeline</text>')
-    for t in ticks:
-        x = x_left + (t / total_for_plot) * plot_w
-        exec_svg.append(f'<line x1="{x:.2f}" y1="{y_top - 6}" x2="{x:.2f}" y2="{exec_h - 52}" stroke="#e0e0e0" stroke-width="1"/>')
-        exec_svg.append(f'<text x="{x:.2f}" y="{exec_h - 36}" text-anchor="middle" font-family="Arial, sans-serif" font-size="11" fill="#555">{t}</text>')
-    exec_svg.append(
-        f'<text x="{x_left + (plot_w / 2):.2f}" y="{exec_h - 18}" text-anchor="middle" '
-        'font-family="Arial, sans-serif" font-size="12" fill="#333">Transaction number</text>'
-    )
-    exec_svg.append(
-        f'<text x="{x_left + (plot_w / 2):.2f}" y="{exec_h - 2}" text-anchor="middle" '
-        'font-family="Arial, sans-serif" font-size="11" fill="#555">'
-        'Issued memory transactions (r/w) and computation cycles (i.e., req = 0) are both modeled here.'
-        '</text>'
-    )
-
-    def _rw_mix_text(node):
-        rpct = node.get('traffic_read_pct')
-        if rpct is None:
-            read_bytes = 0
-            write_bytes = 0
-            for reg in node.get('regions', []):
-                label_l = str(reg.get('label', '')).lower()
-                size_b = max(0, int(reg.get('size', 0)))
-                if 'read' in label_l and 'write' not in label_l:
-                    read_bytes += size_b
-                elif 'write' in label_l and 'read' not in label_l:
-                    write_bytes += size_b
-            if (read_bytes + write_bytes) > 0:
-                rpct = int(round(100.0 * read_bytes / (read_bytes + write_bytes)))
-            else:
-                rpct = 50
-        rpct = max(0, min(100, int(rpct)))
-        if rpct == 0:
-            return "100% writes"
-        if rpct == 100:
-            return "100% reads"
-        return f"{rpct}% reads / {100 - rpct}% writes"
-
-    def _fmt_kib(bytes_v):
-        return f"{(max(0, int(bytes_v)) / 1024.0):.1f} KiB"
-
-    def _outside_detail_lines(node, base_addr, size_kib):
-        regs = list(node.get('regions', []))
-        label_map = {str(r.get('label', '')): r for r in regs}
-
-        if node.get('mem_access_type') == 'copy_linear':
-            lines = []
-            for lbl in ('src(read)', 'dst(write)'):
-                if lbl in label_map:
-                    r = label_map[lbl]
-                    short = 'src' if lbl.startswith('src') else 'dst'
-                    lines.append(f"{short}@0x{int(r['base']):08x} ({_fmt_kib(r['size'])})")
-            return lines or [f"@0x{base_addr:08x}", f"{size_kib:.1f} KiB"]
-
-        has_matmul_regs = any(k in label_map for k in ('A(read)', 'B(read)', 'C(write)'))
-        is_matmul = node.get('mem_access_type') in {'matmul', 'matmul_phased', 'matmul_tiled_interleave'} or has_matmul_regs
-
-        if is_matmul:
-            mat_lines = []
-            for lbl, short in [('A(read)', 'A'), ('B(read)', 'B'), ('C(write)', 'C')]:
-                if lbl in label_map:
-                    r = label_map[lbl]
-                    mat_lines.append(f"{short}@0x{int(r['base']):08x} ({_fmt_kib(r['size'])})")
-            if not mat_lines:
-                return [f"@0x{base_addr:08x}", f"{size_kib:.1f} KiB"]
-            return mat_lines
-
-        if regs:
-            r0 = regs[0]
-            return [f"@0x{int(r0['base']):08x}", f"{_fmt_kib(r0['size'])}"]
-        return [f"@0x{base_addr:08x}", f"{size_kib:.1f} KiB"]
-
-    for row_idx, row in enumerate(exec_rows):
-        y = y_top + row_idx * row_h
-        name = html.escape(row['name'])
-        label_color = "#111111" if row['is_hwpe'] else "#555555"
-        exec_svg.append(f'<text x="{x_left - 10}" y="{y + 34}" text-anchor="end" font-family="Arial, sans-serif" font-size="12" fill="{label_color}">{name}</text>')
-        exec_svg.append(f'<line x1="{x_left}" y1="{y + row_h - 1}" x2="{x_left + plot_w}" y2="{y + row_h - 1}" stroke="#f0f0f0" stroke-width="1"/>')
-        nodes = sorted(
-            [n for n in pattern_nodes if n['driver_idx'] == row['driver_idx']],
-            key=lambda n: n['start_cycle'],
-        )
-        for node_i, node in enumerate(nodes):
-            if node['end_cycle'] <= node['start_cycle']:
-                continue
-            x = x_left + (node['start_cycle'] / total_for_plot) * plot_w
-            w = max(1.0, ((node['end_cycle'] - node['start_cycle']) / total_for_plot) * plot_w)
-            # clip width: extend to next box start (or plot edge) so text can use empty space
-            next_nodes = [n for n in nodes[node_i + 1:] if n['end_cycle'] > n['start_cycle']]
-            if next_nodes:
-                next_x = x_left + (next_nodes[0]['start_cycle'] / total_for_plot) * plot_w
-            else:
-                next_x = x_left + plot_w
-            clip_w = max(w, next_x - x)
-            color = _color_for_driver(node['driver_idx'])
-            base_addr = min((int(r.get('base', 0)) for r in node.get('regions', [])), default=0)
-            size_kib = (int(node['n_transactions']) * int(node.get('txn_bytes', 1))) / 1024.0
-            rw_mix = _rw_mix_text(node)
-            line1_full = f"{node['job']}"
-            line2_full = f"{node['mem_access_type']}"
-            line3_full = rw_mix
-            outside_lines = _outside_detail_lines(node, base_addr, size_kib)
-            title = (
-                f"{node['driver_name']} p{node['pattern_idx']} job={node['job']} "
-                f"[{node['start_cycle']}, {node['end_cycle']}) "
-                f"{node['mem_access_type']} n={node['n_transactions']} "
-                f"base=0x{base_addr:08x} {size_kib:.1f}KiB {rw_mix} "
-                f"{' | '.join(outside_lines)}"
-            )
-            clip_id = f"c{node['node_idx']}"
-            exec_svg.append(
-                f'<defs><clipPath id="{clip_id}">'
-                f'<rect x="{x:.2f}" y="{y}" width="{clip_w:.2f}" height="{row_h}"/>'
-                f'</clipPath></defs>'
-            )
-            exec_svg.append('<g style="cursor:help;">')
-            exec_svg.append(f'<title>{html.escape(title)}</title>')
-            exec_svg.append(
-                f'<rect x="{x:.2f}" y="{y + 4}" width="{w:.2f}" height="34" '
-                f'rx="3" ry="3" fill="{color}" fill-opacity="0.82" stroke="#222" stroke-width="0.2"/>'
-            )
-            exec_svg.append(f'<g clip-path="url(#{clip_id})" style="pointer-events:none;">')
-            line1 = html.escape(line1_full)
-            exec_svg.append(
-                f'<text x="{x + 4:.2f}" y="{y + 15}" font-family="Arial, sans-serif" font-size="9" '
-                f'fill="#ffffff">{line1}</text>'
-            )
-            line2 = html.escape(line2_full)
-            exec_svg.append(
-                f'<text x="{x + 4:.2f}" y="{y + 25}" font-family="Arial, sans-serif" font-size="8" '
-                f'fill="#ffffff">{line2}</text>'
-            )
-            line3 = html.escape(line3_full)
-            exec_svg.append(
-                f'<text x="{x + 4:.2f}" y="{y + 34}" font-family="Arial, sans-serif" font-size="8" '
-                f'fill="#ffffff">{line3}</text>'
-            )
-            for ext_idx, ext in enumerate(outside_lines):
-                y_ext = y + 49 + (ext_idx * 9)
-                ext_txt = html.escape(ext)
-                exec_svg.append(
-                    f'<text x="{x + 2:.2f}" y="{y_ext:.2f}" font-family="Arial, sans-serif" font-size="8" '
-                    f'fill="#333333">{ext_txt}</text>'
-                )
-            exec_svg.append('</g>')
-            exec_svg.append('</g>')
-    exec_svg.append('</svg>')
-
-    region_rows = [regions_timeline[k] for k in sorted(regions_timeline.keys(), key=lambda k: (k[0], k[1], k[2]))]
-
-    used_min = min((reg['base'] for reg in region_rows), default=0)
-    used_max = max((reg['end'] for reg in region_rows), default=0)
-    if used_max < used_min:
-        used_max = used_min
-    used_span = max(1, used_max - used_min + 1)
-
-    # ---- Memory Address Timeline (2-D: address × time) ----
-    _mat_addr_max = int(tot_mem_size) * 1024
-    _mat_addr_span = max(1, _mat_addr_max)
-    _mat_xl = 110
-    _mat_xr = 24
-    _mat_pw = chart_width - _mat_xl - _mat_xr
-    _mat_h = 560
-    _mat_yt = 36
-    _mat_yb_mg = 52
-    _mat_ph = _mat_h - _mat_yt - _mat_yb_mg
-    _mat_ybot = _mat_yt + _mat_ph
-    _RC = "#2980b9"   # read  → blue
-    _WC = "#c0392b"   # write → red
-    _MC = "#8e44ad"   # mixed → purple
-
-    # ---- Non-linear Y axis ----
-    # Each region interval gets a guaranteed minimum of _min_px display pixels
-    # (tall enough to show its start-address label on the Y axis), plus a
-    # proportional share of the remaining space.  This way _disp_scale == 1 and
-    # small regions never collapse below _min_px regardless of how many there are.
-    _min_px = 14.0   # px per region — enough for a 7.5px address label below the tick
-    _sregs = sorted(region_rows, key=lambda r: r['base'])
-
-    # Boundaries: region starts + 0 + addr_max  (end+1 skipped to reduce tick clutter)
-    _boundaries = sorted({0, _mat_addr_max}
-                         | {r['base'] for r in _sregs}
-                         | {r['end'] + 1 for r in _sregs})
-
-    # Count how many boundary intervals are "region" intervals
-    def _interval_is_region(a0, a1):
-        return any(r['base'] <= a0 and r['end'] >= a1 - 1 for r in _sregs)
-
-    _n_reg_intervals = sum(
-        1 for _bi in range(len(_boundaries) - 1)
-        if _interval_is_region(_boundaries[_bi], _boundaries[_bi + 1])
-    )
-    # Reserve fixed pixel budget for regions; remainder distributed proportionally
-    _reserved = _n_reg_intervals * _min_px
-    _remaining = max(0.0, _mat_ph - _reserved)
-
-    # Build intervals with guaranteed minimum pixel heights (disp_scale == 1.0)
-    _intervals = []   # (addr_lo, addr_hi, disp_h_px)
-    for _bi in range(len(_boundaries) - 1):
-        _a0, _a1 = _boundaries[_bi], _boundaries[_bi + 1]
-        _span = _a1 - _a0
-        _prop_h = (_span / _mat_addr_span) * _remaining
-        _is_r = _interval_is_region(_a0, _a1)
-        _dh = (_min_px + _prop_h) if _is_r else _prop_h
-        _intervals.append((_a0, _a1, _dh))
-    # Total == _mat_ph by construction; no scaling needed
-    _disp_scale = 1.0
-
-    # Build cumulative lookup: addr -> y pixel
-    _cum_addr = [_boundaries[0]]
-    _cum_y = [float(_mat_yt)]
-    for _a0, _a1, _dh in _intervals:
-        _cum_addr.append(_a1)
-        _cum_y.append(_cum_y[-1] + _dh)
-
-    def _mat_ay(addr):
-        _a = max(0, min(int(addr), _mat_addr_max))
-        # Binary search in cumulative table
-        _lo, _hi = 0, len(_cum_addr) - 1
-        while _lo < _hi - 1:
-            _mid = (_lo + _hi) // 2
-            if _cum_addr[_mid] <= _a:
-                _lo = _mid
-            else:
-                _hi = _mid
-        # Interpolate within interval
-        _ia0, _ia1 = _cum_addr[_lo], _cum_addr[_hi]
-        _iy0, _iy1 = _cum_y[_lo], _cum_y[_hi]
-        if _ia1 == _ia0:
-            return _iy0
-        return _iy0 + (_a - _ia0) / (_ia1 - _ia0) * (_iy1 - _iy0)
-
-    def _mat_ah(addr_start, size):
-        return max(1.5, _mat_ay(int(addr_start) + int(size)) - _mat_ay(int(addr_start)))
-
-    mat_svg = []
-    mat_svg.append(
-        f'<svg width="{chart_width}" height="{_mat_h}" viewBox="0 0 {chart_width} {_mat_h}" '
-        f'xmlns="http://www.w3.org/2000/svg">'
-    )
-    mat_svg.append('<rect x="0" y="0" width="100%" height="100%" fill="#ffffff"/>')
-    mat_svg.append(
-        f'<text x="{_mat_xl}" y="22" font-family="Arial, sans-serif" font-size="14" font-weight="700">'
-        f'Memory Address Timeline</text>'
-    )
-
-    # Background bands — each region uses the same non-linear mapping as everything else
-    for _i, _reg in enumerate(_sregs):
-        _ry = _mat_ay(_reg['base'])
-        _rh = _mat_ah(_reg['base'], _reg['size'])
-        _fill = "#f5f5f5" if _i % 2 == 0 else "#ebebeb"
-        mat_svg.append(
-            f'<rect x="{_mat_xl}" y="{_ry:.2f}" width="{_mat_pw}" height="{_rh:.2f}" '
-            f'fill="{_fill}" stroke="#ddd" stroke-width="0.5"/>'
-        )
-
-    # Address-axis tick lines and hex labels.
-    # Show region start addresses + 0 + addr_max.
-    # With non-linear mapping each region start is >= _min_px apart — all labels fit.
-    _tick_addrs = sorted({0, _mat_addr_max} | {r['base'] for r in _sregs})
-    _prev_ty = -999.0
-    for _addr in _tick_addrs:
-        _ty = _mat_ay(_addr)
-        if _ty < _mat_yt - 1 or _ty > _mat_ybot + 1:
-            continue
-        mat_svg.append(
-            f'<line x1="{_mat_xl - 3}" y1="{_ty:.2f}" x2="{_mat_xl + _mat_pw}" y2="{_ty:.2f}" '
-            f'stroke="#d0d0d0" stroke-width="0.5"/>'
-        )
-        if abs(_ty - _prev_ty) >= 8:
-            mat_svg.append(
-                f'<text x="{_mat_xl - 5}" y="{_ty + 7:.2f}" text-anchor="end" '
-                f'font-family="monospace" font-size="7.5" fill="#777">0x{_addr:05X}</text>'
-            )
-            _prev_ty = _ty
-
-    # Time-axis grid (same tick positions as Gantt chart)
-    for _t in ticks:
-        _tx = _mat_xl + (_t / total_for_plot) * _mat_pw
-        mat_svg.append(
-            f'<line x1="{_tx:.2f}" y1="{_mat_yt}" x2="{_tx:.2f}" y2="{_mat_ybot}" '
-            f'stroke="#e8e8e8" stroke-width="1"/>'
-        )
-        mat_svg.append(
-            f'<text x="{_tx:.2f}" y="{_mat_ybot + 13}" text-anchor="middle" '
-            f'font-family="Arial, sans-serif" font-size="10" fill="#555">{_t}</text>'
-        )
-
-    mat_svg.append(
-        f'<rect x="{_mat_xl}" y="{_mat_yt}" width="{_mat_pw}" height="{_mat_ph}" '
-        f'fill="none" stroke="#999" stroke-width="1"/>'
-    )
-    mat_svg.append(
-        f'<text x="{_mat_xl + _mat_pw / 2:.2f}" y="{_mat_h - 18}" text-anchor="middle" '
-        f'font-family="Arial, sans-serif" font-size="12" fill="#333">Transaction number</text>'
-    )
-    mat_svg.append(
-        f'<text x="{_mat_xl + _mat_pw / 2:.2f}" y="{_mat_h - 2}" text-anchor="middle" '
-        f'font-family="Arial, sans-serif" font-size="11" fill="#555">'
-        f'Issued memory transactions (r/w) and computation cycles (i.e., req = 0) are both modeled here.'
-        f'</text>'
-    )
-
-    # One colored rectangle per (pattern_node, memory region)
-    for _node in pattern_nodes:
-        if _node['end_cycle'] <= _node['start_cycle']:
-            continue
-        _nx = _mat_xl + (_node['start_cycle'] / total_for_plot) * _mat_pw
-        _nw = max(1.5, ((_node['end_cycle'] - _node['start_cycle']) / total_for_plot) * _mat_pw)
-        for _reg in _node.get('regions', []):
-            _base = int(_reg.get('base', 0))
-            _size = int(_reg.get('size', 0))
-            if _size <= 0 or _base >= _mat_addr_max:
-                continue
-            _lbl = str(_reg.get('label', '')).lower()
-            if 'write' in _lbl and 'read' not in _lbl:
-                _color = _WC; _rws = "W"
-            elif 'read' in _lbl and 'write' not in _lbl:
-                _color = _RC; _rws = "R"
-            else:
-                _rpct = _node.get('traffic_read_pct')
-                if _rpct is not None:
-                    _rpi = int(_rpct)
-                    _color, _rws = (_RC, "R") if _rpi >= 70 else ((_WC, "W") if _rpi <= 30 else (_MC, "R/W"))
-                else:
-                    _color = _MC; _rws = "R/W"
-            _ry = _mat_ay(_base)
-            _rh = _mat_ah(_base, _size)
-            _ry0 = max(float(_mat_yt), _ry)
-            _ry1 = min(float(_mat_ybot), _ry + _rh)
-            _rhc = _ry1 - _ry0
-            if _rhc <= 0:
-                continue
-            _ttl = (
-                f"{_node['job']} [{_node['start_cycle']}, {_node['end_cycle']}) "
-                f"0x{_base:05X}+{_size}B {_rws}"
-            )
-            mat_svg.append('<g style="cursor:help;">')
-            mat_svg.append(f'<title>{html.escape(_ttl)}</title>')
-            mat_svg.append(
-                f'<rect x="{_nx:.2f}" y="{_ry0:.2f}" width="{_nw:.2f}" height="{_rhc:.2f}" '
-                f'fill="{_color}" fill-opacity="0.45" stroke="{_color}" stroke-width="0.7" rx="1.5"/>'
-            )
-            if _nw >= 8 and _rhc >= 9:
-                _chars_per_line = max(1, int((_nw - 4) / 4))
-                _job = _node["job"]
-                _lines = [_job[i:i + _chars_per_line] for i in range(0, len(_job), _chars_per_line)]
-                _clip_id = f"mc{_node['node_idx']}r{_base}"
-                mat_svg.append(
-                    f'<defs><clipPath id="{_clip_id}">'
-                    f'<rect x="{_nx:.2f}" y="{_ry0:.2f}" width="{_nw:.2f}" height="{_rhc:.2f}"/>'
-                    f'</clipPath></defs>'
-                )
-                mat_svg.append(f'<g clip-path="url(#{_clip_id})" style="pointer-events:none;">')
-                for _li, _line in enumerate(_lines):
-                    _ty = _ry0 + 8 + _li * 9
-                    if _ty > _ry0 + _rhc:
-                        break
-                    mat_svg.append(
-                        f'<text x="{_nx + 2:.2f}" y="{_ty:.2f}" '
-                        f'font-family="Arial, sans-serif" font-size="7" fill="#111">'
-                        f'{html.escape(_line)}</text>'
-                    )
-                mat_svg.append('</g>')
-            mat_svg.append('</g>')
-
-    # Legend
-    for _li, (_lc, _ll) in enumerate([(_RC, "Read from TCDM"), (_WC, "Write to TCDM"), (_MC, "Read + Write")]):
-        _lx = _mat_xl + _li * 200
-        _ly = _mat_ybot + 26
-        mat_svg.append(
-            f'<rect x="{_lx:.2f}" y="{_ly}" width="10" height="10" '
-            f'fill="{_lc}" fill-opacity="0.6" stroke="{_lc}" rx="1"/>'
-        )
-        mat_svg.append(
-            f'<text x="{_lx + 14:.2f}" y="{_ly + 9}" '
-            f'font-family="Arial, sans-serif" font-size="10" fill="#333">'
-            f'{html.escape(_ll)}</text>'
-        )
-    mat_svg.append('</svg>')
-
-    # ---- Job Dependency DAG ----
-    _dag_node_h = 28
-    _dag_v_gap = 12
-    _dag_h_gap = 70
-    _dag_xl = 20
-    _dag_yt = 50
-
-    # Collect unique jobs (first occurrence wins for metadata)
-    _dag_jobs = {}
-    for _n in pattern_nodes:
-        _jn = _n['job']
-        if _jn not in _dag_jobs:
-            _dag_jobs[_jn] = {
-                'driver_idx': _n['driver_idx'],
-                'driver_name': _n['driver_name'],
-                'is_hwpe': _n['is_hwpe'],
-                'wait_for': list(_n.get('wait_for_jobs_declared', [])),
-            }
-
-    # Filter wait_for to existing jobs only
-    _all_dag_jobs = set(_dag_jobs)
-    for _info in _dag_jobs.values():
-        _info['wait_for'] = [d for d in _info['wait_for'] if d in _all_dag_jobs]
-
-    # Build children map and in-degree for topological sort
-    _dag_children = {j: [] for j in _dag_jobs}
-    _dag_indeg = {j: 0 for j in _dag_jobs}
-    for _jn, _info in _dag_jobs.items():
-        for _dep in _info['wait_for']:
-            _dag_children[_dep].append(_jn)
-            _dag_indeg[_jn] += 1
-
-    # Longest-path level assignment via topological BFS
-    _dag_levels = {j: 0 for j in _dag_jobs}
-    _tmp_indeg = dict(_dag_indeg)
-    _q = deque(j for j in _dag_jobs if _tmp_indeg[j] == 0)
-    while _q:
-        _jn = _q.popleft()
-        for _ch in _dag_children[_jn]:
-            _dag_levels[_ch] = max(_dag_levels[_ch], _dag_levels[_jn] + 1)
-            _tmp_indeg[_ch] -= 1
-            if _tmp_indeg[_ch] == 0:
-                _q.append(_ch)
-
-    # Group by level; sort within level by (driver_idx, job_name)
-    _dag_level_groups = {}
-    for _jn, _lvl in _dag_levels.items():
-        _dag_level_groups.setdefault(_lvl, []).append(_jn)
-    for _lvl in _dag_level_groups:
-        _dag_level_groups[_lvl].sort(key=lambda j: (_dag_jobs[j]['driver_idx'], j))
-
-    # Node width: fit the longest job name (~5.8px per char at font-size 9 + padding)
-    _dag_node_w = max(90, max((len(j) * 6 + 16) for j in _dag_jobs) if _dag_jobs else 90)
-
-    # Assign (x, y) positions
-    _dag_pos = {}
-    _max_dag_lvl = max(_dag_levels.values()) if _dag_levels else 0
-    for _lvl, _group in sorted(_dag_level_groups.items()):
-        _nx = _dag_xl + _lvl * (_dag_node_w + _dag_h_gap)
-        for _i, _jn in enumerate(_group):
-            _dag_pos[_jn] = (_nx, _dag_yt + _i * (_dag_node_h + _dag_v_gap))
-
-    _dag_svg_w = max(chart_width, _dag_xl + (_max_dag_lvl + 1) * (_dag_node_w + _dag_h_gap) + 20)
-    _max_per_dag_lvl = max(len(g) for g in _dag_level_groups.values()) if _dag_level_groups else 1
-    _dag_svg_h = _dag_yt + _max_per_dag_lvl * (_dag_node_h + _dag_v_gap) + 30
-
-    dag_svg = []
-    dag_svg.append(
-        f'<svg width="{_dag_svg_w}" height="{_dag_svg_h}" '
-        f'viewBox="0 0 {_dag_svg_w} {_dag_svg_h}" xmlns="http://www.w3.org/2000/svg">'
-    )
-    dag_svg.append('<rect x="0" y="0" width="100%" height="100%" fill="#ffffff"/>')
-    dag_svg.append(
-        f'<text x="{_dag_xl}" y="22" font-family="Arial, sans-serif" '
-        f'font-size="14" font-weight="700">Job Dependency Graph</text>'
-    )
-    dag_svg.append(
-        '<defs><marker id="dag_arr" markerWidth="8" markerHeight="7" refX="7" refY="3.5" orient="auto">'
-        '<path d="M0,0 L0,7 L8,3.5 z" fill="#888"/>'
-        '</marker></defs>'
-    )
-
-    # Edges (drawn before nodes so nodes appear on top)
-    for _jn, _info in _dag_jobs.items():
-        _tx, _ty = _dag_pos[_jn]
-        _ty_mid = _ty + _dag_node_h / 2
-        for _dep in _info['wait_for']:
-            if _dep not in _dag_pos:
-                continue
-            _sx, _sy = _dag_pos[_dep]
-            _sy_mid = _sy + _dag_node_h / 2
-            _x1 = _sx + _dag_node_w
-            _x2 = _tx
-            _mx = (_x1 + _x2) / 2
-            dag_svg.append(
-                f'<path d="M{_x1:.1f},{_sy_mid:.1f} '
-                f'C{_mx:.1f},{_sy_mid:.1f} {_mx:.1f},{_ty_mid:.1f} {_x2:.1f},{_ty_mid:.1f}" '
-                f'fill="none" stroke="#aaa" stroke-width="1.2" marker-end="url(#dag_arr)"/>'
-            )
-
-    # Nodes
-    for _jn, _info in _dag_jobs.items():
-        _nx, _ny = _dag_pos[_jn]
-        _nc = _color_for_driver(_info['driver_idx'])
-        dag_svg.append(
-            f'<rect x="{_nx}" y="{_ny}" width="{_dag_node_w}" height="{_dag_node_h}" '
-            f'rx="4" fill="{_nc}" fill-opacity="0.88" stroke="#333" stroke-width="0.8"/>'
-        )
-        dag_svg.append(
-            f'<text x="{_nx + 6}" y="{_ny + 18}" font-family="Arial, sans-serif" '
-            f'font-size="9" fill="#ffffff" style="pointer-events:none;">'
-            f'{html.escape(_jn)}</text>'
-        )
-
-    dag_svg.append('</svg>')
+    """HTML shell of the dataflow report: metadata, legend and the canvas viewer.
 
+    The charts are drawn by dataflow_view.js from <page stem>.data.js (see
+    build_dataflow_data), so the shell does not grow with the workload.
+    """
     legend_items = []
     for d in sorted(driver_windows.keys()):
         n = driver_name_fn(d)
@@ -748,6 +663,19 @@ def build_memory_lifetime_html(
         "(no interconnect conflict/stall/arbitration modeling). "
         "Computation is modeled through idle cycles with no transaction issued."
     )
+    if schedule_stats and schedule_stats['contention_applied']:
+        note_2 = (
+            "Time axis is transaction-count based; concurrently active patterns share the "
+            "interconnect-side and memory-side ideal bandwidth (max-min fair) and stretch accordingly "
+            f"(uncontended total: {schedule_stats['ideal_total_cycles']} units). "
+            "Computation is modeled through idle cycles with no transaction issued."
+        )
+    util_html = ""
+    if schedule_stats and schedule_stats['predicted_utilization'] is not None:
+        util_html = (
+            f" | <b>Predicted utilization:</b> {100.0 * schedule_stats['predicted_utilization']:.1f}% "
+            f"of {schedule_stats['bottleneck_bits_per_cycle']:.0f} bit/cycle"
+        )
     note_2b = "Per-driver list order is still enforced by stimulus/fence sequencing."
     note_3 = ""
     if mux_serialization_applied:
@@ -758,10 +686,32 @@ def build_memory_lifetime_html(
         if mux_phase_order:
             note_3 += f" Job order: {', '.join(mux_phase_order)}."
     note_3_html = f"<div class='meta'>{html.escape(note_3)}</div>" if note_3 else ""
+    if critical_path and critical_path['bottleneck']:
+        bottleneck = critical_path['bottleneck']
+        note_4 = (
+            f"Critical path (outlined in red): {critical_path['total_cycles']} units over "
+            f"{len(critical_path['critical_path'])} patterns; bottleneck job '{bottleneck['job']}' "
+            f"({bottleneck['job_cycles']} units), driver {bottleneck['driver']} ({bottleneck['driver_cycles']} units)."
+        )
+        note_3_html += f"<div class='meta'>{html.escape(note_4)}</div>"
+    bank_panel_html = ""
+    if bank_load is not None:
+        peak = bank_load['peak']
+        bank_note = (
+            f"Bank load: max {bank_load['max']} accesses (bank {bank_load['hot_bank']}), "
+            f"mean {bank_load['mean']:.1f}, imbalance {bank_load['imbalance']:.2f} (max/mean), "
+            f"per-bucket imbalance {bank_load['bucket_imbalance']:.2f}; "
+            f"peak bank {peak['bank']} during [{peak['start']}, {peak['end']}): {peak['count']} accesses."
+        )
+        bank_panel_html = (
+            f"<div class='panel'><div class='meta'>{html.escape(bank_note)}</div>"
+            "<canvas id='df-banks'></canvas></div>"
+        )
     cycle_warning_html = (
         "<p style='margin:8px 0;color:#b00020;font-weight:600;'>Warning: dependency cycle detected; fallback scheduling order used.</p>"
         if schedule_has_cycle else ""
     )
+    viewer_js = _VIEWER_JS.read_text(encoding='utf-8')
     return (
         "<!doctype html><html><head><meta charset='utf-8'>"
         "<title>Memory Access Region View (Transaction-Count Model)</title>"
@@ -770,13 +720,9 @@ def build_memory_lifetime_html(
         "h1{font-size:20px;margin:0 0 6px 0;}h2{font-size:16px;margin:18px 0 8px 0;}"
         ".meta{font-size:13px;color:#333;margin-bottom:10px;}"
         ".panel{background:#fff;border:1px solid #ddd;border-radius:8px;padding:12px;margin-bottom:14px;overflow-x:auto;}"
-        "table{border-collapse:collapse;width:100%;font-size:12px;background:#fff;}"
-        "th,td{border:1px solid #ddd;padding:5px 7px;text-align:left;vertical-align:top;}"
-        "th{background:#f3f3f3;}"
-        ".region-card{border:1px solid #dcdcdc;border-radius:6px;padding:10px;margin-bottom:10px;background:#fff;}"
-        ".smalltbl{border-collapse:collapse;width:100%;font-size:11px;background:#fff;}"
-        ".smalltbl th,.smalltbl td{border:1px solid #ddd;padding:4px 6px;text-align:left;vertical-align:top;}"
-        ".smalltbl th{background:#f7f7f7;}"
+        ".panel canvas{display:block;cursor:grab;}"
+        "#df-tip{position:fixed;display:none;pointer-events:none;background:#fffff0;border:1px solid #999;"
+        "padding:3px 6px;font-size:11px;max-width:520px;z-index:10;}"
         "</style></head><body>"
         "<h1>Memory Access Region View</h1>"
         f"<div class='meta'><b>Drivers ({dw_narrow} bit):</b> "
@@ -786,27 +732,40 @@ def build_memory_lifetime_html(
         f"<b>Narrow master ports ({dw_narrow} bit):</b> {n_narrow_hci_cfg} | "
         f"<b>Wide master ports ({dw_wide} bit):</b> {n_wide_hci_cfg} | "
         f"<b>Slave ports (banks):</b> {n_banks} | "
-        f"<b>Total modeled time:</b> {total_cycles} units</div>"
+        f"<b>Total modeled time:</b> {total_cycles} units{util_html}</div>"
         f"<div class='meta'>{html.escape(note)}</div>"
         f"<div class='meta'>{html.escape(note_2)}</div>"
         f"<div class='meta'>{html.escape(note_2b)}</div>"
         f"{note_3_html}"
         f"{cycle_warning_html}"
+        "<div class='meta'>Wheel: zoom, drag: pan, double-click: reset. Patterns narrower than a pixel "
+        "are merged; zoom in to see them.</div>"
         "<div class='panel'><h2 style='margin-top:0;'>Legend</h2>"
         f"{''.join(legend_items)}</div>"
-        "<div class='panel'>"
-        f"{''.join(exec_svg)}"
-        "</div>"
-        "<div class='panel'>"
-        f"{''.join(mat_svg)}"
-        "</div>"
-        "<div class='panel'>"
-        f"{''.join(dag_svg)}"
-        "</div>"
+        "<div class='panel'><canvas id='df-exec'></canvas></div>"
+        "<div class='panel'><canvas id='df-addr'></canvas></div>"
+        f"{bank_panel_html}"
+        "<div class='panel'><canvas id='df-dag'></canvas></div>"
+        "<div id='df-tip'></div>"
+        # <name>.html loads <name>.data.js, so renamed copies keep working
+        "<script>document.write('<script src=\"' + encodeURI((decodeURIComponent("
+        "location.pathname.split('/').pop()) || 'dataflow.html').replace(/\\.html?$/, '')) "
+        "+ '.data.js\"><\\/script>');</script>"
+        f"<script>{viewer_js}</script>"
         "</body></html>"
     )
 
 
 def write_memory_lifetime_html(memory_lifetime_path: Path, **kwargs):
+    """Write the HTML shell and, next to it, <stem>.data.js with the chart data.
+
+    The data is one JSON object assigned to DATAFLOW_DATA: a script include
+    also loads from file:// pages, where fetch() of a sibling file is blocked.
+    Copy both files together, renaming them to the same stem.
+    """
+    data_path = memory_lifetime_path.with_name(f"{memory_lifetime_path.stem}.data.js")
+    data = build_dataflow_data(**kwargs)
+    data_path.write_text(
+        "DATAFLOW_DATA=" + json.dumps(data, separators=(',', ':')) + ";\n", encoding='utf-8')
     html_doc = build_memory_lifetime_html(**kwargs)
     memory_lifetime_path.write_text(html_doc, encoding='utf-8')
@@ -11,12 +11,42 @@ The application driver may consume some idle entries while stalled on an earlier
 request grant, and hide some memory/interconnect latency. So the file is not a
 strict wall-clock replay under contention.
 
+With --issue_mode timed the idle lines are replaced by cycle stamps: every request
+carries its earliest-issue cycle within the segment and the driver issues it at
+max(stamp, previous grant). The offered load is then exact under backpressure
+(open-loop), which is what latency-vs-load measurements need.
+
 Stimuli line format:
-  req(1b) id(IWb) wen(1b) data(Nb) add(Ab)
+  req(1b) id(IWb) wen(1b) be(BEWb) data(Nb) add(Ab)
+  @<cycle> req(1b) id(IWb) wen(1b) be(BEWb) data(Nb) add(Ab)   (timed)
+  DESC n id_start base ...                                    (descriptors)
+Every file starts with a '# totals requests=.. reads=.. writes=.. fences=..' line.
+
+With --fifo the stimuli never touch the disk: fence_params.svh and the reports
+are computed first, then every generated master file is replaced by a named
+pipe and filled by its own producer process while the simulator reads it
+(the pipe blocks the producer when the driver falls behind). Such files carry
+no totals header. --plan_only stops before the stimuli, e.g. to compile the
+testbench ahead of a --fifo run; --plan_only --fifo also creates the pipes, so
+the simulator and the later --fifo producers can be started in either order.
+Both still run every pattern generator into os.devnull, so a workload the
+generators reject fails here instead of in a producer.
+
+With --compress gz|zst the finished files are stored as master_*.txt.gz or
+master_*.txt.zst (the totals header pass writes them, so this costs no extra
+pass); run-verif decompresses them into the simulator through named pipes.
+Every master is finished and stored as soon as it is generated, so at most one
+plain master file is on disk at a time.
+
+With --stim_format descriptors, regular patterns (linear, 2d, 3d, matmul_phased
+under uniform arrival) are written as affine descriptors that the driver expands
+itself; the other patterns keep their expanded lines.
 """
 
 import json
 import math
+import multiprocessing
+import os
 import sys
 from pathlib import Path
 import argparse
@@ -24,14 +54,26 @@ import argparse
 code_directory = Path(__file__).resolve().parent
 
 try:
-    from hci_stimuli import StimuliGenerator
+    from hci_stimuli import (COMPRESSIONS, StimuliGenerator, TrafficShaper, codec_available, compressed_path,
+                              open_stimuli, plain_path, stimuli_files, write_stimuli_header,
+                              write_timed_stimuli)
     from memory_report import write_memory_map_txt
-    from html_report import write_memory_lifetime_html, build_schedule
+    from html_report import write_memory_lifetime_html, build_schedule, ideal_bandwidth
+    from critical_path import ScheduleGraph, find_node, parse_what_if, write_critical_path_json
+    from region_index import AccessIndex, find_hazards, write_hazards_json
+    from bank_load import bank_load, request_addresses
+    from placement import optimize_placement, write_placement_report
 except Exception:
     sys.path.insert(0, str(code_directory))
-    from hci_stimuli import StimuliGenerator
+    from hci_stimuli import (COMPRESSIONS, StimuliGenerator, TrafficShaper, codec_available, compressed_path,
+                              open_stimuli, plain_path, stimuli_files, write_stimuli_header,
+                              write_timed_stimuli)
     from memory_report import write_memory_map_txt
-    from html_report import write_memory_lifetime_html, build_schedule
+    from html_report import write_memory_lifetime_html, build_schedule, ideal_bandwidth
+    from critical_path import ScheduleGraph, find_node, parse_what_if, write_critical_path_json
+    from region_index import AccessIndex, find_hazards, write_hazards_json
+    from bank_load import bank_load, request_addresses
+    from placement import optimize_placement, write_placement_report
 
 
 def parse_args(argv=None):
@@ -41,6 +83,56 @@ def parse_args(argv=None):
     parser.add_argument('--hardware_config', required=True, help="Path to JSON hardware configuration file")
     parser.add_argument('--emit_fence_svh', default=None, metavar='PATH',
                         help="Write fence_params.svh to PATH (default: <simvectors_gen_dir>/fence_params.svh)")
+    parser.add_argument(
+        '--schedule',
+        choices=('ideal', 'contention'),
+        default='ideal',
+        help=(
+            "Temporal model for memory_map.txt and dataflow.html: 'ideal' runs every pattern at its "
+            "offered rate, 'contention' shares the interconnect/memory bandwidth among concurrent patterns."
+        ),
+    )
+    parser.add_argument(
+        '--what_if',
+        action='append',
+        default=[],
+        metavar='DRIVER:PATTERN=FACTOR',
+        help=(
+            "Report the total time and critical path if the duration of pattern PATTERN of DRIVER "
+            "(e.g. hwpe_0:1=1.5) were scaled by FACTOR. Can be given multiple times."
+        ),
+    )
+    parser.add_argument(
+        '--optimize_placement',
+        default=None,
+        metavar='PATH',
+        help=(
+            "Move the workload's regions to base addresses that minimize the predicted bank conflicts "
+            "of concurrently scheduled patterns, and write the rewritten workload JSON to PATH "
+            "(before/after report in generated/placement_report.txt). Overlapping regions move together; "
+            "patterns with \"relocatable\": false keep theirs."
+        ),
+    )
+    parser.add_argument(
+        '--issue_mode',
+        choices=('padded', 'timed'),
+        default='padded',
+        help=(
+            "padded: issue gaps are req=0 idle lines (default). "
+            "timed: every request carries its earliest-issue cycle instead, so the offered "
+            "load is kept exactly under backpressure."
+        ),
+    )
+    parser.add_argument(
+        '--stim_format',
+        choices=('lines', 'descriptors'),
+        default='lines',
+        help=(
+            "lines: one stimuli line per cycle (default). "
+            "descriptors: regular patterns as DESC lines expanded by the application driver, "
+            "which keeps the stimuli files small for long runs."
+        ),
+    )
     parser.add_argument(
         '--golden',
         action='store_true',
@@ -49,6 +141,29 @@ def parse_args(argv=None):
             "This assumes a per-master sequential memory model (initial = all 1s, updated by that master's writes)."
         ),
     )
+    parser.add_argument(
+        '--fifo',
+        action='store_true',
+        help=(
+            "Write the stimuli into named pipes (one per generated master) from concurrent "
+            "producer processes while the simulator reads them, instead of into files. "
+            "Returns once every pipe has been read to the end."
+        ),
+    )
+    parser.add_argument(
+        '--plan_only',
+        action='store_true',
+        help=(
+            "Only write fence_params.svh and the reports, no stimuli (e.g. to compile ahead of --fifo). "
+            "With --fifo, also create the named pipes without starting the producers."
+        ),
+    )
+    parser.add_argument(
+        '--compress',
+        choices=tuple(COMPRESSIONS),
+        default='none',
+        help="Store the stimuli files as master_*.txt.gz (gz) or master_*.txt.zst (zst, needs zstandard).",
+    )
     return parser.parse_args(argv)
 
 
@@ -67,6 +182,19 @@ def load_config(filename, description):
 ### MAIN ENTRYPOINT ###
 def main(argv=None):
     args = parse_args(argv)
+    if args.stim_format == 'descriptors' and args.issue_mode == 'timed':
+        print("ERROR: --stim_format descriptors cannot be combined with --issue_mode timed")
+        sys.exit(1)
+    if (args.fifo or args.plan_only) and (args.golden or args.issue_mode == 'timed'):
+        print("ERROR: --golden and --issue_mode timed rewrite the stimuli files and need them on disk "
+              "(not with --fifo/--plan_only)")
+        sys.exit(1)
+    if args.compress != 'none' and (args.fifo or args.plan_only):
+        print("ERROR: --compress stores the stimuli files, which --fifo/--plan_only do not write")
+        sys.exit(1)
+    if not codec_available(args.compress):
+        print("ERROR: --compress zst needs the zstandard package (pip install zstandard)")
+        sys.exit(1)
 
     hardware_config = load_config(args.hardware_config, "Hardware configuration")
     testbench_config = load_config(args.testbench_config, "Testbench configuration")
@@ -129,6 +257,13 @@ def main(argv=None):
     stimuli_dir = (generated_dir / 'stimuli').resolve()
     generated_dir.mkdir(parents=True, exist_ok=True)
     stimuli_dir.mkdir(parents=True, exist_ok=True)
+    # Pipes of an earlier --fifo or compressed run would block the writers
+    # below; only the producer run keeps the ones its --plan_only --fifo pass
+    # created. Compressed files of an earlier run would shadow the new ones.
+    if not (args.fifo and not args.plan_only):
+        for path in stimuli_files(stimuli_dir):
+            if path.is_fifo() or path != plain_path(path):
+                path.unlink()
 
     def _create_idle_file(path: Path, data_width: int):
         """Write a single idle line for a master that is not present in hardware."""
@@ -162,6 +297,16 @@ def main(argv=None):
         _create_idle_file(stimuli_dir / 'master_hwpe_0.txt', HWPE_WIDTH_FACT * DATA_WIDTH)
 
     next_start_id = 0
+    # Without it only the ids, memory map and schedule are planned (--fifo, --plan_only)
+    emit_stimuli = not (args.fifo or args.plan_only)
+    # Planning still runs the generators, into this sink, to validate the patterns
+    plan_sink = None if emit_stimuli else open(os.devnull, 'w', encoding='ascii')
+    # (filepath, master config, _generate_master kwargs, first id) per master for --fifo
+    fifo_jobs = []
+
+    def _idle_line(data_width):
+        return ("0 " + "0" * IW + " 0 " + "0" * max(1, data_width // 8) + " " + "0" * data_width
+                + " " + "0" * ADD_WIDTH + "\n")
 
     # Memory map entries collected during generation, printed at the end
     memory_map_entries = []
@@ -194,8 +339,7 @@ def main(argv=None):
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
                 rpct = master_config.get('traffic_read_pct', 50)
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
                 detail['read_pct']    = f"{rpct}%"
         elif config == 'matmul_phased':
             ra = _parse_maybe_bin_int(master_config.get('region_base_address_a'), None)
@@ -234,8 +378,7 @@ def main(argv=None):
                 detail['matrix_dims'] = f"M={m} N={n} K={k}  (A: {m}x{k}, B: {k}x{n}, C: {m}x{n})"
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
             idle_between = master_config.get('idle_cycles_between_phases', 0)
             if idle_between:
                 detail['idle_between_phases'] = f"{idle_between} cycles"
@@ -250,8 +393,7 @@ def main(argv=None):
             last_addr  = max(src_b + src_s, dst_b + dst_s) - access_bytes
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
         elif config == 'multi_linear':
             regs = master_config.get('regions', []) or []
             detail['schedule'] = str(master_config.get('schedule', 'round_robin'))
@@ -274,8 +416,7 @@ def main(argv=None):
                 last_addr = lb + max(0, ls) - access_bytes
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
         elif config == 'bank_group_linear':
             span = max(1, int(master_config.get('bank_group_span', 1)))
             start_bank = int(master_config.get('start_bank', 0)) % max(1, int(N_BANKS))
@@ -295,8 +436,7 @@ def main(argv=None):
                 detail['wen'] = int(master_config.get('wen', 1))
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
         elif config == 'rw_rowwise':
             row_base = _parse_maybe_bin_int(master_config.get('row_base_address'), region_base)
             row_size = _parse_maybe_bin_int(master_config.get('row_size_bytes'), access_bytes)
@@ -314,8 +454,7 @@ def main(argv=None):
                 detail['idle_between_rows'] = f"{idle_between} cycles"
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
         elif config == 'gather_scatter':
             rr = master_config.get('read_regions', []) or []
             wr = master_config.get('write_region', {}) or {}
@@ -335,8 +474,7 @@ def main(argv=None):
             last_addr = wb + max(0, ws) - access_bytes if ws > 0 else first_addr
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
         elif config == 'matmul_tiled_interleave':
             ra = _parse_maybe_bin_int(master_config.get('region_base_address_a'), region_base)
             sa = _parse_maybe_bin_int(master_config.get('region_size_bytes_a'), region_size // 3)
@@ -361,8 +499,7 @@ def main(argv=None):
             last_addr = rc + max(0, sc) - access_bytes
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
         elif config == 'hotspot_random':
             hrs = master_config.get('hot_regions', []) or []
             for idx, reg in enumerate(hrs):
@@ -378,8 +515,7 @@ def main(argv=None):
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
                 rpct = master_config.get('traffic_read_pct', 50)
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
                 detail['read_pct'] = f"{rpct}%"
         elif config == 'linear':
             base = int(start_address, 2) if set(start_address) <= {'0','1'} else int(start_address, 0)
@@ -391,8 +527,7 @@ def main(argv=None):
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
                 rpct = master_config.get('traffic_read_pct', 50)
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
                 detail['read_pct']    = f"{rpct}%"
         elif config == '2d':
             base = int(start_address, 2) if set(start_address) <= {'0','1'} else int(start_address, 0)
@@ -473,8 +608,10 @@ def main(argv=None):
                 detail['idle_between_groups'] = f"{idle_groups} cycles"
             tpct = master_config.get('traffic_pct')
             if tpct is not None:
-                n_idles_per_req = max(0, round((100 - int(tpct)) / int(tpct))) if int(tpct) < 100 else 0
-                detail['traffic_pct'] = f"{tpct}%  ({n_idles_per_req} idle(s) after each transaction)"
+                detail['traffic_pct'] = f"{tpct}%  ({TrafficShaper.describe(tpct, master_config.get('arrival'))})"
+
+        if master_config.get('data_mode', 'random') != 'random':
+            detail['data_mode'] = master_config['data_mode']
 
         if first_addr is not None:
             detail['first_addr'] = f"0x{first_addr:08x}  (bank {_bank_of(first_addr)})"
@@ -484,10 +621,6 @@ def main(argv=None):
         memory_map_entries.append({'label': label, 'pattern': config, 'n': n_test,
                                    'detail': detail})
 
-    # (file_path, n_idle_cycles) -- populated during generation,
-    # prepended as idle lines before padding for static start delays.
-    pending_start_delays = []
-
     def _parse_maybe_bin_int(raw_value, default_value):
         """Parse an int or binary/hex/decimal string; return default on failure."""
         if raw_value is None:
@@ -552,6 +685,24 @@ def main(argv=None):
             return [str(x) for x in raw]
         return [str(raw)]
 
+    def _pattern_seed(pattern_config, master_global_idx, pattern_idx):
+        """Seed of a pattern's random streams: 'seed' or '<driver index>:<pattern index>'."""
+        return pattern_config.get('seed', f"{master_global_idx}:{pattern_idx}")
+
+    def _pattern_arrival(pattern_config, master_global_idx, pattern_idx):
+        """Resolve the optional 'arrival' object, defaulting the seed to the pattern seed."""
+        raw = pattern_config.get('arrival')
+        if not raw:
+            return None
+        arrival = dict(raw)
+        arrival.setdefault('seed', _pattern_seed(pattern_config, master_global_idx, pattern_idx))
+        try:
+            TrafficShaper.from_arrival(pattern_config.get('traffic_pct') or 100, arrival)
+        except ValueError as e:
+            print(f"ERROR: pattern {pattern_idx} of driver {master_global_idx}: {e}")
+            sys.exit(1)
+        return arrival
+
     def _warn_if_id_mismatch(master_cfg, expected_idx, master_name):
         raw_id = master_cfg.get("id", expected_idx)
         try:
@@ -717,7 +868,9 @@ def main(argv=None):
         master_global_idx: int,
         master_local_idx: int,
         n_peers_of_kind: int,
+        pattern_idx: int,
         append: bool,
+        stream=None,
     ):
         """Generate one pattern segment. append=True opens file in append mode.
         Every pattern always writes a trailing PAUSE (handled by the generator)."""
@@ -725,10 +878,18 @@ def main(argv=None):
         data_width = HWPE_WIDTH_FACT * DATA_WIDTH if is_hwpe else DATA_WIDTH
         kind = 'master_hwpe' if is_hwpe else 'master_log'
 
-        master = StimuliGenerator(
-            IW, DATA_WIDTH, N_BANKS, TOT_MEM_SIZE, data_width, ADD_WIDTH,
-            str(filepath), 0, master_global_idx
-        )
+        try:
+            master = StimuliGenerator(
+                IW, DATA_WIDTH, N_BANKS, TOT_MEM_SIZE, data_width, ADD_WIDTH,
+                str(filepath), 0, master_global_idx,
+                data_mode=pattern_config.get('data_mode', 'random'),
+                seed=f"{_pattern_seed(pattern_config, master_global_idx, pattern_idx)}:data",
+                stim_format=args.stim_format,
+                stream=stream if emit_stimuli else plan_sink,
+            )
+        except ValueError as e:
+            print(f"ERROR: {kind}_{master_local_idx}: {e}")
+            sys.exit(1)
 
         if 'mem_access_type' not in pattern_config:
             print(f"ERROR: {kind}_{master_local_idx} pattern is missing mem_access_type.")
@@ -791,7 +952,8 @@ def main(argv=None):
         read_blocked_local = []
         write_blocked_local = []
         tpct_raw = pattern_config.get('traffic_pct', 100)
-        tpct = 100 if tpct_raw is None else int(tpct_raw)
+        tpct = 100 if tpct_raw is None else float(tpct_raw)
+        arrival = _pattern_arrival(pattern_config, master_global_idx, pattern_idx)
 
         multi_regions_cfg = []
         for reg in pattern_config.get('regions', []) or []:
@@ -830,6 +992,7 @@ def main(argv=None):
                 region_base=region_base,
                 region_size=region_size,
                 traffic_pct=tpct,
+                arrival=arrival,
                 traffic_read_pct=pattern_config.get('traffic_read_pct'),
                 append=append,
             )
@@ -839,6 +1002,7 @@ def main(argv=None):
                 read_blocked_local,
                 write_blocked_local,
                 traffic_pct=tpct,
+                arrival=arrival,
                 traffic_read_pct=pattern_config.get('traffic_read_pct'),
                 append=append,
             )
@@ -933,7 +1097,8 @@ def main(argv=None):
                 _ratio_a,
                 _ratio_b,
                 _ratio_c,
-                traffic_pct=int(pattern_config.get('traffic_pct', 100)),
+                traffic_pct=tpct,
+                arrival=arrival,
                 idle_cycles_between_phases=int(pattern_config.get('idle_cycles_between_phases', 0)),
                 region_base_address_a=_parse_maybe_bin_int(pattern_config.get('region_base_address_a'), None),
                 region_size_bytes_a=_parse_maybe_bin_int(pattern_config.get('region_size_bytes_a'), None),
@@ -955,6 +1120,7 @@ def main(argv=None):
                 schedule=pattern_config.get('schedule', 'round_robin'),
                 burst_len=int(pattern_config.get('burst_len', 1)),
                 traffic_pct=tpct,
+                arrival=arrival,
                 append=append,
             )
         elif config == 'bank_group_linear':
@@ -968,6 +1134,7 @@ def main(argv=None):
                 bank_group_hop=int(pattern_config.get('bank_group_hop', 0)),
                 wen=pattern_config.get('wen'),
                 traffic_pct=tpct,
+                arrival=arrival,
                 append=append,
             )
         elif config == 'rw_rowwise':
@@ -982,6 +1149,7 @@ def main(argv=None):
                 reads_per_row=int(pattern_config.get('reads_per_row', 0)),
                 writes_per_row=int(pattern_config.get('writes_per_row', 0)),
                 traffic_pct=tpct,
+                arrival=arrival,
                 idle_cycles_between_rows=int(pattern_config.get('idle_cycles_between_rows', 0)),
                 append=append,
             )
@@ -995,6 +1163,7 @@ def main(argv=None):
                 chunk_bytes=_parse_maybe_bin_int(pattern_config.get('chunk_bytes'), access_bytes),
                 schedule=pattern_config.get('schedule', '4read_1write'),
                 traffic_pct=tpct,
+                arrival=arrival,
                 append=append,
             )
         elif config == 'matmul_tiled_interleave':
@@ -1032,6 +1201,7 @@ def main(argv=None):
                 tiles=int(pattern_config.get('tiles', 1)),
                 ab_c_schedule=pattern_config.get('ab_c_schedule', 'A_B_C'),
                 traffic_pct=tpct,
+                arrival=arrival,
                 idle_cycles_between_tiles=int(pattern_config.get('idle_cycles_between_tiles', 0)),
                 append=append,
             )
@@ -1042,6 +1212,7 @@ def main(argv=None):
                 write_blocked_local,
                 hot_regions=hot_regions_cfg,
                 traffic_pct=tpct,
+                arrival=arrival,
                 traffic_read_pct=pattern_config.get('traffic_read_pct'),
                 append=append,
             )
@@ -1071,6 +1242,7 @@ def main(argv=None):
                 include_weights=bool(pattern_config.get('include_weights', True)),
                 output_writes_per_point=int(pattern_config.get('output_writes_per_point', 1)),
                 traffic_pct=tpct,
+                arrival=arrival,
                 idle_cycles_between_rows=int(pattern_config.get('idle_cycles_between_rows', 0)),
                 idle_cycles_between_groups=int(pattern_config.get('idle_cycles_between_groups', 0)),
                 append=append,
@@ -1085,6 +1257,7 @@ def main(argv=None):
                 dst_base_address=_parse_maybe_bin_int(pattern_config.get('dst_base_address'), region_base),
                 dst_size_bytes=_parse_maybe_bin_int(pattern_config.get('dst_size_bytes'), access_bytes),
                 traffic_pct=tpct,
+                arrival=arrival,
                 append=append,
             )
 
@@ -1105,9 +1278,17 @@ def main(argv=None):
         master_global_idx: int,
         master_local_idx: int,
         n_peers_of_kind: int,
+        stream=None,
     ):
         """Generate stimulus for a master, supporting single flat pattern or patterns list."""
         data_width = HWPE_WIDTH_FACT * DATA_WIDTH if is_hwpe else DATA_WIDTH
+        if args.fifo and not emit_stimuli:
+            fifo_jobs.append((filepath, master_config, {
+                'is_hwpe': is_hwpe,
+                'master_global_idx': master_global_idx,
+                'master_local_idx': master_local_idx,
+                'n_peers_of_kind': n_peers_of_kind,
+            }, next_start_id))
 
         # Resolve pattern list: either explicit 'patterns' list or a single flat pattern
         if 'patterns' in master_config:
@@ -1120,10 +1301,15 @@ def main(argv=None):
             # Legacy flat format: treat the master config itself as a single pattern
             patterns = [master_config]
 
-        # Start delay applies to the whole master (prepended before first pattern)
+        # Start delay applies to the whole master (written before the first pattern)
+        first_written = False
         start_delay = int(master_config.get('start_delay_cycles', 0))
         if start_delay > 0:
-            pending_start_delays.append((filepath, start_delay, data_width))
+            if stream is not None:
+                stream.write(_idle_line(data_width) * start_delay)
+            elif emit_stimuli:
+                filepath.write_text(_idle_line(data_width) * start_delay, encoding='ascii')
+                first_written = True
 
         # For each pattern with wait_for_jobs, prepend a synthetic idle+PAUSE that acts as
         # the blocking fence. The pattern's own trailing PAUSE is always mask=0 (free
@@ -1131,26 +1317,125 @@ def main(argv=None):
         # This separates "I am done" (trailing PAUSE, free) from "I may start" (idle
         # gate, blocking), giving resume_i a single clean meaning: start your next job.
         dw = HWPE_WIDTH_FACT * DATA_WIDTH if is_hwpe else DATA_WIDTH
-        first_written = False
         for p_idx, pattern_config in enumerate(patterns):
-            if _pattern_wait_for_jobs(pattern_config):
+            if _pattern_wait_for_jobs(pattern_config) and emit_stimuli:
                 # Synthetic idle+PAUSE gates this pattern
                 _idle = StimuliGenerator(IW, DATA_WIDTH, N_BANKS, TOT_MEM_SIZE,
-                                         dw, ADD_WIDTH, str(filepath), 0, master_global_idx)
+                                         dw, ADD_WIDTH, str(filepath), 0, master_global_idx,
+                                         stream=stream)
                 _idle.N_TEST = 0
                 _idle.idle_gen(next_start_id, append=first_written)
                 first_written = True
-            _generate_pattern(
-                filepath,
-                pattern_config,
-                is_hwpe=is_hwpe,
-                master_global_idx=master_global_idx,
-                master_local_idx=master_local_idx,
-                n_peers_of_kind=n_peers_of_kind,
-                append=first_written,
-            )
+            try:
+                _generate_pattern(
+                    filepath,
+                    pattern_config,
+                    is_hwpe=is_hwpe,
+                    master_global_idx=master_global_idx,
+                    master_local_idx=master_local_idx,
+                    n_peers_of_kind=n_peers_of_kind,
+                    pattern_idx=p_idx,
+                    append=first_written,
+                    stream=stream,
+                )
+            except (RuntimeError, ValueError) as e:
+                kind = 'master_hwpe' if is_hwpe else 'master_log'
+                print(f"ERROR: {kind}_{master_local_idx} pattern {p_idx}: {e}")
+                sys.exit(1)
             first_written = True
 
+    def _fifo_producer(filepath, master_config, master_kwargs, start_id):
+        """Producer process of --fifo: generate one master into its named pipe."""
+        nonlocal next_start_id, emit_stimuli
+        next_start_id = start_id
+        emit_stimuli = True
+        try:
+            # Blocks until the simulator opens the pipe
+            with open(filepath, 'w', encoding='ascii') as stream:
+                _generate_master(filepath, master_config, stream=stream, **master_kwargs)
+        except BrokenPipeError:
+            print(f"ERROR: {filepath.name}: the reader closed the pipe before the end of the stimuli")
+            sys.exit(1)
+
+    def _make_fifos():
+        """Replace the planned master files by named pipes (existing pipes are kept)."""
+        for filepath, _, _, _ in fifo_jobs:
+            if filepath.is_fifo():
+                continue
+            if filepath.exists() or filepath.is_symlink():
+                filepath.unlink()
+            os.mkfifo(filepath)
+
+    def _run_fifo_producers():
+        """Fill the named pipes of the planned masters concurrently."""
+        _make_fifos()
+        # fork: the producers inherit the planned state instead of pickling it
+        ctx = multiprocessing.get_context('fork')
+        producers = []
+        for filepath, master_config, master_kwargs, start_id in fifo_jobs:
+            proc = ctx.Process(target=_fifo_producer, args=(filepath, master_config, master_kwargs, start_id),
+                               name=filepath.name)
+            proc.start()
+            producers.append(proc)
+        print(f"Streaming stimuli into {len(producers)} named pipe(s) under {stimuli_dir}")
+        failed = []
+        for proc in producers:
+            proc.join()
+            if proc.exitcode != 0:
+                failed.append(proc.name)
+        if failed:
+            print(f"ERROR: stimuli producer(s) failed: {', '.join(failed)}")
+            sys.exit(1)
+        print("STEP 2 COMPLETED: stimuli streamed")
+
+    # Final paths of the stimuli files already stored by _store_stimuli
+    stored_stimuli = set()
+
+    def _store_stimuli(stim_path: Path):
+        """Finish a generated master file: golden vectors, cycle stamps, totals header.
+
+        The last pass stores it with --compress and removes the plain file.
+        """
+        if args.golden:
+            _write_golden(stim_path)
+        if args.issue_mode == 'timed':
+            write_timed_stimuli(stim_path)
+        out_path = compressed_path(stim_path, args.compress)
+        write_stimuli_header(stim_path, out_path)
+        stored_stimuli.add(out_path)
+
+    def _write_golden(stim_path: Path):
+        """Expected read data of a stimuli file, from its own earlier writes."""
+        golden_dir = (generated_dir / 'golden').resolve()
+        golden_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            with open_stimuli(stim_path) as f:
+                text = f.read()
+        except OSError:
+            return
+
+        mem = {}
+        out_lines = []
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) != 5:
+                continue
+            req_s, id_s, wen_s, data_s, add_s = parts
+            if req_s != '1':
+                continue
+            if wen_s == '0':
+                mem[add_s] = data_s
+                continue
+            exp_s = mem.get(add_s, '1' * len(data_s))
+            out_lines.append(f"{id_s} {add_s} {exp_s}")
+
+        (golden_dir / f"golden_{plain_path(stim_path).name}").write_text(
+            "\n".join(out_lines) + ("\n" if out_lines else ""), encoding='ascii'
+        )
+
     global_idx = 0
 
     # Generate LOG masters (CORE, DMA, EXT) in order
@@ -1178,6 +1463,8 @@ def main(argv=None):
             master_local_idx=i,
             n_peers_of_kind=max(1, N_LOG),
         )
+        if emit_stimuli:
+            _store_stimuli(stimuli_dir / f"master_log_{i}.txt")
         global_idx += 1
 
     # Generate HWPE masters
@@ -1195,9 +1482,25 @@ def main(argv=None):
             master_local_idx=hw_idx,
             n_peers_of_kind=max(1, N_HWPE),
         )
+        if emit_stimuli:
+            _store_stimuli(stimuli_dir / f"master_hwpe_{hw_idx}.txt")
         global_idx += 1
 
-    print("STEP 0 COMPLETED: generate stimuli files")
+    if emit_stimuli:
+        # The idle files of the absent masters
+        for stim_path in stimuli_files(stimuli_dir):
+            if stim_path not in stored_stimuli:
+                _store_stimuli(stim_path)
+        steps = ["totals headers"]
+        if args.golden:
+            steps.insert(0, "golden vectors")
+        if args.issue_mode == 'timed':
+            steps.insert(-1, "cycle stamps")
+        stored = f", stored as master_*.txt{COMPRESSIONS[args.compress]}" if args.compress != 'none' else ""
+        print(f"STEP 0 COMPLETED: generate stimuli files ({', '.join(steps)}{stored})")
+    else:
+        plan_sink.close()
+        print("STEP 0 COMPLETED: plan stimuli")
 
     # -----------------------------------------------------------------------
     # Compute FENCE_MASKS and emit fence_params.svh
@@ -1365,7 +1668,10 @@ def main(argv=None):
         f"localparam logic [N_DRIVERS*LEVEL_BITS-1:0] FENCE_REQ_LEVELS_PACKED [N_DRIVERS][MAX_FENCES] =\n"
         f"    {fence_req_levels_packed_param};\n"
     )
-    svh_path.write_text(svh_content, encoding='utf-8')
+    # Unchanged content keeps the timestamp, so a --fifo run after --plan_only
+    # does not make the compiled testbench look stale
+    if not svh_path.exists() or svh_path.read_text(encoding='utf-8') != svh_content:
+        svh_path.write_text(svh_content, encoding='utf-8')
     print(f"FENCE_PARAMS.SVH written: {svh_path}")
 
     # -----------------------------------------------------------------------
@@ -1695,15 +2001,13 @@ def main(argv=None):
             })
         return regions
 
-    def _estimate_pattern_cycles(pattern_config, mem_access_type, n_test, txn_bytes):
+    def _estimate_pattern_cycles(pattern_config, mem_access_type, n_test, txn_bytes, arrival=None):
         # Temporal model: one unit per transaction plus req=0 idles from traffic_pct
-        # shaping, plus inter-phase/tile/row boundary idles where applicable.
+        # shaping (replayed for seeded arrival models), plus inter-phase/tile/row
+        # boundary idles where applicable.
         base = max(0, int(n_test))
         tpct = pattern_config.get('traffic_pct')
-        n_idles_per_req = 0
-        if tpct is not None:
-            tp = max(1, min(100, int(tpct)))
-            n_idles_per_req = 0 if tp >= 100 else int(round((100 - tp) / tp))
+        shaping_idles = TrafficShaper.total_idles(tpct, base, arrival) if tpct is not None else 0
 
         boundary_idles = 0
         if mem_access_type == '2d':
@@ -1746,7 +2050,7 @@ def main(argv=None):
             groups = math.ceil(channels / channel_group)
             boundary_idles = max(0, out_h - 1) * idle_rows * groups + max(0, groups - 1) * idle_groups
 
-        return int(base * (1 + n_idles_per_req) + boundary_idles)
+        return int(base + shaping_idles + boundary_idles)
 
     pattern_nodes = []
     node_idx_by_driver_pattern = {}
@@ -1779,7 +2083,10 @@ def main(argv=None):
                 'wait_for_jobs_declared': declared_wait_for_jobs,
                 'wait_for_jobs_effective': effective_wait_for_jobs,
                 'n_transactions': int(n_test),
-                'cycles': int(_estimate_pattern_cycles(pat, mem_access_type, n_test, int(data_width // 8))),
+                'cycles': int(_estimate_pattern_cycles(
+                    pat, mem_access_type, n_test, int(data_width // 8),
+                    arrival=_pattern_arrival(pat, drv_idx, p_idx),
+                )),
                 'mem_access_type': mem_access_type,
                 'traffic_read_pct': (
                     50 if mem_access_type == 'copy_linear'
@@ -1798,11 +2105,115 @@ def main(argv=None):
             job_to_nodes.setdefault(node['job'], []).append(node['node_idx'])
             driver_last_node[drv_idx] = node['node_idx']
 
+    bandwidth = None
+    if args.schedule == 'contention':
+        bandwidth = ideal_bandwidth(INTERCO_TYPE, N_NARROW_HCI_CFG, N_WIDE_HCI_CFG,
+                                    DW_NARROW, DW_WIDE, N_BANKS, DATA_WIDTH)
     (driver_windows, regions_timeline, total_cycles,
-     schedule_has_cycle, mux_serialization_applied, mux_phase_order) = build_schedule(
-        pattern_nodes, node_idx_by_driver_pattern, job_to_nodes, INTERCO_TYPE
+     schedule_has_cycle, mux_serialization_applied, mux_phase_order,
+     schedule_stats) = build_schedule(
+        pattern_nodes, node_idx_by_driver_pattern, job_to_nodes, INTERCO_TYPE,
+        bandwidth=bandwidth,
     )
 
+    # -----------------------------------------------------------------------
+    # Critical path and slack
+    # -----------------------------------------------------------------------
+    critical_path = None
+    what_if_results = []
+    if not schedule_has_cycle:
+        schedule_graph = ScheduleGraph(pattern_nodes)
+        schedule_graph.annotate()
+        critical_path = schedule_graph.summary()
+        for spec in args.what_if:
+            try:
+                drv_name, p_idx, factor = parse_what_if(spec)
+                n_idx = find_node(pattern_nodes, drv_name, p_idx)
+            except (ValueError, KeyError) as e:
+                print(f"ERROR: --what_if: {e}")
+                sys.exit(1)
+            what_if_results.append(schedule_graph.what_if(n_idx, factor))
+        critical_path_path = generated_dir / 'critical_path.json'
+        write_critical_path_json(critical_path_path, critical_path, what_if_results)
+        print(f"Critical path written: {critical_path_path}")
+    else:
+        print("WARNING: dependency cycle in the pattern schedule; critical path and --what_if skipped")
+
+    # -----------------------------------------------------------------------
+    # Data hazards between concurrently scheduled drivers
+    # -----------------------------------------------------------------------
+    access_index = AccessIndex(pattern_nodes)
+    hazards = find_hazards(access_index)
+    hazards_path = generated_dir / 'hazards.json'
+    write_hazards_json(hazards_path, hazards)
+    print(f"Hazards written: {hazards_path} ({len(hazards)} hazard(s))")
+
+    # -----------------------------------------------------------------------
+    # Per-bank load over time, from the stimuli just generated
+    # -----------------------------------------------------------------------
+    def _driver_addresses(drv_idx):
+        is_hwpe = all_masters[drv_idx][1]
+        name = f"master_hwpe_{drv_idx - N_LOG}.txt" if is_hwpe else f"master_log_{drv_idx}.txt"
+        path = compressed_path(stimuli_dir / name, args.compress)
+        if not path.is_file():
+            return None
+        data_width = HWPE_WIDTH_FACT * DATA_WIDTH if is_hwpe else DATA_WIDTH
+        return request_addresses(path, max(1, data_width // 8))
+
+    bank_load_data = None
+    if emit_stimuli:
+        bank_load_data = bank_load(pattern_nodes, _driver_addresses, total_cycles, N_BANKS, DATA_WIDTH // 8)
+    if bank_load_data is not None:
+        print(
+            f"Bank load: max={bank_load_data['max']} (bank {bank_load_data['hot_bank']}) "
+            f"mean={bank_load_data['mean']:.1f} imbalance={bank_load_data['imbalance']:.2f}"
+        )
+    else:
+        print("Bank load: skipped (no stimuli files to read)")
+
+    # -----------------------------------------------------------------------
+    # Region placement minimizing the predicted bank conflicts
+    # -----------------------------------------------------------------------
+    if args.optimize_placement:
+        node_configs = {
+            node['node_idx']: _patterns_of(all_masters[node['driver_idx']][0])[node['pattern_idx']]
+            for node in pattern_nodes
+        }
+
+        def _resolve_node_regions(node_idx, pattern_config):
+            node = pattern_nodes[node_idx]
+            n_peers = max(1, N_HWPE if node['is_hwpe'] else N_LOG)
+            return _resolve_regions(pattern_config, node['mem_access_type'], node['is_hwpe'],
+                                    node['local_idx'], n_peers)
+
+        placement = optimize_placement(
+            pattern_nodes, node_configs, _resolve_node_regions,
+            n_banks=N_BANKS, word_bytes=DATA_WIDTH // 8, total_mem_bytes=int(TOT_MEM_SIZE * 1024),
+        )
+        placed_workload = dict(workload_config)
+        for key, masters, first_drv in (('log_masters', log_masters, 0), ('hwpe_masters', hwpe_masters, N_LOG)):
+            placed_masters = []
+            for local_idx, master_cfg in enumerate(masters):
+                drv_idx = first_drv + local_idx
+                placed_patterns = [
+                    placement['configs'][node_idx_by_driver_pattern[(drv_idx, p_idx)]]
+                    for p_idx in range(len(_patterns_of(master_cfg)))
+                ]
+                if 'patterns' in master_cfg:
+                    placed_masters.append(dict(master_cfg, patterns=placed_patterns))
+                else:
+                    placed_masters.append(placed_patterns[0])
+            placed_workload[key] = placed_masters
+        placed_workload_path = Path(args.optimize_placement)
+        placed_workload_path.write_text(json.dumps(placed_workload, indent=2) + "\n", encoding='utf-8')
+        placement_report_path = generated_dir / 'placement_report.txt'
+        write_placement_report(placement_report_path, placement, pattern_nodes,
+                               n_banks=N_BANKS, word_bytes=DATA_WIDTH // 8)
+        print(
+            f"Placed workload written: {placed_workload_path} (predicted conflicts "
+            f"{placement['cost_before']:.1f} -> {placement['cost_after']:.1f}, see {placement_report_path})"
+        )
+
     # -----------------------------------------------------------------------
     # Build memory_map.txt
     # -----------------------------------------------------------------------
@@ -1835,11 +2246,16 @@ def main(argv=None):
         driver_windows=driver_windows,
         pattern_nodes=pattern_nodes,
         regions_timeline=regions_timeline,
+        schedule_stats=schedule_stats,
+        critical_path=critical_path,
+        what_if=what_if_results,
+        hazards=hazards,
+        bank_load=bank_load_data,
     )
     print(f"Memory map written: {memory_map_path}")
 
     # -----------------------------------------------------------------------
-    # Build dataflow.html (simple SVG timeline view)
+    # Build dataflow.html + dataflow.data.js (canvas timeline view)
     # -----------------------------------------------------------------------
     dataflow_path = generated_dir / 'dataflow.html'
     write_memory_lifetime_html(
@@ -1863,55 +2279,22 @@ def main(argv=None):
         n_wide_hci_cfg=N_WIDE_HCI_CFG,
         n_banks=N_BANKS,
         tot_mem_size=TOT_MEM_SIZE,
+        schedule_stats=schedule_stats,
+        critical_path=critical_path,
+        bank_load=bank_load_data,
     )
     print(f"Dataflow plot written: {dataflow_path}")
 
-    # -----------------------------------------------------------------------
-    # Apply per-master start delays
-    # -----------------------------------------------------------------------
-    for fpath, delay, dw in pending_start_delays:
-        if fpath.exists():
-            idle_line = "0 " + "0" * IW + " 0 " + "0" * dw + " " + "0" * ADD_WIDTH + "\n"
-            original = fpath.read_text(encoding='ascii')
-            fpath.write_text(idle_line * delay + original, encoding='ascii')
-
-    print("STEP 1 COMPLETED: generate documents and apply start delays to stimuli")
+    print("STEP 1 COMPLETED: generate documents")
 
     # -----------------------------------------------------------------------
-    # Golden vectors
+    # Stream the planned masters into their named pipes
     # -----------------------------------------------------------------------
-    if args.golden:
-        golden_dir = (generated_dir / 'golden').resolve()
-        golden_dir.mkdir(parents=True, exist_ok=True)
-
-        for stim_path in sorted(stimuli_dir.glob('master_*.txt')):
-            try:
-                text = stim_path.read_text(encoding='ascii')
-            except OSError:
-                continue
-
-            mem = {}
-            out_lines = []
-            for raw_line in text.splitlines():
-                line = raw_line.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) != 5:
-                    continue
-                req_s, id_s, wen_s, data_s, add_s = parts
-                if req_s != '1':
-                    continue
-                if wen_s == '0':
-                    mem[add_s] = data_s
-                    continue
-                exp_s = mem.get(add_s, '1' * len(data_s))
-                out_lines.append(f"{id_s} {add_s} {exp_s}")
-
-            (golden_dir / f"golden_{stim_path.name}").write_text(
-                "\n".join(out_lines) + ("\n" if out_lines else ""), encoding='ascii'
-            )
-        print("STEP 2 COMPLETED: golden vectors")
+    if args.fifo and args.plan_only:
+        _make_fifos()
+        print(f"Created {len(fifo_jobs)} named pipe(s) under {stimuli_dir}")
+    elif args.fifo:
+        _run_fifo_producers()
 
 
 if __name__ == '__main__':
@@ -31,6 +31,12 @@ def build_memory_map_text(
     driver_windows,
     pattern_nodes,
     regions_timeline,
+    schedule_stats=None,
+    critical_path=None,
+    what_if=(),
+    hazards=None,
+    bank_load=None,
+    hazard_top=20,
 ):
     word_bytes = data_width // 8
     bank_stride_bytes = n_banks * word_bytes
@@ -77,27 +83,69 @@ def build_memory_map_text(
     lines.append(f"    Total modeled time: {total_cycles} units (1 unit = 1 transaction)")
     lines.append("    Note: Declared wait_for_jobs dependencies are used for scheduling.")
     lines.append("    Note: Per-driver list order is also enforced (pattern p[i] -> p[i+1]).")
-    lines.append("    Note: No interconnect contention/stall timing is modeled.")
+    contention = bool(schedule_stats and schedule_stats['contention_applied'])
+    if contention:
+        lines.append("    Note: Concurrent patterns share the interconnect-side and memory-side ideal bandwidth.")
+        lines.append(f"    Uncontended total time: {schedule_stats['ideal_total_cycles']} units")
+    else:
+        lines.append("    Note: No interconnect contention/stall timing is modeled.")
+    if schedule_stats and schedule_stats['predicted_utilization'] is not None:
+        lines.append(
+            f"    Predicted utilization: {100.0 * schedule_stats['predicted_utilization']:.1f}% "
+            f"of {schedule_stats['bottleneck_bits_per_cycle']:.0f} bit/cycle "
+            f"({schedule_stats['total_bits']} bits)"
+        )
     if mux_serialization_applied:
         lines.append("    Note: MUX mode serializes HWPE execution by job order, then HWPE ID (tb_hci-like).")
         lines.append(f"    MUX job order: {', '.join(mux_phase_order)}")
     if schedule_has_cycle:
         lines.append("    WARNING: dependency cycle detected while scheduling; using fallback order.")
+    nodes_by_driver = {}
+    for node in pattern_nodes:
+        nodes_by_driver.setdefault(node['driver_idx'], []).append(node)
     for d in range(n_drivers):
         if d not in driver_windows:
             continue
         w = driver_windows[d]
         lines.append(f"    {w['name']:<8}: [{w['start']:>6}, {w['end']:>6})  dur={w['end'] - w['start']:>6}")
-        for node in [n for n in pattern_nodes if n['driver_idx'] == d]:
+        for node in nodes_by_driver.get(d, []):
             reg_tokens = []
             for reg in node['regions']:
                 reg_tokens.append(f"{reg['label']}@0x{reg['base']:08x}+{reg['size']}B")
             reg_text = ", ".join(reg_tokens) if reg_tokens else "no regions"
+            ideal_text = (
+                f" ideal=[{node['ideal_start_cycle']},{node['ideal_end_cycle']})"
+                if contention else ""
+            )
+            slack_text = ""
+            if 'slack' in node:
+                slack_text = " slack=0 CRITICAL" if node['critical'] else f" slack={node['slack']}"
             lines.append(
                 f"      p{node['pattern_idx']} job={node['job']} "
-                f"[{node['start_cycle']},{node['end_cycle']}) "
+                f"[{node['start_cycle']},{node['end_cycle']}){ideal_text}{slack_text} "
                 f"type={node['mem_access_type']} n={node['n_transactions']}  {reg_text}"
             )
+    if critical_path is not None:
+        lines.append("")
+        lines.append("  Critical path (longest path through the schedule):")
+        lines.append(f"    Length: {critical_path['total_cycles']} units")
+        bottleneck = critical_path['bottleneck']
+        if bottleneck:
+            lines.append(
+                f"    Bottleneck: job '{bottleneck['job']}' ({bottleneck['job_cycles']} units), "
+                f"driver {bottleneck['driver']} ({bottleneck['driver_cycles']} units)"
+            )
+        for entry in critical_path['critical_path']:
+            lines.append(
+                f"    {entry['driver']:<8} p{entry['pattern_idx']} job={entry['job']} "
+                f"[{entry['start']},{entry['end']})  dur={entry['duration']}"
+            )
+        for res in what_if:
+            node = res['node']
+            lines.append(
+                f"    What-if {node['driver']} p{node['pattern_idx']} x{res['factor']:g}: "
+                f"total={res['total_cycles']} ({res['delta_cycles']:+d})"
+            )
     lines.append("")
     lines.append("  Memory region lifetimes:")
     for key in sorted(regions_timeline.keys(), key=lambda k: (k[0], k[1], k[2])):
@@ -108,6 +156,40 @@ def build_memory_map_text(
             f"({reg['size']:>6} B)  lifetime=[{reg['lifetime_start']},{reg['lifetime_end']})  "
             f"users={', '.join(users)}"
         )
+    if bank_load is not None:
+        lines.append("")
+        lines.append(
+            f"  Bank load (bank word accesses of the stimuli over the schedule, "
+            f"{bank_load['n_buckets']} buckets of {bank_load['bucket_cycles']:.1f} units):"
+        )
+        lines.append(
+            f"    Max: {bank_load['max']} (bank {bank_load['hot_bank']})  Mean: {bank_load['mean']:.1f}  "
+            f"Imbalance: {bank_load['imbalance']:.2f} (max/mean)  "
+            f"Per-bucket imbalance: {bank_load['bucket_imbalance']:.2f} (average over busy buckets)"
+        )
+        peak = bank_load['peak']
+        lines.append(
+            f"    Peak: bank {peak['bank']} during [{peak['start']},{peak['end']}): {peak['count']} accesses"
+        )
+        per_bank = bank_load['per_bank']
+        for b0 in range(0, len(per_bank), 8):
+            lines.append("    " + "  ".join(f"b{b:<2}={per_bank[b]:>7}" for b in range(b0, min(b0 + 8, len(per_bank)))))
+    if hazards is not None:
+        lines.append("")
+        lines.append("  Data hazards (different drivers, overlapping regions, overlapping windows):")
+        if not hazards:
+            lines.append("    none")
+        else:
+            counts = "  ".join(f"{t}={sum(1 for h in hazards if h['type'] == t)}" for t in ('RAW', 'WAR', 'WAW'))
+            shown = min(len(hazards), hazard_top)
+            lines.append(f"    {counts}  (first {shown} of {len(hazards)}, all in hazards.json)")
+        for hz in hazards[:hazard_top]:
+            first, second = hz['first'], hz['second']
+            lines.append(
+                f"    {hz['type']}  {first['driver']} p{first['pattern_idx']} {first['region']}({first['kind']}) -> "
+                f"{second['driver']} p{second['pattern_idx']} {second['region']}({second['kind']})  "
+                f"0x{hz['addr'][0]:08x}-0x{hz['addr'][1]:08x}  during [{hz['window'][0]},{hz['window'][1]})"
+            )
     lines.append("=" * 72)
 
     return "\n".join(lines) + "\n"
@@ -0,0 +1,392 @@
+"""Region placement that minimizes the predicted bank conflicts of a workload.
+
+Regions whose address ranges overlap (e.g. a buffer written by one pattern
+and read by the next) form a block that is only ever moved as a whole, so
+the dataflow between patterns is kept. Under word interleaving, moving a
+block changes its bank footprint only through the offset modulo the bank
+stride (N_BANKS words), so the search runs over one rotation per block:
+
+  cost = sum over pairs of patterns of different drivers whose schedule
+         windows overlap of  overlap * sum_bank rate_a[bank] * rate_b[bank]
+
+where rate[bank] is the pattern's accesses per unit of time to that bank,
+its requests being spread evenly over its window and its regions' words.
+This is the expected number of same-bank collisions if requests were
+issued at random inside their windows. The schedule (transaction-count
+model) does not depend on addresses, so the windows stay valid.
+
+Rotations are chosen by coordinate descent (best rotation of one block at
+a time, given the others, until nothing changes), then the blocks are
+packed into memory at the lowest free address with the chosen offset
+modulo the bank stride, respecting alignment, TOT_MEM_SIZE and
+non-overlap. A block stays in place when one of its patterns sets
+"relocatable": false, or when its address fields cannot be rewritten so
+that the pattern resolves to the shifted regions (e.g. default or
+bank-derived placements).
+"""
+
+import math
+from pathlib import Path
+
+# Pattern config keys holding absolute byte addresses (also inside nested region lists)
+ADDRESS_KEYS = frozenset((
+    'region_base_address', 'region_base_address_a', 'region_base_address_b', 'region_base_address_c',
+    'start_address', 'row_base_address', 'src_base_address', 'dst_base_address',
+    'input_base_address', 'weight_base_address', 'output_base_address', 'base',
+))
+
+
+def parse_address(value):
+    """Integer of an int or binary/hex/decimal string (as the workload parser reads it), or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        v = value.strip()
+        if not v:
+            return None
+        if set(v) <= {'0', '1'}:
+            return int(v, 2)
+        try:
+            return int(v, 0)
+        except ValueError:
+            return None
+    return None
+
+
+def shift_addresses(config, moves):
+    """Copy of a pattern config with every address inside a moved range shifted.
+
+    moves: (lo, hi, delta) on the original addresses; each address is mapped
+    once, so a shifted value landing in another moved range is not shifted
+    again. String addresses are written back as hex strings.
+    """
+    def shifted(value):
+        addr = parse_address(value)
+        if addr is None:
+            return value
+        for lo, hi, delta in moves:
+            if lo <= addr <= hi:
+                if not delta:
+                    return value
+                return addr + delta if isinstance(value, int) else f"0x{addr + delta:x}"
+        return value
+
+    def walk(obj):
+        if isinstance(obj, dict):
+            return {k: shifted(v) if k in ADDRESS_KEYS else walk(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [walk(v) for v in obj]
+        return obj
+
+    return walk(config)
+
+
+def _bank_words(base, size, word_bytes, n_banks):
+    """Number of words of [base, base + size) in each bank."""
+    n_words = max(1, -(-size // word_bytes))
+    full, rem = divmod(n_words, n_banks)
+    counts = [full] * n_banks
+    first = base // word_bytes
+    for k in range(rem):
+        counts[(first + k) % n_banks] += 1
+    return counts
+
+
+def _blocks_of(pattern_nodes):
+    """Connected components of the overlapping region ranges: [lo, hi, [(node_idx, region)]]."""
+    items = sorted(
+        ((reg['base'], reg['end'], node['node_idx'], reg) for node in pattern_nodes for reg in node['regions']
+         if reg['size'] > 0),
+        key=lambda it: (it[0], it[1]),
+    )
+    blocks = []
+    for lo, hi, node_idx, reg in items:
+        if blocks and lo <= blocks[-1][1]:
+            blocks[-1][1] = max(blocks[-1][1], hi)
+            blocks[-1][2].append((node_idx, reg))
+        else:
+            blocks.append([lo, hi, [(node_idx, reg)]])
+    return blocks
+
+
+class PlacementProblem:
+    """Bank conflict cost of the block rotations, and its minimization."""
+
+    def __init__(self, pattern_nodes, n_banks, word_bytes):
+        self.nodes = pattern_nodes
+        self.n_banks = max(1, int(n_banks))
+        self.word_bytes = max(1, int(word_bytes))
+        self.blocks = []
+        block_of_region = {}
+        for lo, hi, members in _blocks_of(pattern_nodes):
+            node_ids = sorted({n for n, _ in members})
+            self.blocks.append({
+                'lo': lo,
+                'hi': hi,
+                'size': hi - lo + 1,
+                'nodes': node_ids,
+                'align': max(max(1, int(pattern_nodes[n]['txn_bytes'])) for n in node_ids),
+            })
+            for n, reg in members:
+                block_of_region[id(reg)] = len(self.blocks) - 1
+
+        # Per node: (block, bank access rate of one region at the original placement)
+        self.terms = {}
+        for node in pattern_nodes:
+            dur = node['end_cycle'] - node['start_cycle']
+            regs = [r for r in node['regions'] if r['size'] > 0]
+            if dur <= 0 or not regs or node['n_transactions'] <= 0:
+                continue
+            words_per_req = max(1, int(node['txn_bytes']) // self.word_bytes)
+            total_words = sum(max(1, -(-r['size'] // self.word_bytes)) for r in regs)
+            per_word = node['n_transactions'] * words_per_req / dur / total_words
+            self.terms[node['node_idx']] = [
+                (block_of_region[id(r)], [per_word * w for w in _bank_words(r['base'], r['size'], self.word_bytes, self.n_banks)])
+                for r in regs
+            ]
+
+        # Pairs of patterns of different drivers running at the same time
+        self.pairs = []
+        active = []
+        for node in sorted((self.nodes[i] for i in self.terms), key=lambda n: (n['start_cycle'], n['node_idx'])):
+            active = [a for a in active if a['end_cycle'] > node['start_cycle']]
+            for a in active:
+                if a['driver_idx'] != node['driver_idx']:
+                    overlap = min(a['end_cycle'], node['end_cycle']) - node['start_cycle']
+                    self.pairs.append((a['node_idx'], node['node_idx'], overlap))
+            active.append(node)
+        self.pairs_of_node = {}
+        for k, (a, b, _) in enumerate(self.pairs):
+            self.pairs_of_node.setdefault(a, []).append(k)
+            self.pairs_of_node.setdefault(b, []).append(k)
+
+    def rate(self, node_idx, rotation):
+        """Bank access rates of a node with block b rotated by rotation[b] words."""
+        nb = self.n_banks
+        out = [0.0] * nb
+        for block, hist in self.terms[node_idx]:
+            r = rotation[block] % nb
+            for k in range(nb):
+                out[(k + r) % nb] += hist[k]
+        return out
+
+    def pair_costs(self, rotation, pair_ids=None):
+        """[(cost, node_a, node_b)] of the given pairs (all by default)."""
+        rates = {}
+        out = []
+        for k in range(len(self.pairs)) if pair_ids is None else pair_ids:
+            a, b, overlap = self.pairs[k]
+            for n in (a, b):
+                if n not in rates:
+                    rates[n] = self.rate(n, rotation)
+            out.append((overlap * sum(x * y for x, y in zip(rates[a], rates[b])), a, b))
+        return out
+
+    def cost(self, rotation):
+        return sum(c for c, _, _ in self.pair_costs(rotation))
+
+    def rotation_step(self, block):
+        """Rotations (in words) that keep the block aligned to its widest access."""
+        align_words = max(1, self.blocks[block]['align'] // self.word_bytes)
+        return math.gcd(align_words, self.n_banks)
+
+    def optimize(self, pinned, max_passes=8):
+        """Block rotations minimizing the cost; pinned blocks keep rotation 0."""
+        rotation = [0] * len(self.blocks)
+        # Heaviest blocks first: they constrain the others most
+        weight = [0.0] * len(self.blocks)
+        for terms in self.terms.values():
+            for block, hist in terms:
+                weight[block] += sum(hist)
+        order = sorted((b for b in range(len(self.blocks)) if b not in pinned), key=lambda b: (-weight[b], b))
+        for _ in range(max_passes):
+            changed = False
+            for block in order:
+                own = set(self.blocks[block]['nodes'])
+                pair_ids = sorted({k for n in own for k in self.pairs_of_node.get(n, ())})
+                if not pair_ids:
+                    continue
+                # Rates of the other patterns do not depend on this block
+                fixed = {n: self.rate(n, rotation) for k in pair_ids for n in self.pairs[k][:2] if n not in own}
+                current = rotation[block]
+                costs = {}
+                for r in range(0, self.n_banks, self.rotation_step(block)):
+                    rotation[block] = r
+                    rates = dict(fixed)
+                    rates.update((n, self.rate(n, rotation)) for n in own if n in self.terms)
+                    costs[r] = sum(
+                        overlap * sum(x * y for x, y in zip(rates[a], rates[b]))
+                        for a, b, overlap in (self.pairs[k] for k in pair_ids)
+                    )
+                best = min(costs, key=lambda r: (costs[r], r))
+                # Only move for a real improvement
+                if costs[best] >= costs[current] * (1 - 1e-9):
+                    best = current
+                rotation[block] = best
+                changed |= best != current
+            if not changed:
+                break
+        return rotation
+
+
+def _place(blocks, offsets, pinned, total_mem_bytes, stride):
+    """New base per block, or (None, block) for the first block that does not fit.
+
+    Pinned blocks stay put; the others are placed in address order at the
+    lowest free address from their old stride line on (then from 0) that
+    has the wanted offset modulo the bank stride and alignment.
+    """
+    occupied = sorted((blocks[b]['lo'], blocks[b]['hi'] + 1) for b in pinned)
+    new_base = {b: blocks[b]['lo'] for b in pinned}
+    for b in sorted((b for b in range(len(blocks)) if b not in pinned), key=lambda b: blocks[b]['lo']):
+        blk = blocks[b]
+        period = stride * blk['align'] // math.gcd(stride, blk['align'])
+        residue = (blk['lo'] + offsets[b]) % period
+        found = None
+        for start_from in ((blk['lo'] // period) * period, 0):
+            prev_end = 0
+            for g0, g1 in [(0, 0)] + occupied + [(total_mem_bytes, total_mem_bytes)]:
+                gap_lo, gap_hi = max(prev_end, start_from), g0
+                prev_end = max(prev_end, g1)
+                addr = gap_lo + (residue - gap_lo) % period
+                if addr + blk['size'] <= gap_hi:
+                    found = addr
+                    break
+            if found is not None:
+                break
+        if found is None:
+            return None, b
+        new_base[b] = found
+        occupied.append((found, found + blk['size']))
+        occupied.sort()
+    return new_base, None
+
+
+def optimize_placement(pattern_nodes, configs, resolve, *, n_banks, word_bytes, total_mem_bytes, max_passes=8):
+    """Relocate the region blocks of a workload to minimize the predicted bank conflicts.
+
+    configs: node_idx -> pattern config. resolve(node_idx, config) returns
+    the regions the pattern would get from that config, which checks that
+    rewriting its address fields moves it as intended.
+    """
+    problem = PlacementProblem(pattern_nodes, n_banks, word_bytes)
+    blocks = problem.blocks
+    stride = problem.n_banks * problem.word_bytes
+
+    blocks_of_node = {}
+    for b, blk in enumerate(blocks):
+        for n in blk['nodes']:
+            blocks_of_node.setdefault(n, []).append(b)
+
+    def node_config(n, moves):
+        """Pattern config of node n with the moves of its own blocks applied."""
+        own = [moves[b] for b in blocks_of_node.get(n, ()) if b in moves]
+        return shift_addresses(configs[n], own) if own else configs[n]
+
+    def moved_ok(moves, node_ids):
+        """Do the rewritten configs of node_ids resolve to their regions shifted by the block moves?"""
+        for n in node_ids:
+            expected = []
+            for reg in pattern_nodes[n]['regions']:
+                delta = next((d for lo, hi, d in moves.values() if lo <= reg['base'] <= hi), 0)
+                expected.append((reg['label'], reg['base'] + delta, reg['size']))
+            got = [(r['label'], r['base'], r['size']) for r in resolve(n, node_config(n, moves))]
+            if got != expected:
+                return False
+        return True
+
+    pinned = {}
+    for b, blk in enumerate(blocks):
+        if any(configs[n].get('relocatable', True) is False for n in blk['nodes']):
+            pinned[b] = 'relocatable: false'
+            continue
+        # Trial move by one alignment unit (or the bank stride), inside the memory
+        step = max(blk['align'], stride)
+        delta = step if blk['hi'] + 1 + step <= total_mem_bytes else -step
+        if blk['lo'] + delta < 0 or not moved_ok({b: (blk['lo'], blk['hi'], delta)}, blk['nodes']):
+            pinned[b] = 'address fields not relocatable'
+
+    while True:
+        rotation = problem.optimize(set(pinned), max_passes=max_passes)
+        offsets = [r * problem.word_bytes for r in rotation]
+        new_base, failed = _place(blocks, offsets, set(pinned), total_mem_bytes, stride)
+        if failed is None:
+            moves = {b: (blk['lo'], blk['hi'], new_base[b] - blk['lo']) for b, blk in enumerate(blocks)}
+            bad = [b for b, blk in enumerate(blocks) if b not in pinned and not moved_ok(moves, blk['nodes'])]
+            if not bad:
+                break
+            failed = bad[0]
+            pinned[failed] = 'address fields not relocatable'
+        else:
+            pinned[failed] = 'no free space with a better bank offset'
+
+    final_rotation = [((new_base[b] - blk['lo']) // problem.word_bytes) % problem.n_banks
+                      for b, blk in enumerate(blocks)]
+    before = problem.pair_costs([0] * len(blocks))
+    after = problem.pair_costs(final_rotation)
+    return {
+        'blocks': [
+            {
+                'lo': blk['lo'],
+                'hi': blk['hi'],
+                'size': blk['size'],
+                'new_lo': new_base[b],
+                'delta': new_base[b] - blk['lo'],
+                'pinned': pinned.get(b),
+                'patterns': [f"{pattern_nodes[n]['driver_name']} p{pattern_nodes[n]['pattern_idx']}" for n in blk['nodes']],
+            }
+            for b, blk in enumerate(blocks)
+        ],
+        'cost_before': sum(c for c, _, _ in before),
+        'cost_after': sum(c for c, _, _ in after),
+        'pairs_before': before,
+        'pairs_after': after,
+        'configs': {n: node_config(n, moves) for n in configs},
+    }
+
+
+def build_placement_report(result, pattern_nodes, *, n_banks, word_bytes, top=10):
+    def pair_name(a, b):
+        na, nb = pattern_nodes[a], pattern_nodes[b]
+        return (f"{na['driver_name']} p{na['pattern_idx']} ({na['job']}) x "
+                f"{nb['driver_name']} p{nb['pattern_idx']} ({nb['job']})")
+
+    before, after = result['cost_before'], result['cost_after']
+    lines = []
+    lines.append("=" * 72)
+    lines.append("REGION PLACEMENT REPORT")
+    lines.append(f"  Banks        : {n_banks}  x  {word_bytes} B/word  (interleaved, stride {n_banks * word_bytes} B)")
+    lines.append("  Cost model   : expected same-bank collisions of concurrently scheduled patterns")
+    lines.append("                 (requests spread evenly over each pattern's window and regions)")
+    reduction = f"  ({100.0 * (before - after) / before:.1f}% lower)" if before > 0 else ""
+    lines.append(f"  Predicted conflicts: before={before:.1f}  after={after:.1f}{reduction}")
+    lines.append("=" * 72)
+    lines.append("")
+    lines.append("  Region blocks (overlapping regions move together):")
+    for blk in result['blocks']:
+        if blk['pinned']:
+            state = f"kept ({blk['pinned']})"
+        elif blk['delta']:
+            state = f"-> 0x{blk['new_lo']:08x}-0x{blk['new_lo'] + blk['size'] - 1:08x}  ({blk['delta']:+d} B)"
+        else:
+            state = "kept (already best)"
+        lines.append(f"    0x{blk['lo']:08x}-0x{blk['hi']:08x} ({blk['size']:>6} B)  {state}")
+        lines.append(f"      used by: {', '.join(blk['patterns'])}")
+    cost_after = {(a, b): c for c, a, b in result['pairs_after']}
+    lines.append("")
+    lines.append(f"  Most conflicting pattern pairs (before -> after, top {top}):")
+    worst = sorted(result['pairs_before'], key=lambda p: -p[0])[:top]
+    if not worst:
+        lines.append("    none (no concurrently scheduled patterns of different drivers)")
+    for c, a, b in worst:
+        lines.append(f"    {c:>10.1f} -> {cost_after[(a, b)]:>10.1f}  {pair_name(a, b)}")
+    lines.append("=" * 72)
+    return "\n".join(lines) + "\n"
+
+
+def write_placement_report(report_path: Path, result, pattern_nodes, **kwargs):
+    report_text = build_placement_report(result, pattern_nodes, **kwargs)
+    report_path.write_text(report_text, encoding='utf-8')
+    return report_text
@@ -0,0 +1,175 @@
+"""Address x time index of the scheduled region accesses, and data hazards.
+
+The reports ask the same question over and over: which accesses touch this
+address range (during this time window)? IntervalIndex answers the address
+part with a static augmented interval tree: the intervals are sorted by start
+and the sorted array is read as an implicit balanced binary tree (node =
+middle of its range) whose nodes also keep the largest end of their subtree,
+so whole subtrees ending before the query are skipped. A query visits
+O(min(n, (k + 1) log n)) nodes for k hits: every hit can cost a root path of
+pruned siblings (a centered interval tree would get O(log n + k), but the
+indexes here are small and built once per run).
+AccessIndex puts every (pattern node, region) of the schedule in one and
+filters the k address hits by time window.
+"""
+
+import json
+from pathlib import Path
+
+
+class IntervalIndex:
+    """Static index of closed intervals [lo, hi] with payloads."""
+
+    def __init__(self, items):
+        """items: iterable of (lo, hi, payload)."""
+        entries = sorted(items, key=lambda e: (e[0], e[1]))
+        self._lo = [int(e[0]) for e in entries]
+        self._hi = [int(e[1]) for e in entries]
+        self._payload = [e[2] for e in entries]
+        self._max_hi = list(self._hi)
+        self._build(0, len(entries))
+
+    def __len__(self):
+        return len(self._lo)
+
+    def _build(self, left, right):
+        if left >= right:
+            return None
+        mid = (left + right) // 2
+        best = self._hi[mid]
+        for sub in (self._build(left, mid), self._build(mid + 1, right)):
+            if sub is not None and sub > best:
+                best = sub
+        self._max_hi[mid] = best
+        return best
+
+    def _query(self, lo, hi):
+        """Sorted positions of the intervals overlapping [lo, hi]."""
+        out = []
+        stack = [(0, len(self._lo))]
+        while stack:
+            left, right = stack.pop()
+            if left >= right:
+                continue
+            mid = (left + right) // 2
+            # Nothing in this subtree reaches lo
+            if self._max_hi[mid] < lo:
+                continue
+            # The right subtree starts at or after _lo[mid]
+            if self._lo[mid] <= hi:
+                stack.append((mid + 1, right))
+                if self._hi[mid] >= lo:
+                    out.append(mid)
+            stack.append((left, mid))
+        out.sort()
+        return out
+
+    def overlapping(self, lo, hi):
+        """Payloads of the intervals overlapping [lo, hi], in start order."""
+        return [self._payload[i] for i in self._query(lo, hi)]
+
+    def covering(self, lo, hi):
+        """Payloads of the intervals that contain all of [lo, hi]."""
+        return [self._payload[i] for i in self._query(lo, lo) if self._hi[i] >= hi]
+
+
+def region_access_kind(node, region):
+    """'R', 'W' or 'RW': how a pattern node accesses one of its regions."""
+    label = str(region.get('label', '')).lower()
+    if 'read' in label and 'write' not in label:
+        return 'R'
+    if 'write' in label and 'read' not in label:
+        return 'W'
+    rpct = node.get('traffic_read_pct')
+    rpct = 50 if rpct is None else int(rpct)
+    if rpct >= 100:
+        return 'R'
+    if rpct <= 0:
+        return 'W'
+    return 'RW'
+
+
+class AccessIndex:
+    """Every scheduled (pattern node, region) access, indexed by address."""
+
+    def __init__(self, pattern_nodes):
+        self.accesses = []
+        for node in pattern_nodes:
+            for region in node['regions']:
+                self.accesses.append({
+                    'access_idx': len(self.accesses),
+                    'node_idx': node['node_idx'],
+                    'driver_idx': node['driver_idx'],
+                    'driver_name': node['driver_name'],
+                    'pattern_idx': node['pattern_idx'],
+                    'job': node['job'],
+                    'label': region['label'],
+                    'base': region['base'],
+                    'end': region['end'],
+                    'start_cycle': node['start_cycle'],
+                    'end_cycle': node['end_cycle'],
+                    'kind': region_access_kind(node, region),
+                })
+        self._index = IntervalIndex((a['base'], a['end'], a) for a in self.accesses)
+
+    def overlapping(self, base, end, start_cycle=None, end_cycle=None):
+        """Accesses touching [base, end] whose window meets [start_cycle, end_cycle)."""
+        hits = self._index.overlapping(base, end)
+        if start_cycle is None and end_cycle is None:
+            return hits
+        t0 = float('-inf') if start_cycle is None else start_cycle
+        t1 = float('inf') if end_cycle is None else end_cycle
+        return [a for a in hits if a['start_cycle'] < t1 and t0 < a['end_cycle']]
+
+
+def _hazard_types(first_kind, second_kind):
+    types = []
+    if 'W' in first_kind and 'R' in second_kind:
+        types.append('RAW')
+    if 'R' in first_kind and 'W' in second_kind:
+        types.append('WAR')
+    if 'W' in first_kind and 'W' in second_kind:
+        types.append('WAW')
+    return types
+
+
+def find_hazards(access_index):
+    """RAW/WAR/WAW hazards between accesses of different drivers that overlap in time and address.
+
+    Concurrent accesses have no defined order; 'first' is the one that starts
+    earlier (then the lower node index), so e.g. RAW means the earlier
+    pattern writes what the later one reads while both are running.
+    """
+    hazards = []
+    for a in access_index.accesses:
+        for b in access_index.overlapping(a['base'], a['end'], a['start_cycle'], a['end_cycle']):
+            if b['driver_idx'] == a['driver_idx'] or b['access_idx'] <= a['access_idx']:
+                continue
+            first, second = sorted((a, b), key=lambda x: (x['start_cycle'], x['node_idx'], x['access_idx']))
+            for hazard_type in _hazard_types(first['kind'], second['kind']):
+                hazards.append({
+                    'type': hazard_type,
+                    'first': _access_entry(first),
+                    'second': _access_entry(second),
+                    'addr': [max(a['base'], b['base']), min(a['end'], b['end'])],
+                    'window': [max(a['start_cycle'], b['start_cycle']), min(a['end_cycle'], b['end_cycle'])],
+                })
+    hazards.sort(key=lambda h: (h['window'][0], h['addr'][0], h['first']['driver'], h['second']['driver'], h['type']))
+    return hazards
+
+
+def _access_entry(access):
+    return {
+        'driver': access['driver_name'],
+        'pattern_idx': access['pattern_idx'],
+        'job': access['job'],
+        'region': access['label'],
+        'kind': access['kind'],
+    }
+
+
+def write_hazards_json(hazards_path: Path, hazards):
+    counts = {t: sum(1 for h in hazards if h['type'] == t) for t in ('RAW', 'WAR', 'WAW')}
+    data = {'counts': counts, 'hazards': hazards}
+    hazards_path.write_text(json.dumps(data, indent=2) + "\n", encoding='utf-8')
+    return data
@@ -0,0 +1,95 @@
+"""Per-bank load over time (bank_load)."""
+
+import random
+
+import pytest
+
+import bank_load as bl
+from hci_stimuli import AffineDescriptor
+
+N_BANKS = 4
+WORD_BYTES = 4
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    """Run a test on the NumPy path (when installed) and on the pure-Python path."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+        assert bl.np is not None
+    else:
+        monkeypatch.setattr(bl, 'np', None)
+    return request.param
+
+
+def as_list(values):
+    return [int(v) for v in values]
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    np = pytest.importorskip('numpy')
+    rng = random.Random(1)
+    fields = [format(rng.randrange(1 << 20), '020b') for _ in range(500)]
+    addrs = [rng.randrange(0, 4096) for _ in range(300)]
+
+    def run():
+        decoded = as_list(bl._decode_binary(fields))
+        counts = np.zeros(N_BANKS * 16, dtype=np.int64) if bl.np is not None else [0] * (N_BANKS * 16)
+        # 300 requests of two words over [37, 937) of a 1000-cycle schedule
+        bl._count_requests(counts, addrs, 37, 900, len(addrs), 1000, N_BANKS, 16, WORD_BYTES, 2)
+        return decoded, as_list(counts)
+
+    with_numpy = run()
+    monkeypatch.setattr(bl, 'np', None)
+    assert run() == with_numpy
+    assert with_numpy[0] == [int(f, 2) for f in fields]
+    assert sum(with_numpy[1]) == 2 * len(addrs)
+
+
+def node(driver_idx, pattern_idx, n, start, end, txn_bytes=WORD_BYTES):
+    return {'driver_idx': driver_idx, 'pattern_idx': pattern_idx, 'n_transactions': n,
+            'start_cycle': start, 'end_cycle': end, 'txn_bytes': txn_bytes}
+
+
+def test_requests_are_spread_over_their_pattern_window(backend):
+    # 4 requests to bank 1 in [40, 80): issued at 40, 50, 60, 70 of 100 cycles
+    result = bl.bank_load([node(0, 0, 4, 40, 80)], lambda d: [4, 20, 36, 52], 100, N_BANKS, WORD_BYTES,
+                          n_buckets=10)
+    assert result['counts'][1] == [0, 0, 0, 0, 1, 1, 1, 1, 0, 0]
+    assert result['per_bank'] == [0, 4, 0, 0]
+    assert (result['hot_bank'], result['max'], result['imbalance']) == (1, 4, 4.0)
+    assert result['peak'] == {'bank': 1, 'bucket': 4, 'start': 40, 'end': 50, 'count': 1}
+
+
+def test_patterns_take_their_requests_in_order(backend):
+    # driver 0: 2 requests in [0, 10), then 2 wide ones (two words each) in [50, 60)
+    nodes = [node(0, 1, 2, 50, 60, txn_bytes=2 * WORD_BYTES), node(0, 0, 2, 0, 10)]
+    result = bl.bank_load(nodes, lambda d: [0, 4, 8, 12], 100, N_BANKS, WORD_BYTES, n_buckets=10)
+    # words 2-3 and 3-4: the second wide request wraps around to bank 0
+    assert result['counts'] == [
+        [1, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 2, 0, 0, 0, 0],
+    ]
+    assert result['accesses'] == 6
+
+
+def test_request_addresses_reads_every_format(tmp_path, backend):
+    desc = AffineDescriptor(3, 2, 0x40, stride0=2)
+    path = tmp_path / 'master_log_0.txt'
+    path.write_text("\n".join([
+        "# totals requests=6 reads=3 writes=3 fences=1",
+        "1 0000 1 1111 00000000 0000000000010000",
+        "0 0000 0 0000 00000000 0000000000000000",
+        "@3 1 0001 0 1111 00000000 0000000000010100",
+        desc.to_line(),
+        "@9 PAUSE",
+        "1 0101 1 1111 00000000 0000000100000000",
+        "",
+    ]), encoding='ascii')
+    assert as_list(bl.request_addresses(path, WORD_BYTES)) == [0x10, 0x14, 0x40, 0x48, 0x50, 0x100]
+
+
+def test_empty_schedule_has_no_load():
+    assert bl.bank_load([node(0, 0, 1, 0, 0)], lambda d: [0], 0, N_BANKS, WORD_BYTES) is None
@@ -0,0 +1,60 @@
+"""Critical-path and slack analysis (critical_path.ScheduleGraph)."""
+
+import pytest
+
+from critical_path import ScheduleGraph, parse_what_if
+from test_schedule import DRIVER_ORDER_CYCLE, schedule
+
+# a and b in parallel, c after both on core_0, d after a on core_2
+DIAMOND = {
+    'core_0': [('a', [], 100), ('c', ['b'], 10)],
+    'core_1': [('b', [], 40)],
+    'core_2': [('d', ['a'], 5)],
+}
+
+
+def test_earliest_times_reproduce_the_schedule():
+    nodes, (_, _, total_cycles, has_cycle, _, _, _) = schedule(DIAMOND)
+    assert not has_cycle
+    graph = ScheduleGraph(nodes)
+    assert graph.total_cycles == total_cycles == 110
+    for n in nodes:
+        assert (graph.earliest_start[n['node_idx']], graph.earliest_finish[n['node_idx']]) == \
+            (n['start_cycle'], n['end_cycle'])
+
+
+def test_slack_and_critical_path():
+    nodes, _ = schedule(DIAMOND)
+    graph = ScheduleGraph(nodes)
+    graph.annotate()
+    a, c, b, d = nodes
+    assert [nodes[i]['job'] for i in graph.critical_path()] == ['a', 'c']
+    assert (a['slack'], c['slack'], b['slack'], d['slack']) == (0, 0, 60, 5)
+    assert a['critical'] and c['critical'] and not b['critical']
+    assert graph.summary()['bottleneck']['job'] == 'a'
+
+
+def test_what_if_restores_the_graph():
+    nodes, _ = schedule(DIAMOND)
+    graph = ScheduleGraph(nodes)
+    b = nodes[2]['node_idx']
+    result = graph.what_if(b, 3.0)
+    assert result['total_cycles'] == 130
+    assert result['delta_cycles'] == 20
+    assert [e['job'] for e in result['critical_path']] == ['b', 'c']
+    assert graph.total_cycles == 110
+    assert graph.duration[b] == 40
+
+
+def test_driver_order_cycle_is_flagged_before_the_graph_is_built():
+    # main.py only builds the graph when build_schedule reports no cycle
+    nodes, (_, _, _, has_cycle, _, _, _) = schedule(DRIVER_ORDER_CYCLE)
+    assert has_cycle
+    with pytest.raises(ValueError):
+        ScheduleGraph(nodes)
+
+
+def test_parse_what_if():
+    assert parse_what_if('hwpe_0:1=1.5') == ('hwpe_0', 1, 1.5)
+    with pytest.raises(ValueError):
+        parse_what_if('hwpe_0=1.5')
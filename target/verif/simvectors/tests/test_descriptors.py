@@ -0,0 +1,109 @@
+"""Descriptor stimuli (AffineDescriptor) against the expanded line format."""
+
+from fractions import Fraction
+
+import pytest
+
+from hci_stimuli import AffineDescriptor, StimuliGenerator, address_payload, stimuli_totals
+
+DATA_WIDTH = 32
+ACCESS_BYTES = DATA_WIDTH // 8
+
+
+def make_generator(tmp_path, stim_format, n_test, data_mode='address'):
+    return StimuliGenerator(
+        IW=8, WIDTH_OF_MEMORY=32, N_BANKS=4, TOT_MEM_SIZE=64, DATA_WIDTH=DATA_WIDTH, ADD_WIDTH=16,
+        filepath=str(tmp_path / f"master_log_0_{stim_format}.txt"), N_TEST=n_test,
+        MASTER_NUMBER_IDENTIFICATION=0, data_mode=data_mode, seed='0:0:data', stim_format=stim_format,
+    )
+
+
+def line_requests(path):
+    """[(id, wen, be, data, addr, idles after)] of an expanded stimuli file."""
+    requests = []
+    for line in path.read_text().splitlines():
+        fields = line.split()
+        if fields[0] == '1':
+            requests.append([int(fields[1], 2), int(fields[2]), fields[3], int(fields[4], 2), int(fields[5], 2), 0])
+        elif fields[0] == '0' and requests:
+            requests[-1][5] += 1
+    return [tuple(r) for r in requests]
+
+
+def desc_requests(path):
+    """The same for a descriptor file, as application_driver.sv expands it."""
+    requests = []
+    for line in path.read_text().splitlines():
+        if not line.startswith('DESC'):
+            continue
+        desc = AffineDescriptor.from_line(line)
+        n_writes = 0
+        for t, (addr, wen, idles) in enumerate(desc.expand(ACCESS_BYTES)):
+            be = '1' * ACCESS_BYTES
+            if desc.last_be and t == desc.n - 1:
+                be = ('1' * desc.last_be).zfill(ACCESS_BYTES)
+            if wen:
+                data = 0
+            elif desc.data_mode == 'address':
+                data = address_payload(addr, DATA_WIDTH)
+            else:
+                data = desc.data_state + n_writes
+            n_writes += not wen
+            requests.append((desc.id_start + t, wen, be, data, addr, idles))
+    return requests
+
+
+def generate(tmp_path, stim_format, n_test, pattern, data_mode='address'):
+    gen = make_generator(tmp_path, stim_format, n_test, data_mode)
+    next_id = pattern(gen)
+    assert next_id == 5 + n_test
+    return tmp_path / f"master_log_0_{stim_format}.txt"
+
+
+def linear(gen):
+    return gen.linear_gen(3, '0x100', 5, [], [], traffic_pct=40, traffic_read_pct=30, trailing_bytes=2)
+
+
+@pytest.mark.parametrize('data_mode', ['address', 'counter'])
+def test_linear_descriptor_expands_to_the_lines(tmp_path, data_mode):
+    lines = generate(tmp_path, 'lines', 23, linear, data_mode)
+    descs = generate(tmp_path, 'descriptors', 23, linear, data_mode)
+    assert sum(line.startswith('DESC') for line in descs.read_text().splitlines()) == 1
+    assert desc_requests(descs) == line_requests(lines)
+    assert stimuli_totals(descs.read_text().splitlines()) == stimuli_totals(lines.read_text().splitlines())
+
+
+@pytest.mark.parametrize('name, pattern, n_test', [
+    ('2d', lambda g: g.gen_2d(2, 5, 64, '0x40', 5, [], [], idle_cycles_between_phases=3), 17),
+    ('3d', lambda g: g.gen_3d(1, 4, 16, 3, 256, '0x0', 5, [], [], idle_cycles_between_phases=2), 30),
+])
+def test_nd_descriptors_keep_addresses_ids_and_gaps(tmp_path, name, pattern, n_test):
+    # The read/write mix of 2d/3d descriptors comes from the driver LFSR, not the line rng
+    lines = generate(tmp_path, 'lines', n_test, pattern, 'zeros')
+    descs = generate(tmp_path, 'descriptors', n_test, pattern, 'zeros')
+    assert any(line.startswith('DESC') for line in descs.read_text().splitlines())
+
+    def without_wen(requests):
+        return [(i, be, addr, idles) for i, _, be, _, addr, idles in requests]
+
+    assert without_wen(desc_requests(descs)) == without_wen(line_requests(lines))
+
+
+def test_from_line_round_trips():
+    desc = AffineDescriptor(
+        12, 7, 0x1f0, stride0=2, len_d0=3, stride1=8, len_d1=2, stride2=64, wrap=100, n_reads=4,
+        wen_seed=0xdeadbeef, idle_ratio=Fraction(2, 3), idle_credit=Fraction(1, 3), row_gap=1,
+        tail_gap=5, last_be=2, data_mode='lfsr', data_state=0x1234,
+    )
+    again = AffineDescriptor.from_line(desc.to_line())
+    assert again.to_line() == desc.to_line()
+    assert list(again.expand(4)) == list(desc.expand(4))
+    assert vars(again) == vars(desc)
+
+
+def test_idle_credit_carries_over():
+    first = AffineDescriptor(5, 0, 0, idle_ratio=Fraction(1, 3))
+    second = AffineDescriptor(5, 5, 0, idle_ratio=Fraction(1, 3), idle_credit=first.final_credit())
+    joined = AffineDescriptor(10, 0, 0, idle_ratio=Fraction(1, 3))
+    idles = [i for _, _, i in first.expand(4)] + [i for _, _, i in second.expand(4)]
+    assert idles == [i for _, _, i in joined.expand(4)]
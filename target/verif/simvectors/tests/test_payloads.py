@@ -0,0 +1,63 @@
+"""Seeded random write payloads (StimuliGenerator.payloads and PayloadBatch)."""
+
+import random
+
+import pytest
+
+from hci_stimuli import StimuliGenerator
+from hci_stimuli.generator import PAYLOAD_BLOCK
+
+
+def make_generator(tmp_path, data_width=32, n_test=0, seed='0:0:data', data_mode='random'):
+    return StimuliGenerator(
+        IW=4, WIDTH_OF_MEMORY=32, N_BANKS=4, TOT_MEM_SIZE=64, DATA_WIDTH=data_width, ADD_WIDTH=16,
+        filepath=str(tmp_path / 'master_log_0.txt'), N_TEST=n_test, MASTER_NUMBER_IDENTIFICATION=0,
+        data_mode=data_mode, seed=seed,
+    )
+
+
+def request_fields(path):
+    return [line.split() for line in path.read_text().splitlines() if line.startswith('1 ')]
+
+
+@pytest.mark.parametrize('data_width', [16, 32, 256])
+def test_payloads_do_not_depend_on_batching(tmp_path, data_width):
+    batched = make_generator(tmp_path, data_width)
+    single = make_generator(tmp_path, data_width)
+    got = batched.payloads(3) + batched.payloads(1) + batched.payloads(PAYLOAD_BLOCK + 5)
+    assert got == [single.random_data() for _ in range(len(got))]
+    assert all(len(d) == data_width and set(d) <= {'0', '1'} for d in got)
+
+
+def test_pattern_draws_exactly_its_writes(tmp_path):
+    gen = make_generator(tmp_path, data_width=32, n_test=10)
+    gen.linear_gen(1, '0x0', 0, [], [], traffic_pct=50, traffic_read_pct=70)
+    fields = request_fields(tmp_path / 'master_log_0.txt')
+    writes = [f for f in fields if f[2] == '0']
+    assert len(fields) == 10 and len(writes) == 3
+    # three 32-bit payloads: three Mersenne Twister words, nothing drawn ahead
+    rng = random.Random('0:0:data')
+    rng.randbytes(12)
+    assert gen.rng.getstate() == rng.getstate()
+    assert [f[4] for f in writes] == make_generator(tmp_path).payloads(3)
+
+
+def test_batched_lines_keep_their_order(tmp_path):
+    n_test = PAYLOAD_BLOCK + 100
+    gen = make_generator(tmp_path, data_width=32, n_test=n_test)
+    gen.linear_gen(1, '0x0', 0, [], [], traffic_pct=25, traffic_read_pct=0)
+    lines = (tmp_path / 'master_log_0.txt').read_text().splitlines()
+    fields = [line.split() for line in lines if line.startswith('1 ')]
+    assert [int(f[5], 2) for f in fields] == [4 * i for i in range(n_test)]
+    assert [f[4] for f in fields] == make_generator(tmp_path).payloads(n_test)
+    # three idles after every request, then the PAUSE of the pattern
+    assert len(lines) == 4 * n_test + 1 and lines[-1] == 'PAUSE'
+    assert all(line.startswith('0 ') for line in lines[1:4])
+
+
+def test_other_data_modes_draw_no_payloads(tmp_path):
+    gen = make_generator(tmp_path, n_test=8, data_mode='counter')
+    before = gen.rng.getstate()
+    gen.linear_gen(1, '0x0', 0, [], [], traffic_read_pct=0)
+    assert gen.rng.getstate() == before
+    assert [int(f[4], 2) for f in request_fields(tmp_path / 'master_log_0.txt')] == list(range(8))
@@ -0,0 +1,126 @@
+"""Region placement optimizer (placement._place and optimize_placement)."""
+
+import math
+import random
+
+import pytest
+
+from placement import _place, optimize_placement, parse_address, shift_addresses
+
+N_BANKS = 4
+WORD_BYTES = 4
+STRIDE = N_BANKS * WORD_BYTES
+TOT_MEM_BYTES = 1024
+
+
+def assert_valid_layout(sizes, new_base, total_mem_bytes):
+    spans = sorted((new_base[b], new_base[b] + sizes[b]) for b in new_base)
+    assert all(0 <= lo and hi <= total_mem_bytes for lo, hi in spans)
+    assert all(prev_hi <= lo for (_, prev_hi), (lo, _) in zip(spans, spans[1:]))
+
+
+def random_blocks(rng, n):
+    blocks = []
+    addr = 0
+    for _ in range(n):
+        align = rng.choice([4, 4, 32])
+        addr += rng.randrange(0, 3) * align
+        addr = -(-addr // align) * align
+        size = rng.randrange(1, 5) * align
+        blocks.append({'lo': addr, 'hi': addr + size - 1, 'size': size, 'align': align})
+        addr += size
+    return blocks
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_place_keeps_pinned_blocks_and_packs_the_others(seed):
+    rng = random.Random(seed)
+    blocks = random_blocks(rng, rng.randrange(1, 12))
+    # Rotations keep the widest access aligned (PlacementProblem.rotation_step)
+    offsets = [rng.randrange(0, STRIDE, math.gcd(blk['align'], STRIDE)) for blk in blocks]
+    pinned = {b for b in range(len(blocks)) if rng.random() < 0.3}
+    new_base, failed = _place(blocks, offsets, pinned, TOT_MEM_BYTES, STRIDE)
+    assert failed is None
+    assert all(new_base[b] == blocks[b]['lo'] for b in pinned)
+    assert_valid_layout({b: blk['size'] for b, blk in enumerate(blocks)}, new_base, TOT_MEM_BYTES)
+    for b, blk in enumerate(blocks):
+        if b not in pinned:
+            assert new_base[b] % blk['align'] == 0
+            assert (new_base[b] - blk['lo'] - offsets[b]) % STRIDE == 0
+
+
+def test_place_reports_the_block_that_does_not_fit():
+    blocks = [
+        {'lo': 0, 'hi': 47, 'size': 48, 'align': 4},
+        {'lo': 48, 'hi': 63, 'size': 16, 'align': 4},
+    ]
+    # Block 1 wants one word of rotation, which leaves no room in 64 bytes
+    new_base, failed = _place(blocks, [0, 4], {0}, 64, STRIDE)
+    assert new_base is None and failed == 1
+
+
+def make_node(node_idx, driver_idx, base, size, start=0, end=100):
+    return {
+        'node_idx': node_idx,
+        'driver_idx': driver_idx,
+        'driver_name': f"core_{driver_idx}",
+        'pattern_idx': 0,
+        'start_cycle': start,
+        'end_cycle': end,
+        'n_transactions': 100,
+        'txn_bytes': WORD_BYTES,
+        'regions': [{'label': 'data', 'base': base, 'end': base + size - 1, 'size': size}],
+    }
+
+
+def resolve(node_idx, config):
+    base = parse_address(config['region_base_address'])
+    size = config['region_size_bytes']
+    return [{'label': 'data', 'base': base, 'end': base + size - 1, 'size': size}]
+
+
+def placement(configs):
+    nodes = [make_node(n, n, parse_address(c['region_base_address']), c['region_size_bytes'])
+             for n, c in enumerate(configs)]
+    result = optimize_placement(nodes, dict(enumerate(configs)), resolve, n_banks=N_BANKS,
+                                word_bytes=WORD_BYTES, total_mem_bytes=TOT_MEM_BYTES)
+    return nodes, result
+
+
+def test_concurrent_single_bank_regions_are_spread_over_the_banks():
+    # Three drivers hammering one word each, all in bank 0
+    configs = [{'region_base_address': f"0x{base:x}", 'region_size_bytes': WORD_BYTES} for base in (0, 64, 128)]
+    configs[0]['relocatable'] = False
+    nodes, result = placement(configs)
+    assert result['cost_before'] > 0
+    assert result['cost_after'] == 0
+    blocks = result['blocks']
+    assert blocks[0]['pinned'] == 'relocatable: false' and blocks[0]['delta'] == 0
+    assert_valid_layout({b: blk['size'] for b, blk in enumerate(blocks)},
+                        {b: blk['new_lo'] for b, blk in enumerate(blocks)}, TOT_MEM_BYTES)
+    banks = [(blk['new_lo'] // WORD_BYTES) % N_BANKS for blk in blocks]
+    assert len(set(banks)) == 3
+    # The rewritten configs resolve to the moved blocks
+    for n, blk in enumerate(blocks):
+        assert resolve(n, result['configs'][n])[0]['base'] == blk['new_lo']
+
+
+def test_overlapping_regions_move_together():
+    configs = [
+        {'region_base_address': '0x0', 'region_size_bytes': WORD_BYTES},
+        {'region_base_address': '0x40', 'region_size_bytes': 2 * WORD_BYTES},
+        {'region_base_address': '0x44', 'region_size_bytes': WORD_BYTES},
+    ]
+    nodes, result = placement(configs)
+    blocks = result['blocks']
+    assert len(blocks) == 2 and blocks[1]['patterns'] == ['core_1 p0', 'core_2 p0']
+    delta = blocks[1]['delta']
+    assert [resolve(n, result['configs'][n])[0]['base'] for n in (1, 2)] == [0x40 + delta, 0x44 + delta]
+    assert result['cost_after'] <= result['cost_before']
+
+
+def test_shift_addresses_keeps_the_value_type():
+    config = {'start_address': 64, 'regions': [{'base': '0x40', 'size_bytes': 16}], 'n_transactions': 64}
+    moved = shift_addresses(config, [(64, 79, 16)])
+    assert moved == {'start_address': 80, 'regions': [{'base': '0x50', 'size_bytes': 16}], 'n_transactions': 64}
+    assert config['regions'][0]['base'] == '0x40'
@@ -0,0 +1,92 @@
+"""Address index of the region accesses (region_index)."""
+
+import random
+
+import pytest
+
+from html_report import _KIND_OF_ACCESS, _region_kind
+from region_index import AccessIndex, IntervalIndex, find_hazards, region_access_kind
+
+
+def random_intervals(n, seed):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        lo = rng.randrange(0, 1000)
+        items.append((lo, lo + rng.randrange(0, 200), i))
+    return items
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 7, 64, 257])
+def test_queries_match_a_linear_scan(n):
+    items = random_intervals(n, seed=n)
+    index = IntervalIndex(items)
+    assert len(index) == n
+    in_start_order = sorted(items, key=lambda e: (e[0], e[1]))
+    rng = random.Random(-n)
+    for _ in range(200):
+        lo = rng.randrange(-50, 1250)
+        hi = lo + rng.randrange(0, 100)
+        assert index.overlapping(lo, hi) == [p for a, b, p in in_start_order if a <= hi and lo <= b]
+        assert index.covering(lo, hi) == [p for a, b, p in in_start_order if a <= lo and hi <= b]
+
+
+def test_bounds_are_inclusive():
+    index = IntervalIndex([(10, 19, 'a'), (20, 29, 'b')])
+    assert index.overlapping(19, 20) == ['a', 'b']
+    assert index.overlapping(0, 9) == []
+    assert index.overlapping(30, 40) == []
+    assert index.covering(20, 29) == ['b']
+    assert index.covering(19, 20) == []
+
+
+def make_node(node_idx, driver_idx, start, end, regions, read_pct=None):
+    return {
+        'node_idx': node_idx,
+        'driver_idx': driver_idx,
+        'driver_name': f"core_{driver_idx}",
+        'pattern_idx': 0,
+        'job': f"job_{node_idx}",
+        'start_cycle': start,
+        'end_cycle': end,
+        'traffic_read_pct': read_pct,
+        'regions': [{'label': label, 'base': base, 'end': end_addr} for label, base, end_addr in regions],
+    }
+
+
+def test_access_index_filters_by_time_window():
+    nodes = [
+        make_node(0, 0, 0, 100, [('data', 0x000, 0x0FF)]),
+        make_node(1, 1, 100, 200, [('data', 0x080, 0x17F)]),
+    ]
+    index = AccessIndex(nodes)
+    assert [a['node_idx'] for a in index.overlapping(0x0C0, 0x0C0)] == [0, 1]
+    # windows are half-open: node 0 has ended at cycle 100
+    assert [a['node_idx'] for a in index.overlapping(0x0C0, 0x0C0, 100, 150)] == [1]
+    assert [a['node_idx'] for a in index.overlapping(0x0C0, 0x0C0, None, 100)] == [0]
+
+
+def test_hazards_need_overlap_in_address_and_time():
+    nodes = [
+        make_node(0, 0, 0, 100, [('write out', 0x000, 0x0FF)]),
+        make_node(1, 1, 50, 150, [('read in', 0x080, 0x17F)]),
+        # same addresses, but after the writer has finished
+        make_node(2, 2, 100, 200, [('read in', 0x000, 0x0FF)]),
+        # same time, other addresses
+        make_node(3, 3, 0, 100, [('write out', 0x200, 0x2FF)]),
+    ]
+    hazards = find_hazards(AccessIndex(nodes))
+    assert [(h['type'], h['first']['driver'], h['second']['driver']) for h in hazards] == \
+        [('RAW', 'core_0', 'core_1')]
+    assert hazards[0]['addr'] == [0x080, 0x0FF]
+    assert hazards[0]['window'] == [50, 100]
+
+
+@pytest.mark.parametrize('label', ['data', 'read A', 'write C', 'read/write buffer'])
+@pytest.mark.parametrize('read_pct', [None, 0, 20, 50, 80, 100])
+def test_viewer_and_hazard_report_agree_on_the_access_kind(label, read_pct):
+    node = {'traffic_read_pct': read_pct}
+    region = {'label': label}
+    assert _region_kind(node, region) == _KIND_OF_ACCESS[region_access_kind(node, region)]
+    assert region_access_kind(node, {'label': 'data'}) == (
+        'R' if read_pct == 100 else 'W' if read_pct == 0 else 'RW')
@@ -0,0 +1,79 @@
+"""Temporal schedule model (html_report.build_schedule)."""
+
+import pytest
+
+from html_report import build_schedule, ideal_bandwidth
+
+
+def make_nodes(drivers):
+    """Pattern nodes as built by main.py from {driver_name: [(job, wait_for_jobs, cycles), ...]}."""
+    nodes = []
+    by_driver_pattern = {}
+    job_to_nodes = {}
+    for drv_idx, (name, patterns) in enumerate(drivers.items()):
+        for p_idx, (job, waits, cycles) in enumerate(patterns):
+            node = {
+                'node_idx': len(nodes),
+                'driver_idx': drv_idx,
+                'driver_name': name,
+                'is_hwpe': False,
+                'local_idx': drv_idx,
+                'pattern_idx': p_idx,
+                'description': job,
+                'job': job,
+                'wait_for_jobs_effective': list(waits),
+                'n_transactions': cycles,
+                'cycles': cycles,
+                'txn_bytes': 4,
+                'start_delay': 0,
+                'regions': [],
+            }
+            nodes.append(node)
+            by_driver_pattern[(drv_idx, p_idx)] = node['node_idx']
+            job_to_nodes.setdefault(job, []).append(node['node_idx'])
+    return nodes, by_driver_pattern, job_to_nodes
+
+
+def schedule(drivers, bandwidth=None):
+    nodes, by_driver_pattern, job_to_nodes = make_nodes(drivers)
+    result = build_schedule(nodes, by_driver_pattern, job_to_nodes, 'HCI', bandwidth=bandwidth)
+    return nodes, result
+
+
+# core_0 runs X (waits for W) then Y; core_1 runs Z (waits for Y) then W. The
+# job edges alone are acyclic; with the driver order they close X->Y->Z->W->X.
+DRIVER_ORDER_CYCLE = {
+    'core_0': [('x', ['w'], 10), ('y', [], 10)],
+    'core_1': [('z', ['y'], 10), ('w', [], 10)],
+}
+
+BANDWIDTH = ideal_bandwidth('HCI', n_narrow_hci=2, n_wide_hci=0, dw_narrow=32, dw_wide=256,
+                            n_banks=4, data_width=32)
+
+
+@pytest.mark.parametrize('bandwidth', [None, BANDWIDTH], ids=['ideal', 'contention'])
+def test_driver_order_cycle_is_detected(bandwidth):
+    nodes, (_, _, total_cycles, has_cycle, _, _, stats) = schedule(DRIVER_ORDER_CYCLE, bandwidth)
+    assert has_cycle
+    assert not stats['contention_applied']
+    assert all(isinstance(n['start_cycle'], int) and n['end_cycle'] >= n['start_cycle'] for n in nodes)
+    assert total_cycles == max(n['end_cycle'] for n in nodes)
+
+
+def test_contention_shares_bandwidth_of_concurrent_patterns():
+    drivers = {
+        'core_0': [('a', [], 100), ('c', ['a', 'b'], 10)],
+        'core_1': [('b', [], 100)],
+    }
+    # One narrow port: a and b each offer 32 bit/cycle and get half of it
+    bandwidth = ideal_bandwidth('HCI', n_narrow_hci=1, n_wide_hci=0, dw_narrow=32, dw_wide=256,
+                                n_banks=4, data_width=32)
+    nodes, (_, _, total_cycles, has_cycle, _, _, stats) = schedule(drivers, bandwidth)
+    assert not has_cycle
+    assert stats['contention_applied']
+    assert stats['ideal_total_cycles'] == 110
+    a, c, b = nodes
+    assert (a['start_cycle'], a['end_cycle']) == (0, 200)
+    assert (b['start_cycle'], b['end_cycle']) == (0, 200)
+    assert (c['start_cycle'], c['end_cycle']) == (200, 210)
+    assert total_cycles == 210
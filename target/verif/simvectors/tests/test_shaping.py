@@ -0,0 +1,43 @@
+"""Traffic shaping and arrival models (hci_stimuli.shaping)."""
+
+import pytest
+
+from hci_stimuli.shaping import MarkovShaper, TrafficShaper
+
+
+def issue_rate(shaper, n_requests):
+    return 100.0 * n_requests / (n_requests + shaper.take(n_requests))
+
+
+@pytest.mark.parametrize('traffic_pct', [1, 33.3, 40, 99, 100])
+def test_uniform_shaper_stays_within_one_cycle(traffic_pct):
+    shaper = TrafficShaper(traffic_pct)
+    n = 1000
+    exact = n * (100 - traffic_pct) / traffic_pct
+    assert exact - 1 < shaper.take(n) <= exact
+
+
+@pytest.mark.parametrize('model', ['burst', 'geometric', 'markov'])
+def test_random_models_are_seeded(model):
+    arrival = {'model': model, 'seed': '3:1'}
+    first = [TrafficShaper.from_arrival(40, arrival).idles() for _ in range(200)]
+    again = [TrafficShaper.from_arrival(40, arrival).idles() for _ in range(200)]
+    assert first == again
+
+
+@pytest.mark.parametrize('burst_len, traffic_pct', [(16, 40), (4, 80), (16, 95), (1, 60), (2, 99)])
+def test_markov_rate_equals_traffic_pct(burst_len, traffic_pct):
+    shaper = MarkovShaper(traffic_pct, {'model': 'markov', 'burst_len': burst_len, 'seed': 1})
+    assert 0.0 < shaper.p_off_on <= 1.0
+    assert issue_rate(shaper, 200000) == pytest.approx(traffic_pct, abs=0.5)
+
+
+def test_markov_lengthens_short_bursts_at_high_rate():
+    shaper = MarkovShaper(95, {'model': 'markov', 'burst_len': 16})
+    assert shaper.p_off_on == 1.0
+    assert shaper.mean_on() == 19
+
+
+def test_markov_rejects_rate_outside_on_off():
+    with pytest.raises(ValueError):
+        MarkovShaper(50, {'model': 'markov', 'on_pct': 40})
@@ -0,0 +1,71 @@
+"""Cycle-stamped stimuli (hci_stimuli.timed)."""
+
+import pytest
+
+from hci_stimuli import stimuli_totals, to_timed_lines, write_timed_stimuli
+
+IDLE = "0 0000 0 0000 00000000 0000"
+
+PADDED = [
+    "# totals requests=4 reads=2 writes=2 fences=2",
+    IDLE,
+    IDLE,
+    "1 0001 1 1111 00000000 0010",
+    "1 0010 0 1111 deadbeef 0014",
+    IDLE,
+    "1 0011 1 1111 00000000 0018",
+    IDLE,
+    IDLE,
+    IDLE,
+    "PAUSE",
+    IDLE,
+    "1 0100 0 0011 cafe0000 001c",
+    "PAUSE",
+]
+
+TIMED = [
+    "# totals requests=4 reads=2 writes=2 fences=2",
+    "@2 1 0001 1 1111 00000000 0010",
+    "@3 1 0010 0 1111 deadbeef 0014",
+    "@5 1 0011 1 1111 00000000 0018",
+    "@9 PAUSE",
+    "@1 1 0100 0 0011 cafe0000 001c",
+    "@2 PAUSE",
+]
+
+
+def test_idle_runs_become_stamps_counted_per_segment():
+    lines, n_requests = to_timed_lines(PADDED)
+    assert lines == TIMED
+    assert n_requests == 4
+    assert stimuli_totals(lines) == stimuli_totals(PADDED)
+
+
+def padded_from_timed(lines):
+    """Inverse of to_timed_lines: every stamp gap back to idle lines."""
+    out = []
+    cycle = 0
+    for line in lines:
+        if line.startswith('#'):
+            out.append(line)
+            continue
+        stamp, rest = line.split(None, 1)
+        out.extend([IDLE] * (int(stamp[1:]) - cycle))
+        out.append(rest)
+        cycle = 0 if rest == 'PAUSE' else int(stamp[1:]) + 1
+    return out
+
+
+def test_round_trip_keeps_requests_and_fences(tmp_path):
+    path = tmp_path / 'master_log_0.txt'
+    path.write_text("\n".join(PADDED) + "\n\n", encoding='ascii')
+    assert write_timed_stimuli(path) == 4
+    timed = path.read_text(encoding='ascii').splitlines()
+    assert timed == TIMED
+    # idle lines after the last request of a segment are folded into the PAUSE stamp
+    assert padded_from_timed(timed) == PADDED
+
+
+def test_timed_stimuli_are_not_stamped_twice():
+    with pytest.raises(ValueError):
+        to_timed_lines(TIMED)
@@ -31,6 +31,46 @@
  * idle entries, so the stimuli file represents offered traffic order and fence
  * structure rather than an exact wall-clock replay under backpressure.
  *
+ * Timed (cycle-stamped) entries carry an earliest-issue cycle instead of idle
+ * padding:
+ *   @<cycle> req id wen be data add
+ *   @<cycle> PAUSE
+ * <cycle> is decimal and counts from the start of the current segment (reset,
+ * or the resume that left the previous PAUSE). A stamped request is issued at
+ * max(stamp, grant of the previous request) and a stamped PAUSE is consumed no
+ * earlier than its stamp, so the offered load is exact under backpressure.
+ * Unstamped entries behave as stamp 0. The cycles by which requests issue
+ * after their stamp are reported at the end of simulation.
+ *
+ * Descriptor entries stand for a whole affine request stream and are expanded
+ * by the driver (see simvectors/hci_stimuli/descriptors.py):
+ *   DESC n id_start base stride0 len_d0 stride1 len_d1 stride2 wrap n_reads wen_seed
+ *        idle_num idle_den idle_credit row_gap tail_gap last_be data_mode data_state
+ * (one line; base, wen_seed and data_state hex, the rest decimal). Request t
+ * of n goes to base + ((i*stride0 + j*stride1 + k*stride2) mod wrap) * DW/8,
+ * with i < len_d0 and j < len_d1 nested loop indices (0 = unbounded, wrap 0 =
+ * no wrap), id id_start + t, wen t < n_reads (or bit 0 of a Galois LFSR seeded
+ * with wen_seed) and a partial be of last_be bytes on the last request. After
+ * each request the driver owes idle_num/idle_den idle cycles by error
+ * diffusion, plus row_gap when a len_d0 row completes or tail_gap after the
+ * last request. Owed idles are consumed like idle entries, also while stalled.
+ * Write payloads follow data_mode: 0 random, 1 address, 2 counter, 3 lfsr,
+ * 4 zeros; data_state is the initial write count or LFSR state.
+ *
+ * A leading header line carries the totals of the file:
+ *   # totals requests=<n> reads=<n> writes=<n> fences=<n>
+ * They are reported as the expected counts and checked against the issued
+ * requests at the end; without a header the issued counts are reported.
+ * Other lines starting with '#' are ignored.
+ *
+ * By default the whole file is parsed before reset. With +STIM_PREFETCH=<n>
+ * (n > 0) the driver streams it instead: it keeps n parsed entries ahead of
+ * the current one and refills the queue as entries are consumed, so memory
+ * does not grow with the file size and issuing starts right away.
+ *
+ * +STIM_DIR=<dir> reads the file of the same name from <dir> instead of the
+ * directory of STIM_FILE, e.g. the per-run pipes of parallel regression runs.
+ *
  * When a PAUSE token is encountered the driver drains all in-flight reads
  * (waits in DRAIN_FOR_PAUSE), then enters PAUSED and holds fence_reached_o=1
  * until resume_i is asserted. This allows multi-phase execution on a single
@@ -55,16 +95,59 @@ module application_driver #(
   output logic            end_resp_o,      // held HIGH after all transactions and responses done
   output int unsigned     n_issued_tr_o,
   output int unsigned     n_issued_rd_tr_o,
-  output int unsigned     n_retired_rd_tr_o
+  output int unsigned     n_retired_rd_tr_o,
+  output int unsigned     n_expected_tr_o,    // requests in the file (header totals)
+  output int unsigned     n_expected_rd_tr_o  // reads in the file (header totals)
 );
 
   int unsigned n_req_issued_q, n_req_issued_d;
   int unsigned n_rd_req_issued_q, n_rd_req_issued_d;
   int unsigned n_rd_resp_retired_q, n_rd_resp_retired_d;
 
+  localparam logic [31:0] LFSR_TAPS = 32'h8020_0003;  // x^32 + x^22 + x^2 + x + 1
+  localparam int unsigned N_LANES   = (DATA_WIDTH >= 32) ? DATA_WIDTH / 32 : 1;
+
+  typedef enum int unsigned {
+    DATA_RANDOM  = 0,
+    DATA_ADDRESS = 1,
+    DATA_COUNTER = 2,
+    DATA_LFSR    = 3,
+    DATA_ZEROS   = 4
+  } data_mode_t;
+
+  // Affine request stream of a DESC line
+  typedef struct {
+    int unsigned               n;
+    int unsigned               id_start;
+    logic [ADDR_WIDTH-1:0]     base;
+    longint                    stride0;
+    int unsigned               len_d0;
+    longint                    stride1;
+    int unsigned               len_d1;
+    longint                    stride2;
+    longint                    wrap;
+    int unsigned               n_reads;
+    logic [31:0]               wen_seed;
+    int unsigned               idle_num;
+    int unsigned               idle_den;
+    int unsigned               idle_credit;
+    int unsigned               row_gap;
+    int unsigned               tail_gap;
+    int unsigned               last_be;
+    int unsigned               data_mode;
+    logic [31:0]               data_state;
+  } desc_t;
+  desc_t descriptors[$];
+  int unsigned desc_base;  // descriptor index of descriptors[0]
+
   // Transaction queue from file. is_pause=1 entries are fence tokens, not real transactions.
+  // is_desc=1 entries stand for the descriptor with index desc_idx.
   typedef struct {
     logic                      is_pause;
+    logic                      is_desc;
+    int unsigned               desc_idx;
+    logic                      timed;     // entry carries a cycle stamp
+    int unsigned               stamp;     // earliest-issue cycle within the segment
     logic                      req;
     logic [IW-1:0]             id;
     logic                      wen;
@@ -72,33 +155,59 @@ module application_driver #(
     logic [DATA_WIDTH-1:0]     data;
     logic [ADDR_WIDTH-1:0]     add;
   } transaction_t;
+  // transactions[0] is entry tr_base of the file. With a prefetch depth of 0
+  // the whole file is loaded before reset; otherwise consumed entries are
+  // dropped and the queue is topped up to prefetch entries every cycle.
   transaction_t transactions[$];
+  int unsigned  tr_base;
+  logic         stim_eof;  // every entry of the file has been queued
+  int unsigned  prefetch;
+  int           stim;
+  string        stim_path;  // STIM_FILE, or its name in +STIM_DIR
+
+  function automatic string stim_file_in(string dir);
+    int sep = STIM_FILE.len() - 1;
+    while (sep >= 0 && STIM_FILE[sep] != "/") sep--;
+    return {dir, "/", STIM_FILE.substr(sep + 1, STIM_FILE.len() - 1)};
+  endfunction
 
-  // Fill up the queue by reading the stimuli file until the end.
+  // Totals of the '# totals' header line written by simvectors/main.py
+  logic         has_totals;
+  int unsigned  n_tot_requests, n_tot_reads, n_tot_writes, n_tot_fences;
+
+  // Read the next entry of the stimuli file; found=0 at the end of the file.
   // PAUSE lines are read as fence tokens with is_pause=1.
-  initial begin
-    string file_path;
-    int    stim;
+  task automatic read_entry(output transaction_t t, output bit found);
     string line;
-
-    if (STIM_FILE != "") begin
-      file_path = STIM_FILE;
-    end else begin
-      $fatal("ERROR: Specify STIM_FILE path");
-    end
-    stim = $fopen(file_path, "r");
-    if (stim == 0) begin
-      $fatal("ERROR: Could not open stimuli file: %s", file_path);
-    end
-    while (!$feof(stim)) begin
-      transaction_t t;
-      int scan_status;
+    int    sep;
+    int    scan_status;
+    found = 1'b0;
+    while (!found && !$feof(stim)) begin
       void'($fgets(line, stim));
       // Strip trailing newline/CR for comparison
       if (line.len() > 0 && (line[line.len()-1] == "\n" || line[line.len()-1] == "\r"))
         line = line.substr(0, line.len()-2);
       if (line.len() > 1 && line[line.len()-1] == "\r")
         line = line.substr(0, line.len()-2);
+      if (line.len() > 0 && line[0] == "#") begin
+        if ($sscanf(line, "# totals requests=%d reads=%d writes=%d fences=%d",
+                    n_tot_requests, n_tot_reads, n_tot_writes, n_tot_fences) == 4) begin
+          has_totals = 1'b1;
+        end
+        continue;
+      end
+      // Split off the cycle stamp of timed entries
+      t.timed = 1'b0;
+      t.stamp = 0;
+      if (line.len() > 0 && line[0] == "@") begin
+        t.timed = 1'b1;
+        sep = 1;
+        while (sep < line.len() && line[sep] != " ") sep++;
+        t.stamp = line.substr(1, sep-1).atoi();
+        line = (sep + 1 < line.len()) ? line.substr(sep+1, line.len()-1) : "";
+      end
+      t.is_desc  = 1'b0;
+      t.desc_idx = 0;
       if (line == "PAUSE") begin
         t.is_pause = 1'b1;
         t.req      = 1'b0;
@@ -107,21 +216,77 @@ module application_driver #(
         t.be       = '0;
         t.data     = '0;
         t.add      = '0;
-        transactions.push_back(t);
+        found      = 1'b1;
+      end else if (line.len() > 4 && line.substr(0, 4) == "DESC ") begin
+        desc_t d;
+        scan_status = $sscanf(line, "DESC %d %d %h %d %d %d %d %d %d %d %h %d %d %d %d %d %d %d %h",
+            d.n, d.id_start, d.base, d.stride0, d.len_d0, d.stride1, d.len_d1, d.stride2,
+            d.wrap, d.n_reads, d.wen_seed, d.idle_num, d.idle_den, d.idle_credit,
+            d.row_gap, d.tail_gap, d.last_be, d.data_mode, d.data_state);
+        if (scan_status != 19 || d.idle_den == 0) begin
+          $fatal(1, "ERROR: malformed descriptor in %s: '%s'", stim_path, line);
+        end
+        t.is_pause = 1'b0;
+        t.is_desc  = 1'b1;
+        t.desc_idx = desc_base + descriptors.size();
+        t.req      = 1'b0;
+        t.id       = '0;
+        t.wen      = 1'b0;
+        t.be       = '0;
+        t.data     = '0;
+        t.add      = '0;
+        descriptors.push_back(d);
+        found      = 1'b1;
       end else if (line.len() > 0) begin
         t.is_pause = 1'b0;
         scan_status = $sscanf(line, "%b %b %b %b %b %b",
             t.req, t.id, t.wen, t.be, t.data, t.add);
         if (scan_status != 6) begin
           if (!$feof(stim)) begin
-            $fatal(1, "ERROR: malformed stimuli line in %s: '%s'", file_path, line);
+            $fatal(1, "ERROR: malformed stimuli line in %s: '%s'", stim_path, line);
           end
           break;
         end
+        found = 1'b1;
+      end
+    end
+  endtask
+
+  // Queue entries until prefetch entries are ahead of the current one
+  // (or the whole file with prefetch = 0)
+  task automatic refill();
+    transaction_t t;
+    bit           found;
+    while (!stim_eof && (prefetch == 0 || transactions.size() < prefetch)) begin
+      read_entry(t, found);
+      if (found) begin
         transactions.push_back(t);
+      end else begin
+        stim_eof = 1'b1;
+        $fclose(stim);
       end
     end
-    $fclose(stim);
+  endtask
+
+  initial begin
+    if (STIM_FILE == "") begin
+      $fatal("ERROR: Specify STIM_FILE path");
+    end
+    stim_path = STIM_FILE;
+    if ($value$plusargs("STIM_DIR=%s", stim_path)) begin
+      stim_path = stim_file_in(stim_path);
+    end
+    stim = $fopen(stim_path, "r");
+    if (stim == 0) begin
+      $fatal("ERROR: Could not open stimuli file: %s", stim_path);
+    end
+    prefetch = 0;
+    void'($value$plusargs("STIM_PREFETCH=%d", prefetch));
+    tr_base    = 0;
+    desc_base  = 0;
+    stim_eof   = 1'b0;
+    has_totals = 1'b0;
+    refill();
   end
 
   //////////////////
@@ -139,10 +304,52 @@ module application_driver #(
 
   req_state_t  req_state_q, req_state_d;
   int unsigned tr_idx_q, tr_idx_d;
-  int unsigned last_op_issued_q, last_op_issued_d;
+  transaction_t issued_q, issued_d;  // request held on the bus until granted
+  int unsigned seg_cycle_q;  // cycles since the start of the current segment
+  int unsigned tr_pos;       // queue position of entry tr_idx_q
+  logic        tr_valid;     // entry tr_idx_q is queued
+  logic        tr_more;      // entry tr_idx_q is queued or still to be read
+
+  assign tr_pos   = tr_idx_q - tr_base;
+  assign tr_valid = tr_pos < transactions.size();
+  assign tr_more  = tr_valid || !stim_eof;
+
+  // Streaming: drop the consumed entries and top up the queue away from the
+  // active clock edge
+  initial begin
+    forever begin
+      @(negedge clk_i);
+      if (stim_eof) break;
+      while (tr_base < tr_idx_q) begin
+        if (transactions[0].is_desc) begin
+          void'(descriptors.pop_front());
+          desc_base++;
+        end
+        void'(transactions.pop_front());
+        tr_base++;
+      end
+      refill();
+    end
+  end
+
+  // Descriptor expansion state. desc_t_q counts the requests issued from the
+  // current descriptor; while it is 0 the remaining state is taken from the
+  // descriptor itself.
+  int unsigned     desc_t_q, desc_t_d;
+  int unsigned     desc_i_q, desc_i_d;
+  int unsigned     desc_j_q, desc_j_d;
+  int unsigned     desc_k_q, desc_k_d;
+  int unsigned     desc_credit_q, desc_credit_d;
+  int unsigned     desc_idles_q, desc_idles_d;      // idle cycles still owed
+  logic [31:0]     desc_wen_lfsr_q, desc_wen_lfsr_d;
+  logic [31:0]     desc_data_q, desc_data_d;        // write count or data LFSR state
+  logic [DATA_WIDTH-1:0] desc_rand_q;               // payload of the next random write
+  logic            desc_issue;
 
-  assign n_issued_tr_o    = n_req_issued_q;
-  assign n_issued_rd_tr_o = n_rd_req_issued_q;
+  assign n_issued_tr_o      = n_req_issued_q;
+  assign n_issued_rd_tr_o   = n_rd_req_issued_q;
+  assign n_expected_tr_o    = has_totals ? n_tot_requests : n_req_issued_q;
+  assign n_expected_rd_tr_o = has_totals ? n_tot_reads : n_rd_req_issued_q;
 
   always_ff @(posedge clk_i or negedge rst_ni) begin
     if (!rst_ni) begin
@@ -150,13 +357,135 @@ module application_driver #(
       tr_idx_q           <= '0;
       n_req_issued_q     <= '0;
       n_rd_req_issued_q  <= '0;
-      last_op_issued_q   <= '0;
+      issued_q           <= '{default: '0};
+      seg_cycle_q        <= '0;
+      desc_t_q           <= '0;
+      desc_i_q           <= '0;
+      desc_j_q           <= '0;
+      desc_k_q           <= '0;
+      desc_credit_q      <= '0;
+      desc_idles_q       <= '0;
+      desc_wen_lfsr_q    <= '0;
+      desc_data_q        <= '0;
     end else begin
       req_state_q        <= req_state_d;
       tr_idx_q           <= tr_idx_d;
       n_req_issued_q     <= n_req_issued_d;
       n_rd_req_issued_q  <= n_rd_req_issued_d;
-      last_op_issued_q   <= last_op_issued_d;
+      issued_q           <= issued_d;
+      // A new segment starts in the first REQ_IDLE cycle after a fence
+      seg_cycle_q        <= (req_state_q == PAUSED && req_state_d == REQ_IDLE) ? '0 : seg_cycle_q + 1;
+      desc_t_q           <= desc_t_d;
+      desc_i_q           <= desc_i_d;
+      desc_j_q           <= desc_j_d;
+      desc_k_q           <= desc_k_d;
+      desc_credit_q      <= desc_credit_d;
+      desc_idles_q       <= desc_idles_d;
+      desc_wen_lfsr_q    <= desc_wen_lfsr_d;
+      desc_data_q        <= desc_data_d;
+    end
+  end
+
+  function automatic logic [DATA_WIDTH-1:0] random_payload();
+    logic [N_LANES*32-1:0] lanes;
+    for (int lane = 0; lane < N_LANES; lane++) lanes[32*lane +: 32] = $urandom;
+    return DATA_WIDTH'(lanes);
+  endfunction
+
+  always_ff @(posedge clk_i or negedge rst_ni) begin
+    if (!rst_ni) begin
+      desc_rand_q <= random_payload();
+    end else if (desc_issue) begin
+      desc_rand_q <= random_payload();
+    end
+  end
+
+  // Next request of the current descriptor and the expansion state after it
+  logic                    cur_is_desc;
+  desc_t                   cur_desc;
+  logic [IW-1:0]           desc_id;
+  logic                    desc_wen;
+  logic [DATA_WIDTH/8-1:0] desc_be;
+  logic [DATA_WIDTH-1:0]   desc_wdata;
+  logic [ADDR_WIDTH-1:0]   desc_add;
+  int unsigned             desc_idles_after;
+  int unsigned             desc_i_nxt, desc_j_nxt, desc_k_nxt, desc_credit_nxt;
+  logic [31:0]             desc_wen_lfsr_nxt, desc_data_nxt;
+
+  always_comb begin
+    int unsigned           credit;
+    logic [31:0]           wen_lfsr, data_state;
+    longint                off;
+    logic                  row_done;
+    logic [N_LANES*32-1:0] lanes;
+
+    cur_is_desc = tr_valid && transactions[tr_pos].is_desc;
+    cur_desc    = cur_is_desc ? descriptors[transactions[tr_pos].desc_idx - desc_base] : '{idle_den: 1, default: '0};
+    credit      = (desc_t_q == 0) ? cur_desc.idle_credit : desc_credit_q;
+    wen_lfsr    = (desc_t_q == 0) ? cur_desc.wen_seed    : desc_wen_lfsr_q;
+    data_state  = (desc_t_q == 0) ? cur_desc.data_state  : desc_data_q;
+
+    off = longint'(desc_i_q) * cur_desc.stride0 + longint'(desc_j_q) * cur_desc.stride1 +
+          longint'(desc_k_q) * cur_desc.stride2;
+    if (cur_desc.wrap > 0) off = off % cur_desc.wrap;
+    desc_add = cur_desc.base + ADDR_WIDTH'(off * (DATA_WIDTH/8));
+    desc_id  = IW'(cur_desc.id_start + desc_t_q);
+    desc_be  = (cur_desc.last_be > 0 && desc_t_q + 1 == cur_desc.n) ?
+               {(DATA_WIDTH/8){1'b1}} >> (DATA_WIDTH/8 - cur_desc.last_be) : '1;
+    if (cur_desc.wen_seed != 0) begin
+      desc_wen_lfsr_nxt = (wen_lfsr >> 1) ^ (wen_lfsr[0] ? LFSR_TAPS : 32'h0);
+      desc_wen          = desc_wen_lfsr_nxt[0];
+    end else begin
+      desc_wen_lfsr_nxt = wen_lfsr;
+      desc_wen          = desc_t_q < cur_desc.n_reads;
+    end
+
+    // Write payload; the counter and LFSR only advance on writes
+    desc_data_nxt = data_state;
+    lanes         = '0;
+    case (cur_desc.data_mode)
+      DATA_ADDRESS: begin
+        for (int lane = 0; lane < N_LANES; lane++) lanes[32*lane +: 32] = 32'(desc_add) + 4 * lane;
+        desc_wdata = DATA_WIDTH'(lanes);
+      end
+      DATA_COUNTER: begin
+        desc_wdata    = DATA_WIDTH'(data_state);
+        desc_data_nxt = data_state + 1;
+      end
+      DATA_LFSR: begin
+        desc_data_nxt = (data_state >> 1) ^ (data_state[0] ? LFSR_TAPS : 32'h0);
+        for (int lane = 0; lane < N_LANES; lane++) lanes[32*lane +: 32] = desc_data_nxt;
+        desc_wdata = DATA_WIDTH'(lanes);
+      end
+      DATA_ZEROS: desc_wdata = '0;
+      default:    desc_wdata = desc_rand_q;
+    endcase
+    if (desc_wen) begin
+      desc_wdata    = '0;
+      desc_data_nxt = data_state;
+    end
+
+    // Idle cycles owed after this request and the next loop indices
+    credit           = credit + cur_desc.idle_num;
+    desc_idles_after = credit / cur_desc.idle_den;
+    desc_credit_nxt  = credit - desc_idles_after * cur_desc.idle_den;
+    desc_i_nxt       = desc_i_q + 1;
+    desc_j_nxt       = desc_j_q;
+    desc_k_nxt       = desc_k_q;
+    row_done         = 1'b0;
+    if (cur_desc.len_d0 != 0 && desc_i_nxt == cur_desc.len_d0) begin
+      desc_i_nxt = 0;
+      desc_j_nxt = desc_j_q + 1;
+      row_done   = 1'b1;
+      if (cur_desc.len_d1 != 0 && desc_j_nxt == cur_desc.len_d1) begin
+        desc_j_nxt = 0;
+        desc_k_nxt = desc_k_q + 1;
+      end
+    end
+    if (desc_t_q + 1 == cur_desc.n) begin
+      desc_idles_after = desc_idles_after + cur_desc.tail_gap;
+    end else if (row_done) begin
+      desc_idles_after = desc_idles_after + cur_desc.row_gap;
     end
   end
 
@@ -166,7 +495,16 @@ module application_driver #(
     tr_idx_d         = tr_idx_q;
     n_req_issued_d   = n_req_issued_q;
     n_rd_req_issued_d = n_rd_req_issued_q;
-    last_op_issued_d = last_op_issued_q;
+    issued_d         = issued_q;
+    desc_t_d         = desc_t_q;
+    desc_i_d         = desc_i_q;
+    desc_j_d         = desc_j_q;
+    desc_k_d         = desc_k_q;
+    desc_credit_d    = desc_credit_q;
+    desc_idles_d     = desc_idles_q;
+    desc_wen_lfsr_d  = desc_wen_lfsr_q;
+    desc_data_d      = desc_data_q;
+    desc_issue       = 1'b0;
     // HCI output defaults
     hci_if.id       = '0;
     hci_if.add      = '0;
@@ -185,8 +523,10 @@ module application_driver #(
 
     case (req_state_q)
       REQ_IDLE: begin
-        if (tr_idx_q < transactions.size()) begin
-          if (transactions[tr_idx_q].is_pause) begin
+        if (tr_valid) begin
+          if (seg_cycle_q < transactions[tr_pos].stamp) begin
+            // Timed entry not due yet: hold the bus idle
+          end else if (transactions[tr_pos].is_pause) begin
             // Consume the PAUSE token and drain any in-flight reads before pausing
             tr_idx_d = tr_idx_q + 1;
             if (n_rd_req_issued_q > n_rd_resp_retired_q) begin
@@ -194,24 +534,69 @@ module application_driver #(
             end else begin
               req_state_d = PAUSED;
             end
+          end else if (transactions[tr_pos].is_desc) begin
+            if (desc_idles_q > 0) begin
+              // Idle cycle owed by the descriptor
+              desc_idles_d = desc_idles_q - 1;
+              if (desc_idles_q == 1 && desc_t_q >= cur_desc.n) begin
+                tr_idx_d = tr_idx_q + 1;
+                desc_t_d = 0;
+              end
+            end else if (desc_t_q >= cur_desc.n) begin
+              // Empty descriptor
+              tr_idx_d = tr_idx_q + 1;
+              desc_t_d = 0;
+            end else begin
+              hci_if.req  = 1'b1;
+              hci_if.id   = desc_id;
+              hci_if.wen  = desc_wen;
+              hci_if.be   = desc_be;
+              hci_if.data = desc_wdata;
+              hci_if.add  = desc_add;
+              n_req_issued_d = n_req_issued_q + 1;
+              if (desc_wen) begin
+                n_rd_req_issued_d = n_rd_req_issued_q + 1;
+              end
+              issued_d      = '{req: 1'b1, id: desc_id, wen: desc_wen, be: desc_be,
+                                data: desc_wdata, add: desc_add, default: '0};
+              desc_issue      = 1'b1;
+              desc_t_d        = desc_t_q + 1;
+              desc_i_d        = desc_i_nxt;
+              desc_j_d        = desc_j_nxt;
+              desc_k_d        = desc_k_nxt;
+              desc_credit_d   = desc_credit_nxt;
+              desc_idles_d    = desc_idles_after;
+              desc_wen_lfsr_d = desc_wen_lfsr_nxt;
+              desc_data_d     = desc_data_nxt;
+              if (desc_t_q + 1 == cur_desc.n && desc_idles_after == 0) begin
+                tr_idx_d = tr_idx_q + 1;
+                desc_t_d = 0;
+              end
+              req_state_d = hci_if.gnt ? REQ_IDLE : WAIT_GNT;
+            end
+            if (tr_idx_d != tr_idx_q) begin
+              desc_i_d = 0;
+              desc_j_d = 0;
+              desc_k_d = 0;
+            end
           end else begin
             tr_idx_d = tr_idx_q + 1;
-            if (transactions[tr_idx_q].req) begin
+            if (transactions[tr_pos].req) begin
               hci_if.req  = 1'b1;
-              hci_if.id   = transactions[tr_idx_q].id;
-              hci_if.wen  = transactions[tr_idx_q].wen;
-              hci_if.be   = transactions[tr_idx_q].be;
-              hci_if.data = transactions[tr_idx_q].data;
-              hci_if.add  = transactions[tr_idx_q].add;
+              hci_if.id   = transactions[tr_pos].id;
+              hci_if.wen  = transactions[tr_pos].wen;
+              hci_if.be   = transactions[tr_pos].be;
+              hci_if.data = transactions[tr_pos].data;
+              hci_if.add  = transactions[tr_pos].add;
               n_req_issued_d = n_req_issued_q + 1;
-              if (transactions[tr_idx_q].wen) begin
+              if (transactions[tr_pos].wen) begin
                 n_rd_req_issued_d = n_rd_req_issued_q + 1;
               end
-              last_op_issued_d = tr_idx_q;
+              issued_d = transactions[tr_pos];
               req_state_d = hci_if.gnt ? REQ_IDLE : WAIT_GNT;
             end
           end
-        end else begin
+        end else if (stim_eof) begin
           // No more transactions
           if (n_rd_req_issued_q > n_rd_resp_retired_q) begin
             req_state_d = REQ_DONE;
@@ -223,22 +608,35 @@ module application_driver #(
 
       WAIT_GNT: begin
         hci_if.req  = 1'b1;
-        hci_if.id   = transactions[last_op_issued_q].id;
-        hci_if.wen  = transactions[last_op_issued_q].wen;
-        hci_if.be   = transactions[last_op_issued_q].be;
-        hci_if.data = transactions[last_op_issued_q].data;
-        hci_if.add  = transactions[last_op_issued_q].add;
-        if (tr_idx_q < transactions.size()) begin
+        hci_if.id   = issued_q.id;
+        hci_if.wen  = issued_q.wen;
+        hci_if.be   = issued_q.be;
+        hci_if.data = issued_q.data;
+        hci_if.add  = issued_q.add;
+        if (tr_more) begin
           // Consume later idle entries while stalled so the driver can hide memory
           // latency/backpressure when the workload permits it. This makes req=0 tokens
           // issue-gap hints, not strict simulation-time no-op cycles.
-          if (!transactions[tr_idx_q].req && !transactions[tr_idx_q].is_pause) begin
+          if (!tr_valid) begin
+            // Next entry not parsed yet
+          end else if (transactions[tr_pos].is_desc) begin
+            if (desc_idles_q > 0) begin
+              desc_idles_d = desc_idles_q - 1;
+              if (desc_idles_q == 1 && desc_t_q >= cur_desc.n) begin
+                tr_idx_d = tr_idx_q + 1;
+                desc_t_d = 0;
+                desc_i_d = 0;
+                desc_j_d = 0;
+                desc_k_d = 0;
+              end
+            end
+          end else if (!transactions[tr_pos].req && !transactions[tr_pos].is_pause) begin
             tr_idx_d = tr_idx_q + 1;
           end
           req_state_d = hci_if.gnt ? REQ_IDLE : WAIT_GNT;
         end else begin
           if (hci_if.gnt) begin
-            if (transactions[last_op_issued_q].req && transactions[last_op_issued_q].wen) begin
+            if (issued_q.req && issued_q.wen) begin
               req_state_d = REQ_DONE;
             end else begin
               req_state_d = RSP_DONE;
@@ -267,7 +665,8 @@ module application_driver #(
         // to avoid a spurious one-cycle REQ_IDLE bounce between consecutive fences.
         fence_reached_o = 1'b1;
         if (resume_i) begin
-          if (tr_idx_q < transactions.size() && transactions[tr_idx_q].is_pause) begin
+          if (tr_valid && transactions[tr_pos].is_pause &&
+              transactions[tr_pos].stamp == 0) begin
             tr_idx_d    = tr_idx_q + 1;
             req_state_d = PAUSED;
           end else begin
@@ -286,6 +685,48 @@ module application_driver #(
     endcase
   end
 
+  // The issued requests must add up to the header totals
+  always_ff @(posedge clk_i) begin
+    if (req_state_q != RSP_DONE && req_state_d == RSP_DONE && has_totals &&
+        (n_req_issued_q != n_tot_requests || n_rd_req_issued_q != n_tot_reads)) begin
+      $error("Driver %0d (%s): issued %0d requests (%0d reads), header expects %0d (%0d reads)",
+             MASTER_NUMBER, stim_path, n_req_issued_q, n_rd_req_issued_q,
+             n_tot_requests, n_tot_reads);
+    end
+  end
+
+  ///////////////////////////
+  // Timed issue statistics //
+  ///////////////////////////
+
+  // Cycles by which each request is presented after its stamp (queueing delay
+  // of the open-loop source behind earlier, not yet granted requests).
+  longint unsigned n_issue_delay_cycles;
+  int unsigned     max_issue_delay_cycles;
+  int unsigned     n_stamped_issued;
+
+  always_ff @(posedge clk_i or negedge rst_ni) begin
+    if (!rst_ni) begin
+      n_issue_delay_cycles   <= '0;
+      max_issue_delay_cycles <= '0;
+      n_stamped_issued       <= '0;
+    end else if (req_state_q == REQ_IDLE && n_req_issued_d != n_req_issued_q &&
+                 transactions[tr_pos].timed) begin
+      n_issue_delay_cycles   <= n_issue_delay_cycles + (seg_cycle_q - transactions[tr_pos].stamp);
+      max_issue_delay_cycles <= (seg_cycle_q - transactions[tr_pos].stamp > max_issue_delay_cycles) ?
+                                seg_cycle_q - transactions[tr_pos].stamp : max_issue_delay_cycles;
+      n_stamped_issued       <= n_stamped_issued + 1;
+    end
+  end
+
+  final begin
+    if (n_stamped_issued > 0) begin
+      $display("Driver %0d (%s): %0d timed requests, issue delay after stamp avg %.2f max %0d cycles",
+               MASTER_NUMBER, stim_path, n_stamped_issued,
+               real'(n_issue_delay_cycles) / real'(n_stamped_issued), max_issue_delay_cycles);
+    end
+  end
+
   ///////////////////////
   // Read response FSM //
   ///////////////////////
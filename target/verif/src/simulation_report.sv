@@ -36,7 +36,10 @@ module simulation_report
   input int unsigned         n_write_granted_transactions_log_i[N_DRIVERS-N_HWPE],
   input int unsigned         n_write_granted_transactions_hwpe_i[N_HWPE],
   input int unsigned         n_read_complete_transactions_log_i[N_DRIVERS-N_HWPE],
-  input int unsigned         n_read_complete_transactions_hwpe_i[N_HWPE]
+  input int unsigned         n_read_complete_transactions_hwpe_i[N_HWPE],
+  // Totals from the stimuli file headers, indexed by driver
+  input int unsigned         n_expected_transactions_i[N_DRIVERS],
+  input int unsigned         n_expected_read_transactions_i[N_DRIVERS]
 );
 
   initial begin : proc_simulation_report
@@ -61,6 +64,7 @@ module simulation_report
     int unsigned log_masters_with_grants;
     int unsigned hwpe_masters_with_grants;
     logic missing_reads;
+    logic missing_requests;
     // Ideal bandwidth: maximum data the memory system can serve per cycle.
     // Memory side: N_BANKS narrow ports, each DATA_WIDTH bits wide.
     real ideal_bw_mem_side_bpc;     // bits per cycle (memory-side ceiling)
@@ -91,6 +95,7 @@ module simulation_report
     log_masters_with_grants = '0;
     hwpe_masters_with_grants = '0;
     missing_reads = 1'b0;
+    missing_requests = 1'b0;
 
     wait (&end_resp_i);
     wait (throughput_complete_i >= 0);
@@ -303,7 +308,7 @@ module simulation_report
 
     $display("\n\\\\READ RESPONSE COVERAGE\\\\");
     for (int i = 0; i < N_CORE; i++) begin
-      expected_reads = n_read_granted_transactions_log_i[i];
+      expected_reads = n_expected_read_transactions_i[i];
       observed_reads = n_read_complete_transactions_log_i[i];
       $display(
         "master_log_%0d: observed %0d / expected %0d",
@@ -314,7 +319,7 @@ module simulation_report
       end
     end
     for (int i = N_CORE; i < N_CORE + N_DMA; i++) begin
-      expected_reads = n_read_granted_transactions_log_i[i];
+      expected_reads = n_expected_read_transactions_i[i];
       observed_reads = n_read_complete_transactions_log_i[i];
       $display(
         "master_log_%0d: observed %0d / expected %0d",
@@ -325,7 +330,7 @@ module simulation_report
       end
     end
     for (int i = N_CORE + N_DMA; i < N_CORE + N_DMA + N_EXT; i++) begin
-      expected_reads = n_read_granted_transactions_log_i[i];
+      expected_reads = n_expected_read_transactions_i[i];
       observed_reads = n_read_complete_transactions_log_i[i];
       $display(
         "master_log_%0d: observed %0d / expected %0d",
@@ -336,7 +341,7 @@ module simulation_report
       end
     end
     for (int i = 0; i < N_HWPE; i++) begin
-      expected_reads = n_read_granted_transactions_hwpe_i[i];
+      expected_reads = n_expected_read_transactions_i[N_DRIVERS - N_HWPE + i];
       observed_reads = n_read_complete_transactions_hwpe_i[i];
       $display(
         "master_hwpe_%0d: observed %0d / expected %0d",
@@ -353,39 +358,62 @@ module simulation_report
     $display("\n\\\\TRANSACTION COUNTS\\\\");
     for (int i = 0; i < N_CORE; i++) begin
       $display(
-        "master_log_%0d: granted reads=%0d writes=%0d, read-complete=%0d",
+        "master_log_%0d: granted reads=%0d writes=%0d, read-complete=%0d, expected requests=%0d",
         i,
         n_read_granted_transactions_log_i[i],
         n_write_granted_transactions_log_i[i],
-        n_read_complete_transactions_log_i[i]
+        n_read_complete_transactions_log_i[i],
+        n_expected_transactions_i[i]
       );
+      if (n_read_granted_transactions_log_i[i] + n_write_granted_transactions_log_i[i] !=
+          n_expected_transactions_i[i]) begin
+        missing_requests = 1'b1;
+      end
     end
     for (int i = N_CORE; i < N_CORE + N_DMA; i++) begin
       $display(
-        "master_log_%0d: granted reads=%0d writes=%0d, read-complete=%0d",
+        "master_log_%0d: granted reads=%0d writes=%0d, read-complete=%0d, expected requests=%0d",
         i,
         n_read_granted_transactions_log_i[i],
         n_write_granted_transactions_log_i[i],
-        n_read_complete_transactions_log_i[i]
+        n_read_complete_transactions_log_i[i],
+        n_expected_transactions_i[i]
       );
+      if (n_read_granted_transactions_log_i[i] + n_write_granted_transactions_log_i[i] !=
+          n_expected_transactions_i[i]) begin
+        missing_requests = 1'b1;
+      end
     end
     for (int i = N_CORE + N_DMA; i < N_CORE + N_DMA + N_EXT; i++) begin
       $display(
-        "master_log_%0d: granted reads=%0d writes=%0d, read-complete=%0d",
+        "master_log_%0d: granted reads=%0d writes=%0d, read-complete=%0d, expected requests=%0d",
         i,
         n_read_granted_transactions_log_i[i],
         n_write_granted_transactions_log_i[i],
-        n_read_complete_transactions_log_i[i]
+        n_read_complete_transactions_log_i[i],
+        n_expected_transactions_i[i]
       );
+      if (n_read_granted_transactions_log_i[i] + n_write_granted_transactions_log_i[i] !=
+          n_expected_transactions_i[i]) begin
+        missing_requests = 1'b1;
+      end
     end
     for (int i = 0; i < N_HWPE; i++) begin
       $display(
-        "master_hwpe_%0d: granted reads=%0d writes=%0d, read-complete=%0d",
+        "master_hwpe_%0d: granted reads=%0d writes=%0d, read-complete=%0d, expected requests=%0d",
         i,
         n_read_granted_transactions_hwpe_i[i],
         n_write_granted_transactions_hwpe_i[i],
-        n_read_complete_transactions_hwpe_i[i]
+        n_read_complete_transactions_hwpe_i[i],
+        n_expected_transactions_i[N_DRIVERS - N_HWPE + i]
       );
+      if (n_read_granted_transactions_hwpe_i[i] + n_write_granted_transactions_hwpe_i[i] !=
+          n_expected_transactions_i[N_DRIVERS - N_HWPE + i]) begin
+        missing_requests = 1'b1;
+      end
+    end
+    if (missing_requests) begin
+      $display("** WARNING **: one or more masters have granted request counts differing from their stimuli totals.");
     end
 
     $display("\n\\\\REQUEST-TO-GRANT LATENCY\\\\");
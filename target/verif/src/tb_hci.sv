@@ -275,10 +275,23 @@ module tb_hci
   logic s_clear;
   assign s_clear = 1'b0;
 
+  // Arbitration settings are run-time plusargs (defaulting to the package
+  // parameters), so that one compiled library serves every testbench config
+  // of a hardware config
+  int unsigned invert_prio = INVERT_PRIO;
+  int unsigned priority_cnt_numerator = PRIORITY_CNT_NUMERATOR;
+  int unsigned priority_cnt_denominator = PRIORITY_CNT_DENOMINATOR;
+
+  initial begin
+    void'($value$plusargs("INVERT_PRIO=%d", invert_prio));
+    void'($value$plusargs("PRIORITY_CNT_NUMERATOR=%d", priority_cnt_numerator));
+    void'($value$plusargs("PRIORITY_CNT_DENOMINATOR=%d", priority_cnt_denominator));
+  end
+
   assign s_hci_ctrl.arb_policy = ARBITER_MODE;
-  assign s_hci_ctrl.invert_prio = INVERT_PRIO;
-  assign s_hci_ctrl.priority_cnt_numerator = PRIORITY_CNT_NUMERATOR;
-  assign s_hci_ctrl.priority_cnt_denominator = PRIORITY_CNT_DENOMINATOR;
+  assign s_hci_ctrl.invert_prio = invert_prio;
+  assign s_hci_ctrl.priority_cnt_numerator = priority_cnt_numerator;
+  assign s_hci_ctrl.priority_cnt_denominator = priority_cnt_denominator;
 
   // fence_idx[i] = number of PAUSE tokens driver i has passed.
   // This counts all fences in file order, including synthetic blocking fences
@@ -383,6 +396,8 @@ module tb_hci
 
   int unsigned s_issued_transactions[0:N_DRIVERS-1];
   int unsigned s_issued_read_transactions[0:N_DRIVERS-1];
+  int unsigned s_expected_transactions[0:N_DRIVERS-1];
+  int unsigned s_expected_read_transactions[0:N_DRIVERS-1];
 
   generate
     for (genvar ii = 0; ii < N_LOG_MASTERS; ii++) begin : gen_app_driver_log
@@ -403,7 +418,9 @@ module tb_hci
         .end_resp_o(s_end_resp[ii]),
         .n_issued_tr_o(s_issued_transactions[ii]),
         .n_issued_rd_tr_o(s_issued_read_transactions[ii]),
-        .n_retired_rd_tr_o()
+        .n_retired_rd_tr_o(),
+        .n_expected_tr_o(s_expected_transactions[ii]),
+        .n_expected_rd_tr_o(s_expected_read_transactions[ii])
       );
     end
   endgenerate
@@ -427,7 +444,9 @@ module tb_hci
         .end_resp_o(s_end_resp[N_LOG_MASTERS + ii]),
         .n_issued_tr_o(s_issued_transactions[N_LOG_MASTERS + ii]),
         .n_issued_rd_tr_o(s_issued_read_transactions[N_LOG_MASTERS + ii]),
-        .n_retired_rd_tr_o()
+        .n_retired_rd_tr_o(),
+        .n_expected_tr_o(s_expected_transactions[N_LOG_MASTERS + ii]),
+        .n_expected_rd_tr_o(s_expected_read_transactions[N_LOG_MASTERS + ii])
       );
     end
   endgenerate
@@ -508,7 +527,9 @@ module tb_hci
     .n_write_granted_transactions_log_i(N_WRITE_GRANTED_TRANSACTIONS_LOG),
     .n_write_granted_transactions_hwpe_i(N_WRITE_GRANTED_TRANSACTIONS_HWPE),
     .n_read_complete_transactions_log_i(N_READ_COMPLETE_TRANSACTIONS_LOG),
-    .n_read_complete_transactions_hwpe_i(N_READ_COMPLETE_TRANSACTIONS_HWPE)
+    .n_read_complete_transactions_hwpe_i(N_READ_COMPLETE_TRANSACTIONS_HWPE),
+    .n_expected_transactions_i(s_expected_transactions),
+    .n_expected_read_transactions_i(s_expected_read_transactions)
   );
 
   ////////////////
@@ -33,6 +33,7 @@ package tb_hci_pkg;
   localparam unsigned RST_CLK_CYCLES = `ifdef RST_CLK_CYCLES `RST_CLK_CYCLES `else 10 `endif;
 
   // TCDM and arbitration parameters
+  // (INVERT_PRIO and PRIORITY_CNT_* are defaults, overridden by plusargs)
   localparam int unsigned RANDOM_GNT          = `ifdef RANDOM_GNT `RANDOM_GNT `else 0 `endif;
   localparam int unsigned ARBITER_MODE        = 0;
   localparam int unsigned INVERT_PRIO         = `ifdef INVERT_PRIO `INVERT_PRIO `else 0 `endif;
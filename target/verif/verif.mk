@@ -10,12 +10,23 @@ HCI_VERIF_DIR = $(HCI_ROOT)/target/verif
 HCI_VERIF_CFG_DIR = $(HCI_VERIF_DIR)/config
 HCI_VERIF_CFG_GEN_DIR = $(HCI_VERIF_CFG_DIR)/generated
 
+# Per-run directory for the generated Makefiles and the simulation transcript.
+# Empty for the default flow; the regression sets one per test so that runs
+# sharing a compiled library can execute in parallel (see run-only-verif)
+sim_run_dir ?=
+ifneq ($(sim_run_dir),)
+    override sim_run_dir := $(abspath $(sim_run_dir))
+    VERIF_CFG_MK_DIR = $(sim_run_dir)
+else
+    VERIF_CFG_MK_DIR = $(HCI_VERIF_CFG_GEN_DIR)
+endif
+
 # Other Makefiles
 include $(HCI_VERIF_DIR)/exploration/exploration.mk
 
 # Include generated Makefiles
-include $(HCI_VERIF_CFG_GEN_DIR)/hardware.mk
-include $(HCI_VERIF_CFG_GEN_DIR)/testbench.mk
+include $(VERIF_CFG_MK_DIR)/hardware.mk
+include $(VERIF_CFG_MK_DIR)/testbench.mk
 
 # Bender targets and defines
 include $(HCI_VERIF_DIR)/bender.mk
@@ -44,14 +55,50 @@ SIMVECTORS_GEN_DIR := $(HCI_VERIF_DIR)/simvectors/generated
 
 FENCE_PARAMS_SVH := $(SIMVECTORS_GEN_DIR)/fence_params.svh
 
+# Temporal model of memory_map.txt/dataflow.html: ideal or contention
+STIM_SCHEDULE ?= ideal
+# Stimulus issue gaps: padded (req=0 idle lines) or timed (per-request cycle stamps)
+STIM_ISSUE_MODE ?= padded
+# Stimulus encoding: lines (one line per cycle) or descriptors (expanded by the driver)
+STIM_FORMAT ?= lines
+# Stimulus transport: 0 (files) or 1 (named pipes filled during run-verif)
+STIM_FIFO ?= 0
+# Stimulus storage: none, gz or zst (decompressed on the fly by run-verif)
+STIM_COMPRESS ?= none
+
+GEN_STIM_ARGS = \
+	--workload_config $(WORKLOAD_JSON) \
+	--testbench_config $(TESTBENCH_JSON) \
+	--hardware_config $(HARDWARE_JSON) \
+	--schedule $(STIM_SCHEDULE) \
+	--issue_mode $(STIM_ISSUE_MODE) \
+	--stim_format $(STIM_FORMAT) \
+	--compress $(STIM_COMPRESS)
+
+# Directory the simulator reads the stimuli from (+STIM_DIR): the generated one,
+# or a per-run one with sim_run_dir, so that parallel runs get their own pipes
+STIM_RUN_DIR = $(if $(sim_run_dir),$(sim_run_dir)/stimuli,$(SIMVECTORS_GEN_DIR)/stimuli)
+
+# Shell prefix of the simulation recipes: every compressed master_*.txt.gz/.zst
+# is fed to the simulator through a named pipe at its master_*.txt path in
+# $(STIM_RUN_DIR), plain files are linked there, and the decompressors left
+# (e.g. after a failed simulation) are killed afterwards through $$unpack_pids
+STIM_UNPACK = unpack_pids=; mkdir -p $(STIM_RUN_DIR); \
+	for f in $(SIMVECTORS_GEN_DIR)/stimuli/master_*.txt*; do \
+		[ -e "$$f" ] || continue; \
+		p="$(STIM_RUN_DIR)/$$(basename "$${f%.txt*}").txt"; \
+		case "$$f" in \
+			*.gz) rm -f "$$p"; mkfifo "$$p"; gzip -dc "$$f" > "$$p" & unpack_pids="$$unpack_pids $$!" ;; \
+			*.zst) rm -f "$$p"; mkfifo "$$p"; zstd -qdc "$$f" > "$$p" & unpack_pids="$$unpack_pids $$!" ;; \
+			*) [ "$$f" = "$$p" ] || ln -sf "$$f" "$$p" ;; \
+		esac; \
+	done;
+
 .PHONY: stim-verif
 stim-verif: $(FENCE_PARAMS_SVH)
 $(FENCE_PARAMS_SVH): $(VERIF_CFG_JSON) $(VERIF_CFG_MK) $(STIM_SRC_FILES) $(GEN_STIM_SCRIPT)
 	mkdir -p $(SIMVECTORS_GEN_DIR)
-	$(PYTHON) $(GEN_STIM_SCRIPT) \
-		--workload_config $(WORKLOAD_JSON) \
-		--testbench_config $(TESTBENCH_JSON) \
-		--hardware_config $(HARDWARE_JSON)
+	$(PYTHON) $(GEN_STIM_SCRIPT) $(GEN_STIM_ARGS) $(if $(filter 1,$(STIM_FIFO)),--plan_only --fifo)
 
 .PHONY: clean-stim-verif
 clean-stim-verif:
@@ -70,19 +117,19 @@ WORKLOAD_JSON  ?= $(HCI_VERIF_CFG_DIR)/workload.json
 VERIF_CFG_JSON := $(HARDWARE_JSON) $(TESTBENCH_JSON) $(WORKLOAD_JSON)
 
 # Makefiles to generate from JSON configs
-VERIF_CFG_MK := $(HCI_VERIF_CFG_GEN_DIR)/hardware.mk \
-	$(HCI_VERIF_CFG_GEN_DIR)/testbench.mk
+VERIF_CFG_MK := $(VERIF_CFG_MK_DIR)/hardware.mk \
+	$(VERIF_CFG_MK_DIR)/testbench.mk
 
 .PHONY: config-verif
 config-verif: $(VERIF_CFG_MK)
 
-$(HCI_VERIF_CFG_GEN_DIR)/hardware.mk: $(HARDWARE_JSON) $(HCI_VERIF_CFG_GEN_DIR)/hardware.mk.tpl $(HCI_VERIF_CFG_GEN_DIR)/json_to_mk.py | $(HCI_VERIF_CFG_GEN_DIR)
+$(VERIF_CFG_MK_DIR)/hardware.mk: $(HARDWARE_JSON) $(HCI_VERIF_CFG_GEN_DIR)/hardware.mk.tpl $(HCI_VERIF_CFG_GEN_DIR)/json_to_mk.py | $(VERIF_CFG_MK_DIR)
 	$(PYTHON) $(HCI_VERIF_CFG_GEN_DIR)/json_to_mk.py hardware $(HARDWARE_JSON) $(HCI_VERIF_CFG_GEN_DIR) > $@
 
-$(HCI_VERIF_CFG_GEN_DIR)/testbench.mk: $(TESTBENCH_JSON) $(HCI_VERIF_CFG_GEN_DIR)/testbench.mk.tpl $(HCI_VERIF_CFG_GEN_DIR)/json_to_mk.py | $(HCI_VERIF_CFG_GEN_DIR)
+$(VERIF_CFG_MK_DIR)/testbench.mk: $(TESTBENCH_JSON) $(HCI_VERIF_CFG_GEN_DIR)/testbench.mk.tpl $(HCI_VERIF_CFG_GEN_DIR)/json_to_mk.py | $(VERIF_CFG_MK_DIR)
 	$(PYTHON) $(HCI_VERIF_CFG_GEN_DIR)/json_to_mk.py testbench $(TESTBENCH_JSON) $(HCI_VERIF_CFG_GEN_DIR) > $@
 
-$(HCI_VERIF_CFG_GEN_DIR):
+$(VERIF_CFG_MK_DIR):
 	mkdir -p $@
 
 .PHONY: clean-config-verif
@@ -97,7 +144,11 @@ clean-config-verif:
 GUI ?= $(if $(gui),$(gui),0)
 # Top-level to simulate
 sim_top_level ?= tb_hci
+# Compiled library. Only hardware parameters and CLK_PERIOD, RST_CLK_CYCLES,
+# RANDOM_GNT are compiled in, so configs differing in the other testbench
+# parameters can share a library (e.g. one per hardware config)
 sim_vsim_lib ?= $(HCI_VERIF_DIR)/vsim/work
+override sim_vsim_lib := $(abspath $(sim_vsim_lib))
 
 SIM_SRC_FILES = $(shell find {$(HCI_RTL_DIR),$(HCI_VERIF_DIR)/src} -type f) $(FENCE_PARAMS_SVH)
 SIM_QUESTA_SUPPRESS ?= -suppress 3009 -suppress 3053 -suppress 8885 -suppress 12003
@@ -112,6 +163,13 @@ SIM_HCI_VOPT_ARGS += $(SIM_QUESTA_SUPPRESS) -work $(sim_vsim_lib)
 # vsim simulation arguments
 SIM_HCI_VSIM_ARGS ?=
 SIM_HCI_VSIM_ARGS += $(SIM_QUESTA_SUPPRESS) -lib $(sim_vsim_lib) +permissive +notimingchecks +nospecify -t 1ps
+SIM_HCI_VSIM_ARGS += +INVERT_PRIO=$(INVERT_PRIO) \
+	+PRIORITY_CNT_NUMERATOR=$(PRIORITY_CNT_NUMERATOR) \
+	+PRIORITY_CNT_DENOMINATOR=$(PRIORITY_CNT_DENOMINATOR) \
+	+STIM_PREFETCH=$(STIM_PREFETCH)
+ifneq ($(sim_run_dir),)
+	SIM_HCI_VSIM_ARGS += -l $(sim_run_dir)/transcript -wlf $(sim_run_dir)/vsim.wlf
+endif
 ifeq ($(GUI),0)
 	SIM_HCI_VSIM_ARGS += -c
 endif
@@ -138,10 +196,36 @@ $(sim_vsim_lib)/$(sim_top_level)_optimized/.tb_opt_compiled: $(sim_vsim_lib)/.hw
 
 .PHONY: run-verif
 run-verif: $(HCI_VERIF_DIR)/vsim/$(sim_top_level).tcl $(sim_vsim_lib)/$(sim_top_level)_optimized/.tb_opt_compiled $(FENCE_PARAMS_SVH)
+ifeq ($(STIM_FIFO),1)
+	$(PYTHON) $(GEN_STIM_SCRIPT) $(GEN_STIM_ARGS) --fifo & stim_pid=$$!; \
 	cd $(HCI_VERIF_DIR)/vsim && \
 	$(SIM_VSIM) $(SIM_HCI_VSIM_ARGS) \
 	$(sim_top_level)_optimized \
-	-do 'set GUI $(GUI); source $<'
+	-do 'set GUI $(GUI); source $<'; \
+	sim_rc=$$?; wait $$stim_pid || sim_rc=1; exit $$sim_rc
+else
+	$(STIM_UNPACK) \
+	cd $(HCI_VERIF_DIR)/vsim && \
+	$(SIM_VSIM) $(SIM_HCI_VSIM_ARGS) +STIM_DIR=$(STIM_RUN_DIR) \
+	$(sim_top_level)_optimized \
+	-do 'set GUI $(GUI); source $<'; \
+	sim_rc=$$?; [ -z "$$unpack_pids" ] || kill $$unpack_pids 2>/dev/null; exit $$sim_rc
+endif
+
+# Same as run-verif, but simulate whatever is in $(sim_vsim_lib) without
+# rebuilding it: used by the regression once opt-verif has run for the
+# hardware config, typically with a sim_run_dir per test. Not with
+# STIM_FIFO=1: its producers regenerate the shared outputs of stim-verif,
+# so runs sharing them could not execute in parallel; use run-verif
+.PHONY: run-only-verif
+run-only-verif: $(HCI_VERIF_DIR)/vsim/$(sim_top_level).tcl
+	$(if $(filter 1,$(STIM_FIFO)),$(error run-only-verif reads stimuli files, use run-verif with STIM_FIFO=1))
+	$(STIM_UNPACK) \
+	cd $(HCI_VERIF_DIR)/vsim && \
+	$(SIM_VSIM) $(SIM_HCI_VSIM_ARGS) +STIM_DIR=$(STIM_RUN_DIR) \
+	$(sim_top_level)_optimized \
+	-do 'set GUI $(GUI); source $<'; \
+	sim_rc=$$?; [ -z "$$unpack_pids" ] || kill $$unpack_pids 2>/dev/null; exit $$sim_rc
 
 
 .PHONY: clean-verif
@@ -151,6 +235,7 @@ clean-sim-verif:
 	rm -f $(HCI_VERIF_DIR)/vsim/modelsim.ini
 	rm -f $(HCI_VERIF_DIR)/vsim/transcript
 	rm -f $(HCI_VERIF_DIR)/vsim/vsim.wlf
+	$(if $(sim_run_dir),rm -rf $(sim_run_dir))
 
 ###########
 # Helpers #